@@ -1,5 +1,12 @@
 """Backend application package for Chatbot WebUI."""
 
-from .main import create_app
-
 __all__ = ["create_app"]
+
+
+def __getattr__(name: str):
+    # Imported lazily so `backend.app.config` & co. do not pull in the whole app.
+    if name == "create_app":
+        from .main import create_app
+
+        return create_app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,5 +1,31 @@
 """Route modules for the FastAPI app."""
 
-from . import health, mock, runtime, spec
+from . import (
+    benchmarks,
+    chat,
+    conversations,
+    debug,
+    documents,
+    health,
+    metrics,
+    mock,
+    openai,
+    runtime,
+    spec,
+    tokenize,
+)
 
-__all__ = ["health", "mock", "runtime", "spec"]
+__all__ = [
+    "benchmarks",
+    "chat",
+    "conversations",
+    "debug",
+    "documents",
+    "health",
+    "metrics",
+    "mock",
+    "openai",
+    "runtime",
+    "spec",
+    "tokenize",
+]
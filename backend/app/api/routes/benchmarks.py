@@ -0,0 +1,120 @@
+"""Benchmark history endpoints."""
+
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlmodel import Session, select
+
+from backend.app.config import settings
+from backend.app.db.models import BenchmarkRun, InstalledModel
+from backend.app.db.session import get_read_session, get_session
+from backend.app.runtime import get_benchmark_runner, get_runtime_manager
+from backend.app.runtime.benchmark import (
+    BenchmarkRunner,
+    compare_runs,
+    find_baseline,
+    mark_baseline,
+)
+from backend.app.runtime.manager import LlamaRuntime
+from backend.app.schemas.benchmarks import (
+    BenchmarkComparison,
+    BenchmarkJobRead,
+    BenchmarkRunList,
+    BenchmarkRunRead,
+    BenchmarkRunRequest,
+)
+
+router = APIRouter(prefix="/benchmarks", tags=["benchmarks"])
+
+
+def _get_run(session: Session, run_id: int) -> BenchmarkRun:
+    run = session.get(BenchmarkRun, run_id)
+    if not run:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Benchmark not found.")
+    return run
+
+
+@router.post("", response_model=BenchmarkJobRead, status_code=status.HTTP_202_ACCEPTED)
+def create_benchmark(
+    payload: BenchmarkRunRequest,
+    session: Session = Depends(get_session),
+    runtime: LlamaRuntime = Depends(get_runtime_manager),
+    runner: BenchmarkRunner = Depends(get_benchmark_runner),
+) -> BenchmarkJobRead:
+    """Queue the standard suite on the loaded model; poll the job for the recorded run."""
+    state = runtime.get_state()
+    model = session.get(InstalledModel, state.model_id) if state else None
+    if state is None or model is None:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="No model is loaded.")
+    job = runner.submit(
+        runtime,
+        model_id=model.id,  # type: ignore[arg-type]
+        config=state.config,
+        request=payload,
+    )
+    return job.to_read()
+
+
+@router.get("/jobs/{job_id}", response_model=BenchmarkJobRead)
+def get_benchmark_job(
+    job_id: str, runner: BenchmarkRunner = Depends(get_benchmark_runner)
+) -> BenchmarkJobRead:
+    job = runner.get(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Benchmark job not found."
+        )
+    return job.to_read()
+
+
+@router.get("", response_model=BenchmarkRunList)
+def list_benchmarks(
+    model_id: int | None = None,
+    limit: int = Query(default=50, ge=1, le=500),
+    session: Session = Depends(get_read_session),
+) -> BenchmarkRunList:
+    """Recorded runs, newest first."""
+    query = select(BenchmarkRun).order_by(BenchmarkRun.id.desc()).limit(limit)
+    if model_id is not None:
+        query = query.where(BenchmarkRun.model_id == model_id)
+    return BenchmarkRunList(
+        items=[BenchmarkRunRead.model_validate(run) for run in session.exec(query)]
+    )
+
+
+@router.get("/compare", response_model=BenchmarkComparison)
+def compare_benchmarks(
+    candidate_id: int | None = None,
+    baseline_id: int | None = None,
+    threshold_pct: float | None = Query(default=None, ge=0),
+    session: Session = Depends(get_read_session),
+) -> BenchmarkComparison:
+    """Compare two runs; defaults to the latest run against its model + hardware baseline."""
+    if candidate_id is not None:
+        candidate = _get_run(session, candidate_id)
+    else:
+        candidate = session.exec(select(BenchmarkRun).order_by(BenchmarkRun.id.desc())).first()
+        if candidate is None:
+            raise HTTPException(status.HTTP_404_NOT_FOUND, detail="No benchmark runs recorded.")
+    baseline = (
+        _get_run(session, baseline_id)
+        if baseline_id is not None
+        else find_baseline(session, candidate)
+    )
+    if baseline is None:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, detail="No baseline to compare against.")
+    threshold = (
+        settings.benchmark_regression_threshold_pct if threshold_pct is None else threshold_pct
+    )
+    return compare_runs(baseline, candidate, threshold)
+
+
+@router.get("/{run_id}", response_model=BenchmarkRunRead)
+def get_benchmark(run_id: int, session: Session = Depends(get_read_session)) -> BenchmarkRunRead:
+    return BenchmarkRunRead.model_validate(_get_run(session, run_id))
+
+
+@router.post("/{run_id}/baseline", response_model=BenchmarkRunRead)
+def set_baseline(run_id: int, session: Session = Depends(get_session)) -> BenchmarkRunRead:
+    """Make this run the baseline for its suite, model file and hardware."""
+    return BenchmarkRunRead.model_validate(mark_baseline(session, _get_run(session, run_id)))
@@ -0,0 +1,452 @@
+"""Chat streaming endpoints backed by the loaded llama.cpp runtime."""
+
+from __future__ import annotations
+
+import json
+import logging
+from collections.abc import Iterator
+from dataclasses import dataclass
+from inspect import GEN_CREATED, getgeneratorstate
+from pathlib import Path
+from time import perf_counter_ns
+from typing import Literal
+
+import anyio
+import anyio.abc
+from anyio import to_thread
+from fastapi import APIRouter, Depends, HTTPException, WebSocket, WebSocketDisconnect, status
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from sqlmodel import Session, select
+
+from backend.app.api.routes.conversations import append_message
+from backend.app.config import settings
+from backend.app.db.models import Conversation, InstalledModel, LoraAdapter, Message
+from backend.app.db.session import get_engine, get_session
+from backend.app.db.write_behind import MessageWriteBehind, get_message_writer, process_owner
+from backend.app.runtime import get_runtime_manager, get_summarizer, get_token_counter
+from backend.app.runtime.manager import (
+    AdapterSpec,
+    LlamaRuntime,
+    LoadedModelState,
+    RuntimeNotAvailableError,
+)
+from backend.app.runtime.snapshot import RuntimeStateHub, build_runtime_state, get_runtime_hub
+from backend.app.runtime.summarizer import latest_summary
+from backend.app.schemas.chat import (
+    ChatConfig,
+    ChatSocketMessage,
+    ChatStreamRequest,
+    FramePolicy,
+)
+from backend.app.schemas.conversations import MessageRole, MessageStatus
+from backend.app.telemetry.instrumentation import instrument_token_stream
+from backend.app.telemetry.tracing import tracer
+from backend.app.utils.streaming import (
+    SSE_FRAMES,
+    FrameEncoder,
+    FrameT,
+    SocketFrames,
+    coalesce_tokens,
+)
+from backend.app.utils.tokens import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/chat", tags=["chat"])
+
+
+@dataclass
+class _ReplyTarget:
+    message_id: int
+    conversation_id: int
+
+
+def _history(
+    session: Session, conversation_id: int, budget: int
+) -> tuple[str | None, list[dict[str, str]], int]:
+    """Latest summary plus the most recent turns after it that fit in `budget` tokens.
+
+    Uses the cached per-message counts. Also returns the tokens of unsummarized history seen
+    (past the budget when turns were dropped), which says when compaction is due.
+    """
+    summary = latest_summary(session, conversation_id)
+    statement = select(Message.role, Message.content, Message.token_count).where(
+        Message.conversation_id == conversation_id
+    )
+    if summary is not None:
+        budget -= summary.token_count
+        statement = statement.where(Message.id > summary.last_message_id)
+    turns: list[dict[str, str]] = []
+    used = 0
+    for role, content, token_count in session.exec(statement.order_by(Message.id.desc())):
+        if not content:
+            continue
+        used += token_count
+        if used > budget:
+            break
+        turns.append({"role": role, "content": content})
+    turns.reverse()
+    return (summary.content if summary else None), turns, used
+
+
+def _reload_evicted(
+    session: Session, runtime: LlamaRuntime, hub: RuntimeStateHub, slug: str
+) -> LoadedModelState | None:
+    """Bring back a model the watchdog unloaded, if it is the one being asked for."""
+    model = session.exec(select(InstalledModel).where(InstalledModel.slug == slug)).first()
+    if model is None:
+        return None
+    with tracer.span("runtime.lazy_reload", model_id=model.id):
+        reloaded = runtime.ensure_loaded(model.id)  # type: ignore[arg-type]
+    if reloaded:
+        hub.publish_state(build_runtime_state(session, runtime))
+    return runtime.get_state()
+
+
+def _persisted(
+    tokens: Iterator[str], writer: MessageWriteBehind, reply: _ReplyTarget
+) -> Iterator[str]:
+    """Hand each token to the write-behind buffer before it can sit in a pending frame."""
+    for token in tokens:
+        writer.append(reply.message_id, reply.conversation_id, token)
+        yield token
+
+
+def require_loaded_model(
+    session: Session, runtime: LlamaRuntime, hub: RuntimeStateHub, slug: str
+) -> LoadedModelState:
+    """Runtime state for `slug`, reloading it if it was evicted; 409 when another is loaded."""
+    state = runtime.get_state() or _reload_evicted(session, runtime, hub, slug)
+    with tracer.span("db.get_model"):
+        model = session.get(InstalledModel, state.model_id) if state else None
+    if state is None or model is None or model.slug != slug:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Model '{slug}' is not loaded.",
+        )
+    return state
+
+
+def resolve_adapter(
+    session: Session, slug: str | None, state: LoadedModelState
+) -> AdapterSpec | None:
+    """Runtime spec for adapter `slug`; 404 when unknown, 409 when it targets another base."""
+    if slug is None:
+        return None
+    adapter = session.exec(select(LoraAdapter).where(LoraAdapter.slug == slug)).first()
+    if adapter is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Adapter not found.")
+    if adapter.base_model_id != state.model_id:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Adapter '{slug}' does not apply to the loaded model.",
+        )
+    return AdapterSpec(
+        adapter_id=adapter.id,  # type: ignore[arg-type]
+        path=Path(adapter.file_path),
+        scale=adapter.scale,
+    )
+
+
+def require_valid_constraint(runtime: LlamaRuntime, config: ChatConfig) -> None:
+    """Compile the requested grammar or schema up front; 422 when invalid, 409 when unsupported."""
+    try:
+        runtime.check_constraint(config)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(exc)
+        ) from exc
+    except RuntimeNotAvailableError as exc:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(exc)) from exc
+
+
+def _stream_tokens(
+    runtime: LlamaRuntime,
+    messages: list[dict[str, str]],
+    config: ChatConfig,
+    writer: MessageWriteBehind,
+    reply: _ReplyTarget | None,
+    frame_policy: FramePolicy = FramePolicy.ADAPTIVE,
+    frames: FrameEncoder[FrameT] = SSE_FRAMES,  # type: ignore[assignment]
+    adapter: AdapterSpec | None = None,
+) -> Iterator[FrameT]:
+    count = frame_count = 0
+    outcome = MessageStatus.FAILED
+    serialize_started = serialize_ns = 0
+    try:
+        with tracer.span("chat.tokenize"):
+            prompt_tokens = sum(estimate_tokens(turn["content"]) for turn in messages)
+        cache_key = f"conversation:{reply.conversation_id}" if reply is not None else None
+        tokens = instrument_token_stream(
+            runtime.generate(messages, config, cache_key=cache_key, adapter=adapter),
+            prompt_tokens=prompt_tokens,
+        )
+        if reply is not None:
+            tokens = _persisted(tokens, writer, reply)
+        for index, pieces in coalesce_tokens(tokens, frame_policy):
+            started = perf_counter_ns()
+            serialize_started = serialize_started or started
+            frame = frames.token("".join(pieces), index)
+            serialize_ns += perf_counter_ns() - started
+            yield frame
+            count += len(pieces)
+            frame_count += 1
+        outcome = MessageStatus.COMPLETE
+        yield frames.final(count)
+    except GeneratorExit:
+        outcome = MessageStatus.CANCELLED
+        raise
+    except Exception as exc:
+        logger.exception("Chat generation failed.")
+        yield frames.error(str(exc))
+    finally:
+        if serialize_ns:
+            # Serialization is interleaved with decode; report its summed cost as one span.
+            tracer.record_span(
+                "chat.serialize",
+                serialize_started,
+                serialize_started + serialize_ns,
+                frames=frame_count,
+                tokens=count,
+            )
+        if reply is not None:
+            writer.finish(
+                reply.message_id,
+                reply.conversation_id,
+                status=outcome,
+                token_count=count,
+            )
+
+
+def _prepare_generation(
+    payload: ChatStreamRequest,
+    session: Session,
+    runtime: LlamaRuntime,
+    hub: RuntimeStateHub,
+) -> tuple[list[dict[str, str]], _ReplyTarget | None, AdapterSpec | None]:
+    """Check the model, load history and open the assistant reply; raises HTTPException."""
+    state = require_loaded_model(session, runtime, hub, payload.model_id)
+    adapter = resolve_adapter(session, payload.adapter_id, state)
+    require_valid_constraint(runtime, payload.config)
+
+    system_prompt = payload.system_prompt
+    history: list[dict[str, str]] = []
+    reply: _ReplyTarget | None = None
+    if payload.conversation_id is not None:
+        conversation = session.get(Conversation, payload.conversation_id)
+        if not conversation:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Conversation not found.",
+            )
+        system_prompt = conversation.system_prompt or system_prompt
+        system_tokens, prompt_tokens = (
+            get_token_counter()
+            .count(runtime, state.model_id, state.model_path, [system_prompt, payload.prompt])
+            .counts
+        )
+        budget = (
+            state.config.context_length - payload.config.max_tokens - system_tokens - prompt_tokens
+        )
+        with tracer.span("db.load_history"):
+            summary, history, history_tokens = _history(
+                session, conversation.id, budget  # type: ignore[arg-type]
+            )
+        if summary is not None:
+            system_prompt = f"{system_prompt}\n\nSummary of the earlier conversation:\n{summary}"
+        with tracer.span("db.append_messages"):
+            append_message(
+                session,
+                conversation,
+                role=MessageRole.USER,
+                content=payload.prompt,
+                token_count=prompt_tokens,
+            )
+            message = append_message(
+                session,
+                conversation,
+                role=MessageRole.ASSISTANT,
+                content="",
+                token_count=0,
+                status=MessageStatus.STREAMING,
+                owner=process_owner(),
+            )
+            session.commit()
+        reply = _ReplyTarget(message_id=message.id, conversation_id=conversation.id)  # type: ignore[arg-type]
+        if history_tokens > budget * settings.summary_trigger_ratio:
+            get_summarizer().schedule(runtime, reply.conversation_id)
+
+    messages = [
+        {"role": MessageRole.SYSTEM.value, "content": system_prompt},
+        *history,
+        {"role": MessageRole.USER.value, "content": payload.prompt},
+    ]
+    return messages, reply, adapter
+
+
+@router.post(
+    "/stream",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"text/event-stream": {}}}},
+    summary="Stream a chat completion as server-sent events",
+)
+def stream_chat(
+    payload: ChatStreamRequest,
+    session: Session = Depends(get_session),
+    runtime: LlamaRuntime = Depends(get_runtime_manager),
+    writer: MessageWriteBehind = Depends(get_message_writer),
+    hub: RuntimeStateHub = Depends(get_runtime_hub),
+) -> StreamingResponse:
+    """Stream `ChatChunk` events; replies are persisted through the write-behind buffer."""
+    messages, reply, adapter = _prepare_generation(payload, session, runtime, hub)
+    return StreamingResponse(
+        _stream_tokens(
+            runtime,
+            messages,
+            payload.config,
+            writer,
+            reply,
+            payload.frame_policy,
+            adapter=adapter,
+        ),
+        media_type="text/event-stream",
+    )
+
+
+class _ChatSocket:
+    """One `/chat/ws` connection: a reader, a single writer and a task per live stream.
+
+    Every stream pushes frames into one bounded outbox drained by the writer, so a slow
+    client blocks the producers (and through them the runtime) instead of buffering without
+    limit. Cancelling a stream closes its generator, which marks the reply cancelled.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        runtime: LlamaRuntime,
+        writer: MessageWriteBehind,
+        hub: RuntimeStateHub,
+        *,
+        binary: bool,
+    ) -> None:
+        self.websocket = websocket
+        self.runtime = runtime
+        self.writer = writer
+        self.hub = hub
+        self.binary = binary
+        self.streams: dict[int, anyio.CancelScope] = {}
+        self.outbox, self._outbox_reader = anyio.create_memory_object_stream[str | bytes](
+            settings.chat_ws_send_buffer
+        )
+
+    async def serve(self) -> None:
+        async with anyio.create_task_group() as group:
+            group.start_soon(self._pump, group.cancel_scope)
+            try:
+                while True:
+                    await self._handle(group, await self.websocket.receive_text())
+            except WebSocketDisconnect:
+                pass
+            group.cancel_scope.cancel()
+
+    async def _pump(self, scope: anyio.CancelScope) -> None:
+        async with self._outbox_reader:
+            async for frame in self._outbox_reader:
+                try:
+                    if isinstance(frame, bytes):
+                        await self.websocket.send_bytes(frame)
+                    else:
+                        await self.websocket.send_text(frame)
+                except (WebSocketDisconnect, RuntimeError):
+                    scope.cancel()
+                    return
+
+    async def _handle(self, group: anyio.abc.TaskGroup, raw: str) -> None:
+        try:
+            message = ChatSocketMessage.model_validate_json(raw)
+        except ValidationError as exc:
+            await self.outbox.send(
+                json.dumps({"type": "error", "id": None, "status": 422, "detail": exc.errors()})
+            )
+            return
+        frames = SocketFrames(message.id, binary=self.binary)
+        if message.type == "cancel":
+            scope = self.streams.pop(message.id, None)
+            if scope is not None:
+                scope.cancel()
+                await self.outbox.send(frames.cancelled())
+            return
+        if message.request is None:
+            await self.outbox.send(frames.error("A start message needs a request.", 422))
+        elif message.id in self.streams:
+            await self.outbox.send(frames.error(f"Stream {message.id} is already running.", 409))
+        elif len(self.streams) >= settings.chat_ws_max_streams:
+            await self.outbox.send(frames.error("Too many concurrent streams.", 429))
+        else:
+            scope = self.streams[message.id] = anyio.CancelScope()
+            group.start_soon(self._run, message.id, message.request, frames, scope)
+
+    def _prepare(
+        self, payload: ChatStreamRequest
+    ) -> tuple[list[dict[str, str]], _ReplyTarget | None, AdapterSpec | None]:
+        with Session(get_engine()) as session:
+            return _prepare_generation(payload, session, self.runtime, self.hub)
+
+    async def _run(
+        self,
+        stream_id: int,
+        payload: ChatStreamRequest,
+        frames: SocketFrames,
+        scope: anyio.CancelScope,
+    ) -> None:
+        with scope:
+            try:
+                # Shielded so a cancel cannot strand the reply row prepare just opened.
+                with anyio.CancelScope(shield=True):
+                    messages, reply, adapter = await to_thread.run_sync(self._prepare, payload)
+            except HTTPException as exc:
+                await self.outbox.send(frames.error(str(exc.detail), exc.status_code))
+                return
+            generation = _stream_tokens(
+                self.runtime,
+                messages,
+                payload.config,
+                self.writer,
+                reply,
+                payload.frame_policy,
+                frames,
+                adapter,
+            )
+            try:
+                while (frame := await to_thread.run_sync(next, generation, None)) is not None:
+                    await self.outbox.send(frame)
+            finally:
+                if getgeneratorstate(generation) == GEN_CREATED:
+                    # Closing an unstarted generator skips its cleanup; finish the reply here.
+                    if reply is not None:
+                        self.writer.finish(
+                            reply.message_id,
+                            reply.conversation_id,
+                            status=MessageStatus.CANCELLED,
+                            token_count=0,
+                        )
+                else:
+                    with anyio.CancelScope(shield=True):
+                        await to_thread.run_sync(generation.close)
+        if self.streams.get(stream_id) is scope:
+            del self.streams[stream_id]
+
+
+@router.websocket("/ws")
+async def chat_websocket(
+    websocket: WebSocket,
+    encoding: Literal["json", "binary"] = "json",
+    runtime: LlamaRuntime = Depends(get_runtime_manager),
+    writer: MessageWriteBehind = Depends(get_message_writer),
+    hub: RuntimeStateHub = Depends(get_runtime_hub),
+) -> None:
+    """Multiplex concurrent generations over one socket; see `_ChatSocket` for the protocol."""
+    await websocket.accept()
+    await _ChatSocket(websocket, runtime, writer, hub, binary=encoding == "binary").serve()
@@ -0,0 +1,222 @@
+"""Conversation + message persistence endpoints."""
+
+from __future__ import annotations
+
+import base64
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy import tuple_
+from sqlmodel import Session, delete, select
+
+from backend.app.db.models import Conversation, ConversationSummary, Message
+from backend.app.db.search import search_messages
+from backend.app.db.session import get_read_session, get_session
+from backend.app.schemas.conversations import (
+    ConversationCreate,
+    ConversationPage,
+    ConversationRead,
+    ConversationUpdate,
+    MessageCreate,
+    MessagePage,
+    MessageRead,
+    MessageRole,
+    MessageSearchResponse,
+    MessageSearchResult,
+    MessageStatus,
+)
+from backend.app.utils.clock import utcnow
+from backend.app.utils.tokens import estimate_tokens
+
+router = APIRouter(prefix="/conversations", tags=["conversations"])
+
+
+def _serialize_conversation(conversation: Conversation) -> ConversationRead:
+    return ConversationRead.model_validate(conversation)
+
+
+def _serialize_message(message: Message) -> MessageRead:
+    return MessageRead.model_validate(message)
+
+
+def _get_conversation(session: Session, conversation_id: int) -> Conversation:
+    conversation = session.get(Conversation, conversation_id)
+    if not conversation:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Conversation not found.")
+    return conversation
+
+
+def _encode_cursor(conversation: Conversation) -> str:
+    raw = f"{conversation.updated_at.isoformat()}|{conversation.id}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+        timestamp, conversation_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(timestamp), int(conversation_id)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor.",
+        ) from exc
+
+
+def append_message(
+    session: Session,
+    conversation: Conversation,
+    *,
+    role: MessageRole,
+    content: str,
+    token_count: int | None = None,
+    status: MessageStatus = MessageStatus.COMPLETE,
+    owner: str | None = None,
+) -> Message:
+    """Add a message and roll its cached token count into the conversation totals."""
+    message = Message(
+        conversation_id=conversation.id,  # type: ignore[arg-type]
+        role=role.value,
+        content=content,
+        token_count=estimate_tokens(content) if token_count is None else token_count,
+        status=status.value,
+        owner=owner,
+    )
+    conversation.message_count += 1
+    conversation.token_count += message.token_count
+    conversation.updated_at = utcnow()
+    session.add(message)
+    session.add(conversation)
+    return message
+
+
+@router.get("", response_model=ConversationPage)
+def list_conversations(
+    limit: int = Query(50, ge=1, le=200),
+    cursor: str | None = Query(None, description="`next_cursor` from the previous page."),
+    session: Session = Depends(get_read_session),
+) -> ConversationPage:
+    """Return conversations, most recently active first, using keyset pagination."""
+    statement = select(Conversation).order_by(
+        Conversation.updated_at.desc(),
+        Conversation.id.desc(),
+    )
+    if cursor:
+        updated_at, conversation_id = _decode_cursor(cursor)
+        statement = statement.where(
+            tuple_(Conversation.updated_at, Conversation.id) < tuple_(updated_at, conversation_id)
+        )
+    rows = session.exec(statement.limit(limit + 1)).all()
+    page = rows[:limit]
+    next_cursor = _encode_cursor(page[-1]) if len(rows) > limit else None
+    return ConversationPage(
+        conversations=[_serialize_conversation(item) for item in page],
+        next_cursor=next_cursor,
+    )
+
+
+@router.post("", response_model=ConversationRead, status_code=status.HTTP_201_CREATED)
+def create_conversation(
+    payload: ConversationCreate,
+    session: Session = Depends(get_session),
+) -> ConversationRead:
+    conversation = Conversation(title=payload.title, system_prompt=payload.system_prompt)
+    session.add(conversation)
+    session.commit()
+    session.refresh(conversation)
+    return _serialize_conversation(conversation)
+
+
+@router.get("/search", response_model=MessageSearchResponse)
+def search_conversations(
+    q: str = Query(..., min_length=1, description="Full-text query across all messages."),
+    limit: int = Query(20, ge=1, le=100),
+    session: Session = Depends(get_read_session),
+) -> MessageSearchResponse:
+    """Search every stored message through the FTS5 index."""
+    hits = search_messages(session, q, limit=limit)
+    return MessageSearchResponse(
+        results=[
+            MessageSearchResult(
+                message_id=hit.message_id,
+                conversation_id=hit.conversation_id,
+                conversation_title=hit.conversation_title,
+                role=MessageRole(hit.role),
+                snippet=hit.snippet,
+            )
+            for hit in hits
+        ]
+    )
+
+
+@router.get("/{conversation_id}", response_model=ConversationRead)
+def get_conversation(
+    conversation_id: int,
+    session: Session = Depends(get_read_session),
+) -> ConversationRead:
+    return _serialize_conversation(_get_conversation(session, conversation_id))
+
+
+@router.patch("/{conversation_id}", response_model=ConversationRead)
+def update_conversation(
+    conversation_id: int,
+    payload: ConversationUpdate,
+    session: Session = Depends(get_session),
+) -> ConversationRead:
+    conversation = _get_conversation(session, conversation_id)
+    for field, value in payload.model_dump(exclude_unset=True).items():
+        setattr(conversation, field, value)
+    conversation.updated_at = utcnow()
+    session.add(conversation)
+    session.commit()
+    session.refresh(conversation)
+    return _serialize_conversation(conversation)
+
+
+@router.delete("/{conversation_id}", status_code=status.HTTP_204_NO_CONTENT)
+def delete_conversation(conversation_id: int, session: Session = Depends(get_session)) -> Response:
+    conversation = _get_conversation(session, conversation_id)
+    session.exec(
+        delete(ConversationSummary).where(ConversationSummary.conversation_id == conversation_id)
+    )
+    session.exec(delete(Message).where(Message.conversation_id == conversation_id))
+    session.delete(conversation)
+    session.commit()
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+@router.get("/{conversation_id}/messages", response_model=MessagePage)
+def list_messages(
+    conversation_id: int,
+    limit: int = Query(50, ge=1, le=500),
+    before_id: int | None = Query(None, description="`next_cursor` from the previous page."),
+    session: Session = Depends(get_read_session),
+) -> MessagePage:
+    """Return the newest `limit` messages older than `before_id`, oldest first."""
+    _get_conversation(session, conversation_id)
+    statement = select(Message).where(Message.conversation_id == conversation_id)
+    if before_id is not None:
+        statement = statement.where(Message.id < before_id)
+    rows = session.exec(statement.order_by(Message.id.desc()).limit(limit + 1)).all()
+    page = list(reversed(rows[:limit]))
+    next_cursor = page[0].id if len(rows) > limit else None
+    return MessagePage(
+        messages=[_serialize_message(item) for item in page], next_cursor=next_cursor
+    )
+
+
+@router.post(
+    "/{conversation_id}/messages",
+    response_model=MessageRead,
+    status_code=status.HTTP_201_CREATED,
+)
+def create_message(
+    conversation_id: int,
+    payload: MessageCreate,
+    session: Session = Depends(get_session),
+) -> MessageRead:
+    conversation = _get_conversation(session, conversation_id)
+    message = append_message(session, conversation, role=payload.role, content=payload.content)
+    session.commit()
+    session.refresh(message)
+    return _serialize_message(message)
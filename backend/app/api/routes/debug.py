@@ -0,0 +1,21 @@
+"""Diagnostics endpoints."""
+
+from fastapi import APIRouter, Depends, Query
+
+from backend.app.config import settings
+from backend.app.schemas.system import TraceListResponse, TraceRead
+from backend.app.telemetry.tracing import Tracer, get_tracer
+
+router = APIRouter(prefix="/debug", tags=["debug"])
+
+
+@router.get("/traces", response_model=TraceListResponse, summary="Slowest sampled traces")
+def list_traces(
+    limit: int = Query(default=20, ge=1, le=200),
+    tracer: Tracer = Depends(get_tracer),
+) -> TraceListResponse:
+    """Return recent traces that crossed the slow-request threshold, slowest first."""
+    return TraceListResponse(
+        threshold_ms=settings.trace_slow_threshold_ms,
+        items=[TraceRead.model_validate(item) for item in tracer.slowest(limit)],
+    )
@@ -0,0 +1,137 @@
+"""Document ingestion endpoints for local retrieval-augmented chat."""
+
+from __future__ import annotations
+
+from hashlib import sha256
+from pathlib import Path
+from uuid import uuid4
+
+from fastapi import APIRouter, Depends, File, HTTPException, Response, UploadFile, status
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, delete, select
+
+from backend.app.config import settings
+from backend.app.db.models import Document, DocumentChunk
+from backend.app.db.session import get_read_session, get_session
+from backend.app.documents import get_document_ingestor
+from backend.app.documents.ingest import DocumentIngestor
+from backend.app.schemas.documents import (
+    DocumentListResponse,
+    DocumentRead,
+    DocumentStatus,
+    DocumentUploadResponse,
+)
+from backend.app.utils.clock import utcnow
+from backend.app.utils.file_ops import save_upload
+
+router = APIRouter(prefix="/documents", tags=["documents"])
+
+_MEDIA_TYPES = {".txt": "text/plain", ".md": "text/markdown", ".markdown": "text/markdown"}
+
+
+def _serialize_document(document: Document) -> DocumentRead:
+    return DocumentRead.model_validate(document)
+
+
+def _get_document(session: Session, document_id: int) -> Document:
+    document = session.get(Document, document_id)
+    if not document:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Document not found.")
+    return document
+
+
+def _find_by_hash(session: Session, content_hash: str) -> Document | None:
+    return session.exec(select(Document).where(Document.content_hash == content_hash)).first()
+
+
+@router.get("", response_model=DocumentListResponse)
+def list_documents(session: Session = Depends(get_read_session)) -> DocumentListResponse:
+    """Return ingested documents, newest first."""
+    documents = session.exec(select(Document).order_by(Document.created_at.desc())).all()
+    return DocumentListResponse(documents=[_serialize_document(item) for item in documents])
+
+
+@router.post(
+    "",
+    response_model=DocumentUploadResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def upload_document(
+    response: Response,
+    file: UploadFile = File(...),
+    session: Session = Depends(get_session),
+    ingestor: DocumentIngestor = Depends(get_document_ingestor),
+) -> DocumentUploadResponse:
+    """Store a text/markdown upload and queue it for background ingestion."""
+    if not file.filename:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Filename is required.")
+    filename = Path(file.filename).name
+    suffix = Path(filename).suffix.lower()
+    media_type = _MEDIA_TYPES.get(suffix)
+    if media_type is None:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Only .txt and .md documents are supported.",
+        )
+
+    digest = sha256()
+    spool_path = settings.documents_dir / f".upload-{uuid4().hex}{suffix}"
+    size_bytes = await save_upload(file, spool_path, on_chunk=digest.update)
+    content_hash = digest.hexdigest()
+
+    existing = _find_by_hash(session, content_hash)
+    if existing and existing.status != DocumentStatus.FAILED.value:
+        spool_path.unlink(missing_ok=True)
+        response.status_code = status.HTTP_200_OK
+        return DocumentUploadResponse(document=_serialize_document(existing), deduplicated=True)
+
+    destination = settings.documents_dir / f"{content_hash}{suffix}"
+    spool_path.replace(destination)
+    document = existing or Document(
+        filename=filename,
+        content_hash=content_hash,
+        media_type=media_type,
+        file_path=str(destination),
+        size_bytes=size_bytes,
+    )
+    document.status = DocumentStatus.PENDING.value
+    document.updated_at = utcnow()
+    session.add(document)
+    try:
+        session.commit()
+    except IntegrityError:
+        # A concurrent upload of the same bytes won the race; report its row instead.
+        session.rollback()
+        winner = _find_by_hash(session, content_hash)
+        if winner is None:
+            raise
+        response.status_code = status.HTTP_200_OK
+        return DocumentUploadResponse(document=_serialize_document(winner), deduplicated=True)
+    session.refresh(document)
+
+    ingestor.submit(document.id, destination)  # type: ignore[arg-type]
+    return DocumentUploadResponse(document=_serialize_document(document))
+
+
+@router.get("/{document_id}", response_model=DocumentUploadResponse)
+def get_document(
+    document_id: int, session: Session = Depends(get_read_session)
+) -> DocumentUploadResponse:
+    """Return a single document, including its ingestion status."""
+    return DocumentUploadResponse(document=_serialize_document(_get_document(session, document_id)))
+
+
+@router.delete("/{document_id}", status_code=status.HTTP_204_NO_CONTENT)
+def delete_document(
+    document_id: int,
+    session: Session = Depends(get_session),
+    ingestor: DocumentIngestor = Depends(get_document_ingestor),
+) -> Response:
+    """Remove a document, its chunks and the stored upload, stopping any ingest first."""
+    document = _get_document(session, document_id)
+    ingestor.cancel(document_id)
+    session.exec(delete(DocumentChunk).where(DocumentChunk.document_id == document_id))
+    session.delete(document)
+    session.commit()
+    Path(document.file_path).unlink(missing_ok=True)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,26 @@
+"""Prometheus scrape endpoint."""
+
+from fastapi import APIRouter, Depends, Response
+
+from backend.app.runtime import get_runtime_manager
+from backend.app.runtime.manager import LlamaRuntime
+from backend.app.runtime.snapshot import RuntimeStateHub, get_runtime_hub
+from backend.app.schemas.runtime import MemoryStats
+from backend.app.telemetry.metrics import REGISTRY, RUNTIME_RESIDENT_BYTES, RUNTIME_VRAM_BYTES
+
+router = APIRouter(tags=["metrics"])
+
+_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@router.get("/metrics", response_class=Response, summary="Prometheus metrics")
+def get_metrics(
+    runtime: LlamaRuntime = Depends(get_runtime_manager),
+    hub: RuntimeStateHub = Depends(get_runtime_hub),
+) -> Response:
+    """Render every registered metric; memory gauges come from the hub's cached sample."""
+    memory = MemoryStats.model_validate_json(hub.memory(runtime).body)
+    RUNTIME_RESIDENT_BYTES.set(memory.resident_bytes)
+    if memory.vram_bytes is not None:
+        RUNTIME_VRAM_BYTES.set(memory.vram_bytes)
+    return Response(content=REGISTRY.render(), media_type=_CONTENT_TYPE)
@@ -2,35 +2,114 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
-from pathlib import Path
+import logging
+from collections.abc import AsyncIterator, Iterator
+from itertools import islice
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Request, Response, status
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
 
 from backend.app.config import settings
-from backend.app.schemas.chat import ChatChunk, ChatRequest, ChatResponse
+from backend.app.runtime.synthetic import synthetic_token
+from backend.app.schemas.chat import (
+    ChatChunk,
+    ChatRequest,
+    ChatResponse,
+    MockChatStreamRequest,
+    MockStreamOptions,
+)
 from backend.app.schemas.models import ModelCard
+from backend.app.utils.http import asset_response, sse_event
+from backend.app.utils.static_assets import Render, StaticAsset, static_assets
+from backend.app.utils.streaming import final_frame, token_frame
 
 router = APIRouter(prefix="/mock", tags=["mock"])
+logger = logging.getLogger(__name__)
+
+_MODELS = TypeAdapter(list[ModelCard])
+_STREAM = TypeAdapter(list[ChatChunk])
+
+
+def _render_models(content: bytes) -> tuple[list[ModelCard], bytes]:
+    models = _MODELS.validate_json(content)
+    return models, _MODELS.dump_json(models)
+
+
+def _render_stream(content: bytes) -> tuple[list[ChatChunk], bytes]:
+    stream = _STREAM.validate_json(content)
+    return stream, _STREAM.dump_json(stream)
 
 
-def _read_fixture(name: str) -> list[dict]:
-    fixture_path = settings.fixtures_dir / name
-    if not fixture_path.exists():
+_FIXTURES: dict[str, Render] = {
+    "models.json": _render_models,
+    "chat_stream.json": _render_stream,
+}
+
+
+def _read_fixture(name: str) -> StaticAsset:
+    try:
+        return static_assets.get(settings.fixtures_dir / name, _FIXTURES[name])
+    except FileNotFoundError as exc:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Fixture '{name}' not found.",
+        ) from exc
+
+
+def prime_fixtures() -> int:
+    """Load every fixture into the static-asset cache; returns how many loaded cleanly."""
+    loaded = 0
+    for name, render in _FIXTURES.items():
+        try:
+            static_assets.get(settings.fixtures_dir / name, render)
+        except (OSError, ValueError):
+            logger.warning("Fixture %s could not be loaded.", name, exc_info=True)
+            continue
+        loaded += 1
+    return loaded
+
+
+def _require_model(model_id: str) -> None:
+    models: list[ModelCard] = _read_fixture("models.json").value
+    if all(model.id != model_id for model in models):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Unknown model_id '{model_id}'.",
         )
 
-    with Path(fixture_path).open("r", encoding="utf-8") as handle:
-        return json.load(handle)
+
+async def _paced_frames(tokens: Iterator[str], options: MockStreamOptions) -> AsyncIterator[str]:
+    """Emit `tokens` as SSE frames on the schedule (and with the faults) in `options`."""
+    loop = asyncio.get_running_loop()
+    interval = 1.0 / options.tokens_per_second if options.tokens_per_second > 0 else 0.0
+    first_due = loop.time() + options.first_token_delay_ms / 1000
+    stops = [n for n in (options.fail_after, options.disconnect_after) if n is not None]
+    if stops:
+        tokens = islice(tokens, min(stops))
+    sent = 0
+    while batch := list(islice(tokens, options.coalesce)):
+        # Frames are due when their last token would be, measured from the first token, so
+        # pacing does not drift with serialization or send time.
+        delay = first_due + (sent + len(batch) - 1) * interval - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        yield token_frame("".join(batch), sent)
+        sent += len(batch)
+    if sent == options.fail_after:
+        yield sse_event(json.dumps({"detail": "Injected mock failure."}), event="error")
+        return
+    if sent == options.disconnect_after:
+        return
+    yield final_frame(sent)
 
 
 @router.get("/models", response_model=list[ModelCard], summary="List mock models")
-def list_models() -> list[ModelCard]:
-    """Return registered mock models."""
-    raw_models = _read_fixture("models.json")
-    return [ModelCard(**model) for model in raw_models]
+def list_models(request: Request) -> Response:
+    """Return registered mock models (gzip + ETag aware)."""
+    return asset_response(request, _read_fixture("models.json"))
 
 
 @router.post(
@@ -38,15 +117,29 @@ def list_models() -> list[ModelCard]:
     response_model=ChatResponse,
     summary="Return a mock chat stream",
 )
-def create_mock_chat(request: ChatRequest) -> ChatResponse:
+def create_mock_chat(request: ChatRequest) -> Response:
     """Replay a canned stream so the frontend can build against SSE/parsing logic."""
-    stream_fixture = _read_fixture("chat_stream.json")
-    stream = [ChatChunk(**chunk) for chunk in stream_fixture]
-    model_ids = {model.id for model in list_models()}
-    if request.model_id not in model_ids:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Unknown model_id '{request.model_id}'.",
-        )
+    stream = _read_fixture("chat_stream.json")
+    _require_model(request.model_id)
+
+    # The stream is pre-serialized; only the echoed model id is encoded per request.
+    body = b'{"model_id":%s,"stream":%s}' % (json.dumps(request.model_id).encode(), stream.body)
+    return Response(content=body, media_type="application/json")
+
 
-    return ChatResponse(model_id=request.model_id, stream=stream)
+@router.post(
+    "/chat/stream",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"text/event-stream": {}}}},
+    summary="Stream a mock chat reply as server-sent events",
+)
+def stream_mock_chat(request: MockChatStreamRequest) -> StreamingResponse:
+    """Stream the fixture (or `synthetic_tokens` filler) in the same frames as `/chat/stream`."""
+    _require_model(request.model_id)
+    options = request.stream
+    if options.synthetic_tokens is not None:
+        tokens = map(synthetic_token, range(options.synthetic_tokens))
+    else:
+        chunks: list[ChatChunk] = _read_fixture("chat_stream.json").value
+        tokens = (chunk.token for chunk in chunks)
+    return StreamingResponse(_paced_frames(tokens, options), media_type="text/event-stream")
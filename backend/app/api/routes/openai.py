@@ -0,0 +1,220 @@
+"""OpenAI-compatible `/v1` completion endpoints over the loaded runtime."""
+
+from __future__ import annotations
+
+import json
+import logging
+import time
+import uuid
+from collections.abc import Callable, Iterator
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
+from sqlmodel import Session, select
+
+from backend.app.api.routes.chat import (
+    require_loaded_model,
+    require_valid_constraint,
+    resolve_adapter,
+)
+from backend.app.db.models import InstalledModel, LoraAdapter
+from backend.app.db.session import get_read_session, get_session
+from backend.app.runtime import get_runtime_manager
+from backend.app.runtime.manager import AdapterSpec, LlamaRuntime, RuntimeNotAvailableError
+from backend.app.runtime.snapshot import RuntimeStateHub, get_runtime_hub
+from backend.app.schemas.openai import (
+    ChatCompletion,
+    ChatCompletionChoice,
+    ChatCompletionMessage,
+    ChatCompletionRequest,
+    Completion,
+    CompletionChoice,
+    CompletionRequest,
+    ModelList,
+    ModelObject,
+    Usage,
+)
+from backend.app.utils.http import sse_event
+from backend.app.utils.tokens import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/v1", tags=["openai"])
+
+_STREAM_RESPONSES = {200: {"content": {"text/event-stream": {}}}}
+
+
+def _resolve_model(
+    session: Session, runtime: LlamaRuntime, hub: RuntimeStateHub, name: str
+) -> AdapterSpec | None:
+    """Check `name` is servable: the loaded model, or a LoRA adapter over it."""
+    adapter = session.exec(select(LoraAdapter).where(LoraAdapter.slug == name)).first()
+    if adapter is None:
+        require_loaded_model(session, runtime, hub, name)
+        return None
+    base = session.get(InstalledModel, adapter.base_model_id)
+    state = require_loaded_model(session, runtime, hub, base.slug if base else name)
+    return resolve_adapter(session, name, state)
+
+
+def _choices(
+    runtime: LlamaRuntime,
+    payload: ChatCompletionRequest | CompletionRequest,
+    adapter: AdapterSpec | None,
+    messages: list[dict[str, str]] | None = None,
+    prompt: str | None = None,
+) -> Iterator[tuple[int, str, str | None]]:
+    return runtime.generate_choices(
+        payload.chat_config(),
+        messages=messages,
+        prompt=prompt,
+        n=payload.n,
+        stop=payload.stop_sequences(),
+        seed=payload.seed,
+        adapter=adapter,
+    )
+
+
+def _collect(
+    stream: Iterator[tuple[int, str, str | None]], n: int
+) -> tuple[list[str], list[str | None], int]:
+    """Drain a choice stream into per-choice texts, finish reasons and a token count."""
+    parts: list[list[str]] = [[] for _ in range(n)]
+    reasons: list[str | None] = [None] * n
+    completion_tokens = 0
+    try:
+        for choice, delta, finish_reason in stream:
+            if delta:
+                parts[choice].append(delta)
+                completion_tokens += 1
+            if finish_reason:
+                reasons[choice] = finish_reason
+    except RuntimeNotAvailableError as exc:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(exc)) from exc
+    return ["".join(chunks) for chunks in parts], reasons, completion_tokens
+
+
+def _usage(prompt_tokens: int, completion_tokens: int) -> Usage:
+    return Usage(
+        prompt_tokens=prompt_tokens,
+        completion_tokens=completion_tokens,
+        total_tokens=prompt_tokens + completion_tokens,
+    )
+
+
+def _sse_chunks(
+    stream: Iterator[tuple[int, str, str | None]],
+    envelope: dict[str, object],
+    choice_body: Callable[[str], dict[str, object]],
+) -> Iterator[str]:
+    """Frame each `(choice, delta, finish_reason)` as an OpenAI chunk, ending with `[DONE]`."""
+    try:
+        for choice, delta, finish_reason in stream:
+            body = {"index": choice, **choice_body(delta), "finish_reason": finish_reason}
+            yield sse_event(json.dumps({**envelope, "choices": [body]}, ensure_ascii=False))
+    except Exception as exc:
+        logger.exception("OpenAI-compatible generation failed.")
+        yield sse_event(json.dumps({"error": {"message": str(exc), "type": "server_error"}}))
+    yield sse_event("[DONE]")
+
+
+@router.get("/models", response_model=ModelList)
+def list_models(session: Session = Depends(get_read_session)) -> ModelList:
+    """Installed models and their LoRA adapters, addressed by slug."""
+    models = session.exec(select(InstalledModel).order_by(InstalledModel.created_at.desc())).all()
+    adapters = session.exec(select(LoraAdapter).order_by(LoraAdapter.created_at.desc())).all()
+    return ModelList(
+        data=[
+            ModelObject(id=item.slug, created=int(item.created_at.timestamp()))
+            for item in (*models, *adapters)
+        ]
+    )
+
+
+@router.post(
+    "/chat/completions",
+    response_model=ChatCompletion,
+    responses=_STREAM_RESPONSES,
+    summary="OpenAI-compatible chat completion",
+)
+def chat_completions(
+    payload: ChatCompletionRequest,
+    session: Session = Depends(get_session),
+    runtime: LlamaRuntime = Depends(get_runtime_manager),
+    hub: RuntimeStateHub = Depends(get_runtime_hub),
+) -> ChatCompletion | StreamingResponse:
+    """Sample `n` replies to `messages`; all choices share one prompt prefill."""
+    adapter = _resolve_model(session, runtime, hub, payload.model)
+    require_valid_constraint(runtime, payload.chat_config())
+    messages = [message.model_dump() for message in payload.messages]
+    stream = _choices(runtime, payload, adapter, messages=messages)
+    completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+    created = int(time.time())
+    if payload.stream:
+        envelope = {
+            "id": completion_id,
+            "object": "chat.completion.chunk",
+            "created": created,
+            "model": payload.model,
+        }
+        return StreamingResponse(
+            _sse_chunks(stream, envelope, lambda delta: {"delta": {"content": delta}}),
+            media_type="text/event-stream",
+        )
+    texts, reasons, completion_tokens = _collect(stream, payload.n)
+    return ChatCompletion(
+        id=completion_id,
+        created=created,
+        model=payload.model,
+        choices=[
+            ChatCompletionChoice(
+                index=index,
+                message=ChatCompletionMessage(role="assistant", content=text),
+                finish_reason=reasons[index],
+            )
+            for index, text in enumerate(texts)
+        ],
+        usage=_usage(sum(estimate_tokens(m["content"]) for m in messages), completion_tokens),
+    )
+
+
+@router.post(
+    "/completions",
+    response_model=Completion,
+    responses=_STREAM_RESPONSES,
+    summary="OpenAI-compatible text completion",
+)
+def completions(
+    payload: CompletionRequest,
+    session: Session = Depends(get_session),
+    runtime: LlamaRuntime = Depends(get_runtime_manager),
+    hub: RuntimeStateHub = Depends(get_runtime_hub),
+) -> Completion | StreamingResponse:
+    """Continue a raw `prompt` `n` times; all choices share one prompt prefill."""
+    adapter = _resolve_model(session, runtime, hub, payload.model)
+    require_valid_constraint(runtime, payload.chat_config())
+    stream = _choices(runtime, payload, adapter, prompt=payload.prompt)
+    completion_id = f"cmpl-{uuid.uuid4().hex}"
+    created = int(time.time())
+    if payload.stream:
+        envelope = {
+            "id": completion_id,
+            "object": "text_completion",
+            "created": created,
+            "model": payload.model,
+        }
+        return StreamingResponse(
+            _sse_chunks(stream, envelope, lambda delta: {"text": delta, "logprobs": None}),
+            media_type="text/event-stream",
+        )
+    texts, reasons, completion_tokens = _collect(stream, payload.n)
+    return Completion(
+        id=completion_id,
+        created=created,
+        model=payload.model,
+        choices=[
+            CompletionChoice(index=index, text=text, finish_reason=reasons[index])
+            for index, text in enumerate(texts)
+        ],
+        usage=_usage(estimate_tokens(payload.prompt), completion_tokens),
+    )
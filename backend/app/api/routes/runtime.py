@@ -2,18 +2,42 @@
 
 from __future__ import annotations
 
+import asyncio
+from collections.abc import AsyncIterator
 from pathlib import Path
 
-from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile, status
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    Form,
+    HTTPException,
+    Request,
+    Response,
+    UploadFile,
+    status,
+)
+from fastapi.responses import StreamingResponse
 from sqlmodel import Session, select
 
 from backend.app.config import settings
-from backend.app.db.models import InstalledModel, RuntimeConfig
-from backend.app.db.session import get_session
-from backend.app.runtime import get_runtime_manager
+from backend.app.db.models import InstalledModel, LoraAdapter, RuntimeConfig
+from backend.app.db.session import get_read_session, get_session
+from backend.app.runtime import get_auto_tuner, get_runtime_manager
 from backend.app.runtime.manager import LlamaRuntime, RuntimeNotAvailableError
+from backend.app.runtime.pagecache import page_cache_residency
+from backend.app.runtime.snapshot import (
+    RuntimeStateHub,
+    build_runtime_state,
+    describe_instances,
+    get_runtime_hub,
+)
+from backend.app.runtime.tuning import AutoTuner, get_tuned_config, resolve_load_config
 from backend.app.schemas.runtime import (
     InstalledModelRead,
+    LoraAdapterListResponse,
+    LoraAdapterRead,
+    LoraAdapterUploadResponse,
     MemoryStats,
     ModelListResponse,
     ModelSelectionRequest,
@@ -22,7 +46,11 @@ from backend.app.schemas.runtime import (
     RuntimeConfigSchema,
     RuntimeLoadRequest,
     RuntimeState,
+    TunedConfigRead,
+    TuningJobRead,
+    TuningRequest,
 )
+from backend.app.telemetry.tracing import tracer
 from backend.app.utils.clock import utcnow
 from backend.app.utils.file_ops import (
     infer_quantization_from_filename,
@@ -30,14 +58,26 @@ from backend.app.utils.file_ops import (
     sha256_file,
     slugify,
 )
+from backend.app.utils.http import cached_response
 
 router = APIRouter(prefix="/runtime", tags=["runtime"])
 
+_EVENT_KEEPALIVE_SECONDS = 15.0
+
 
 def _serialize_model(model: InstalledModel) -> InstalledModelRead:
     return InstalledModelRead.model_validate(model)
 
 
+def _with_residency(model: InstalledModel) -> InstalledModelRead:
+    item = _serialize_model(model)
+    residency = page_cache_residency(Path(model.file_path))
+    if residency is not None:
+        item.page_cache_resident_bytes = residency.resident_bytes
+        item.page_cache_fraction = round(residency.fraction, 4)
+    return item
+
+
 def _ensure_default_config(session: Session) -> RuntimeConfig:
     config = session.get(RuntimeConfig, 1)
     if not config:
@@ -53,10 +93,12 @@ def _config_to_schema(config: RuntimeConfig) -> RuntimeConfigSchema:
         context_length=config.context_length,
         gpu_layers=config.gpu_layers,
         cpu_threads=config.cpu_threads,
+        prefill_threads=config.prefill_threads,
         eval_batch_size=config.eval_batch_size,
         kv_cache_placement=config.kv_cache_placement,  # type: ignore[arg-type]
         use_mmap=config.use_mmap,
         keep_in_memory=config.keep_in_memory,
+        instances=config.instances,  # type: ignore[arg-type]
     )
 
 
@@ -68,7 +110,8 @@ def _apply_schema_to_config(config: RuntimeConfig, schema: RuntimeConfigSchema)
 
 
 def _get_model(session: Session, model_id: int) -> InstalledModel:
-    model = session.get(InstalledModel, model_id)
+    with tracer.span("db.get_model", model_id=model_id):
+        model = session.get(InstalledModel, model_id)
     if not model:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Model not found.")
     return model
@@ -77,7 +120,10 @@ def _get_model(session: Session, model_id: int) -> InstalledModel:
 def _dedupe_slug(session: Session, base_slug: str) -> str:
     slug = base_slug
     counter = 2
-    while session.exec(select(InstalledModel).where(InstalledModel.slug == slug)).first():
+    # Models and adapters share one namespace so either can be addressed by slug alone.
+    while session.exec(select(InstalledModel).where(InstalledModel.slug == slug)).first() or (
+        session.exec(select(LoraAdapter).where(LoraAdapter.slug == slug)).first()
+    ):
         slug = f"{base_slug}-{counter}"
         counter += 1
     return slug
@@ -91,10 +137,10 @@ def _deactivate_all(session: Session) -> None:
 
 
 @router.get("/models", response_model=ModelListResponse)
-def list_models(session: Session = Depends(get_session)) -> ModelListResponse:
-    """Return installed GGUF artifacts."""
+def list_models(session: Session = Depends(get_read_session)) -> ModelListResponse:
+    """Return installed GGUF artifacts with their page-cache residency."""
     models = session.exec(select(InstalledModel).order_by(InstalledModel.created_at.desc())).all()
-    return ModelListResponse(models=[_serialize_model(model) for model in models])
+    return ModelListResponse(models=[_with_residency(model) for model in models])
 
 
 @router.post(
@@ -139,6 +185,8 @@ async def upload_model(
 def select_model(
     payload: ModelSelectionRequest,
     session: Session = Depends(get_session),
+    runtime: LlamaRuntime = Depends(get_runtime_manager),
+    hub: RuntimeStateHub = Depends(get_runtime_hub),
 ) -> ModelUploadResponse:
     """Mark a model as active (does not load it into memory)."""
     model = _get_model(session, payload.model_id)
@@ -148,9 +196,130 @@ def select_model(
     session.add(model)
     session.commit()
     session.refresh(model)
+    hub.publish_state(build_runtime_state(session, runtime))
     return ModelUploadResponse(model=_serialize_model(model))
 
 
+@router.post(
+    "/models/{model_id}/tune",
+    response_model=TuningJobRead,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Benchmark config candidates and store the fastest for this model",
+)
+def tune_model(
+    model_id: int,
+    payload: TuningRequest | None = None,
+    session: Session = Depends(get_session),
+    runtime: LlamaRuntime = Depends(get_runtime_manager),
+    tuner: AutoTuner = Depends(get_auto_tuner),
+    hub: RuntimeStateHub = Depends(get_runtime_hub),
+) -> TuningJobRead:
+    """Queue a tuning sweep; the runtime is busy until the job finishes."""
+    model = _get_model(session, model_id)
+    job = tuner.submit(
+        runtime,
+        model_id=model.id,  # type: ignore[arg-type]
+        base=_config_to_schema(_ensure_default_config(session)),
+        request=payload or TuningRequest(),
+        hub=hub,
+    )
+    return job.to_read()
+
+
+@router.get("/tuning/{job_id}", response_model=TuningJobRead)
+def get_tuning_job(job_id: str, tuner: AutoTuner = Depends(get_auto_tuner)) -> TuningJobRead:
+    job = tuner.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Tuning job not found.")
+    return job.to_read()
+
+
+@router.get("/models/{model_id}/tuned-config", response_model=TunedConfigRead)
+def get_model_tuned_config(
+    model_id: int, session: Session = Depends(get_read_session)
+) -> TunedConfigRead:
+    tuned = get_tuned_config(session, model_id)
+    if tuned is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Model is not tuned.")
+    return TunedConfigRead.model_validate(tuned)
+
+
+@router.delete("/models/{model_id}/tuned-config", status_code=status.HTTP_204_NO_CONTENT)
+def delete_model_tuned_config(model_id: int, session: Session = Depends(get_session)) -> Response:
+    """Forget a tuning result so loads fall back to the global defaults."""
+    tuned = get_tuned_config(session, model_id)
+    if tuned is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Model is not tuned.")
+    session.delete(tuned)
+    session.commit()
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+@router.post(
+    "/models/{model_id}/adapters/upload",
+    response_model=LoraAdapterUploadResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+async def upload_adapter(
+    model_id: int,
+    file: UploadFile = File(...),
+    display_name: str | None = Form(None),
+    scale: float = Form(1.0, ge=0.0, le=4.0),
+    session: Session = Depends(get_session),
+) -> LoraAdapterUploadResponse:
+    """Register a LoRA adapter GGUF that applies on top of base model `model_id`."""
+    base = _get_model(session, model_id)
+    if not file.filename:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Filename is required.")
+    filename = Path(file.filename).name
+    slug = _dedupe_slug(session, slugify(Path(filename).stem))
+    destination = settings.models_dir / "adapters" / f"{slug}{Path(filename).suffix}"
+    bytes_written = await save_upload(file, destination)
+    adapter = LoraAdapter(
+        slug=slug,
+        display_name=display_name or Path(filename).stem,
+        base_model_id=base.id,  # type: ignore[arg-type]
+        file_path=str(destination),
+        scale=scale,
+        size_bytes=bytes_written,
+        checksum_sha256=sha256_file(destination),
+    )
+    session.add(adapter)
+    session.commit()
+    session.refresh(adapter)
+    return LoraAdapterUploadResponse(adapter=LoraAdapterRead.model_validate(adapter))
+
+
+@router.get("/adapters", response_model=LoraAdapterListResponse)
+def list_adapters(
+    base_model_id: int | None = None, session: Session = Depends(get_read_session)
+) -> LoraAdapterListResponse:
+    query = select(LoraAdapter).order_by(LoraAdapter.created_at.desc())
+    if base_model_id is not None:
+        query = query.where(LoraAdapter.base_model_id == base_model_id)
+    adapters = session.exec(query).all()
+    return LoraAdapterListResponse(
+        adapters=[LoraAdapterRead.model_validate(adapter) for adapter in adapters]
+    )
+
+
+@router.delete("/adapters/{adapter_id}", status_code=status.HTTP_204_NO_CONTENT)
+def delete_adapter(
+    adapter_id: int,
+    session: Session = Depends(get_session),
+    runtime: LlamaRuntime = Depends(get_runtime_manager),
+) -> Response:
+    """Unregister an adapter, detaching it from the runtime first if it is loaded."""
+    adapter = session.get(LoraAdapter, adapter_id)
+    if adapter is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Adapter not found.")
+    runtime.forget_adapter(adapter_id)
+    session.delete(adapter)
+    session.commit()
+    Path(adapter.file_path).unlink(missing_ok=True)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
 @router.get("/config", response_model=RuntimeConfigResponse)
 def get_runtime_config(session: Session = Depends(get_session)) -> RuntimeConfigResponse:
     config = _ensure_default_config(session)
@@ -161,30 +330,55 @@ def get_runtime_config(session: Session = Depends(get_session)) -> RuntimeConfig
 def update_runtime_config(
     payload: RuntimeConfigSchema,
     session: Session = Depends(get_session),
+    runtime: LlamaRuntime = Depends(get_runtime_manager),
+    hub: RuntimeStateHub = Depends(get_runtime_hub),
 ) -> RuntimeConfigResponse:
     config = _ensure_default_config(session)
     config = _apply_schema_to_config(config, payload)
     session.add(config)
     session.commit()
     session.refresh(config)
+    hub.publish_state(build_runtime_state(session, runtime))
     return RuntimeConfigResponse(config=_config_to_schema(config))
 
 
 @router.get("/state", response_model=RuntimeState)
-def runtime_state(
-    session: Session = Depends(get_session),
+async def runtime_state(
+    request: Request,
+    hub: RuntimeStateHub = Depends(get_runtime_hub),
+) -> Response:
+    """Serve the cached snapshot; honours If-None-Match so unchanged polls get a 304."""
+    snapshot = hub.state()
+    return cached_response(request, snapshot.body, snapshot.etag)
+
+
+@router.get(
+    "/events",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"text/event-stream": {}}}},
+    summary="Stream runtime state + memory changes",
+)
+async def runtime_events(
+    request: Request,
     runtime: LlamaRuntime = Depends(get_runtime_manager),
-) -> RuntimeState:
-    state = runtime.get_state()
-    if not state:
-        return RuntimeState(loaded=False)
-    model = _get_model(session, state.model_id)
-    return RuntimeState(
-        loaded=True,
-        model=_serialize_model(model),
-        config=state.config,
-        runtime_path=str(Path(model.file_path).parent),
-        loaded_at=state.loaded_at,
+    hub: RuntimeStateHub = Depends(get_runtime_hub),
+) -> StreamingResponse:
+    """Push `state` and `memory` events as they change, starting with the current snapshot."""
+
+    async def stream() -> AsyncIterator[str]:
+        async with hub.subscribe(runtime) as queue:
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(queue.get(), _EVENT_KEEPALIVE_SECONDS)
+                except TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield event.encode()
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"},
     )
 
 
@@ -193,10 +387,12 @@ def load_model(
     payload: RuntimeLoadRequest,
     session: Session = Depends(get_session),
     runtime: LlamaRuntime = Depends(get_runtime_manager),
+    hub: RuntimeStateHub = Depends(get_runtime_hub),
 ) -> RuntimeState:
     model = _get_model(session, payload.model_id)
-    config_model = _ensure_default_config(session)
-    config_schema = payload.config_override or _config_to_schema(config_model)
+    config_schema = payload.config_override or resolve_load_config(
+        session, model.id  # type: ignore[arg-type]
+    )
 
     try:
         state = runtime.load_model(
@@ -209,6 +405,11 @@ def load_model(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(exc),
         ) from exc
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=str(exc),
+        ) from exc
 
     _deactivate_all(session)
     model.is_active = True
@@ -218,31 +419,37 @@ def load_model(
     session.commit()
     session.refresh(model)
 
-    return RuntimeState(
+    runtime_state = RuntimeState(
         loaded=True,
         model=_serialize_model(model),
         config=config_schema,
         runtime_path=str(Path(model.file_path).parent),
         loaded_at=state.loaded_at,
+        instances=describe_instances(state),
     )
+    hub.publish_state(runtime_state)
+    return runtime_state
 
 
 @router.post("/unload", response_model=RuntimeState)
 def unload_model(
     session: Session = Depends(get_session),
     runtime: LlamaRuntime = Depends(get_runtime_manager),
+    hub: RuntimeStateHub = Depends(get_runtime_hub),
 ) -> RuntimeState:
     runtime.unload_model()
     _deactivate_all(session)
     session.commit()
-    return RuntimeState(loaded=False)
+    runtime_state = RuntimeState(loaded=False)
+    hub.publish_state(runtime_state)
+    return runtime_state
 
 
 @router.get("/memory", response_model=MemoryStats)
-def runtime_memory(runtime: LlamaRuntime = Depends(get_runtime_manager)) -> MemoryStats:
-    snapshot = runtime.memory_snapshot()
-    return MemoryStats(
-        resident_bytes=snapshot.resident_bytes,
-        vram_bytes=snapshot.vram_bytes,
-        source=snapshot.source,
-    )
+def runtime_memory(
+    request: Request,
+    runtime: LlamaRuntime = Depends(get_runtime_manager),
+    hub: RuntimeStateHub = Depends(get_runtime_hub),
+) -> Response:
+    snapshot = hub.memory(runtime)
+    return cached_response(request, snapshot.body, snapshot.etag)
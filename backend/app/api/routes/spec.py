@@ -1,29 +1,39 @@
 """Serve the hand-authored OpenAPI schema used by the frontend mock client."""
 
-from fastapi import APIRouter, HTTPException, Response, status
+from fastapi import APIRouter, HTTPException, Request, Response, status
 
 from backend.app.config import settings
+from backend.app.utils.http import asset_response
+from backend.app.utils.static_assets import static_assets
 
 router = APIRouter(tags=["spec"])
 
 
+def prime_schema() -> bool:
+    """Load the schema into the static-asset cache; False when it is missing."""
+    try:
+        static_assets.get(settings.openapi_schema_path, media_type="application/yaml")
+    except OSError:
+        return False
+    return True
+
+
 @router.get(
     "/spec",
     response_class=Response,
     responses={200: {"content": {"application/yaml": {}}}},
     summary="Return mock OpenAPI schema",
 )
-def get_openapi_spec() -> Response:
+def get_openapi_spec(request: Request) -> Response:
     """Serve the YAML file that defines chat + model management endpoints."""
-    schema_path = settings.openapi_schema_path
-    if not schema_path.exists():
+    try:
+        asset = static_assets.get(settings.openapi_schema_path, media_type="application/yaml")
+    except FileNotFoundError as exc:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=(
                 "OpenAPI schema missing. "
                 "Regenerate via `uv run python backend/app/main.py --generate-schema`."
             ),
-        )
-
-    payload = schema_path.read_text(encoding="utf-8")
-    return Response(content=payload, media_type="application/yaml")
+        ) from exc
+    return asset_response(request, asset)
@@ -0,0 +1,43 @@
+"""Batch token counting against a model's vocabulary."""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlmodel import Session, select
+
+from backend.app.db.models import InstalledModel
+from backend.app.db.session import get_read_session
+from backend.app.runtime import get_runtime_manager, get_token_counter
+from backend.app.runtime.manager import LlamaRuntime
+from backend.app.runtime.tokenizer import TokenCounter
+from backend.app.schemas.chat import TokenizeRequest, TokenizeResponse
+
+router = APIRouter(prefix="/tokenize", tags=["tokenize"])
+
+
+@router.post("", response_model=TokenizeResponse)
+async def tokenize(
+    payload: TokenizeRequest,
+    session: Session = Depends(get_read_session),
+    runtime: LlamaRuntime = Depends(get_runtime_manager),
+    counter: TokenCounter = Depends(get_token_counter),
+) -> TokenizeResponse:
+    """Count tokens per text on the tokenizer pool; unchanged texts come from the cache."""
+    model = session.exec(
+        select(InstalledModel).where(InstalledModel.slug == payload.model_id)
+    ).first()
+    if model is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Model not found.")
+    result = await asyncio.wrap_future(
+        counter.submit(runtime, model.id, Path(model.file_path), payload.texts)  # type: ignore[arg-type]
+    )
+    return TokenizeResponse(
+        model_id=payload.model_id,
+        counts=result.counts,
+        total=sum(result.counts),
+        cached=result.cached,
+        source=result.source,  # type: ignore[arg-type]
+    )
@@ -17,11 +17,67 @@ class Settings(BaseSettings):
 
     data_dir: Path = BASE_DIR / ".state"
     models_dir: Path = data_dir / "models"
+    documents_dir: Path = data_dir / "documents"
     runtime_root: Path = BASE_DIR / "runtime"
     preferred_runtime_path: Path = runtime_root / "lmstudio-rocm-1.55.0"
 
     database_path: Path = data_dir / "chatbot.db"
     database_url: str = f"sqlite:///{(BASE_DIR / '.state' / 'chatbot.db').as_posix()}"
+    database_busy_timeout_ms: int = 5000
+    database_mmap_size: int = 256 * 1024 * 1024
+    database_cache_size_kib: int = 64 * 1024
+    database_max_overflow: int = 8
+    database_read_only_pool: bool = False
+    threadpool_size: int = 40
+
+    document_chunk_tokens: int = 256
+    document_chunk_overlap_tokens: int = 32
+    document_embed_batch_size: int = 32
+    document_ingest_workers: int = 2
+    document_embedder: str = "hashing"
+    document_embedding_dimensions: int = 384
+
+    runtime_memory_poll_interval: float = 2.0
+    runtime_backend: str = "llama"
+    runtime_prewarm: bool = True
+    runtime_autoload_active: bool = True
+    runtime_watchdog_interval: float = 15.0
+    runtime_idle_unload_seconds: float = 30 * 60
+    runtime_min_available_bytes: int = 2 * 1024**3
+    runtime_max_swap_bytes_per_second: float = 16 * 1024**2
+    runtime_affinity_entries: int = 1024
+    runtime_affinity_slack: int = 0
+    runtime_pin_threads: bool = False
+    synthetic_prefill_delay: float = 0.2
+    synthetic_tokens_per_second: float = 40.0
+    synthetic_jitter: float = 0.2
+    benchmark_regression_threshold_pct: float = 5.0
+
+    tokenizer_workers: int = 2
+    tokenizer_cache_entries: int = 8192
+    tokenizer_max_vocabs: int = 2
+    chat_template_cache_entries: int = 256
+    grammar_cache_entries: int = 64
+    lora_max_loaded: int = 4
+
+    summary_enabled: bool = True
+    summary_trigger_ratio: float = 0.75
+    summary_keep_recent_messages: int = 6
+    summary_max_tokens: int = 256
+    summary_max_input_tokens: int = 1024
+    summary_retry_interval: float = 2.0
+
+    chat_ws_max_streams: int = 8
+    chat_ws_send_buffer: int = 64
+
+    write_behind_flush_interval: float = 0.25
+    write_behind_max_buffered_chars: int = 2048
+
+    trace_enabled: bool = True
+    trace_slow_threshold_ms: float = 500.0
+    trace_buffer_size: int = 50
+    trace_export_path: Path | None = data_dir / "traces.jsonl"
+    trace_otlp_endpoint: str | None = None
 
     model_config = {
         "env_prefix": "CHATBOT_",
@@ -30,9 +86,8 @@ class Settings(BaseSettings):
 
     def ensure_directories(self) -> None:
         """Create directories that must exist before the app starts."""
-        for path in (self.data_dir, self.models_dir, self.runtime_root):
+        for path in (self.data_dir, self.models_dir, self.documents_dir, self.runtime_root):
             path.mkdir(parents=True, exist_ok=True)
 
 
 settings = Settings()
-settings.ensure_directories()
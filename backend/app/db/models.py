@@ -3,9 +3,12 @@
 from __future__ import annotations
 
 from datetime import datetime
+from typing import Any
 
+from sqlalchemy import JSON, Index
 from sqlmodel import Field, SQLModel
 
+from backend.app.db.search import register_message_fts
 from backend.app.utils.clock import utcnow
 
 
@@ -33,6 +36,23 @@ class InstalledModel(SQLModel, table=True):
     last_loaded_at: datetime | None = None
 
 
+class LoraAdapter(SQLModel, table=True):
+    """LoRA adapter GGUF applied on top of a resident base model."""
+
+    __tablename__ = "lora_adapters"
+
+    id: int | None = Field(default=None, primary_key=True)
+    slug: str = Field(index=True, unique=True)
+    display_name: str
+    base_model_id: int = Field(foreign_key="installed_models.id", index=True)
+    file_path: str = Field(description="Absolute path to the adapter GGUF.")
+    scale: float = Field(default=1.0, description="Strength the adapter is applied with.")
+    size_bytes: int | None = None
+    checksum_sha256: str | None = Field(default=None, index=True)
+    created_at: datetime = Field(default_factory=utcnow, nullable=False)
+    updated_at: datetime = Field(default_factory=utcnow, nullable=False)
+
+
 class RuntimeConfig(SQLModel, table=True):
     """Default inference configuration applied when loading a model."""
 
@@ -45,9 +65,144 @@ class RuntimeConfig(SQLModel, table=True):
         ge=0,
         description="Number of layers offloaded to GPU.",
     )
-    cpu_threads: int = Field(default=8, ge=1)
+    cpu_threads: int | None = Field(default=None, ge=1, description="None: from topology.")
+    prefill_threads: int | None = Field(default=None, ge=1, description="None: from topology.")
     eval_batch_size: int = Field(default=128, ge=1)
     kv_cache_placement: str = Field(default="auto", description="KV cache placement hint.")
     use_mmap: bool = Field(default=True, description="Pass --mmap flag.")
     keep_in_memory: bool = Field(default=True, description="Keep tensors resident between prompts.")
+    instances: list[dict[str, Any]] = Field(
+        default_factory=list, sa_type=JSON, description="Per-instance CPU placement."
+    )
+    updated_at: datetime = Field(default_factory=utcnow, nullable=False)
+
+
+class TunedRuntimeConfig(SQLModel, table=True):
+    """Best measured runtime settings for one model, overlaid on `RuntimeConfig` at load."""
+
+    __tablename__ = "tuned_runtime_configs"
+
+    id: int | None = Field(default=None, primary_key=True)
+    model_id: int = Field(foreign_key="installed_models.id", unique=True, index=True)
+    gpu_layers: int | None = Field(default=None, ge=0)
+    cpu_threads: int = Field(ge=1)
+    eval_batch_size: int = Field(ge=1)
+    kv_cache_placement: str = Field(default="auto")
+    prefill_tokens_per_second: float = 0.0
+    decode_tokens_per_second: float = 0.0
+    trial_count: int = 0
+    created_at: datetime = Field(default_factory=utcnow, nullable=False)
+    updated_at: datetime = Field(default_factory=utcnow, nullable=False)
+
+
+class BenchmarkRun(SQLModel, table=True):
+    """One recorded pass of a benchmark suite against a model + runtime + host."""
+
+    __tablename__ = "benchmark_runs"
+
+    id: int | None = Field(default=None, primary_key=True)
+    suite: str = Field(index=True)
+    model_id: int | None = Field(default=None, foreign_key="installed_models.id")
+    model_checksum: str = Field(index=True)
+    runtime_version: str
+    config: dict[str, Any] = Field(default_factory=dict, sa_type=JSON)
+    hardware_fingerprint: str = Field(index=True)
+    hardware: dict[str, Any] = Field(default_factory=dict, sa_type=JSON)
+    metrics: dict[str, float] = Field(default_factory=dict, sa_type=JSON)
+    is_baseline: bool = Field(default=False, index=True)
+    notes: str | None = None
+    created_at: datetime = Field(default_factory=utcnow, nullable=False)
+
+
+class Document(SQLModel, table=True):
+    """Text or markdown file ingested for retrieval-augmented chat."""
+
+    __tablename__ = "documents"
+
+    id: int | None = Field(default=None, primary_key=True)
+    filename: str
+    content_hash: str = Field(
+        index=True,
+        unique=True,
+        description="SHA-256 of the uploaded bytes; used to deduplicate re-uploads.",
+    )
+    media_type: str
+    file_path: str = Field(description="Absolute path to the stored upload.")
+    size_bytes: int
+    status: str = Field(default="pending", index=True)
+    chunk_count: int = Field(default=0)
+    token_count: int = Field(default=0)
+    error: str | None = None
+    created_at: datetime = Field(default_factory=utcnow, nullable=False)
+    updated_at: datetime = Field(default_factory=utcnow, nullable=False)
+    completed_at: datetime | None = None
+
+
+class DocumentChunk(SQLModel, table=True):
+    """Token-bounded slice of a document plus its embedding vector."""
+
+    __tablename__ = "document_chunks"
+
+    id: int | None = Field(default=None, primary_key=True)
+    document_id: int = Field(foreign_key="documents.id", index=True)
+    ordinal: int
+    text: str
+    token_count: int
+    embedding: bytes = Field(description="Packed float32 vector.")
+
+
+class Conversation(SQLModel, table=True):
+    """Chat thread shown in the sidebar."""
+
+    __tablename__ = "conversations"
+    __table_args__ = (Index("ix_conversations_updated_at_id", "updated_at", "id"),)
+
+    id: int | None = Field(default=None, primary_key=True)
+    title: str = Field(default="New chat")
+    system_prompt: str | None = None
+    message_count: int = Field(default=0)
+    token_count: int = Field(default=0, description="Sum of cached message token counts.")
+    created_at: datetime = Field(default_factory=utcnow, nullable=False)
     updated_at: datetime = Field(default_factory=utcnow, nullable=False)
+
+
+class Message(SQLModel, table=True):
+    """Single turn within a conversation."""
+
+    __tablename__ = "messages"
+    __table_args__ = (Index("ix_messages_conversation_id_id", "conversation_id", "id"),)
+
+    id: int | None = Field(default=None, primary_key=True)
+    conversation_id: int = Field(foreign_key="conversations.id")
+    role: str
+    content: str
+    token_count: int = Field(default=0, description="Cached so history budgeting never re-counts.")
+    status: str = Field(default="complete", description="`streaming` until generation finalizes.")
+    owner: str | None = Field(
+        default=None, description="Process streaming into this row; see `process_owner`."
+    )
+    created_at: datetime = Field(default_factory=utcnow, nullable=False)
+
+
+class ConversationSummary(SQLModel, table=True):
+    """Model-written summary standing in for a conversation's messages up to `last_message_id`."""
+
+    __tablename__ = "conversation_summaries"
+    __table_args__ = (
+        Index(
+            "ix_conversation_summaries_conversation_id_last_message_id",
+            "conversation_id",
+            "last_message_id",
+        ),
+    )
+
+    id: int | None = Field(default=None, primary_key=True)
+    conversation_id: int = Field(foreign_key="conversations.id")
+    first_message_id: int
+    last_message_id: int
+    content: str
+    token_count: int = Field(default=0)
+    created_at: datetime = Field(default_factory=utcnow, nullable=False)
+
+
+register_message_fts(Message.__table__)  # type: ignore[attr-defined]
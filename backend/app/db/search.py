@@ -0,0 +1,81 @@
+"""SQLite FTS5 index over chat messages."""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+
+from sqlalchemy import DDL, Table, event, text
+from sqlmodel import Session
+
+MESSAGE_FTS_DDL: tuple[str, ...] = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5("
+    "content, content='messages', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER IF NOT EXISTS messages_fts_ai AFTER INSERT ON messages BEGIN "
+    "INSERT INTO messages_fts(rowid, content) VALUES (new.id, new.content); END",
+    "CREATE TRIGGER IF NOT EXISTS messages_fts_ad AFTER DELETE ON messages BEGIN "
+    "INSERT INTO messages_fts(messages_fts, rowid, content) "
+    "VALUES ('delete', old.id, old.content); END",
+    "CREATE TRIGGER IF NOT EXISTS messages_fts_au AFTER UPDATE OF content ON messages BEGIN "
+    "INSERT INTO messages_fts(messages_fts, rowid, content) "
+    "VALUES ('delete', old.id, old.content); "
+    "INSERT INTO messages_fts(rowid, content) VALUES (new.id, new.content); END",
+)
+
+MESSAGE_FTS_DROP: tuple[str, ...] = (
+    "DROP TRIGGER IF EXISTS messages_fts_au",
+    "DROP TRIGGER IF EXISTS messages_fts_ad",
+    "DROP TRIGGER IF EXISTS messages_fts_ai",
+    "DROP TABLE IF EXISTS messages_fts",
+)
+
+_SEARCH_SQL = text(
+    """
+    SELECT m.id, m.conversation_id, c.title, m.role,
+           snippet(messages_fts, 0, '[', ']', '...', 12) AS snippet
+    FROM messages_fts
+    JOIN messages AS m ON m.id = messages_fts.rowid
+    JOIN conversations AS c ON c.id = m.conversation_id
+    WHERE messages_fts MATCH :query
+    ORDER BY bm25(messages_fts)
+    LIMIT :limit
+    """
+)
+
+_TERM_PATTERN = re.compile(r"\w+")
+
+
+@dataclass
+class MessageSearchHit:
+    message_id: int
+    conversation_id: int
+    conversation_title: str
+    role: str
+    snippet: str
+
+
+def register_message_fts(table: Table) -> None:
+    """Keep the FTS index alongside `messages` when tables are created via `create_all`."""
+    for statement in MESSAGE_FTS_DDL:
+        event.listen(table, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+    for statement in MESSAGE_FTS_DROP:
+        event.listen(table, "before_drop", DDL(statement).execute_if(dialect="sqlite"))
+
+
+def build_match_expression(query: str) -> str | None:
+    """Quote each term so user input never hits FTS5 syntax; the last term matches as a prefix."""
+    terms = _TERM_PATTERN.findall(query)
+    if not terms:
+        return None
+    quoted = [f'"{term}"' for term in terms]
+    quoted[-1] += "*"
+    return " ".join(quoted)
+
+
+def search_messages(session: Session, query: str, *, limit: int = 20) -> list[MessageSearchHit]:
+    """Return the best-ranked messages matching `query` across all conversations."""
+    expression = build_match_expression(query)
+    if expression is None:
+        return []
+    rows = session.connection().execute(_SEARCH_SQL, {"query": expression, "limit": limit})
+    return [MessageSearchHit(*row) for row in rows]
@@ -3,21 +3,61 @@
 from __future__ import annotations
 
 from collections.abc import Generator
+from typing import Any
 
-from sqlalchemy.engine import Engine
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, make_url
 from sqlmodel import Session, SQLModel, create_engine
 
 from backend.app.config import settings
 
 _engine: Engine | None = None
+_read_engine: Engine | None = None
+
+
+def _sqlite_pragmas(*, read_only: bool) -> list[str]:
+    pragmas = [
+        f"PRAGMA busy_timeout={settings.database_busy_timeout_ms}",
+        f"PRAGMA mmap_size={settings.database_mmap_size}",
+        f"PRAGMA cache_size=-{settings.database_cache_size_kib}",
+    ]
+    if read_only:
+        pragmas.append("PRAGMA query_only=ON")
+    else:
+        pragmas[:0] = ["PRAGMA journal_mode=WAL", "PRAGMA synchronous=NORMAL"]
+    return pragmas
+
+
+def _create_engine(url: str, *, read_only: bool = False) -> Engine:
+    if not url.startswith("sqlite"):
+        return create_engine(url, echo=False)
+
+    kwargs: dict[str, Any] = {"connect_args": {"check_same_thread": False}}
+    if make_url(url).database not in (None, "", ":memory:"):
+        # One connection per threadpool worker, plus headroom for background writers.
+        kwargs["pool_size"] = settings.threadpool_size
+        kwargs["max_overflow"] = settings.database_max_overflow
+    engine = create_engine(url, echo=False, **kwargs)
+    pragmas = _sqlite_pragmas(read_only=read_only)
+
+    @event.listens_for(engine, "connect")
+    def _apply_pragmas(dbapi_connection: Any, _record: Any) -> None:
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+
+    return engine
 
 
 def configure_engine(database_url: str | None = None) -> None:
     """Recreate the SQLAlchemy engine (useful for tests)."""
-    global _engine
-    url = database_url or settings.database_url
-    connect_args = {"check_same_thread": False} if url.startswith("sqlite") else {}
-    _engine = create_engine(url, echo=False, connect_args=connect_args)
+    global _engine, _read_engine
+    for engine in (_engine, _read_engine):
+        if engine is not None:
+            engine.dispose()
+    _engine = _create_engine(database_url or settings.database_url)
+    _read_engine = None
 
 
 def get_engine() -> Engine:
@@ -29,6 +69,17 @@ def get_engine() -> Engine:
     return _engine
 
 
+def get_read_engine() -> Engine:
+    """Return the read-only engine when enabled, otherwise the primary engine."""
+    global _read_engine
+    engine = get_engine()
+    if not settings.database_read_only_pool or engine.dialect.name != "sqlite":
+        return engine
+    if _read_engine is None:
+        _read_engine = _create_engine(engine.url.render_as_string(), read_only=True)
+    return _read_engine
+
+
 def init_db() -> None:
     """Create tables if this is the first run (migrations should handle future changes)."""
     SQLModel.metadata.create_all(get_engine())
@@ -38,3 +89,9 @@ def get_session() -> Generator[Session, None, None]:
     """FastAPI dependency that yields a Session per request."""
     with Session(get_engine()) as session:
         yield session
+
+
+def get_read_session() -> Generator[Session, None, None]:
+    """FastAPI dependency for GET routes; served from the read-only pool when enabled."""
+    with Session(get_read_engine()) as session:
+        yield session
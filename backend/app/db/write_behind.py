@@ -0,0 +1,213 @@
+"""Write-behind persistence for streamed assistant output.
+
+Token producers only append to an in-memory buffer; a background thread folds the buffered
+deltas into the `messages` table in one transaction per flush. Flushes happen every
+`flush_interval` seconds, as soon as a message buffers `max_buffered_chars`, and immediately
+when a stream finishes or is cancelled.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+from dataclasses import dataclass, field
+from functools import cache
+from threading import Event, Lock, Thread
+
+from sqlmodel import Session, select, update
+
+from backend.app.config import settings
+from backend.app.db.models import Conversation, Message
+from backend.app.db.session import get_engine
+from backend.app.schemas.conversations import MessageStatus
+from backend.app.utils.clock import utcnow
+from backend.app.utils.tokens import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _PendingWrite:
+    conversation_id: int
+    chunks: list[str] = field(default_factory=list)
+    chars: int = 0
+    status: MessageStatus | None = None
+    token_count: int = 0
+
+
+class MessageWriteBehind:
+    """Buffers streamed tokens per message and persists them off the token hot path."""
+
+    def __init__(
+        self,
+        *,
+        flush_interval: float | None = None,
+        max_buffered_chars: int | None = None,
+    ) -> None:
+        self._flush_interval = flush_interval or settings.write_behind_flush_interval
+        self._max_buffered_chars = max_buffered_chars or settings.write_behind_max_buffered_chars
+        self._lock = Lock()
+        self._flush_lock = Lock()
+        self._pending: dict[int, _PendingWrite] = {}
+        self._wake = Event()
+        self._closed = Event()
+        self._thread: Thread | None = None
+
+    def append(self, message_id: int, conversation_id: int, text: str) -> None:
+        """Buffer a streamed delta; never touches the database."""
+        with self._lock:
+            pending = self._pending.get(message_id)
+            if pending is None:
+                pending = self._pending[message_id] = _PendingWrite(conversation_id)
+            pending.chunks.append(text)
+            pending.chars += len(text)
+            over_threshold = pending.chars >= self._max_buffered_chars
+        self._ensure_thread()
+        if over_threshold:
+            self._wake.set()
+
+    def finish(
+        self,
+        message_id: int,
+        conversation_id: int,
+        *,
+        status: MessageStatus,
+        token_count: int,
+    ) -> None:
+        """Mark a stream as finalized and trigger an immediate flush."""
+        with self._lock:
+            pending = self._pending.get(message_id)
+            if pending is None:
+                pending = self._pending[message_id] = _PendingWrite(conversation_id)
+            pending.status = status
+            pending.token_count = token_count
+        self._ensure_thread()
+        self._wake.set()
+
+    def flush(self) -> None:
+        """Persist everything buffered so far in a single transaction."""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, {}
+            if not batch:
+                return
+            try:
+                self._write(batch)
+            except Exception:
+                logger.exception("Write-behind flush failed; retrying on the next tick.")
+                self._requeue(batch)
+
+    def close(self) -> None:
+        """Stop the flusher thread after draining the buffer (it restarts on the next append)."""
+        self._closed.set()
+        self._wake.set()
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join()
+        self.flush()
+        self._closed.clear()
+
+    def _ensure_thread(self) -> None:
+        if self._thread is not None or self._closed.is_set():
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = Thread(target=self._run, name="message-write-behind", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while not self._closed.is_set():
+            self._wake.wait(self._flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def _requeue(self, batch: dict[int, _PendingWrite]) -> None:
+        with self._lock:
+            for message_id, failed in batch.items():
+                newer = self._pending.get(message_id)
+                if newer is not None:
+                    failed.chunks.extend(newer.chunks)
+                    failed.chars += newer.chars
+                    failed.status = newer.status or failed.status
+                    failed.token_count = newer.token_count or failed.token_count
+                self._pending[message_id] = failed
+
+    @staticmethod
+    def _write(batch: dict[int, _PendingWrite]) -> None:
+        with Session(get_engine()) as session:
+            for message_id, pending in batch.items():
+                values: dict[str, object] = {}
+                if pending.chunks:
+                    values["content"] = Message.content + "".join(pending.chunks)
+                if pending.status is not None:
+                    values["status"] = pending.status.value
+                    values["token_count"] = pending.token_count
+                if values:
+                    session.exec(update(Message).where(Message.id == message_id).values(**values))
+                if pending.status is not None:
+                    session.exec(
+                        update(Conversation)
+                        .where(Conversation.id == pending.conversation_id)
+                        .values(
+                            token_count=Conversation.token_count + pending.token_count,
+                            updated_at=utcnow(),
+                        )
+                    )
+            session.commit()
+
+
+def process_owner() -> str:
+    """Identity stamped on rows this process streams into: pid plus process start time."""
+    return _process_owner(os.getpid())
+
+
+@cache
+def _process_owner(pid: int) -> str:
+    return _stamp(pid)
+
+
+def _stamp(pid: int) -> str:
+    import psutil
+
+    return f"{pid}:{psutil.Process(pid).create_time():.2f}"
+
+
+def _owner_alive(owner: str) -> bool:
+    """Whether `owner` still runs; the start time rules out a recycled pid."""
+    import psutil
+
+    try:
+        return _stamp(int(owner.partition(":")[0])) == owner
+    except (psutil.Error, ValueError):
+        return False
+
+
+def recover_interrupted_messages() -> int:
+    """Finalize messages a dead process left in `streaming`; returns how many were repaired.
+
+    Rows owned by a live process, such as another worker still streaming, are left alone.
+    """
+    with Session(get_engine()) as session:
+        streaming = session.exec(
+            select(Message).where(Message.status == MessageStatus.STREAMING.value)
+        ).all()
+        alive = {owner: _owner_alive(owner) for owner in {m.owner for m in streaming} if owner}
+        stale = [message for message in streaming if not alive.get(message.owner)]
+        for message in stale:
+            message.status = MessageStatus.INTERRUPTED.value
+            message.token_count = estimate_tokens(message.content)
+            conversation = session.get(Conversation, message.conversation_id)
+            if conversation is not None:
+                conversation.token_count += message.token_count
+                session.add(conversation)
+            session.add(message)
+        session.commit()
+        return len(stale)
+
+
+message_writer = MessageWriteBehind()
+
+
+def get_message_writer() -> MessageWriteBehind:
+    """Return the process-wide write-behind buffer."""
+    return message_writer
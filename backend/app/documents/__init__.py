@@ -0,0 +1,10 @@
+"""Document ingestion container factory."""
+
+from backend.app.documents.ingest import DocumentIngestor
+
+document_ingestor = DocumentIngestor()
+
+
+def get_document_ingestor() -> DocumentIngestor:
+    """Return the singleton ingestion worker pool."""
+    return document_ingestor
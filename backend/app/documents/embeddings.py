@@ -0,0 +1,62 @@
+"""Embedding backends used by the document ingestion pipeline."""
+
+from __future__ import annotations
+
+import math
+import re
+from array import array
+from hashlib import blake2b
+from typing import Protocol
+
+from backend.app.runtime.manager import LlamaRuntime
+
+_WORD_PATTERN = re.compile(r"\w+")
+
+
+class Embedder(Protocol):
+    """Turns a batch of texts into fixed-size vectors."""
+
+    def embed(self, texts: list[str]) -> list[list[float]]: ...
+
+
+class HashingEmbedder:
+    """Feature-hashed bag of words; needs no model, so ingest works before one is loaded."""
+
+    def __init__(self, dimensions: int = 384) -> None:
+        self.dimensions = dimensions
+
+    def embed(self, texts: list[str]) -> list[list[float]]:
+        return [self._embed_one(text) for text in texts]
+
+    def _embed_one(self, text: str) -> list[float]:
+        vector = [0.0] * self.dimensions
+        for word in _WORD_PATTERN.findall(text.lower()):
+            digest = int.from_bytes(blake2b(word.encode("utf-8"), digest_size=8).digest(), "big")
+            sign = 1.0 if digest & 1 else -1.0
+            vector[(digest >> 1) % self.dimensions] += sign
+        norm = math.sqrt(sum(value * value for value in vector))
+        if norm:
+            vector = [value / norm for value in vector]
+        return vector
+
+
+class RuntimeEmbedder:
+    """Delegates to the loaded llama.cpp model, one generation slot per batch."""
+
+    def __init__(self, runtime: LlamaRuntime) -> None:
+        self._runtime = runtime
+
+    def embed(self, texts: list[str]) -> list[list[float]]:
+        return self._runtime.embed(texts)
+
+
+def pack_vector(vector: list[float]) -> bytes:
+    """Serialize a vector as packed float32 for storage."""
+    return array("f", vector).tobytes()
+
+
+def unpack_vector(payload: bytes) -> list[float]:
+    """Inverse of `pack_vector`."""
+    values = array("f")
+    values.frombytes(payload)
+    return values.tolist()
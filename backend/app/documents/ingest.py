@@ -0,0 +1,177 @@
+"""Background worker pool that drives documents through the ingestion pipeline."""
+
+from __future__ import annotations
+
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from functools import partial
+from pathlib import Path
+from threading import Event, Lock
+
+from sqlmodel import Session, delete
+
+from backend.app.config import settings
+from backend.app.db.models import Document, DocumentChunk
+from backend.app.db.session import get_engine
+from backend.app.documents.embeddings import (
+    Embedder,
+    HashingEmbedder,
+    RuntimeEmbedder,
+    pack_vector,
+)
+from backend.app.documents.pipeline import (
+    batched,
+    chunk_paragraphs,
+    embed_batches,
+    parse_document,
+)
+from backend.app.schemas.documents import DocumentStatus
+from backend.app.utils.clock import utcnow
+
+logger = logging.getLogger(__name__)
+
+
+class _IngestCancelled(Exception):
+    """Raised between batches once the document's ingest is cancelled."""
+
+
+def build_embedder(name: str) -> Embedder:
+    """Resolve the `document_embedder` setting to an implementation."""
+    if name == "hashing":
+        return HashingEmbedder(settings.document_embedding_dimensions)
+    if name == "runtime":
+        from backend.app.runtime import get_runtime_manager
+
+        return RuntimeEmbedder(get_runtime_manager())
+    raise ValueError(f"Unknown document embedder '{name}'.")
+
+
+class DocumentIngestor:
+    """Runs ingest jobs on a small thread pool, away from request handlers."""
+
+    def __init__(self, *, embedder: Embedder | None = None, max_workers: int | None = None) -> None:
+        self._embedder = embedder
+        self._max_workers = max_workers or settings.document_ingest_workers
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = Lock()
+        self._pending: set[Future[None]] = set()
+        self._jobs: dict[int, tuple[Future[None], Event]] = {}
+
+    @property
+    def embedder(self) -> Embedder:
+        if self._embedder is None:
+            self._embedder = build_embedder(settings.document_embedder)
+        return self._embedder
+
+    def submit(self, document_id: int, source_path: Path) -> Future[None]:
+        """Queue a document for ingestion and return immediately."""
+        cancelled = Event()
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._max_workers,
+                    thread_name_prefix="document-ingest",
+                )
+            future = self._executor.submit(self.ingest, document_id, source_path, cancelled)
+            self._pending.add(future)
+            self._jobs[document_id] = (future, cancelled)
+        future.add_done_callback(partial(self._discard, document_id))
+        return future
+
+    def _discard(self, document_id: int, future: Future[None]) -> None:
+        with self._lock:
+            self._pending.discard(future)
+            if self._jobs.get(document_id, (None,))[0] is future:
+                del self._jobs[document_id]
+        if not future.cancelled() and (exc := future.exception()) is not None:
+            logger.error("Ingesting document %s failed.", document_id, exc_info=exc)
+
+    def cancel(self, document_id: int) -> None:
+        """Stop any queued or running ingest of `document_id` and wait until it lets go.
+
+        A running job stops after its current embed batch and removes the chunks it wrote.
+        """
+        with self._lock:
+            job = self._jobs.get(document_id)
+        if job is None:
+            return
+        future, cancelled = job
+        cancelled.set()
+        if not future.cancel():
+            wait([future])
+
+    def wait(self, timeout: float | None = None) -> None:
+        """Block until every queued job has finished (used by tests and shutdown)."""
+        with self._lock:
+            pending = set(self._pending)
+        wait(pending, timeout=timeout)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def ingest(self, document_id: int, source_path: Path, cancelled: Event | None = None) -> None:
+        """Parse, chunk, embed and persist one document, committing once per embed batch.
+
+        A failed or cancelled job leaves none of its chunks behind; a cancelled one also
+        leaves the document row alone, since its canceller is about to delete it.
+        """
+        cancelled = cancelled or Event()
+        with Session(get_engine()) as session:
+            document = session.get(Document, document_id)
+            if document is None:
+                return
+            document.status = DocumentStatus.PROCESSING.value
+            document.chunk_count = 0
+            document.token_count = 0
+            document.error = None
+            document.updated_at = utcnow()
+            session.exec(delete(DocumentChunk).where(DocumentChunk.document_id == document_id))
+            session.add(document)
+            session.commit()
+
+            try:
+                chunks = chunk_paragraphs(
+                    parse_document(source_path),
+                    max_tokens=settings.document_chunk_tokens,
+                    overlap_tokens=settings.document_chunk_overlap_tokens,
+                )
+                batches = batched(chunks, settings.document_embed_batch_size)
+                for embedded in embed_batches(batches, self.embedder):
+                    if cancelled.is_set():
+                        raise _IngestCancelled
+                    for item in embedded:
+                        session.add(
+                            DocumentChunk(
+                                document_id=document_id,
+                                ordinal=item.chunk.ordinal,
+                                text=item.chunk.text,
+                                token_count=item.chunk.token_count,
+                                embedding=pack_vector(item.vector),
+                            )
+                        )
+                    document.chunk_count += len(embedded)
+                    document.token_count += sum(item.chunk.token_count for item in embedded)
+                    document.updated_at = utcnow()
+                    session.add(document)
+                    session.commit()
+            except _IngestCancelled:
+                session.exec(delete(DocumentChunk).where(DocumentChunk.document_id == document_id))
+                session.commit()
+                return
+            except Exception as exc:  # surfaced through the document status
+                session.rollback()
+                # Earlier batches are already committed; drop them with the failed one.
+                session.exec(delete(DocumentChunk).where(DocumentChunk.document_id == document_id))
+                document.status = DocumentStatus.FAILED.value
+                document.error = str(exc) or exc.__class__.__name__
+                document.chunk_count = 0
+                document.token_count = 0
+            else:
+                document.status = DocumentStatus.READY.value
+                document.completed_at = utcnow()
+            document.updated_at = utcnow()
+            session.add(document)
+            session.commit()
@@ -0,0 +1,145 @@
+"""Generator stages that turn a document on disk into embedded, token-bounded chunks.
+
+Every stage consumes and yields lazily so a corpus is never fully materialized in memory.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from itertools import islice
+from pathlib import Path
+from typing import TypeVar
+
+from backend.app.documents.embeddings import Embedder
+from backend.app.utils.tokens import estimate_tokens
+
+T = TypeVar("T")
+
+_MAX_LINE_CHARS = 64 * 1024
+_MAX_PARAGRAPH_CHARS = 256 * 1024
+
+
+@dataclass
+class TextChunk:
+    ordinal: int
+    text: str
+    token_count: int
+
+
+@dataclass
+class EmbeddedChunk:
+    chunk: TextChunk
+    vector: list[float]
+
+
+def parse_document(path: Path, *, encoding: str = "utf-8") -> Iterator[str]:
+    """Yield paragraphs from a text or markdown file one at a time.
+
+    Lines are read with a size cap so a file without newlines still streams, and markdown
+    headings start a new paragraph.
+    """
+    buffer: list[str] = []
+    buffered_chars = 0
+    with path.open("r", encoding=encoding, errors="replace") as handle:
+        for line in iter(lambda: handle.readline(_MAX_LINE_CHARS), ""):
+            stripped = line.strip()
+            if buffer and (not stripped or stripped.startswith("#")):
+                yield " ".join(buffer)
+                buffer.clear()
+                buffered_chars = 0
+            if not stripped:
+                continue
+            buffer.append(stripped)
+            buffered_chars += len(stripped)
+            if buffered_chars >= _MAX_PARAGRAPH_CHARS:
+                yield " ".join(buffer)
+                buffer.clear()
+                buffered_chars = 0
+    if buffer:
+        yield " ".join(buffer)
+
+
+def chunk_paragraphs(
+    paragraphs: Iterable[str],
+    *,
+    max_tokens: int,
+    overlap_tokens: int = 0,
+    count_tokens: Callable[[str], int] = estimate_tokens,
+) -> Iterator[TextChunk]:
+    """Pack words into chunks of at most `max_tokens`, carrying `overlap_tokens` forward.
+
+    A single word that alone exceeds `max_tokens` is cut into pieces by characters.
+    """
+    if max_tokens < 1:
+        raise ValueError("max_tokens must be positive.")
+    overlap_tokens = max(0, min(overlap_tokens, max_tokens - 1))
+
+    window: list[tuple[str, int]] = []
+    window_tokens = 0
+    fresh = False
+    ordinal = 0
+    for paragraph in paragraphs:
+        for word, cost in _words(paragraph, max_tokens, count_tokens):
+            if window and window_tokens + cost > max_tokens:
+                yield TextChunk(ordinal, " ".join(item for item, _ in window), window_tokens)
+                ordinal += 1
+                window, window_tokens = _overlap_tail(window, overlap_tokens)
+                fresh = False
+            window.append((word, cost))
+            window_tokens += cost
+            fresh = True
+    if fresh:
+        yield TextChunk(ordinal, " ".join(item for item, _ in window), window_tokens)
+
+
+def _words(
+    paragraph: str, max_tokens: int, count_tokens: Callable[[str], int]
+) -> Iterator[tuple[str, int]]:
+    """Yield `(word, cost)` pairs, splitting words that do not fit in one chunk."""
+    for word in paragraph.split():
+        cost = max(1, count_tokens(word))
+        if cost <= max_tokens:
+            yield word, cost
+            continue
+        step = max(1, len(word) * max_tokens // cost)
+        start = 0
+        while start < len(word):
+            size = step
+            while size > 1 and count_tokens(word[start : start + size]) > max_tokens:
+                size = max(1, size * 3 // 4)
+            piece = word[start : start + size]
+            yield piece, max(1, count_tokens(piece))
+            start += size
+
+
+def _overlap_tail(window: list[tuple[str, int]], budget: int) -> tuple[list[tuple[str, int]], int]:
+    kept: list[tuple[str, int]] = []
+    kept_tokens = 0
+    for word, cost in reversed(window):
+        if kept_tokens + cost > budget:
+            break
+        kept.append((word, cost))
+        kept_tokens += cost
+    kept.reverse()
+    return kept, kept_tokens
+
+
+def batched(items: Iterable[T], size: int) -> Iterator[list[T]]:
+    """Group an iterable into lists of `size` (the final batch may be shorter)."""
+    iterator = iter(items)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def embed_batches(
+    batches: Iterable[list[TextChunk]],
+    embedder: Embedder,
+) -> Iterator[list[EmbeddedChunk]]:
+    """Embed each batch with a single embedder call."""
+    for batch in batches:
+        vectors = embedder.embed([chunk.text for chunk in batch])
+        yield [
+            EmbeddedChunk(chunk=chunk, vector=vector)
+            for chunk, vector in zip(batch, vectors, strict=True)
+        ]
@@ -1,19 +1,76 @@
 """FastAPI application factory."""
 
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from anyio import to_thread
 from fastapi import FastAPI
 
-from backend.app.api.routes import health, mock, runtime, spec
+from backend.app.api.routes import (
+    benchmarks,
+    chat,
+    conversations,
+    debug,
+    documents,
+    health,
+    metrics,
+    mock,
+    openai,
+    runtime,
+    spec,
+    tokenize,
+)
 from backend.app.config import settings
-from backend.app.db.session import init_db
+from backend.app.db.write_behind import get_message_writer
+from backend.app.runtime import get_runtime_manager, get_summarizer, get_token_counter
+from backend.app.runtime.autoload import start_autoload
+from backend.app.runtime.snapshot import RuntimeStateHub
+from backend.app.runtime.watchdog import RuntimeWatchdog
+from backend.app.startup import run_startup
+from backend.app.telemetry.instrumentation import MetricsMiddleware, TracingMiddleware
 from backend.app.version import __version__
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Initialize state off the import path, then run background services until shutdown."""
+    # Match anyio's worker-thread limit to the DB pool so sync handlers never queue on it.
+    to_thread.current_default_thread_limiter().total_tokens = settings.threadpool_size
+    await run_startup(app)
+    watchdog: RuntimeWatchdog = app.state.runtime_watchdog
+    await watchdog.start()
+    await start_autoload(app, get_runtime_manager())
+    try:
+        yield
+    finally:
+        await watchdog.stop()
+        get_summarizer().close()
+        get_message_writer().close()
+        get_token_counter().shutdown()
+
+
 def create_app() -> FastAPI:
-    """Instantiate the FastAPI application."""
-    init_db()
-    app = FastAPI(title=settings.project_name, version=__version__)
-    for router in (health.router, mock.router, runtime.router, spec.router):
+    """Instantiate the FastAPI application; database and runtime setup run in `lifespan`."""
+    app = FastAPI(title=settings.project_name, version=__version__, lifespan=lifespan)
+    app.state.runtime_hub = hub = RuntimeStateHub()
+    app.state.runtime_watchdog = RuntimeWatchdog(get_runtime_manager(), hub)
+    app.add_middleware(TracingMiddleware)
+    app.add_middleware(MetricsMiddleware)
+    for router in (
+        health.router,
+        mock.router,
+        runtime.router,
+        spec.router,
+        documents.router,
+        conversations.router,
+        chat.router,
+        tokenize.router,
+        benchmarks.router,
+        debug.router,
+    ):
         app.include_router(router, prefix=settings.api_prefix)
+    app.include_router(metrics.router)
+    app.include_router(openai.router)
     return app
 
 
@@ -25,7 +82,8 @@ def main() -> None:
     import uvicorn
 
     uvicorn.run(
-        "backend.app.main:app",
+        "backend.app.main:create_app",
+        factory=True,
         host="0.0.0.0",
         port=8000,
         reload=True,
@@ -1,10 +1,60 @@
 """Runtime container factory."""
 
+from backend.app.config import settings
+from backend.app.runtime.benchmark import BenchmarkRunner
 from backend.app.runtime.manager import LlamaRuntime
+from backend.app.runtime.summarizer import ConversationSummarizer
+from backend.app.runtime.tokenizer import TokenCounter
+from backend.app.runtime.tuning import AutoTuner
 
-runtime_manager = LlamaRuntime()
+
+def build_runtime(backend: str | None = None) -> LlamaRuntime:
+    """Create the runtime selected by `runtime_backend` ("llama" or "synthetic")."""
+    backend = backend or settings.runtime_backend
+    if backend == "synthetic":
+        from backend.app.runtime.synthetic import SyntheticRuntime
+
+        return SyntheticRuntime()
+    if backend != "llama":
+        raise ValueError(f"Unknown runtime backend '{backend}'.")
+    return LlamaRuntime()
+
+
+runtime_manager = build_runtime()
 
 
 def get_runtime_manager() -> LlamaRuntime:
     """Return the singleton runtime manager."""
     return runtime_manager
+
+
+auto_tuner = AutoTuner()
+
+
+def get_auto_tuner() -> AutoTuner:
+    """Return the singleton auto-tuning job runner."""
+    return auto_tuner
+
+
+benchmark_runner = BenchmarkRunner()
+
+
+def get_benchmark_runner() -> BenchmarkRunner:
+    """Return the singleton benchmark job runner."""
+    return benchmark_runner
+
+
+token_counter = TokenCounter()
+
+
+def get_token_counter() -> TokenCounter:
+    """Return the singleton tokenizer pool and count cache."""
+    return token_counter
+
+
+summarizer = ConversationSummarizer()
+
+
+def get_summarizer() -> ConversationSummarizer:
+    """Return the singleton background conversation summarizer."""
+    return summarizer
@@ -0,0 +1,56 @@
+"""Bring the active model back into memory after a restart."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from pathlib import Path
+
+from anyio import to_thread
+from fastapi import FastAPI
+from sqlmodel import Session, select
+
+from backend.app.config import settings
+from backend.app.db.models import InstalledModel
+from backend.app.db.session import get_engine
+from backend.app.runtime.manager import LlamaRuntime
+from backend.app.runtime.pagecache import page_cache_warmer
+from backend.app.runtime.snapshot import RuntimeStateHub, build_runtime_state
+from backend.app.runtime.tuning import resolve_load_config
+
+logger = logging.getLogger(__name__)
+
+
+def load_active_model(runtime: LlamaRuntime, hub: RuntimeStateHub) -> bool:
+    """Load the `is_active` model (or just prewarm it); True when a model was loaded."""
+    with Session(get_engine()) as session:
+        model = session.exec(
+            select(InstalledModel).where(InstalledModel.is_active.is_(True))
+        ).first()
+        if model is None or runtime.get_state() is not None:
+            return False
+        if not settings.runtime_autoload_active:
+            if settings.runtime_prewarm:
+                page_cache_warmer.submit(Path(model.file_path))
+            return False
+        try:
+            state = runtime.load_model(
+                model_id=model.id,  # type: ignore[arg-type]
+                model_path=Path(model.file_path),
+                config=resolve_load_config(session, model.id),  # type: ignore[arg-type]
+            )
+        except Exception:
+            logger.exception("Auto-loading active model %s failed.", model.slug)
+            return False
+        model.last_loaded_at = state.loaded_at
+        session.add(model)
+        session.commit()
+        hub.publish_state(build_runtime_state(session, runtime))
+    return True
+
+
+async def start_autoload(app: FastAPI, runtime: LlamaRuntime) -> None:
+    """Startup hook: load the active model off the event loop without delaying startup."""
+    app.state.autoload_task = asyncio.create_task(
+        to_thread.run_sync(load_active_model, runtime, app.state.runtime_hub)
+    )
@@ -0,0 +1,466 @@
+"""Standard benchmark suite, result history and regression comparison.
+
+Run from the command line against an installed model:
+
+    python -m backend.app.runtime.benchmark run --model <slug> [--baseline]
+    python -m backend.app.runtime.benchmark compare [--baseline-id N] [--candidate-id M]
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import logging
+import platform
+import secrets
+import sys
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from datetime import datetime
+from importlib import metadata
+from pathlib import Path
+from threading import Lock
+from time import perf_counter
+
+from sqlmodel import Session, select
+
+from backend.app.config import settings
+from backend.app.db.models import BenchmarkRun, InstalledModel
+from backend.app.db.session import get_engine
+from backend.app.runtime.manager import LlamaRuntime
+from backend.app.schemas.benchmarks import (
+    BenchmarkComparison,
+    BenchmarkJobRead,
+    BenchmarkJobStatus,
+    BenchmarkRunRead,
+    BenchmarkRunRequest,
+    MetricDelta,
+)
+from backend.app.schemas.chat import ChatConfig
+from backend.app.schemas.runtime import RuntimeConfigSchema
+from backend.app.utils.clock import utcnow
+from backend.app.utils.tokens import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+STANDARD_SUITE = "standard-v1"
+STANDARD_PROMPTS: tuple[str, ...] = (
+    "Say hello in one short sentence.",
+    "Summarize the main trade-offs between throughput and latency when serving a language "
+    "model to a handful of concurrent users on a single workstation.",
+    "You are reviewing a pull request that adds a write-behind buffer for streamed chat "
+    "replies. List the failure modes you would test, how each one could lose or duplicate "
+    "data, and which metrics you would watch after deploying it. Be specific about crash "
+    "recovery, ordering guarantees, transaction boundaries and what happens when the client "
+    "disconnects in the middle of a long reply.",
+)
+
+# True when a larger value is better; drives the sign of a regression.
+METRIC_HIGHER_IS_BETTER: dict[str, bool] = {
+    "ttft_ms_p50": False,
+    "ttft_ms_p99": False,
+    "prefill_tokens_per_second": True,
+    "decode_tokens_per_second": True,
+    "total_seconds": False,
+}
+
+
+@dataclass
+class SuiteTiming:
+    """Aggregated timings for one pass (or several) over a prompt set."""
+
+    seconds: float = 0.0
+    prompt_tokens: int = 0
+    prefill_seconds: float = 0.0
+    decode_tokens: int = 0
+    decode_seconds: float = 0.0
+    ttfts: list[float] = field(default_factory=list)
+
+    @property
+    def prefill_tokens_per_second(self) -> float | None:
+        return _rate(self.prompt_tokens, self.prefill_seconds)
+
+    @property
+    def decode_tokens_per_second(self) -> float | None:
+        return _rate(self.decode_tokens, self.decode_seconds)
+
+    def metrics(self) -> dict[str, float]:
+        values = {
+            "ttft_ms_p50": _percentile(self.ttfts, 50),
+            "ttft_ms_p99": _percentile(self.ttfts, 99),
+            "prefill_tokens_per_second": self.prefill_tokens_per_second,
+            "decode_tokens_per_second": self.decode_tokens_per_second,
+            "total_seconds": self.seconds,
+        }
+        return {name: round(value, 3) for name, value in values.items() if value is not None}
+
+
+def time_prompts(
+    runtime: LlamaRuntime,
+    prompts: tuple[str, ...],
+    config: ChatConfig,
+    *,
+    repeats: int = 1,
+) -> SuiteTiming:
+    """Generate a reply for every prompt on the loaded model and time prefill vs decode."""
+    timing = SuiteTiming()
+    started = perf_counter()
+    for _ in range(repeats):
+        for prompt in prompts:
+            messages = [{"role": "user", "content": prompt}]
+            issued = first = last = perf_counter()
+            count = 0
+            for _token in runtime.generate(messages, config):
+                last = perf_counter()
+                if count == 0:
+                    first = last
+                count += 1
+            timing.prompt_tokens += estimate_tokens(prompt)
+            timing.prefill_seconds += first - issued
+            timing.decode_tokens += max(0, count - 1)
+            timing.decode_seconds += last - first
+            if count:
+                timing.ttfts.append((first - issued) * 1000)
+    timing.seconds = perf_counter() - started
+    return timing
+
+
+def hardware_profile() -> tuple[str, dict[str, object]]:
+    """Describe the host; runs are only comparable when their fingerprints match."""
+    import psutil
+
+    details: dict[str, object] = {
+        "machine": platform.machine(),
+        "system": platform.system(),
+        "cpu": _cpu_model(),
+        "physical_cores": psutil.cpu_count(logical=False),
+        "logical_cores": psutil.cpu_count(logical=True),
+        "memory_gib": round(psutil.virtual_memory().total / 1024**3),
+    }
+    digest = hashlib.sha256(json.dumps(details, sort_keys=True).encode("utf-8")).hexdigest()
+    return digest[:16], details
+
+
+def runtime_version(runtime: LlamaRuntime) -> str:
+    """Identify the inference stack: backend class, bindings version and runtime pack."""
+    parts = [type(runtime).__name__]
+    try:
+        parts.append(f"llama-cpp-python {metadata.version('llama_cpp_python')}")
+    except metadata.PackageNotFoundError:
+        pass
+    pack = settings.preferred_runtime_path / "runtime-pack.json"
+    if pack.exists():
+        try:
+            parts.append(f"pack {json.loads(pack.read_text(encoding='utf-8'))['version']}")
+        except (OSError, ValueError, KeyError):
+            pass
+    return "; ".join(parts)
+
+
+def run_benchmark(
+    session: Session,
+    runtime: LlamaRuntime,
+    model: InstalledModel,
+    config: RuntimeConfigSchema,
+    *,
+    max_tokens: int = 128,
+    repeats: int = 1,
+    notes: str | None = None,
+) -> BenchmarkRun:
+    """Run the standard suite on the loaded model and record the result."""
+    timing = time_prompts(
+        runtime,
+        STANDARD_PROMPTS,
+        ChatConfig(temperature=0.0, max_tokens=max_tokens),
+        repeats=repeats,
+    )
+    fingerprint, hardware = hardware_profile()
+    run = BenchmarkRun(
+        suite=STANDARD_SUITE,
+        model_id=model.id,
+        model_checksum=model.checksum_sha256 or "",
+        runtime_version=runtime_version(runtime),
+        config={**config.model_dump(mode="json"), "max_tokens": max_tokens, "repeats": repeats},
+        hardware_fingerprint=fingerprint,
+        hardware=hardware,
+        metrics=timing.metrics(),
+        notes=notes,
+    )
+    session.add(run)
+    session.commit()
+    session.refresh(run)
+    return run
+
+
+@dataclass
+class BenchmarkJob:
+    id: str
+    model_id: int
+    config: RuntimeConfigSchema
+    request: BenchmarkRunRequest
+    status: BenchmarkJobStatus = BenchmarkJobStatus.PENDING
+    run: BenchmarkRunRead | None = None
+    error: str | None = None
+    created_at: datetime = field(default_factory=utcnow)
+    finished_at: datetime | None = None
+
+    def to_read(self) -> BenchmarkJobRead:
+        return BenchmarkJobRead(
+            id=self.id,
+            model_id=self.model_id,
+            status=self.status,
+            run=self.run,
+            error=self.error,
+            created_at=self.created_at,
+            finished_at=self.finished_at,
+        )
+
+
+class BenchmarkRunner:
+    """Runs suite jobs one at a time on a background thread, off the request path."""
+
+    def __init__(self) -> None:
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = Lock()
+        self._jobs: dict[str, BenchmarkJob] = {}
+        self._pending: set[Future[None]] = set()
+
+    def submit(
+        self,
+        runtime: LlamaRuntime,
+        *,
+        model_id: int,
+        config: RuntimeConfigSchema,
+        request: BenchmarkRunRequest,
+    ) -> BenchmarkJob:
+        job = BenchmarkJob(
+            id=secrets.token_hex(8), model_id=model_id, config=config, request=request
+        )
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="benchmark")
+            self._jobs[job.id] = job
+            future = self._executor.submit(self.run, runtime, job)
+            self._pending.add(future)
+        future.add_done_callback(self._discard)
+        return job
+
+    def _discard(self, future: Future[None]) -> None:
+        with self._lock:
+            self._pending.discard(future)
+
+    def get(self, job_id: str) -> BenchmarkJob | None:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def wait(self, timeout: float | None = None) -> None:
+        """Block until queued jobs finish (used by tests and shutdown)."""
+        with self._lock:
+            pending = set(self._pending)
+        wait(pending, timeout=timeout)
+
+    def run(self, runtime: LlamaRuntime, job: BenchmarkJob) -> None:
+        """Run the suite and record it, marking the run as baseline when requested."""
+        job.status = BenchmarkJobStatus.RUNNING
+        try:
+            with Session(get_engine()) as session:
+                model = session.get(InstalledModel, job.model_id)
+                if model is None:
+                    raise LookupError(f"Model {job.model_id} not found.")
+                run = run_benchmark(
+                    session,
+                    runtime,
+                    model,
+                    job.config,
+                    max_tokens=job.request.max_tokens,
+                    repeats=job.request.repeats,
+                    notes=job.request.notes,
+                )
+                if job.request.mark_baseline:
+                    run = mark_baseline(session, run)
+                job.run = BenchmarkRunRead.model_validate(run)
+            job.status = BenchmarkJobStatus.COMPLETED
+        except Exception as exc:
+            logger.exception("Benchmarking model %s failed.", job.model_id)
+            job.status = BenchmarkJobStatus.FAILED
+            job.error = str(exc) or exc.__class__.__name__
+        finally:
+            job.finished_at = utcnow()
+
+
+def find_baseline(session: Session, run: BenchmarkRun) -> BenchmarkRun | None:
+    """Latest baseline for the same suite, model file and hardware."""
+    return session.exec(
+        select(BenchmarkRun)
+        .where(
+            BenchmarkRun.is_baseline.is_(True),
+            BenchmarkRun.suite == run.suite,
+            BenchmarkRun.model_checksum == run.model_checksum,
+            BenchmarkRun.hardware_fingerprint == run.hardware_fingerprint,
+            BenchmarkRun.id != run.id,
+        )
+        .order_by(BenchmarkRun.id.desc())
+    ).first()
+
+
+def mark_baseline(session: Session, run: BenchmarkRun) -> BenchmarkRun:
+    """Make `run` the only baseline for its suite, model file and hardware."""
+    previous = session.exec(
+        select(BenchmarkRun).where(
+            BenchmarkRun.is_baseline.is_(True),
+            BenchmarkRun.suite == run.suite,
+            BenchmarkRun.model_checksum == run.model_checksum,
+            BenchmarkRun.hardware_fingerprint == run.hardware_fingerprint,
+        )
+    ).all()
+    for item in previous:
+        item.is_baseline = False
+        session.add(item)
+    run.is_baseline = True
+    session.add(run)
+    session.commit()
+    session.refresh(run)
+    return run
+
+
+def compare_runs(
+    baseline: BenchmarkRun, candidate: BenchmarkRun, threshold_pct: float
+) -> BenchmarkComparison:
+    """Diff shared metrics; a change worse than `threshold_pct` is a regression."""
+    deltas: list[MetricDelta] = []
+    for name, higher_is_better in METRIC_HIGHER_IS_BETTER.items():
+        before = baseline.metrics.get(name)
+        after = candidate.metrics.get(name)
+        if before is None or after is None:
+            continue
+        change = (after - before) / before * 100 if before else 0.0
+        worse_by = -change if higher_is_better else change
+        deltas.append(
+            MetricDelta(
+                name=name,
+                baseline=before,
+                candidate=after,
+                change_pct=round(change, 2),
+                higher_is_better=higher_is_better,
+                regression=worse_by > threshold_pct,
+            )
+        )
+    return BenchmarkComparison(
+        baseline_id=baseline.id,  # type: ignore[arg-type]
+        candidate_id=candidate.id,  # type: ignore[arg-type]
+        threshold_pct=threshold_pct,
+        comparable=(
+            baseline.model_checksum == candidate.model_checksum
+            and baseline.hardware_fingerprint == candidate.hardware_fingerprint
+        ),
+        regressed=any(delta.regression for delta in deltas),
+        deltas=deltas,
+    )
+
+
+def _cpu_model() -> str:
+    cpuinfo = Path("/proc/cpuinfo")
+    if cpuinfo.exists():
+        for line in cpuinfo.read_text(encoding="utf-8", errors="replace").splitlines():
+            if line.startswith("model name"):
+                return line.split(":", 1)[1].strip()
+    return platform.processor() or "unknown"
+
+
+def _percentile(values: list[float], pct: float) -> float | None:
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, min(len(ordered), round(pct / 100 * len(ordered) + 0.5)))
+    return ordered[rank - 1]
+
+
+def _rate(tokens: int, seconds: float) -> float | None:
+    return tokens / seconds if tokens and seconds > 0 else None
+
+
+def _print_comparison(comparison: BenchmarkComparison) -> None:
+    print(f"baseline #{comparison.baseline_id} -> candidate #{comparison.candidate_id}")
+    if not comparison.comparable:
+        print("warning: runs used different model files or hardware")
+    for delta in comparison.deltas:
+        flag = "  REGRESSION" if delta.regression else ""
+        print(
+            f"  {delta.name:<28} {delta.baseline:>12.3f} -> {delta.candidate:>12.3f}"
+            f" ({delta.change_pct:+.1f}%){flag}"
+        )
+
+
+def main(argv: list[str] | None = None) -> int:
+    from backend.app.db.session import get_engine, init_db
+    from backend.app.runtime import build_runtime
+    from backend.app.runtime.tuning import resolve_load_config
+
+    parser = argparse.ArgumentParser(description="Run and compare runtime benchmarks.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_parser = commands.add_parser("run", help="Run the standard suite and record it")
+    run_parser.add_argument("--model", required=True, help="Installed model slug")
+    run_parser.add_argument("--backend", help="Runtime backend (default: settings)")
+    run_parser.add_argument("--max-tokens", type=int, default=128)
+    run_parser.add_argument("--repeats", type=int, default=1)
+    run_parser.add_argument("--notes")
+    run_parser.add_argument("--baseline", action="store_true", help="Mark the run as baseline")
+    compare_parser = commands.add_parser("compare", help="Compare two recorded runs")
+    compare_parser.add_argument("--baseline-id", type=int)
+    compare_parser.add_argument("--candidate-id", type=int)
+    for sub in (run_parser, compare_parser):
+        sub.add_argument(
+            "--threshold", type=float, default=settings.benchmark_regression_threshold_pct
+        )
+    args = parser.parse_args(argv)
+
+    settings.ensure_directories()
+    init_db()
+    with Session(get_engine()) as session:
+        if args.command == "run":
+            model = session.exec(
+                select(InstalledModel).where(InstalledModel.slug == args.model)
+            ).first()
+            if model is None:
+                parser.error(f"Model '{args.model}' is not installed.")
+            config = resolve_load_config(session, model.id)  # type: ignore[arg-type]
+            runtime = build_runtime(args.backend)
+            runtime.load_model(model_id=model.id, model_path=Path(model.file_path), config=config)
+            candidate = run_benchmark(
+                session,
+                runtime,
+                model,
+                config,
+                max_tokens=args.max_tokens,
+                repeats=args.repeats,
+                notes=args.notes,
+            )
+            runtime.unload_model()
+            print(f"recorded run #{candidate.id}: {json.dumps(candidate.metrics)}")
+            baseline = find_baseline(session, candidate)
+            if args.baseline:
+                mark_baseline(session, candidate)
+        else:
+            candidate = (
+                session.get(BenchmarkRun, args.candidate_id)
+                if args.candidate_id
+                else session.exec(select(BenchmarkRun).order_by(BenchmarkRun.id.desc())).first()
+            )
+            if candidate is None:
+                parser.error("No benchmark runs recorded.")
+            baseline = (
+                session.get(BenchmarkRun, args.baseline_id)
+                if args.baseline_id
+                else find_baseline(session, candidate)
+            )
+        if baseline is None:
+            print("no baseline to compare against")
+            return 0
+        comparison = compare_runs(baseline, candidate, args.threshold)
+    _print_comparison(comparison)
+    return 1 if comparison.regressed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
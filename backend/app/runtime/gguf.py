@@ -0,0 +1,117 @@
+"""Minimal reader for the key/value metadata header of GGUF files.
+
+Only the header is parsed; tensor data is never touched, so reading a multi-gigabyte model's
+metadata costs one sequential pass over its (mostly vocabulary) header.
+"""
+
+from __future__ import annotations
+
+import struct
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any, BinaryIO
+
+GGUF_MAGIC = b"GGUF"
+
+_SCALARS: dict[int, struct.Struct] = {
+    0: struct.Struct("<B"),
+    1: struct.Struct("<b"),
+    2: struct.Struct("<H"),
+    3: struct.Struct("<h"),
+    4: struct.Struct("<I"),
+    5: struct.Struct("<i"),
+    6: struct.Struct("<f"),
+    7: struct.Struct("<?"),
+    10: struct.Struct("<Q"),
+    11: struct.Struct("<q"),
+    12: struct.Struct("<d"),
+}
+_STRING = 8
+_ARRAY = 9
+_U32 = struct.Struct("<I")
+_U64 = struct.Struct("<Q")
+
+
+class GGUFError(ValueError):
+    """Raised when a file is not a readable GGUF (v2+) model."""
+
+
+def _read(handle: BinaryIO, size: int) -> bytes:
+    data = handle.read(size)
+    if len(data) != size:
+        raise GGUFError("Unexpected end of GGUF header.")
+    return data
+
+
+def _unpack(handle: BinaryIO, layout: struct.Struct) -> Any:
+    return layout.unpack(_read(handle, layout.size))[0]
+
+
+def _string(handle: BinaryIO) -> str:
+    return _read(handle, _unpack(handle, _U64)).decode("utf-8", errors="replace")
+
+
+def _value(handle: BinaryIO, kind: int) -> Any:
+    if kind == _STRING:
+        return _string(handle)
+    if kind == _ARRAY:
+        item_kind = _unpack(handle, _U32)
+        count = _unpack(handle, _U64)
+        return [_value(handle, item_kind) for _ in range(count)]
+    layout = _SCALARS.get(kind)
+    if layout is None:
+        raise GGUFError(f"Unknown GGUF value type {kind}.")
+    return _unpack(handle, layout)
+
+
+def _skip(handle: BinaryIO, kind: int) -> None:
+    if kind == _STRING:
+        handle.seek(_unpack(handle, _U64), 1)
+    elif kind == _ARRAY:
+        item_kind = _unpack(handle, _U32)
+        count = _unpack(handle, _U64)
+        if item_kind in _SCALARS:
+            handle.seek(_SCALARS[item_kind].size * count, 1)
+        else:
+            for _ in range(count):
+                _skip(handle, item_kind)
+    elif kind in _SCALARS:
+        handle.seek(_SCALARS[kind].size, 1)
+    else:
+        raise GGUFError(f"Unknown GGUF value type {kind}.")
+
+
+def read_metadata(path: Path, wanted: Callable[[str], bool] | None = None) -> dict[str, Any]:
+    """Return the GGUF metadata of `path`, limited to keys accepted by `wanted`.
+
+    Values of unwanted keys are skipped without decoding, which matters for the vocabulary
+    arrays that make up most of the header.
+    """
+    metadata: dict[str, Any] = {}
+    with path.open("rb") as handle:
+        if _read(handle, 4) != GGUF_MAGIC:
+            raise GGUFError(f"{path.name} is not a GGUF file.")
+        version = _unpack(handle, _U32)
+        if version < 2:
+            raise GGUFError(f"GGUF version {version} is not supported.")
+        _unpack(handle, _U64)  # tensor count
+        for _ in range(_unpack(handle, _U64)):
+            key = _string(handle)
+            kind = _unpack(handle, _U32)
+            if wanted is None or wanted(key):
+                metadata[key] = _value(handle, kind)
+            else:
+                _skip(handle, kind)
+    return metadata
+
+
+def block_count(path: Path) -> int | None:
+    """Transformer layer count of `path` (`<arch>.block_count`); None when unreadable."""
+    try:
+        metadata = read_metadata(
+            path, lambda key: key == "general.architecture" or key.endswith(".block_count")
+        )
+    except (OSError, GGUFError):
+        return None
+    count = metadata.get(f"{metadata.get('general.architecture')}.block_count")
+    return count if isinstance(count, int) else None
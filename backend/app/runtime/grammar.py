@@ -0,0 +1,106 @@
+"""Constrained decoding: GBNF grammars and JSON schemas compiled once into an LRU."""
+
+from __future__ import annotations
+
+import json
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from hashlib import sha256
+from threading import Lock
+from time import perf_counter
+from typing import Any, Literal
+
+from backend.app.config import settings
+from backend.app.schemas.chat import ChatConfig
+from backend.app.telemetry.metrics import RUNTIME_GRAMMAR_COMPILE, record_cache
+
+
+@dataclass(frozen=True)
+class Constraint:
+    kind: Literal["gbnf", "json_schema"]
+    source: str
+    digest: str
+
+
+@dataclass(frozen=True)
+class CompiledGrammar:
+    grammar: Any
+    compile_ms: float
+    cache_hit: bool
+
+
+def constraint_for(config: ChatConfig) -> Constraint | None:
+    """The output constraint requested by `config`, keyed by a hash of its canonical form."""
+    if config.grammar is not None:
+        kind, source = "gbnf", config.grammar
+    elif config.json_schema is not None:
+        kind = "json_schema"
+        source = json.dumps(config.json_schema, sort_keys=True, separators=(",", ":"))
+    else:
+        return None
+    digest = sha256(f"{kind}\0{source}".encode()).hexdigest()
+    return Constraint(kind=kind, source=source, digest=digest)  # type: ignore[arg-type]
+
+
+def compile_llama_grammar(constraint: Constraint) -> Any:
+    """Build a `LlamaGrammar`, converting JSON schemas to GBNF first; ValueError when invalid."""
+    from llama_cpp.llama_grammar import LlamaGrammar, json_schema_to_gbnf
+
+    try:
+        gbnf = constraint.source
+        if constraint.kind == "json_schema":
+            gbnf = json_schema_to_gbnf(constraint.source)
+        return LlamaGrammar.from_string(gbnf, verbose=False)
+    except Exception as exc:
+        label = "GBNF grammar" if constraint.kind == "gbnf" else "JSON schema"
+        raise ValueError(f"Invalid {label}: {exc}") from exc
+
+
+class GrammarCache:
+    """LRU of compiled grammars keyed by runtime instance and constraint digest.
+
+    Parsing a large schema costs more than sampling a short reply, so repeated requests with
+    the same schema reuse the compiled grammar. A `LlamaGrammar` holds mutable parse state
+    and llama.cpp rebuilds it at the start of every completion, so it is only safe to share
+    within one instance, whose generations are serialized; each instance gets its own copy.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int | None = None,
+        compiler: Callable[[Constraint], Any] = compile_llama_grammar,
+    ) -> None:
+        self._max_entries = max_entries or settings.grammar_cache_entries
+        self._compiler = compiler
+        self._lock = Lock()
+        self._grammars: OrderedDict[tuple[int, str], Any] = OrderedDict()
+
+    def get(self, constraint: Constraint, *, instance: int = 0) -> CompiledGrammar:
+        """The grammar for `constraint`, private to runtime instance `instance`."""
+        key = (instance, constraint.digest)
+        with self._lock:
+            grammar = self._grammars.get(key)
+            if grammar is not None:
+                self._grammars.move_to_end(key)
+        record_cache("grammar", hit=grammar is not None)
+        if grammar is not None:
+            return CompiledGrammar(grammar=grammar, compile_ms=0.0, cache_hit=True)
+
+        started = perf_counter()
+        grammar = self._compiler(constraint)
+        elapsed = perf_counter() - started
+        RUNTIME_GRAMMAR_COMPILE.observe(elapsed)
+        with self._lock:
+            self._grammars[key] = grammar
+            while len(self._grammars) > self._max_entries:
+                self._grammars.popitem(last=False)
+        return CompiledGrammar(grammar=grammar, compile_ms=elapsed * 1000, cache_hit=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._grammars.clear()
+
+
+grammar_cache = GrammarCache()
@@ -2,27 +2,93 @@
 
 from __future__ import annotations
 
+import logging
 import re
 import shutil
 import subprocess
-from dataclasses import dataclass
+from collections import OrderedDict
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future
+from contextlib import closing, contextmanager
+from contextvars import copy_context
+from dataclasses import dataclass, field
 from datetime import datetime
+from functools import cache, partial
 from pathlib import Path
-from threading import Lock
-from typing import Any
+from queue import Queue, SimpleQueue
+from threading import Event, Lock, Thread
+from time import monotonic, perf_counter, perf_counter_ns
+from typing import TYPE_CHECKING, Any
 
-import psutil
-
-from backend.app.schemas.runtime import RuntimeConfigSchema
+from backend.app.config import settings
+from backend.app.runtime.grammar import CompiledGrammar, Constraint, constraint_for, grammar_cache
+from backend.app.runtime.pagecache import page_cache_warmer
+from backend.app.runtime.templates import chat_templates
+from backend.app.runtime.topology import (
+    CpuCore,
+    CpuTopology,
+    default_threads,
+    host_topology,
+    numa_node_cpus,
+    performance_cores,
+    pin_current_thread,
+)
+from backend.app.schemas.chat import ChatConfig
+from backend.app.schemas.runtime import (
+    KVCachePlacement,
+    RuntimeConfigSchema,
+    RuntimeInstanceSchema,
+)
+from backend.app.telemetry.instrumentation import mark_generation_start
+from backend.app.telemetry.metrics import (
+    RUNTIME_ADAPTER_SWAP,
+    RUNTIME_CONSTRAINED_SAMPLING,
+    RUNTIME_MODEL_LOAD_DURATION,
+    RUNTIME_QUEUE_WAIT,
+    record_cache,
+)
+from backend.app.telemetry.tracing import tracer
 from backend.app.utils.clock import utcnow
 
-try:
+if TYPE_CHECKING:
+    from llama_cpp import Llama
+
+logger = logging.getLogger(__name__)
+
+
+@cache
+def _llama_class() -> type[Llama]:
+    """Import llama_cpp on first use; loading its shared library dominates cold start."""
     from llama_cpp import Llama
-except ImportError as exc:  # pragma: no cover
-    Llama = None  # type: ignore[assignment]
-    _IMPORT_ERROR = exc
-else:
-    _IMPORT_ERROR = None
+
+    return Llama
+
+
+@cache
+def _llama_api() -> Any:
+    """The low-level llama_cpp module (LoRA adapter calls are not wrapped by `Llama`)."""
+    import llama_cpp
+
+    return llama_cpp
+
+
+def bindings_available() -> bool:
+    """True when llama-cpp-python can be imported (imports it as a side effect)."""
+    try:
+        _llama_class()
+    except ImportError:
+        return False
+    return True
+
+
+@dataclass(frozen=True)
+class InstancePlacement:
+    index: int
+    cpus: frozenset[int] | None
+    threads: int
+    prefill_threads: int
+    physical_cores: int
+    efficiency_cores: int = 0
 
 
 @dataclass
@@ -31,6 +97,14 @@ class LoadedModelState:
     model_path: Path
     config: RuntimeConfigSchema
     loaded_at: datetime
+    instances: tuple[InstancePlacement, ...] = ()
+
+
+@dataclass(frozen=True)
+class AdapterSpec:
+    adapter_id: int
+    path: Path
+    scale: float = 1.0
 
 
 @dataclass
@@ -44,13 +118,240 @@ class RuntimeNotAvailableError(RuntimeError):
     """Raised when llama.cpp bindings are missing."""
 
 
+class RuntimeBusyError(RuntimeError):
+    """Raised when a background generation finds the runtime busy or is preempted."""
+
+
+# How many tokens an instance worker may run ahead of the request consuming them.
+_STREAM_BUFFER = 16
+_END = object()
+
+
+class _InstanceWorker:
+    """The thread that runs an instance's llama.cpp work, pinned once to its CPUs.
+
+    Request threads (anyio's shared pool) only exchange results with it through queues, so
+    their CPU affinity is never touched, and llama.cpp's own threads inherit the worker's.
+    """
+
+    def __init__(self, name: str, cpus: frozenset[int] | None) -> None:
+        self._jobs: SimpleQueue[Callable[[], None] | None] = SimpleQueue()
+        self._submit_lock = Lock()
+        self._closed = False
+        self._thread = Thread(target=self._run, args=(cpus,), name=name, daemon=True)
+        self._thread.start()
+
+    def _run(self, cpus: frozenset[int] | None) -> None:
+        pin_current_thread(cpus)
+        while (job := self._jobs.get()) is not None:
+            job()
+
+    def _submit(self, job: Callable[[], None]) -> None:
+        with self._submit_lock:
+            if self._closed:
+                raise RuntimeNotAvailableError("No model is loaded.")
+            # Jobs run in the submitter's context so their spans join the request's trace.
+            self._jobs.put(partial(copy_context().run, job))
+
+    def call(self, fn: Callable[[], Any]) -> Any:
+        """Run `fn` on the worker and return its result."""
+        future: Future[Any] = Future()
+
+        def job() -> None:
+            try:
+                future.set_result(fn())
+            except BaseException as exc:
+                future.set_exception(exc)
+
+        self._submit(job)
+        return future.result()
+
+    def stream(self, items: Callable[[], Iterator[Any]]) -> Iterator[Any]:
+        """Run the generator `items()` on the worker and yield what it produces.
+
+        Closing the returned iterator stops the worker after its current item and waits for
+        it, so the caller may hand the instance to someone else afterwards.
+        """
+        out: Queue[tuple[Any, BaseException | None]] = Queue(maxsize=_STREAM_BUFFER)
+        stop = Event()
+
+        def job() -> None:
+            try:
+                with closing(items()) as produced:
+                    for item in produced:
+                        out.put((item, None))
+                        if stop.is_set():
+                            break
+            except BaseException as exc:
+                out.put((_END, exc))
+            else:
+                out.put((_END, None))
+
+        self._submit(job)
+        ended = False
+        try:
+            while True:
+                item, error = out.get()
+                if item is _END:
+                    ended = True
+                    if error is not None:
+                        raise error
+                    return
+                yield item
+        finally:
+            stop.set()
+            while not ended:  # Drain so a worker blocked on a full queue can see `stop`.
+                ended = out.get()[0] is _END
+
+    def close(self) -> None:
+        """Let the worker exit once the jobs already queued have run."""
+        with self._submit_lock:
+            if not self._closed:
+                self._closed = True
+                self._jobs.put(None)
+
+
+@dataclass(eq=False)
+class _Instance:
+    """One llama.cpp context of the resident model, with its own lock, worker and LoRA state."""
+
+    placement: InstancePlacement
+    worker: _InstanceWorker
+    llama: Llama | None
+    lock: Lock = field(default_factory=Lock)
+    waiting: int = 0
+    background: bool = False
+    routed: int = 0
+    adapters: OrderedDict[int, Any] = field(default_factory=OrderedDict)
+    active_adapter: tuple[int, float] | None = None
+    llama_args: dict[str, Any] = field(default_factory=dict)
+    embedder: Llama | None = None
+
+    def load(self) -> int:
+        """Queued plus running foreground generations; background work gives way anyway."""
+        return self.waiting + (self.lock.locked() and not self.background)
+
+
+def plan_instances(
+    config: RuntimeConfigSchema, topology: CpuTopology | None = None
+) -> tuple[InstancePlacement, ...]:
+    """Resolve `config.instances` to CPU sets and thread counts; ValueError if unplaceable.
+
+    Explicit `cpus` are used as given and a `numa_node` narrows to one CPU per physical
+    performance core. Instances without either split the remaining physical cores between
+    them (sharing all of them when there are too few) and, with `runtime_pin_threads`, are
+    pinned the same way. Prefill and decode share one thread pool and so one CPU mask; a
+    pinned instance therefore leaves its E-cores idle rather than let decode land on them.
+    Unset thread counts come from `default_threads` for the cores an instance runs on.
+    """
+    topology = topology or host_topology()
+    available = frozenset(cpu for core in topology.cores for cpu in core.cpus)
+    specs = config.instances or [RuntimeInstanceSchema()]
+    claimed: dict[int, frozenset[int]] = {}
+    for index, spec in enumerate(specs):
+        if spec.numa_node is not None:
+            node = numa_node_cpus(spec.numa_node)
+            cores = performance_cores(topology.within(node & available))
+            cpus = frozenset(core.primary for core in cores)
+        elif spec.cpus is not None:
+            cpus = frozenset(spec.cpus)
+            if not cpus <= available:
+                missing = ", ".join(str(cpu) for cpu in sorted(cpus - available))
+                raise ValueError(f"Instance {index}: CPUs {missing} are not available.")
+        else:
+            continue
+        if not cpus:
+            raise ValueError(f"Instance {index} has no usable CPUs.")
+        claimed[index] = cpus
+
+    floating = [index for index in range(len(specs)) if index not in claimed]
+    taken = frozenset().union(*claimed.values())
+    free = [core for core in topology.cores if not taken.intersection(core.cpus)]
+    free = free or list(topology.cores)
+    shares: dict[int, list[CpuCore]] = {}
+    for position, index in enumerate(floating):
+        if len(free) < len(floating):
+            shares[index] = free
+        else:
+            size, extra = divmod(len(free), len(floating))
+            first = position * size + min(position, extra)
+            shares[index] = free[first : first + size + (position < extra)]
+
+    placements = []
+    for index, spec in enumerate(specs):
+        if index in claimed:
+            cpus = claimed[index]
+            cores = topology.within(cpus)
+            threads, prefill = spec.cpu_threads, spec.prefill_threads
+        else:
+            cores = shares[index]
+            cpus = None
+            if settings.runtime_pin_threads:
+                cores = performance_cores(cores)
+                cpus = frozenset(core.primary for core in cores)
+            threads = spec.cpu_threads or config.cpu_threads
+            prefill = spec.prefill_threads or config.prefill_threads
+        auto_prefill, auto_decode = default_threads(cores)
+        placements.append(
+            InstancePlacement(
+                index=index,
+                cpus=cpus,
+                threads=threads or auto_decode,
+                prefill_threads=prefill or auto_prefill,
+                physical_cores=len(cores),
+                efficiency_cores=sum(core.efficiency for core in cores),
+            )
+        )
+    return tuple(placements)
+
+
+def _report_constraint(
+    constraint: Constraint, compiled: CompiledGrammar, started_ns: int, tokens: int
+) -> None:
+    """Record how long one generation spent sampling under a grammar."""
+    ended_ns = perf_counter_ns()
+    seconds = (ended_ns - started_ns) / 1e9
+    RUNTIME_CONSTRAINED_SAMPLING.labels(constraint.kind).observe(seconds)
+    tracer.record_span(
+        "runtime.constrained_sampling",
+        started_ns,
+        ended_ns,
+        kind=constraint.kind,
+        grammar=constraint.digest[:16],
+        cache_hit=compiled.cache_hit,
+        compile_ms=round(compiled.compile_ms, 3),
+        tokens=tokens,
+    )
+    logger.info(
+        "Constrained sampling (%s %s): %d tokens in %.1f ms; grammar %s in %.1f ms.",
+        constraint.kind,
+        constraint.digest[:12],
+        tokens,
+        seconds * 1000,
+        "cached" if compiled.cache_hit else "compiled",
+        compiled.compile_ms,
+    )
+
+
 class LlamaRuntime:
-    """Thin wrapper around llama_cpp.Llama that enforces a single loaded model."""
+    """Thin wrapper around llama_cpp.Llama that enforces a single loaded model.
+
+    The model may run as several instances (see `RuntimeConfigSchema.instances`), each its
+    own llama.cpp context driven by a worker thread pinned to a CPU set. With mmap they share
+    one copy of the weights in the page cache; each generation is routed to one instance by
+    `_route`.
+    """
+
+    requires_bindings = True
 
     def __init__(self) -> None:
         self._lock = Lock()
-        self._llama: Llama | None = None
+        self._route_lock = Lock()
+        self._instances: list[_Instance] = []
+        self._affinity: OrderedDict[str, _Instance] = OrderedDict()
         self._state: LoadedModelState | None = None
+        self._evicted: LoadedModelState | None = None
+        self._last_used = monotonic()
 
     def load_model(
         self,
@@ -60,47 +361,561 @@ class LlamaRuntime:
         config: RuntimeConfigSchema,
     ) -> LoadedModelState:
         """Load a GGUF file into memory."""
-        if Llama is None:
-            raise RuntimeNotAvailableError(
-                "llama-cpp-python is not available. "
-                "Install extras or ensure the ROCm build succeeded."
-            ) from _IMPORT_ERROR
+        if self.requires_bindings:
+            try:
+                _llama_class()
+            except ImportError as exc:
+                raise RuntimeNotAvailableError(
+                    "llama-cpp-python is not available. "
+                    "Install extras or ensure the ROCm build succeeded."
+                ) from exc
 
         if not model_path.exists():
             raise FileNotFoundError(f"Model path {model_path} does not exist.")
+        if config.use_mmap and settings.runtime_prewarm:
+            # Sequential read-ahead in the background beats faulting weights in page by page
+            # once decode touches them; the load itself only maps the file and does not wait.
+            page_cache_warmer.submit(model_path)
 
+        placements = plan_instances(config)
         with self._lock:
             self._unload_locked()
             llama_args: dict[str, Any] = {
                 "model_path": str(model_path),
                 "n_ctx": config.context_length,
-                "n_threads": config.cpu_threads,
                 "n_batch": config.eval_batch_size,
                 "use_mmap": config.use_mmap,
                 "keep_in_memory": config.keep_in_memory,
             }
             if config.gpu_layers is not None:
                 llama_args["n_gpu_layers"] = config.gpu_layers
+            if config.kv_cache_placement is KVCachePlacement.CPU:
+                llama_args["offload_kqv"] = False
+            elif config.kv_cache_placement is KVCachePlacement.GPU:
+                llama_args["offload_kqv"] = True
 
-            self._llama = Llama(**llama_args)
+            started = perf_counter()
+            instances: list[_Instance] = []
+            try:
+                with tracer.span(
+                    "runtime.load_model", model_id=model_id, instances=len(placements)
+                ):
+                    for placement in placements:
+                        worker = _InstanceWorker(
+                            f"llama-instance-{placement.index}", placement.cpus
+                        )
+                        args = {
+                            **llama_args,
+                            "n_threads": placement.threads,
+                            "n_threads_batch": placement.prefill_threads,
+                        }
+                        instances.append(
+                            _Instance(
+                                placement=placement, worker=worker, llama=None, llama_args=args
+                            )
+                        )
+                        # Created on the pinned worker so first-touch puts the context on its node.
+                        instances[-1].llama = worker.call(
+                            lambda args=args: self._create_llama(args)
+                        )
+            except BaseException:
+                for instance in instances:
+                    instance.worker.close()
+                raise
+            RUNTIME_MODEL_LOAD_DURATION.observe(perf_counter() - started)
             state = LoadedModelState(
                 model_id=model_id,
                 model_path=model_path,
                 config=config,
                 loaded_at=utcnow(),
+                instances=placements,
             )
+            with self._route_lock:
+                self._instances = instances
             self._state = state
+            self._evicted = None
+            self._last_used = monotonic()
             return state
 
+    def _create_llama(self, llama_args: dict[str, Any]) -> Llama | None:
+        return _llama_class()(**llama_args)
+
+    def load_vocab(self, model_path: Path) -> Callable[[str], int] | None:
+        """Load only the vocabulary of `model_path` and return a token counter for it.
+
+        A `vocab_only` context skips the weights, so counting works whether or not the model
+        is resident and never contends with decode. None when no tokenizer is available.
+        """
+        if not self.requires_bindings or not bindings_available():
+            return None
+        vocab = _llama_class()(model_path=str(model_path), vocab_only=True, verbose=False)
+        return lambda text: len(vocab.tokenize(text.encode("utf-8"), add_bos=False, special=True))
+
+    def supports_gpu_offload(self) -> bool:
+        """True when the llama.cpp build can offload layers to a GPU."""
+        if not self.requires_bindings or not bindings_available():
+            return False
+        return bool(_llama_api().llama_supports_gpu_offload())
+
+    def probe(self) -> bool:
+        """Warm the bindings import ahead of the first load; False when they are missing."""
+        return not self.requires_bindings or bindings_available()
+
     def unload_model(self) -> None:
         """Release the currently loaded model."""
         with self._lock:
             self._unload_locked()
+            self._evicted = None
 
     def _unload_locked(self) -> None:
-        self._llama = None
+        # llama.cpp frees a model's adapters together with it, so only drop the handles.
+        with self._route_lock:
+            instances, self._instances = self._instances, []
+            self._affinity.clear()
+        for instance in instances:
+            instance.worker.close()  # After any generation still running on it.
         self._state = None
 
+    @property
+    def _llama(self) -> Llama | None:
+        """The first instance's generation context."""
+        instances = self._instances
+        return instances[0].llama if instances else None
+
+    def idle_seconds(self) -> float:
+        """Seconds since the model was last loaded or used."""
+        return monotonic() - self._last_used
+
+    def is_busy(self) -> bool:
+        return any(instance.lock.locked() for instance in self._instances)
+
+    @contextmanager
+    def _all_idle(self) -> Iterator[bool]:
+        """Hold every instance's lock when none is generating; yields False otherwise."""
+        held: list[_Instance] = []
+        try:
+            for instance in self._instances:
+                if not instance.lock.acquire(blocking=False):
+                    yield False
+                    return
+                held.append(instance)
+            yield True
+        finally:
+            for instance in held:
+                instance.lock.release()
+
+    def release_caches(self) -> bool:
+        """Drop the prompt cache and KV state of the loaded model, keeping its weights.
+
+        Skipped while a generation is running; returns True when something was released.
+        """
+        with self._all_idle() as idle, self._lock:
+            released = False
+            for instance in self._instances if idle else ():
+                llama = instance.llama
+                if llama is None:
+                    continue
+                if getattr(llama, "cache", None) is not None:
+                    llama.set_cache(None)
+                llama.reset()
+                ctx = getattr(llama, "_ctx", None)
+                if ctx is not None and hasattr(ctx, "kv_cache_clear"):
+                    ctx.kv_cache_clear()
+                released = True
+            return released
+
+    def evict(self) -> LoadedModelState | None:
+        """Unload the model but remember it so `ensure_loaded` can bring it back.
+
+        Returns the evicted state, or None when nothing was loaded or a generation is running.
+        """
+        with self._all_idle() as idle, self._lock:
+            state = self._state
+            if not idle or state is None:
+                return None
+            self._unload_locked()
+            self._evicted = state
+            return state
+
+    def ensure_loaded(self, model_id: int) -> bool:
+        """Reload `model_id` if the watchdog evicted it; True when a reload happened."""
+        with self._lock:
+            evicted = self._evicted
+            if self._state is not None or evicted is None or evicted.model_id != model_id:
+                return False
+        self.load_model(
+            model_id=evicted.model_id,
+            model_path=evicted.model_path,
+            config=evicted.config,
+        )
+        return True
+
+    def generate(
+        self,
+        messages: list[dict[str, str]],
+        config: ChatConfig,
+        *,
+        cache_key: str | None = None,
+        adapter: AdapterSpec | None = None,
+    ) -> Iterator[str]:
+        """Stream completion text for a chat transcript, one delta at a time.
+
+        Generations are serialized because a llama.cpp context is not re-entrant. Passing a
+        stable `cache_key` (e.g. the conversation) lets the next turn reuse this prompt prefix.
+        """
+        for _, delta, _ in self.generate_choices(
+            config, messages=messages, cache_key=cache_key, adapter=adapter
+        ):
+            if delta:
+                yield delta
+
+    def generate_choices(
+        self,
+        config: ChatConfig,
+        *,
+        messages: list[dict[str, str]] | None = None,
+        prompt: str | list[int] | None = None,
+        n: int = 1,
+        stop: list[str] | None = None,
+        seed: int | None = None,
+        cache_key: str | None = None,
+        adapter: AdapterSpec | None = None,
+        background: bool = False,
+    ) -> Iterator[tuple[int, str, str | None]]:
+        """Stream `n` sampled continuations as `(choice, delta, finish_reason)` tuples.
+
+        Pass either a chat transcript (`messages`) or a raw `prompt`. All choices run back to
+        back under one hold of the generation lock, so llama.cpp's prefix matching reuses the
+        prompt's KV cache: the prompt is prefilled once and every further choice only
+        re-evaluates its last token before sampling diverges.
+
+        `background` generations only take an idle runtime and give it up between tokens as
+        soon as a foreground caller queues; both cases raise `RuntimeBusyError`.
+        """
+        with self._generation_slot(cache_key, background=background) as instance:
+            with self._lock:
+                state = self._state
+            if state is None:
+                raise RuntimeNotAvailableError("No model is loaded.")
+            yield from instance.worker.stream(
+                lambda: self._run_choices(
+                    instance,
+                    state.model_path,
+                    config,
+                    messages=messages,
+                    prompt=prompt,
+                    n=n,
+                    stop=stop,
+                    seed=seed,
+                    cache_key=cache_key,
+                    adapter=adapter,
+                    background=background,
+                )
+            )
+
+    def _run_choices(
+        self,
+        instance: _Instance,
+        model_path: Path,
+        config: ChatConfig,
+        *,
+        messages: list[dict[str, str]] | None,
+        prompt: str | list[int] | None,
+        n: int,
+        stop: list[str] | None,
+        seed: int | None,
+        cache_key: str | None,
+        adapter: AdapterSpec | None,
+        background: bool,
+    ) -> Iterator[tuple[int, str, str | None]]:
+        """The body of `generate_choices`, run on the instance's worker thread."""
+        llama = instance.llama
+        if adapter is not None or not background:
+            # Background work without an adapter runs under whichever is active rather than
+            # detaching it, which would cost the next foreground request a swap and a prefill.
+            self._use_adapter(instance, adapter)
+        if messages is not None:
+            rendered = self._render_chat(llama, model_path, messages, cache_key)
+            if rendered is not None:
+                messages, prompt = None, rendered
+        constraint = constraint_for(config)
+        compiled = (
+            self._compile_constraint(constraint, instance=instance.placement.index)
+            if constraint
+            else None
+        )
+        started = perf_counter_ns()
+        tokens = 0
+        try:
+            for choice in range(n):
+                for delta, finish_reason in self._sample(
+                    llama,
+                    config,
+                    messages=messages,
+                    prompt=prompt,
+                    stop=stop,
+                    seed=None if seed is None else seed + choice,
+                    shared_prefix=choice > 0,
+                    grammar=compiled.grammar if compiled else None,
+                ):
+                    if background and instance.waiting:
+                        raise RuntimeBusyError("Preempted by a foreground generation.")
+                    tokens += bool(delta)
+                    yield choice, delta, finish_reason
+        finally:
+            if constraint is not None and compiled is not None:
+                _report_constraint(constraint, compiled, started, tokens)
+
+    def _use_adapter(self, instance: _Instance, adapter: AdapterSpec | None) -> None:
+        """Make `adapter` (or none) the active LoRA on the instance's resident base model.
+
+        Called with the instance lock held. Loaded adapters stay in a small LRU, so
+        switching between fine-tunes is a pointer swap on the context, not a model reload.
+        """
+        wanted = (adapter.adapter_id, adapter.scale) if adapter else None
+        if wanted == instance.active_adapter:
+            return
+        llama = instance.llama
+        started = perf_counter()
+        with tracer.span("runtime.swap_adapter", adapter_id=wanted and wanted[0]):
+            # Detach first so the LRU may free any handle, including the one active until now.
+            self._set_adapter(llama, None, 0.0)
+            instance.active_adapter = None
+            if adapter is not None:
+                self._set_adapter(llama, self._adapter_handle(instance, adapter), adapter.scale)
+            if llama is not None:
+                # KV entries computed under other weights must not be reused as a prefix.
+                llama.reset()
+        instance.active_adapter = wanted
+        RUNTIME_ADAPTER_SWAP.observe(perf_counter() - started)
+
+    def _adapter_handle(self, instance: _Instance, adapter: AdapterSpec) -> Any:
+        handle = instance.adapters.get(adapter.adapter_id)
+        record_cache("lora_adapter", hit=handle is not None)
+        if handle is not None:
+            instance.adapters.move_to_end(adapter.adapter_id)
+            return handle
+        if not adapter.path.exists():
+            raise FileNotFoundError(f"Adapter path {adapter.path} does not exist.")
+        with tracer.span("runtime.load_adapter", adapter_id=adapter.adapter_id):
+            handle = self._load_adapter(instance.llama, adapter.path)
+        instance.adapters[adapter.adapter_id] = handle
+        while len(instance.adapters) > settings.lora_max_loaded:
+            _, evicted = instance.adapters.popitem(last=False)
+            self._free_adapter(evicted)
+        return handle
+
+    def forget_adapter(self, adapter_id: int) -> None:
+        """Detach and free a loaded adapter on every instance, e.g. after it was deleted."""
+        for instance in self._instances:
+            with instance.lock:
+                handle = instance.adapters.pop(adapter_id, None)
+                if handle is None:
+                    continue
+                if instance.active_adapter and instance.active_adapter[0] == adapter_id:
+                    self._set_adapter(instance.llama, None, 0.0)
+                    instance.active_adapter = None
+                self._free_adapter(handle)
+
+    def _load_adapter(self, llama: Llama | None, path: Path) -> Any:
+        handle = _llama_api().llama_lora_adapter_init(llama.model, str(path).encode())  # type: ignore[union-attr]
+        if not handle:
+            raise RuntimeError(f"Could not load LoRA adapter {path.name}.")
+        return handle
+
+    def _set_adapter(self, llama: Llama | None, handle: Any, scale: float) -> None:
+        if llama is None:
+            return
+        api = _llama_api()
+        api.llama_lora_adapter_clear(llama.ctx)
+        if handle is not None and api.llama_lora_adapter_set(llama.ctx, handle, scale) != 0:
+            raise RuntimeError("Could not apply the LoRA adapter.")
+
+    def _free_adapter(self, handle: Any) -> None:
+        _llama_api().llama_lora_adapter_free(handle)
+
+    def check_constraint(self, config: ChatConfig) -> None:
+        """Compile `config`'s output constraint ahead of generation; ValueError when invalid.
+
+        This warms the first instance's copy; other instances compile their own on first use.
+        """
+        constraint = constraint_for(config)
+        if constraint is not None:
+            self._compile_constraint(constraint)
+
+    def _compile_constraint(
+        self, constraint: Constraint, *, instance: int = 0
+    ) -> CompiledGrammar | None:
+        """The compiled grammar for `constraint` on `instance`, from the LRU when possible."""
+        try:
+            return grammar_cache.get(constraint, instance=instance)
+        except ImportError as exc:
+            raise RuntimeNotAvailableError("Constrained decoding needs llama-cpp-python.") from exc
+
+    def _render_chat(
+        self,
+        llama: Llama | None,
+        model_path: Path,
+        messages: list[dict[str, str]],
+        cache_key: str | None,
+    ) -> str | list[int] | None:
+        """Format `messages` with the model's own GGUF chat template.
+
+        Returns token ids (or text without a tokenizer), or None when the model has no usable
+        template and llama.cpp should format the chat itself.
+        """
+        template = chat_templates.template_for(model_path)
+        if template is None:
+            return None
+        tokenize = None
+        if llama is not None:
+
+            def tokenize(text: str) -> list[int]:
+                return llama.tokenize(text.encode("utf-8"), add_bos=False, special=True)
+
+        with tracer.span("runtime.render_prompt") as span:
+            rendered = chat_templates.render(cache_key, template, messages, tokenize)
+            if span is not None:
+                span.attributes.update(
+                    rendered=rendered.rendered_messages, reused_tokens=rendered.reused_tokens
+                )
+        return rendered.token_ids if rendered.token_ids is not None else rendered.text
+
+    def _sample(
+        self,
+        llama: Llama | None,
+        config: ChatConfig,
+        *,
+        messages: list[dict[str, str]] | None,
+        prompt: str | list[int] | None,
+        stop: list[str] | None,
+        seed: int | None,
+        shared_prefix: bool,
+        grammar: Any = None,
+    ) -> Iterator[tuple[str, str | None]]:
+        """One continuation as `(delta, finish_reason)` pairs.
+
+        `shared_prefix` says the previous choice just evaluated the same prompt; llama.cpp
+        detects that on its own, so it only matters to runtimes that fake the prefill.
+        """
+        options: dict[str, Any] = {
+            "stream": True,
+            "temperature": config.temperature,
+            "top_p": config.top_p,
+            "max_tokens": config.max_tokens,
+            "presence_penalty": config.presence_penalty,
+            "frequency_penalty": config.frequency_penalty,
+            "stop": stop,
+            "seed": seed,
+            "grammar": grammar,
+        }
+        if messages is not None:
+            for chunk in llama.create_chat_completion(messages=messages, **options):  # type: ignore[union-attr]
+                choice = chunk["choices"][0]
+                yield choice["delta"].get("content") or "", choice.get("finish_reason")
+        else:
+            for chunk in llama.create_completion(prompt=prompt or "", **options):  # type: ignore[union-attr]
+                choice = chunk["choices"][0]
+                yield choice.get("text") or "", choice.get("finish_reason")
+
+    def _route(self, cache_key: str | None, *, background: bool) -> _Instance:
+        """Pick the instance for one generation; called with `_route_lock` held.
+
+        Foreground work goes to the least-loaded instance, but stays on the one that last
+        served `cache_key` while it is within `runtime_affinity_slack` of that load, since its
+        KV cache still holds the conversation's prefix. Background work only takes an idle one,
+        preferring one without an active adapter.
+        """
+        instances = self._instances
+        if not instances:
+            raise RuntimeNotAvailableError("No model is loaded.")
+        if background:
+            idle = [item for item in instances if not item.waiting and not item.lock.locked()]
+            if not idle:
+                raise RuntimeBusyError("The runtime is busy.")
+            return min(idle, key=lambda item: item.active_adapter is not None)
+        chosen = min(instances, key=lambda item: (item.load(), item.routed))
+        if cache_key is not None and len(instances) > 1:
+            preferred = self._affinity.get(cache_key)
+            hit = preferred is not None and (
+                preferred.load() <= chosen.load() + settings.runtime_affinity_slack
+            )
+            record_cache("instance_affinity", hit=hit)
+            if hit:
+                chosen = preferred  # type: ignore[assignment]
+            self._affinity[cache_key] = chosen
+            self._affinity.move_to_end(cache_key)
+            while len(self._affinity) > settings.runtime_affinity_entries:
+                self._affinity.popitem(last=False)
+        chosen.routed += 1
+        return chosen
+
+    @contextmanager
+    def _generation_slot(
+        self, cache_key: str | None = None, *, background: bool = False
+    ) -> Iterator[_Instance]:
+        """Route to an instance and hold its lock, recording how long the caller queued.
+
+        Background callers never queue, and do not count as use for the idle-unload timer.
+        """
+        if background:
+            with self._route_lock:
+                instance = self._route(cache_key, background=True)
+            if not instance.lock.acquire(blocking=False):
+                raise RuntimeBusyError("The runtime is busy.")
+            instance.background = True
+            try:
+                yield instance
+            finally:
+                instance.background = False
+                instance.lock.release()
+            return
+
+        queued_at = perf_counter_ns()
+        while True:
+            with self._route_lock:
+                instance = self._route(cache_key, background=False)
+                instance.waiting += 1
+            try:
+                instance.lock.acquire()
+            finally:
+                with self._route_lock:
+                    instance.waiting -= 1
+            if instance in self._instances:
+                break
+            instance.lock.release()  # The model was reloaded while this caller queued.
+        try:
+            acquired_at = perf_counter_ns()
+            RUNTIME_QUEUE_WAIT.observe((acquired_at - queued_at) / 1e9)
+            tracer.record_span(
+                "runtime.queue_wait", queued_at, acquired_at, instance=instance.placement.index
+            )
+            mark_generation_start(acquired_at)
+            self._last_used = monotonic()
+            yield instance
+        finally:
+            self._last_used = monotonic()
+            instance.lock.release()
+
+    def embed(self, texts: list[str]) -> list[list[float]]:
+        """Embed a batch of texts with the loaded model.
+
+        Runs on an instance's worker under its generation slot, so it never overlaps a
+        generation there. The slot is held for one batch, so long ingests interleave with chat.
+        """
+        with self._generation_slot() as instance:
+            return instance.worker.call(lambda: self._embed(instance, texts))
+
+    def _embed(self, instance: _Instance, texts: list[str]) -> list[list[float]]:
+        if instance.embedder is None:
+            # Generation contexts cannot embed; a second, `embedding=True` context of the same
+            # file shares its mapped weights and is only created once embeddings are asked for.
+            with tracer.span("runtime.load_embedder", instance=instance.placement.index):
+                instance.embedder = self._create_llama({**instance.llama_args, "embedding": True})
+        if instance.embedder is None:
+            raise RuntimeNotAvailableError("This runtime cannot compute embeddings.")
+        return instance.embedder.embed(texts)
+
     def get_state(self) -> LoadedModelState | None:
         """Return details about the loaded model, if any."""
         with self._lock:
@@ -108,6 +923,8 @@ class LlamaRuntime:
 
     def memory_snapshot(self) -> MemorySnapshot:
         """Return host + GPU memory usage."""
+        import psutil
+
         process = psutil.Process()
         rss = int(process.memory_info().rss)
         vram_bytes, source = self._read_rocm_vram_usage()
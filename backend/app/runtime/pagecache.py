@@ -0,0 +1,154 @@
+"""Page-cache helpers for mmap-loaded model files.
+
+`prewarm_file` streams a GGUF through the page cache with sequential read-ahead hints so the
+first tokens after a load do not stall on page faults. `page_cache_residency` reports how much
+of a file is already cached, using mincore(2) where the platform has it.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import logging
+import mmap
+import os
+import sys
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from threading import Lock
+
+logger = logging.getLogger(__name__)
+
+_READ_CHUNK = 8 * 1024 * 1024
+_PROT_READ = 0x1
+_MAP_SHARED = 0x01
+_MAP_FAILED = ctypes.c_void_p(-1).value
+# mincore reports residency in the low bit of each byte; the other bits are reserved.
+_RESIDENT_BIT = bytes(value & 1 for value in range(256))
+
+
+@dataclass(frozen=True)
+class PageResidency:
+    resident_bytes: int
+    total_bytes: int
+
+    @property
+    def fraction(self) -> float:
+        return self.resident_bytes / self.total_bytes if self.total_bytes else 1.0
+
+
+def _load_libc() -> ctypes.CDLL | None:
+    if not sys.platform.startswith(("linux", "darwin", "freebsd")):
+        return None
+    name = ctypes.util.find_library("c")
+    try:
+        libc = ctypes.CDLL(name, use_errno=True)
+    except OSError:
+        return None
+    libc.mmap.restype = ctypes.c_void_p
+    libc.mmap.argtypes = [
+        ctypes.c_void_p,
+        ctypes.c_size_t,
+        ctypes.c_int,
+        ctypes.c_int,
+        ctypes.c_int,
+        ctypes.c_long,
+    ]
+    libc.munmap.argtypes = [ctypes.c_void_p, ctypes.c_size_t]
+    libc.mincore.argtypes = [ctypes.c_void_p, ctypes.c_size_t, ctypes.c_void_p]
+    return libc
+
+
+_libc = _load_libc()
+
+
+def resident_page_count(vector: bytes) -> int:
+    """Pages marked resident in a mincore vector, counted in C rather than per byte."""
+    return vector.translate(_RESIDENT_BIT).count(1)
+
+
+def page_cache_residency(path: Path) -> PageResidency | None:
+    """Bytes of `path` currently in the page cache, or None when mincore is unavailable."""
+    if _libc is None:
+        return None
+    try:
+        size = path.stat().st_size
+    except OSError:
+        return None
+    if size == 0:
+        return PageResidency(resident_bytes=0, total_bytes=0)
+    page = mmap.PAGESIZE
+    pages = (size + page - 1) // page
+    with path.open("rb") as handle:
+        address = _libc.mmap(None, size, _PROT_READ, _MAP_SHARED, handle.fileno(), 0)
+        if address in (None, _MAP_FAILED):
+            return None
+        try:
+            vector = (ctypes.c_ubyte * pages)()
+            if _libc.mincore(address, size, vector) != 0:
+                return None
+        finally:
+            _libc.munmap(address, size)
+    resident_pages = resident_page_count(bytes(vector))
+    return PageResidency(resident_bytes=min(size, resident_pages * page), total_bytes=size)
+
+
+def prewarm_file(path: Path) -> int:
+    """Read `path` sequentially to pull it into the page cache; returns bytes read.
+
+    Skipped (returns 0) when the file would not fit in available memory, since reading it
+    would only evict other hot pages.
+    """
+    import psutil
+
+    size = path.stat().st_size
+    if size > psutil.virtual_memory().available:
+        logger.info("Skipping prewarm of %s: larger than available memory.", path.name)
+        return 0
+    total = 0
+    buffer = bytearray(_READ_CHUNK)
+    view = memoryview(buffer)
+    with path.open("rb", buffering=0) as handle:
+        if hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(handle.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            os.posix_fadvise(handle.fileno(), 0, 0, os.POSIX_FADV_WILLNEED)
+        while read := handle.readinto(view):
+            total += read
+    return total
+
+
+class PageCacheWarmer:
+    """Prewarms files on a background thread, coalescing repeat requests for the same path."""
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._executor: ThreadPoolExecutor | None = None
+        self._inflight: dict[Path, Future[int]] = {}
+
+    def submit(self, path: Path) -> Future[int]:
+        with self._lock:
+            future = self._inflight.get(path)
+            if future is not None:
+                return future
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="prewarm")
+            future = self._executor.submit(self._prewarm, path)
+            self._inflight[path] = future
+        future.add_done_callback(lambda _: self._forget(path))
+        return future
+
+    def _forget(self, path: Path) -> None:
+        with self._lock:
+            self._inflight.pop(path, None)
+
+    @staticmethod
+    def _prewarm(path: Path) -> int:
+        try:
+            return prewarm_file(path)
+        except OSError:
+            logger.warning("Prewarming %s failed.", path, exc_info=True)
+            return 0
+
+
+page_cache_warmer = PageCacheWarmer()
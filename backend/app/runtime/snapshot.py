@@ -0,0 +1,203 @@
+"""Versioned in-memory runtime snapshot with push updates for SSE subscribers.
+
+Route handlers publish a fresh `RuntimeState` whenever they load, unload or reconfigure the
+runtime. Polling GETs and event-stream subscribers read the pre-serialized payload, so
+neither touches the database nor the runtime lock.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import time
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
+from pathlib import Path
+from threading import Lock
+from uuid import uuid4
+
+from anyio import to_thread
+from fastapi.requests import HTTPConnection
+from sqlmodel import Session
+
+from backend.app.config import settings
+from backend.app.db.models import InstalledModel
+from backend.app.runtime.manager import LlamaRuntime, LoadedModelState
+from backend.app.schemas.runtime import (
+    InstalledModelRead,
+    MemoryStats,
+    RuntimeInstanceState,
+    RuntimeState,
+)
+from backend.app.telemetry.metrics import record_cache
+
+_SUBSCRIBER_QUEUE_SIZE = 8
+
+
+@dataclass(frozen=True)
+class CachedPayload:
+    version: int
+    body: bytes
+    etag: str
+
+
+@dataclass(frozen=True)
+class RuntimeEvent:
+    event: str
+    payload: CachedPayload
+
+    def encode(self) -> str:
+        data = self.payload.body.decode()
+        return f"id: {self.payload.version}\nevent: {self.event}\ndata: {data}\n\n"
+
+
+@dataclass(eq=False)
+class _Subscriber:
+    loop: asyncio.AbstractEventLoop
+    queue: asyncio.Queue[RuntimeEvent] = field(
+        default_factory=lambda: asyncio.Queue(maxsize=_SUBSCRIBER_QUEUE_SIZE)
+    )
+
+
+def _offer(queue: asyncio.Queue[RuntimeEvent], event: RuntimeEvent) -> None:
+    if queue.full():
+        # Every event is a full snapshot, so the newest one supersedes whatever is oldest.
+        queue.get_nowait()
+    queue.put_nowait(event)
+
+
+class RuntimeStateHub:
+    """Holds the latest runtime state + memory payloads and fans changes out to subscribers."""
+
+    def __init__(self, *, memory_max_age: float | None = None) -> None:
+        self._lock = Lock()
+        self._instance = uuid4().hex[:8]
+        self._memory_max_age = memory_max_age or settings.runtime_memory_poll_interval
+        self._version = 0
+        self._state = self._freeze("s", RuntimeState(loaded=False).model_dump_json().encode())
+        self._memory: CachedPayload | None = None
+        self._memory_sampled_at = 0.0
+        self._subscribers: set[_Subscriber] = set()
+        self._sampler: asyncio.Task[None] | None = None
+
+    def _freeze(self, kind: str, body: bytes) -> CachedPayload:
+        return CachedPayload(
+            version=self._version,
+            body=body,
+            etag=f'"{self._instance}-{kind}{self._version}"',
+        )
+
+    def state(self) -> CachedPayload:
+        """Return the latest pre-serialized `RuntimeState`."""
+        return self._state
+
+    def publish_state(self, state: RuntimeState) -> CachedPayload:
+        """Replace the cached state and push it to subscribers."""
+        body = state.model_dump_json().encode()
+        with self._lock:
+            self._version += 1
+            self._state = payload = self._freeze("s", body)
+            subscribers = list(self._subscribers)
+        self._broadcast(RuntimeEvent("state", payload), subscribers)
+        return payload
+
+    def memory(self, runtime: LlamaRuntime) -> CachedPayload:
+        """Return memory stats, re-sampling the runtime at most once per `memory_max_age`."""
+        with self._lock:
+            cached = self._memory
+            if cached and time.monotonic() - self._memory_sampled_at < self._memory_max_age:
+                record_cache("runtime_memory", hit=True)
+                return cached
+        record_cache("runtime_memory", hit=False)
+        snapshot = runtime.memory_snapshot()
+        return self.publish_memory(
+            MemoryStats(
+                resident_bytes=snapshot.resident_bytes,
+                vram_bytes=snapshot.vram_bytes,
+                source=snapshot.source,
+            )
+        )
+
+    def publish_memory(self, stats: MemoryStats) -> CachedPayload:
+        """Cache a memory sample; subscribers only hear about it when it changed."""
+        body = stats.model_dump_json().encode()
+        with self._lock:
+            self._memory_sampled_at = time.monotonic()
+            if self._memory is not None and self._memory.body == body:
+                return self._memory
+            self._version += 1
+            self._memory = payload = self._freeze("m", body)
+            subscribers = list(self._subscribers)
+        self._broadcast(RuntimeEvent("memory", payload), subscribers)
+        return payload
+
+    @contextlib.asynccontextmanager
+    async def subscribe(self, runtime: LlamaRuntime) -> AsyncIterator[asyncio.Queue[RuntimeEvent]]:
+        """Register an event queue primed with the current state; memory is sampled meanwhile."""
+        subscriber = _Subscriber(loop=asyncio.get_running_loop())
+        subscriber.queue.put_nowait(RuntimeEvent("state", self._state))
+        with self._lock:
+            self._subscribers.add(subscriber)
+            if self._memory is not None:
+                subscriber.queue.put_nowait(RuntimeEvent("memory", self._memory))
+            if self._sampler is None or self._sampler.done():
+                self._sampler = asyncio.create_task(self._sample_memory(runtime))
+        try:
+            yield subscriber.queue
+        finally:
+            with self._lock:
+                self._subscribers.discard(subscriber)
+                sampler = self._sampler if not self._subscribers else None
+                if sampler is not None:
+                    self._sampler = None
+            if sampler is not None:
+                sampler.cancel()
+
+    async def _sample_memory(self, runtime: LlamaRuntime) -> None:
+        while True:
+            await to_thread.run_sync(self.memory, runtime)
+            await asyncio.sleep(self._memory_max_age)
+
+    def _broadcast(self, event: RuntimeEvent, subscribers: list[_Subscriber]) -> None:
+        for subscriber in subscribers:
+            try:
+                subscriber.loop.call_soon_threadsafe(_offer, subscriber.queue, event)
+            except RuntimeError:  # loop already closed; the subscriber is gone
+                with self._lock:
+                    self._subscribers.discard(subscriber)
+
+
+def describe_instances(state: LoadedModelState) -> list[RuntimeInstanceState]:
+    """Where each instance of the loaded model runs."""
+    return [
+        RuntimeInstanceState(
+            index=placement.index,
+            cpus=sorted(placement.cpus) if placement.cpus is not None else None,
+            cpu_threads=placement.threads,
+            prefill_threads=placement.prefill_threads,
+            physical_cores=placement.physical_cores,
+            efficiency_cores=placement.efficiency_cores,
+        )
+        for placement in state.instances
+    ]
+
+
+def build_runtime_state(session: Session, runtime: LlamaRuntime) -> RuntimeState:
+    """Describe what the runtime currently has loaded."""
+    state = runtime.get_state()
+    model = session.get(InstalledModel, state.model_id) if state else None
+    if state is None or model is None:
+        return RuntimeState(loaded=False)
+    return RuntimeState(
+        loaded=True,
+        model=InstalledModelRead.model_validate(model),
+        config=state.config,
+        runtime_path=str(Path(model.file_path).parent),
+        loaded_at=state.loaded_at,
+        instances=describe_instances(state),
+    )
+
+
+def get_runtime_hub(connection: HTTPConnection) -> RuntimeStateHub:
+    """Return the snapshot hub owned by the running app (for requests and websockets)."""
+    return connection.app.state.runtime_hub
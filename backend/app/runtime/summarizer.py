@@ -0,0 +1,223 @@
+"""Background compaction of long conversations into model-written summaries.
+
+When a conversation's history nears the context window, the chat path schedules it here and
+moves on. A worker thread summarizes everything but the most recent turns with the loaded
+model and stores the result linked to the message range it replaces; the prompt builder then
+sends that summary plus the turns after it, so long sessions keep a bounded prompt.
+
+Summaries run as background generations: they start only once the runtime has been idle for
+`retry_interval` and give the runtime up between tokens as soon as a chat request queues.
+Preemption cannot interrupt a prefill, so each pass reads at most `max_input_tokens` of
+history; a chat that arrives mid-pass waits for that short prefill, never a full window.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections import OrderedDict
+from threading import Event, Lock, Thread
+
+from sqlmodel import Session, select
+
+from backend.app.config import settings
+from backend.app.db.models import Conversation, ConversationSummary, Message
+from backend.app.db.session import get_engine
+from backend.app.runtime.manager import LlamaRuntime, RuntimeBusyError, RuntimeNotAvailableError
+from backend.app.schemas.chat import ChatConfig
+from backend.app.schemas.conversations import MessageRole, MessageStatus
+from backend.app.telemetry.metrics import CONVERSATION_SUMMARIES
+from backend.app.telemetry.tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+_INSTRUCTIONS = (
+    "You keep a running summary of a conversation between a user and an assistant. Rewrite "
+    "the summary so it also covers the new messages. Keep facts, decisions, names, numbers "
+    "and open questions; drop pleasantries. Reply with the summary only."
+)
+
+
+def latest_summary(session: Session, conversation_id: int) -> ConversationSummary | None:
+    """The summary covering the most messages of `conversation_id`, if any."""
+    return session.exec(
+        select(ConversationSummary)
+        .where(ConversationSummary.conversation_id == conversation_id)
+        .order_by(ConversationSummary.last_message_id.desc())
+    ).first()
+
+
+class ConversationSummarizer:
+    """Queue of conversations due for compaction, drained by one low-priority worker."""
+
+    def __init__(
+        self,
+        *,
+        keep_recent: int | None = None,
+        max_tokens: int | None = None,
+        max_input_tokens: int | None = None,
+        retry_interval: float | None = None,
+    ) -> None:
+        self._keep_recent = (
+            settings.summary_keep_recent_messages if keep_recent is None else keep_recent
+        )
+        self._max_tokens = max_tokens or settings.summary_max_tokens
+        self._max_input_tokens = max_input_tokens or settings.summary_max_input_tokens
+        self._retry_interval = (
+            settings.summary_retry_interval if retry_interval is None else retry_interval
+        )
+        self._lock = Lock()
+        self._pending: OrderedDict[int, LlamaRuntime] = OrderedDict()
+        self._wake = Event()
+        self._closed = Event()
+        self._thread: Thread | None = None
+
+    def schedule(self, runtime: LlamaRuntime, conversation_id: int) -> None:
+        """Queue `conversation_id` for compaction with `runtime`; never blocks."""
+        if not settings.summary_enabled:
+            return
+        with self._lock:
+            self._pending[conversation_id] = runtime
+        self._ensure_thread()
+
+    def pending(self) -> list[int]:
+        with self._lock:
+            return list(self._pending)
+
+    def run_pending(self) -> None:
+        """Summarize queued conversations while the runtime stays idle."""
+        while not self._closed.is_set():
+            with self._lock:
+                if not self._pending:
+                    return
+                conversation_id, runtime = next(iter(self._pending.items()))
+                if runtime.is_busy() or runtime.idle_seconds() < self._retry_interval:
+                    return
+                del self._pending[conversation_id]
+            try:
+                outcome = "stored" if self.summarize(runtime, conversation_id) else "skipped"
+            except RuntimeBusyError:
+                CONVERSATION_SUMMARIES.labels("preempted").inc()
+                with self._lock:
+                    self._pending.setdefault(conversation_id, runtime)
+                return
+            except RuntimeNotAvailableError:
+                outcome = "skipped"
+            except Exception:
+                logger.exception("Summarizing conversation %s failed.", conversation_id)
+                outcome = "failed"
+            CONVERSATION_SUMMARIES.labels(outcome).inc()
+
+    def summarize(self, runtime: LlamaRuntime, conversation_id: int) -> ConversationSummary | None:
+        """Fold the oldest unsummarized turns into a new summary; None when there is no work.
+
+        Each pass covers as many turns as fit in `max_input_tokens` and the context window;
+        when more remain the conversation is queued again for the next idle slot.
+        """
+        state = runtime.get_state()
+        if state is None:
+            return None
+        with Session(get_engine()) as session:
+            previous = latest_summary(session, conversation_id)
+            statement = select(
+                Message.id, Message.role, Message.content, Message.token_count
+            ).where(
+                Message.conversation_id == conversation_id,
+                Message.status != MessageStatus.STREAMING.value,
+                Message.content != "",
+            )
+            if previous is not None:
+                statement = statement.where(Message.id > previous.last_message_id)
+            rows = session.exec(statement.order_by(Message.id)).all()
+            first_id = previous.first_message_id if previous is not None else None
+            summary_so_far = previous.content if previous is not None else None
+
+        from backend.app.runtime import get_token_counter
+
+        counter = get_token_counter()
+        instruction_tokens, summary_tokens = counter.count(
+            runtime, state.model_id, state.model_path, [_INSTRUCTIONS, summary_so_far or ""]
+        ).counts
+        budget = state.config.context_length - self._max_tokens - instruction_tokens
+        budget = min(budget, self._max_input_tokens) - summary_tokens
+        end = len(rows) - self._keep_recent
+        used = 0
+        for index, row in enumerate(rows[: max(end, 0)]):
+            used += row.token_count
+            if used > budget:
+                end = index
+                break
+        # Cut right before a user turn so the remaining history still alternates from the user.
+        while 0 < end < len(rows) and rows[end].role != MessageRole.USER.value:
+            end -= 1
+        if end <= 0:
+            return None
+        chunk = rows[:end]
+
+        sections = [f"Summary so far:\n{summary_so_far}"] if summary_so_far else []
+        sections.append(
+            "New messages:\n" + "\n\n".join(f"{row.role}: {row.content}" for row in chunk)
+        )
+        messages = [
+            {"role": MessageRole.SYSTEM.value, "content": _INSTRUCTIONS},
+            {"role": MessageRole.USER.value, "content": "\n\n".join(sections)},
+        ]
+        config = ChatConfig(temperature=0.2, max_tokens=self._max_tokens)
+        with tracer.span("chat.summarize", conversation_id=conversation_id, messages=len(chunk)):
+            text = "".join(
+                delta
+                for _, delta, _ in runtime.generate_choices(
+                    config, messages=messages, background=True
+                )
+            ).strip()
+        if not text:
+            return None
+
+        with Session(get_engine()) as session:
+            if session.get(Conversation, conversation_id) is None:
+                return None
+            summary = ConversationSummary(
+                conversation_id=conversation_id,
+                first_message_id=chunk[0].id if first_id is None else first_id,
+                last_message_id=chunk[-1].id,
+                content=text,
+                token_count=counter.count(runtime, state.model_id, state.model_path, [text]).counts[
+                    0
+                ],
+            )
+            session.add(summary)
+            session.commit()
+            session.refresh(summary)
+        logger.info(
+            "Summarized %d messages of conversation %s into %d tokens.",
+            len(chunk),
+            conversation_id,
+            summary.token_count,
+        )
+        if len(rows) - end > self._keep_recent:
+            self.schedule(runtime, conversation_id)
+        return summary
+
+    def close(self) -> None:
+        """Stop the worker; queued conversations are dropped and rescheduled by later turns."""
+        self._closed.set()
+        self._wake.set()
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join()
+        with self._lock:
+            self._pending.clear()
+        self._closed.clear()
+        self._wake.clear()
+
+    def _ensure_thread(self) -> None:
+        if self._thread is not None or self._closed.is_set():
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = Thread(target=self._run, name="conversation-summarizer", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while not self._closed.is_set():
+            self._wake.wait(self._retry_interval or 0.1)
+            self.run_pending()
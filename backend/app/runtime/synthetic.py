@@ -0,0 +1,98 @@
+"""CPU-only runtime that fakes token generation for benchmarking the serving stack."""
+
+from __future__ import annotations
+
+import random
+import time
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+from backend.app.config import settings
+from backend.app.runtime.grammar import Constraint
+from backend.app.runtime.manager import LlamaRuntime
+from backend.app.schemas.chat import ChatConfig
+
+_VOCABULARY = (
+    "The quick brown fox jumps over the lazy dog while a small language model streams "
+    "tokens to an eager browser tab, one frame at a time, until the answer is complete."
+).split()
+
+
+def synthetic_token(index: int) -> str:
+    """Token `index` of an endless filler stream; every token after the first has a space."""
+    word = _VOCABULARY[index % len(_VOCABULARY)]
+    return word if index == 0 else f" {word}"
+
+
+class SyntheticRuntime(LlamaRuntime):
+    """Emits filler tokens at a configured pace instead of running llama.cpp.
+
+    Generations are still serialized behind the runtime's generation lock, so queueing under
+    concurrent load behaves like a single llama.cpp context.
+    """
+
+    requires_bindings = False
+
+    def __init__(
+        self,
+        *,
+        prefill_delay: float | None = None,
+        tokens_per_second: float | None = None,
+        jitter: float | None = None,
+        seed: int | None = None,
+    ) -> None:
+        super().__init__()
+        self.prefill_delay = (
+            settings.synthetic_prefill_delay if prefill_delay is None else prefill_delay
+        )
+        self.tokens_per_second = (
+            settings.synthetic_tokens_per_second if tokens_per_second is None else tokens_per_second
+        )
+        self.jitter = settings.synthetic_jitter if jitter is None else jitter
+        self._random = random.Random(seed)
+
+    def _create_llama(self, llama_args: dict[str, Any]) -> None:
+        return None
+
+    def _load_adapter(self, llama: None, path: Path) -> Path:
+        return path
+
+    def _free_adapter(self, handle: Any) -> None:
+        return None
+
+    def _compile_constraint(self, constraint: Constraint, *, instance: int = 0) -> None:
+        """Filler tokens ignore output constraints."""
+        return None
+
+    def _sample(
+        self,
+        llama: None,
+        config: ChatConfig,
+        *,
+        messages: list[dict[str, str]] | None,
+        prompt: str | list[int] | None,
+        stop: list[str] | None,
+        seed: int | None,
+        shared_prefix: bool,
+        grammar: Any = None,
+    ) -> Iterator[tuple[str, str | None]]:
+        """Sleep for the prefill delay (unless it is shared), then yield `max_tokens` words."""
+        if not shared_prefix:
+            time.sleep(self._jittered(self.prefill_delay))
+        interval = 1.0 / self.tokens_per_second if self.tokens_per_second > 0 else 0.0
+        for index in range(config.max_tokens):
+            if index:
+                time.sleep(self._jittered(interval))
+            yield synthetic_token(index), None
+        yield "", "length"
+
+    def embed(self, texts: list[str]) -> list[list[float]]:
+        from backend.app.documents.embeddings import HashingEmbedder
+
+        return HashingEmbedder(settings.document_embedding_dimensions).embed(texts)
+
+    def _jittered(self, seconds: float) -> float:
+        if seconds <= 0:
+            return 0.0
+        return max(0.0, seconds * (1 + self._random.uniform(-self.jitter, self.jitter)))
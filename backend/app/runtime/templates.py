@@ -0,0 +1,331 @@
+"""Chat templates compiled from GGUF metadata, with incremental per-conversation rendering.
+
+A model's Jinja chat template is compiled once per file. Rendering a conversation caches
+its prompt prefix (text and token ids) under a caller-chosen key, so the next turn only
+renders the messages appended since, instead of the whole history. Their token ids are
+appended to the cached ones only where the join is a special-token boundary; elsewhere BPE
+merges and SentencePiece's space prefix would make the pieces differ from the whole.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections import OrderedDict
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from datetime import datetime
+from hashlib import blake2b
+from pathlib import Path
+from threading import Lock
+
+from backend.app.config import settings
+from backend.app.runtime.gguf import read_metadata
+from backend.app.telemetry.metrics import record_cache
+
+logger = logging.getLogger(__name__)
+
+Message = dict[str, str]
+Tokenize = Callable[[str], list[int]]
+
+_TEMPLATE_KEY = "tokenizer.chat_template"
+_METADATA_KEYS = frozenset(
+    {
+        _TEMPLATE_KEY,
+        "tokenizer.ggml.tokens",
+        "tokenizer.ggml.token_type",
+        "tokenizer.ggml.bos_token_id",
+        "tokenizer.ggml.eos_token_id",
+    }
+)
+# llama.cpp token types matched whole before the text around them is tokenized.
+_SPECIAL_TOKEN_TYPES = frozenset({3, 4})  # CONTROL, USER_DEFINED
+_PROBES: tuple[tuple[Message, ...], ...] = (
+    (
+        {"role": "system", "content": "S"},
+        {"role": "user", "content": "U1"},
+        {"role": "assistant", "content": "A1"},
+        {"role": "user", "content": "U2"},
+        {"role": "assistant", "content": "A2"},
+        {"role": "user", "content": "U3"},
+    ),
+    (
+        {"role": "user", "content": "U1"},
+        {"role": "assistant", "content": "A1"},
+        {"role": "user", "content": "U2"},
+        {"role": "assistant", "content": "A2"},
+        {"role": "user", "content": "U3"},
+    ),
+)
+
+
+class ChatTemplate:
+    """A compiled Jinja chat template plus the special tokens it refers to.
+
+    `incremental` is decided once at compile time by checking that rendering any split of a
+    probe conversation piecewise reproduces the full render; templates that look at the whole
+    list (e.g. `loop.last` tricks) are always rendered in full.
+    """
+
+    def __init__(
+        self,
+        source: str,
+        *,
+        bos_token: str = "",
+        eos_token: str = "",
+        special_tokens: Sequence[str] = (),
+    ) -> None:
+        from jinja2 import TemplateError
+        from jinja2.sandbox import ImmutableSandboxedEnvironment
+
+        def raise_exception(message: str) -> None:
+            raise TemplateError(message)
+
+        environment = ImmutableSandboxedEnvironment(trim_blocks=True, lstrip_blocks=True)
+        environment.globals["raise_exception"] = raise_exception
+        environment.globals["strftime_now"] = lambda fmt: datetime.now().strftime(fmt)
+        self._template = environment.from_string(source)
+        self._errors: tuple[type[Exception], ...] = (TemplateError, TypeError, ValueError)
+        self.bos_token = bos_token
+        self.eos_token = eos_token
+        self._special_tokens = tuple(token for token in special_tokens if token)
+        self.incremental = self._check_incremental()
+
+    def token_boundary(self, text: str) -> bool:
+        """True when tokenizing `text` apart from what precedes it matches tokenizing both.
+
+        llama.cpp splits the prompt at special tokens and tokenizes the text between them
+        separately, so that holds when `text` starts with one.
+        """
+        return text.startswith(self._special_tokens)
+
+    def render(self, messages: Sequence[Message], *, add_generation_prompt: bool = True) -> str:
+        return self._template.render(
+            messages=list(messages),
+            add_generation_prompt=add_generation_prompt,
+            bos_token=self.bos_token,
+            eos_token=self.eos_token,
+        )
+
+    def _window(self, history: Sequence[Message]) -> list[Message]:
+        """Shortest tail of `history` that renders like the full history would.
+
+        A leading system message is kept, since templates special-case it, and the tail
+        starts at the same role parity so alternation checks see the original positions.
+        """
+        base = list(history[:1]) if history and history[0]["role"] == "system" else []
+        start = len(history) - 1
+        if start % 2 != len(base) % 2:
+            start -= 1
+        if start <= len(base):
+            return list(history)
+        return base + list(history[start:])
+
+    def render_delta(self, history: Sequence[Message], new: Sequence[Message]) -> str | None:
+        """Text that appending `new` adds to the render of `history`, or None if not a suffix."""
+        window = self._window(history)
+        try:
+            anchor = self.render(window, add_generation_prompt=False)
+            extended = self.render([*window, *new], add_generation_prompt=False)
+        except self._errors:
+            return None
+        return extended[len(anchor) :] if extended.startswith(anchor) else None
+
+    def generation_prompt(self, messages: Sequence[Message]) -> str | None:
+        """Text `add_generation_prompt` appends after `messages`, or None if not a suffix."""
+        window = self._window(messages)
+        try:
+            bare = self.render(window, add_generation_prompt=False)
+            prompted = self.render(window, add_generation_prompt=True)
+        except self._errors:
+            return None
+        return prompted[len(bare) :] if prompted.startswith(bare) else None
+
+    def _check_incremental(self) -> bool:
+        checked = False
+        for probe in _PROBES:
+            try:
+                full = self.render(probe, add_generation_prompt=False)
+            except self._errors:
+                continue  # The template rejects this conversation shape altogether.
+            for split in range(1, len(probe)):
+                window = self._window(probe[:split])
+                if len(window) == split:
+                    continue
+                try:
+                    head = self.render(probe[:split], add_generation_prompt=False)
+                    delta = self.render_delta(probe[:split], probe[split:])
+                except self._errors:
+                    return False
+                if delta is None or head + delta != full:
+                    return False
+            checked = True
+        return checked
+
+    @classmethod
+    def from_gguf(cls, path: Path) -> ChatTemplate | None:
+        """Compile the chat template embedded in `path`; None when it has none."""
+        metadata = read_metadata(path, _METADATA_KEYS.__contains__)
+        source = metadata.get(_TEMPLATE_KEY)
+        if not source:
+            return None
+        tokens: list[str] = metadata.get("tokenizer.ggml.tokens", [])
+        types: list[int] = metadata.get("tokenizer.ggml.token_type", [])
+
+        def token(key: str) -> str:
+            index = metadata.get(key)
+            return tokens[index] if isinstance(index, int) and 0 <= index < len(tokens) else ""
+
+        return cls(
+            source,
+            bos_token=token("tokenizer.ggml.bos_token_id"),
+            eos_token=token("tokenizer.ggml.eos_token_id"),
+            special_tokens=[
+                text
+                for text, kind in zip(tokens, types, strict=False)
+                if kind in _SPECIAL_TOKEN_TYPES
+            ],
+        )
+
+
+@dataclass(frozen=True)
+class RenderedPrompt:
+    text: str
+    token_ids: list[int] | None
+    rendered_messages: int
+    reused_tokens: int
+
+
+@dataclass
+class _Prefix:
+    template: ChatTemplate
+    digests: list[bytes]
+    messages: list[Message]
+    text: str
+    token_ids: list[int] | None
+
+
+def _digest(message: Message) -> bytes:
+    hasher = blake2b(digest_size=16)
+    hasher.update(message["role"].encode("utf-8"))
+    hasher.update(b"\0")
+    hasher.update(message["content"].encode("utf-8"))
+    return hasher.digest()
+
+
+class ChatTemplateEngine:
+    """Per-model compiled templates and an LRU of rendered conversation prefixes."""
+
+    def __init__(self, *, max_prefixes: int | None = None) -> None:
+        self._max_prefixes = max_prefixes or settings.chat_template_cache_entries
+        self._lock = Lock()
+        self._templates: dict[Path, tuple[int, ChatTemplate | None]] = {}
+        self._prefixes: OrderedDict[str, _Prefix] = OrderedDict()
+
+    def template_for(self, path: Path) -> ChatTemplate | None:
+        """The compiled template of the GGUF at `path`, recompiled only when the file changes."""
+        try:
+            mtime_ns = path.stat().st_mtime_ns
+        except OSError:
+            return None
+        with self._lock:
+            cached = self._templates.get(path)
+            record_cache("chat_template", hit=cached is not None and cached[0] == mtime_ns)
+            if cached is not None and cached[0] == mtime_ns:
+                return cached[1]
+            try:
+                template = ChatTemplate.from_gguf(path)
+            except ImportError:
+                template = None
+            except Exception as exc:
+                # A broken template must not block generation; llama.cpp formats the chat then.
+                logger.warning("No usable chat template in %s: %s", path.name, exc)
+                template = None
+            self._templates[path] = (mtime_ns, template)
+            return template
+
+    def render(
+        self,
+        key: str | None,
+        template: ChatTemplate,
+        messages: Sequence[Message],
+        tokenize: Tokenize | None = None,
+    ) -> RenderedPrompt:
+        """Render `messages` with a generation prompt, reusing the prefix cached under `key`.
+
+        When the cached messages are a prefix of `messages`, only the appended messages are
+        rendered. Their token ids extend the cached ones at special-token boundaries; any
+        other join is re-tokenized in full so the ids always match the rendered text.
+        """
+        suffix = template.generation_prompt(messages) if template.incremental else None
+        if suffix is None:
+            text = template.render(messages)
+            token_ids = tokenize(text) if tokenize is not None else None
+            return RenderedPrompt(text, token_ids, rendered_messages=len(messages), reused_tokens=0)
+
+        digests = [_digest(message) for message in messages]
+        with self._lock:
+            cached = self._prefixes.get(key) if key is not None else None
+        extended = self._extend(cached, template, messages, digests, tokenize) if cached else None
+        if key is not None:
+            record_cache("chat_prefix", hit=extended is not None)
+        if extended is not None:
+            prefix, reused = extended
+            rendered = len(messages) - len(cached.digests)  # type: ignore[union-attr]
+        else:
+            text = template.render(messages, add_generation_prompt=False)
+            token_ids = tokenize(text) if tokenize is not None else None
+            prefix = _Prefix(template, digests, list(messages), text, token_ids)
+            rendered, reused = len(messages), 0
+        if key is not None:
+            with self._lock:
+                self._prefixes[key] = prefix
+                self._prefixes.move_to_end(key)
+                while len(self._prefixes) > self._max_prefixes:
+                    self._prefixes.popitem(last=False)
+
+        token_ids = None
+        if prefix.token_ids is not None and tokenize is not None:
+            if not suffix or template.token_boundary(suffix):
+                token_ids = prefix.token_ids + (tokenize(suffix) if suffix else [])
+            else:
+                token_ids, reused = tokenize(prefix.text + suffix), 0
+        return RenderedPrompt(
+            prefix.text + suffix, token_ids, rendered_messages=rendered, reused_tokens=reused
+        )
+
+    @staticmethod
+    def _extend(
+        cached: _Prefix,
+        template: ChatTemplate,
+        messages: Sequence[Message],
+        digests: list[bytes],
+        tokenize: Tokenize | None,
+    ) -> tuple[_Prefix, int] | None:
+        """`cached` grown by the messages appended since, plus how many token ids it reused.
+
+        None when `cached` is not a prefix of `messages`.
+        """
+        size = len(cached.digests)
+        if cached.template is not template or digests[:size] != cached.digests:
+            return None
+        new = messages[size:]
+        delta = template.render_delta(cached.messages, new) if new else ""
+        if delta is None:
+            return None
+        text = cached.text + delta
+        token_ids, reused = None, 0
+        if tokenize is not None and cached.token_ids is not None:
+            if not delta or template.token_boundary(delta):
+                token_ids = cached.token_ids + (tokenize(delta) if delta else [])
+                reused = len(cached.token_ids)
+            else:
+                token_ids = tokenize(text)
+        return _Prefix(template, digests, list(messages), text, token_ids), reused
+
+    def clear(self) -> None:
+        with self._lock:
+            self._templates.clear()
+            self._prefixes.clear()
+
+
+chat_templates = ChatTemplateEngine()
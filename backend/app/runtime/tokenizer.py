@@ -0,0 +1,127 @@
+"""Token counting on a dedicated worker pool with a per-model count cache."""
+
+from __future__ import annotations
+
+import logging
+from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from hashlib import blake2b
+from pathlib import Path
+from threading import Lock
+from typing import TYPE_CHECKING
+
+from backend.app.config import settings
+from backend.app.telemetry.metrics import record_cache
+from backend.app.telemetry.tracing import tracer
+from backend.app.utils.tokens import estimate_tokens
+
+if TYPE_CHECKING:
+    from backend.app.runtime.manager import LlamaRuntime
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class TokenCounts:
+    counts: list[int]
+    cached: int
+    source: str
+
+
+def _digest(text: str) -> bytes:
+    return blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+
+class TokenCounter:
+    """Counts tokens for batches of text without touching the decode path.
+
+    Work runs on its own small thread pool against a `vocab_only` tokenizer per model, and
+    each model keeps an LRU of text digest -> count so unchanged messages are counted once.
+    Without a tokenizer (no bindings, synthetic runtime) counts fall back to the estimate.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_workers: int | None = None,
+        max_entries: int | None = None,
+        max_vocabs: int | None = None,
+    ) -> None:
+        self._max_workers = max_workers or settings.tokenizer_workers
+        self._max_entries = max_entries or settings.tokenizer_cache_entries
+        self._max_vocabs = max_vocabs or settings.tokenizer_max_vocabs
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = Lock()
+        self._vocab_lock = Lock()
+        self._counts: dict[int, OrderedDict[bytes, int]] = {}
+        self._sources: dict[int, str] = {}
+        self._vocabs: OrderedDict[int, Callable[[str], int] | None] = OrderedDict()
+
+    def submit(
+        self, runtime: LlamaRuntime, model_id: int, model_path: Path, texts: list[str]
+    ) -> Future[TokenCounts]:
+        """Queue a batch on the tokenizer pool and return immediately."""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._max_workers, thread_name_prefix="tokenizer"
+                )
+            return self._executor.submit(self.count, runtime, model_id, model_path, texts)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def count(
+        self, runtime: LlamaRuntime, model_id: int, model_path: Path, texts: list[str]
+    ) -> TokenCounts:
+        """Token counts for `texts`, tokenizing only the ones not already cached."""
+        keys = [_digest(text) for text in texts]
+        known: dict[bytes, int] = {}
+        with self._lock:
+            cache = self._counts.setdefault(model_id, OrderedDict())
+            for key in keys:
+                if key in cache:
+                    cache.move_to_end(key)
+                    known[key] = cache[key]
+        for key in keys:
+            record_cache("token_count", hit=key in known)
+        cached = sum(key in known for key in keys)
+
+        misses = {key: text for key, text in zip(keys, texts, strict=True) if key not in known}
+        if misses:
+            vocab = self._vocab(runtime, model_id, model_path)
+            with tracer.span("tokenizer.count", model_id=model_id, texts=len(misses)):
+                fresh = {key: (vocab or estimate_tokens)(text) for key, text in misses.items()}
+            known.update(fresh)
+            with self._lock:
+                self._sources[model_id] = "vocab" if vocab else "estimate"
+                cache = self._counts.setdefault(model_id, OrderedDict())
+                cache.update(fresh)
+                while len(cache) > self._max_entries:
+                    cache.popitem(last=False)
+        with self._lock:
+            source = self._sources.get(model_id, "estimate")
+        return TokenCounts(counts=[known[key] for key in keys], cached=cached, source=source)
+
+    def _vocab(
+        self, runtime: LlamaRuntime, model_id: int, model_path: Path
+    ) -> Callable[[str], int] | None:
+        with self._vocab_lock:
+            if model_id in self._vocabs:
+                self._vocabs.move_to_end(model_id)
+                return self._vocabs[model_id]
+            try:
+                with tracer.span("tokenizer.load_vocab", model_id=model_id):
+                    vocab = runtime.load_vocab(model_path)
+            except (OSError, RuntimeError, ValueError):
+                logger.warning("Could not load vocabulary of %s; estimating.", model_path)
+                vocab = None
+            self._vocabs[model_id] = vocab
+            while len(self._vocabs) > self._max_vocabs:
+                self._vocabs.popitem(last=False)
+            return vocab
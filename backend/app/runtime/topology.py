@@ -0,0 +1,177 @@
+"""Host CPU topology helpers used to place and pin runtime instances.
+
+Topology comes from sysfs (SMT siblings per physical core, and efficiency cores on hybrid
+Intel or big.LITTLE parts), falling back to `/proc/cpuinfo` and then to one core per CPU.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+from collections import defaultdict
+from collections.abc import Iterable
+from dataclasses import dataclass
+from functools import cache
+from pathlib import Path
+
+SYSFS_NODES = Path("/sys/devices/system/node")
+SYSFS_CPUS = Path("/sys/devices/system/cpu")
+SYSFS_ATOM_CPUS = Path("/sys/devices/cpu_atom/cpus")
+PROC_CPUINFO = Path("/proc/cpuinfo")
+
+_CPU_DIR = re.compile(r"cpu(\d+)")
+
+
+def parse_cpu_list(text: str) -> frozenset[int]:
+    """Parse a kernel CPU list such as `0-3,8,10-11`."""
+    cpus: set[int] = set()
+    for part in text.strip().split(","):
+        if not part:
+            continue
+        first, _, last = part.partition("-")
+        cpus.update(range(int(first), int(last or first) + 1))
+    return frozenset(cpus)
+
+
+def numa_node_cpus(node: int) -> frozenset[int]:
+    """CPUs of NUMA node `node`; ValueError when the host has no such node."""
+    try:
+        return parse_cpu_list((SYSFS_NODES / f"node{node}" / "cpulist").read_text())
+    except (OSError, ValueError) as exc:
+        raise ValueError(f"NUMA node {node} is not available on this host.") from exc
+
+
+def available_cpus() -> frozenset[int]:
+    """CPUs this process may run on."""
+    if hasattr(os, "sched_getaffinity"):
+        return frozenset(os.sched_getaffinity(0))
+    return frozenset(range(os.cpu_count() or 1))
+
+
+def pin_current_thread(cpus: frozenset[int] | None) -> None:
+    """Restrict the calling thread, and threads it spawns later, to `cpus`.
+
+    Only for threads that run nothing else, since the mask is never restored. A no-op for
+    None and on platforms without `sched_setaffinity`.
+    """
+    if cpus and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, cpus)
+
+
+@dataclass(frozen=True)
+class CpuCore:
+    """One physical core: its logical CPUs (SMT siblings) and whether it is an E-core."""
+
+    cpus: tuple[int, ...]
+    package: int = 0
+    efficiency: bool = False
+
+    @property
+    def primary(self) -> int:
+        return self.cpus[0]
+
+
+@dataclass(frozen=True)
+class CpuTopology:
+    cores: tuple[CpuCore, ...]
+    source: str
+
+    def within(self, cpus: Iterable[int]) -> list[CpuCore]:
+        """The cores that have a CPU in `cpus`, narrowed to those CPUs."""
+        wanted = set(cpus)
+        narrowed = []
+        for core in self.cores:
+            kept = tuple(cpu for cpu in core.cpus if cpu in wanted)
+            if kept:
+                narrowed.append(CpuCore(kept, core.package, core.efficiency))
+        return narrowed
+
+
+def performance_cores(cores: list[CpuCore]) -> list[CpuCore]:
+    """`cores` without efficiency cores, or all of them when there are only E-cores."""
+    return [core for core in cores if not core.efficiency] or cores
+
+
+def default_threads(cores: list[CpuCore]) -> tuple[int, int]:
+    """`(prefill, decode)` thread counts for work confined to `cores`.
+
+    Prefill is compute-bound, so every physical core helps; SMT siblings share its units
+    and only add contention. Decode is bound by memory bandwidth and waits for its slowest
+    thread each token, so it stays on performance cores.
+    """
+    return max(1, len(cores)), max(1, len(performance_cores(cores)))
+
+
+def _read(path: Path) -> str | None:
+    try:
+        return path.read_text().strip()
+    except OSError:
+        return None
+
+
+def _sysfs_cores(available: frozenset[int]) -> list[CpuCore]:
+    siblings: dict[tuple[int, ...], int] = {}
+    capacity: dict[int, int] = {}
+    try:
+        entries = list(SYSFS_CPUS.iterdir())
+    except OSError:
+        return []
+    for entry in entries:
+        match = _CPU_DIR.fullmatch(entry.name)
+        if match is None or int(match.group(1)) not in available:
+            continue
+        topology = entry / "topology"
+        listed = _read(topology / "core_cpus_list") or _read(topology / "thread_siblings_list")
+        if listed is None:
+            return []
+        group = tuple(sorted(parse_cpu_list(listed) & available))
+        siblings[group] = int(_read(topology / "physical_package_id") or 0)
+        value = _read(entry / "cpu_capacity")
+        if value is not None:
+            capacity[int(match.group(1))] = int(value)
+
+    atom = _read(SYSFS_ATOM_CPUS)
+    efficient = parse_cpu_list(atom) if atom else frozenset()
+    if not efficient and len(set(capacity.values())) > 1:
+        top = max(capacity.values())
+        efficient = frozenset(cpu for cpu, value in capacity.items() if value < top)
+    return [
+        CpuCore(group, package, efficiency=group[0] in efficient)
+        for group, package in siblings.items()
+    ]
+
+
+def _cpuinfo_cores(available: frozenset[int]) -> list[CpuCore]:
+    text = _read(PROC_CPUINFO)
+    if not text:
+        return []
+    groups: dict[tuple[int, int], list[int]] = defaultdict(list)
+    for block in text.split("\n\n"):
+        fields = dict(
+            (key.strip(), value.strip())
+            for key, _, value in (line.partition(":") for line in block.splitlines())
+        )
+        if "processor" not in fields or int(fields["processor"]) not in available:
+            continue
+        cpu = int(fields["processor"])
+        package = int(fields.get("physical id", 0))
+        # Without a core id (e.g. most ARM kernels) every processor counts as its own core.
+        core = int(fields["core id"]) if "core id" in fields else -1 - cpu
+        groups[(package, core)].append(cpu)
+    return [CpuCore(tuple(sorted(cpus)), package) for (package, _), cpus in groups.items()]
+
+
+def detect_topology(available: frozenset[int] | None = None) -> CpuTopology:
+    """Physical cores of the CPUs in `available` (default: those this process may use)."""
+    available = available_cpus() if available is None else available
+    for source, reader in (("sysfs", _sysfs_cores), ("cpuinfo", _cpuinfo_cores)):
+        cores = reader(available)
+        if cores:
+            return CpuTopology(tuple(sorted(cores, key=lambda core: core.cpus)), source)
+    return CpuTopology(tuple(CpuCore((cpu,)) for cpu in sorted(available)), "fallback")
+
+
+@cache
+def host_topology() -> CpuTopology:
+    """`detect_topology()` for this process, read once."""
+    return detect_topology()
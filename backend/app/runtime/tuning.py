@@ -0,0 +1,296 @@
+"""Benchmark-driven search for the fastest runtime settings per model."""
+
+from __future__ import annotations
+
+import logging
+import math
+import secrets
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from threading import Lock
+
+from sqlmodel import Session, select
+
+from backend.app.db.models import InstalledModel, RuntimeConfig, TunedRuntimeConfig
+from backend.app.db.session import get_engine
+from backend.app.runtime.benchmark import STANDARD_PROMPTS, time_prompts
+from backend.app.runtime.gguf import block_count
+from backend.app.runtime.manager import LlamaRuntime, LoadedModelState
+from backend.app.runtime.snapshot import RuntimeStateHub, build_runtime_state
+from backend.app.schemas.chat import ChatConfig
+from backend.app.schemas.runtime import (
+    KVCachePlacement,
+    RuntimeConfigSchema,
+    TuningJobRead,
+    TuningJobStatus,
+    TuningRequest,
+    TuningTrialRead,
+)
+from backend.app.utils.clock import utcnow
+
+logger = logging.getLogger(__name__)
+
+# Axes are tuned one at a time (coordinate descent) in this order; placement decisions come
+# first because they change which of the CPU knobs matter.
+_AXES = ("gpu_layers", "kv_cache_placement", "cpu_threads", "eval_batch_size")
+
+
+def default_search_space(
+    request: TuningRequest, *, layers: int | None = None, gpu: bool = False
+) -> dict[str, list]:
+    """Fill unspecified axes from the host's CPU topology and the model's layer count.
+
+    GPU layers and KV placement are only swept when the llama.cpp build can offload
+    (`gpu`); CPU-only builds keep them at their defaults. Without a known layer count the
+    offload sweep is just none versus all.
+    """
+    import psutil
+
+    physical = psutil.cpu_count(logical=False) or 1
+    logical = psutil.cpu_count(logical=True) or physical
+    threads = sorted({max(1, physical // 2), physical, logical})
+    gpu_layers: list[int | None] = [None]
+    placements = [KVCachePlacement.AUTO]
+    if gpu:
+        if layers:
+            top = layers + 1  # The output layer counts too.
+            gpu_layers = sorted({0, top // 4, top // 2, 3 * top // 4, top})
+        else:
+            gpu_layers = [0, 999]  # llama.cpp caps this at the model's layer count.
+        placements = [KVCachePlacement.AUTO, KVCachePlacement.CPU, KVCachePlacement.GPU]
+    return {
+        "gpu_layers": request.gpu_layers or gpu_layers,
+        "kv_cache_placement": request.kv_cache_placement or placements,
+        "cpu_threads": request.cpu_threads or threads,
+        "eval_batch_size": request.eval_batch_size or [64, 128, 256, 512],
+    }
+
+
+def apply_tuned_config(
+    base: RuntimeConfigSchema, tuned: TunedRuntimeConfig | None
+) -> RuntimeConfigSchema:
+    """Overlay a model's tuned knobs on the global defaults."""
+    if tuned is None:
+        return base
+    return base.model_copy(
+        update={
+            "gpu_layers": tuned.gpu_layers,
+            "cpu_threads": tuned.cpu_threads,
+            "eval_batch_size": tuned.eval_batch_size,
+            "kv_cache_placement": KVCachePlacement(tuned.kv_cache_placement),
+        }
+    )
+
+
+def get_tuned_config(session: Session, model_id: int) -> TunedRuntimeConfig | None:
+    return session.exec(
+        select(TunedRuntimeConfig).where(TunedRuntimeConfig.model_id == model_id)
+    ).first()
+
+
+def resolve_load_config(session: Session, model_id: int) -> RuntimeConfigSchema:
+    """Config used to load a model without an override: global defaults plus tuned knobs."""
+    row = session.get(RuntimeConfig, 1)
+    base = (
+        RuntimeConfigSchema.model_validate(row, from_attributes=True)
+        if row
+        else RuntimeConfigSchema()
+    )
+    return apply_tuned_config(base, get_tuned_config(session, model_id))
+
+
+@dataclass
+class TuningJob:
+    id: str
+    model_id: int
+    base: RuntimeConfigSchema
+    request: TuningRequest
+    status: TuningJobStatus = TuningJobStatus.PENDING
+    trials: list[TuningTrialRead] = field(default_factory=list)
+    best: TuningTrialRead | None = None
+    error: str | None = None
+    created_at: datetime = field(default_factory=utcnow)
+    finished_at: datetime | None = None
+
+    def to_read(self) -> TuningJobRead:
+        return TuningJobRead(
+            id=self.id,
+            model_id=self.model_id,
+            status=self.status,
+            trials=list(self.trials),
+            best=self.best,
+            error=self.error,
+            created_at=self.created_at,
+            finished_at=self.finished_at,
+        )
+
+
+class AutoTuner:
+    """Runs tuning jobs one at a time on a background thread.
+
+    A job takes over the runtime: it loads the model once per candidate config and restores
+    whatever was loaded before when it finishes, publishing each change to `hub` if given.
+    """
+
+    def __init__(self, *, prompts: tuple[str, ...] = STANDARD_PROMPTS) -> None:
+        self.prompts = prompts
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = Lock()
+        self._jobs: dict[str, TuningJob] = {}
+        self._pending: set[Future[None]] = set()
+
+    def submit(
+        self,
+        runtime: LlamaRuntime,
+        *,
+        model_id: int,
+        base: RuntimeConfigSchema,
+        request: TuningRequest,
+        hub: RuntimeStateHub | None = None,
+    ) -> TuningJob:
+        job = TuningJob(id=secrets.token_hex(8), model_id=model_id, base=base, request=request)
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tuner")
+            self._jobs[job.id] = job
+            future = self._executor.submit(self.run, runtime, job, hub)
+            self._pending.add(future)
+        future.add_done_callback(self._discard)
+        return job
+
+    def _discard(self, future: Future[None]) -> None:
+        with self._lock:
+            self._pending.discard(future)
+
+    def get(self, job_id: str) -> TuningJob | None:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def wait(self, timeout: float | None = None) -> None:
+        """Block until queued jobs finish (used by tests and shutdown)."""
+        with self._lock:
+            pending = set(self._pending)
+        wait(pending, timeout=timeout)
+
+    def run(
+        self, runtime: LlamaRuntime, job: TuningJob, hub: RuntimeStateHub | None = None
+    ) -> None:
+        """Sweep the search space, then persist the fastest config for the model."""
+        job.status = TuningJobStatus.RUNNING
+        previous = runtime.get_state()
+        try:
+            with Session(get_engine()) as session:
+                model = session.get(InstalledModel, job.model_id)
+                if model is None:
+                    raise LookupError(f"Model {job.model_id} not found.")
+                model_path = Path(model.file_path)
+            best = self._search(runtime, job, model_path, hub)
+            if best is None:
+                raise RuntimeError("Every candidate configuration failed.")
+            job.best = best
+            self._persist(job, best)
+            job.status = TuningJobStatus.COMPLETED
+        except Exception as exc:
+            logger.exception("Auto-tuning model %s failed.", job.model_id)
+            job.status = TuningJobStatus.FAILED
+            job.error = str(exc) or exc.__class__.__name__
+        finally:
+            job.finished_at = utcnow()
+            self._restore(runtime, previous)
+            self._publish(runtime, hub)
+
+    def _search(
+        self,
+        runtime: LlamaRuntime,
+        job: TuningJob,
+        model_path: Path,
+        hub: RuntimeStateHub | None,
+    ) -> TuningTrialRead | None:
+        space = default_search_space(
+            job.request, layers=block_count(model_path), gpu=runtime.supports_gpu_offload()
+        )
+        measured: dict[str, TuningTrialRead] = {}
+
+        def trial(config: RuntimeConfigSchema) -> TuningTrialRead:
+            key = config.model_dump_json()
+            if key not in measured:
+                measured[key] = self._measure(runtime, job, model_path, config, hub)
+                job.trials.append(measured[key])
+            return measured[key]
+
+        current = job.base.model_copy(update={axis: values[0] for axis, values in space.items()})
+        best = trial(current)
+        for axis in _AXES:
+            for value in space[axis]:
+                candidate = trial(current.model_copy(update={axis: value}))
+                if _score(candidate) < _score(best):
+                    best = candidate
+            current = best.config
+        return best if best.error is None else None
+
+    def _measure(
+        self,
+        runtime: LlamaRuntime,
+        job: TuningJob,
+        model_path: Path,
+        config: RuntimeConfigSchema,
+        hub: RuntimeStateHub | None,
+    ) -> TuningTrialRead:
+        chat_config = ChatConfig(temperature=0.0, max_tokens=job.request.max_tokens)
+        try:
+            runtime.load_model(model_id=job.model_id, model_path=model_path, config=config)
+            self._publish(runtime, hub)
+            timing = time_prompts(runtime, self.prompts, chat_config)
+        except Exception as exc:
+            return TuningTrialRead(config=config, error=str(exc) or exc.__class__.__name__)
+        return TuningTrialRead(
+            config=config,
+            seconds=timing.seconds,
+            prefill_tokens_per_second=timing.prefill_tokens_per_second,
+            decode_tokens_per_second=timing.decode_tokens_per_second,
+        )
+
+    @staticmethod
+    def _persist(job: TuningJob, best: TuningTrialRead) -> None:
+        with Session(get_engine()) as session:
+            row = get_tuned_config(session, job.model_id) or TunedRuntimeConfig(
+                model_id=job.model_id, cpu_threads=1, eval_batch_size=1
+            )
+            row.gpu_layers = best.config.gpu_layers
+            row.cpu_threads = best.config.cpu_threads
+            row.eval_batch_size = best.config.eval_batch_size
+            row.kv_cache_placement = best.config.kv_cache_placement.value
+            row.prefill_tokens_per_second = best.prefill_tokens_per_second or 0.0
+            row.decode_tokens_per_second = best.decode_tokens_per_second or 0.0
+            row.trial_count = len(job.trials)
+            row.updated_at = utcnow()
+            session.add(row)
+            session.commit()
+
+    @staticmethod
+    def _publish(runtime: LlamaRuntime, hub: RuntimeStateHub | None) -> None:
+        if hub is None:
+            return
+        with Session(get_engine()) as session:
+            hub.publish_state(build_runtime_state(session, runtime))
+
+    @staticmethod
+    def _restore(runtime: LlamaRuntime, previous: LoadedModelState | None) -> None:
+        try:
+            if previous is None:
+                runtime.unload_model()
+            else:
+                runtime.load_model(
+                    model_id=previous.model_id,
+                    model_path=previous.model_path,
+                    config=previous.config,
+                )
+        except Exception:
+            logger.exception("Could not restore the runtime after auto-tuning.")
+
+
+def _score(trial: TuningTrialRead) -> float:
+    """Wall time for the prompt set; failed trials never win."""
+    return math.inf if trial.seconds is None else trial.seconds
@@ -0,0 +1,123 @@
+"""Background watchdog that frees memory held by an idle or squeezed runtime."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import time
+from enum import Enum
+
+from anyio import to_thread
+from sqlmodel import Session
+
+from backend.app.config import settings
+from backend.app.db.session import get_engine
+from backend.app.runtime.manager import LlamaRuntime
+from backend.app.runtime.snapshot import RuntimeStateHub, build_runtime_state
+
+logger = logging.getLogger(__name__)
+
+
+class WatchdogAction(str, Enum):
+    SHED_CACHES = "shed_caches"
+    UNLOAD_IDLE = "unload_idle"
+    UNLOAD_PRESSURE = "unload_pressure"
+
+
+class RuntimeWatchdog:
+    """Evicts the loaded model after an idle TTL and escalates under memory pressure.
+
+    Pressure means available RAM below `min_available_bytes` or swap traffic above
+    `swap_rate_bytes`/s. The first check under pressure only sheds caches (prompt cache and KV
+    state); if pressure persists on the next check the model is evicted. Evicted models are
+    reloaded lazily by the next chat request.
+    """
+
+    def __init__(
+        self,
+        runtime: LlamaRuntime,
+        hub: RuntimeStateHub,
+        *,
+        idle_ttl: float | None = None,
+        min_available_bytes: int | None = None,
+        swap_rate_bytes: float | None = None,
+        interval: float | None = None,
+    ) -> None:
+        self.runtime = runtime
+        self.hub = hub
+        self.idle_ttl = settings.runtime_idle_unload_seconds if idle_ttl is None else idle_ttl
+        self.min_available_bytes = (
+            settings.runtime_min_available_bytes
+            if min_available_bytes is None
+            else min_available_bytes
+        )
+        self.swap_rate_bytes = (
+            settings.runtime_max_swap_bytes_per_second
+            if swap_rate_bytes is None
+            else swap_rate_bytes
+        )
+        self.interval = settings.runtime_watchdog_interval if interval is None else interval
+        self._shed = False
+        self._swap_sample: tuple[float, int] | None = None
+        self._task: asyncio.Task[None] | None = None
+
+    def under_pressure(self) -> bool:
+        import psutil
+
+        available = psutil.virtual_memory().available
+        swap = psutil.swap_memory()
+        now = time.monotonic()
+        moved = swap.sin + swap.sout
+        previous, self._swap_sample = self._swap_sample, (now, moved)
+        swap_rate = 0.0
+        if previous is not None and now > previous[0]:
+            swap_rate = (moved - previous[1]) / (now - previous[0])
+        return available < self.min_available_bytes or swap_rate > self.swap_rate_bytes
+
+    def check(self) -> WatchdogAction | None:
+        """Run one watchdog pass; returns what it did, if anything."""
+        pressure = self.under_pressure()
+        if self.runtime.get_state() is None or self.runtime.is_busy():
+            self._shed = pressure and self._shed
+            return None
+        if pressure:
+            if not self._shed:
+                self._shed = True
+                if self.runtime.release_caches():
+                    logger.warning("Memory pressure: released runtime caches.")
+                    return WatchdogAction.SHED_CACHES
+            return self._evict(WatchdogAction.UNLOAD_PRESSURE)
+        self._shed = False
+        if self.idle_ttl > 0 and self.runtime.idle_seconds() >= self.idle_ttl:
+            return self._evict(WatchdogAction.UNLOAD_IDLE)
+        return None
+
+    def _evict(self, action: WatchdogAction) -> WatchdogAction | None:
+        evicted = self.runtime.evict()
+        if evicted is None:
+            return None
+        logger.warning("Unloaded model %s (%s).", evicted.model_id, action.value)
+        self._shed = False
+        with Session(get_engine()) as session:
+            self.hub.publish_state(build_runtime_state(session, self.runtime))
+        return action
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await to_thread.run_sync(self.check)
+            except Exception:
+                logger.exception("Runtime watchdog pass failed.")
+
+    async def start(self) -> None:
+        if self._task is None and self.interval > 0:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
@@ -0,0 +1,74 @@
+"""Schemas for benchmark history and regression comparison."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from enum import Enum
+from typing import Any
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class BenchmarkRunRequest(BaseModel):
+    """Run the standard suite against the currently loaded model."""
+
+    max_tokens: int = Field(default=128, ge=2, le=2048)
+    repeats: int = Field(default=1, ge=1, le=10)
+    notes: str | None = Field(default=None, max_length=500)
+    mark_baseline: bool = False
+
+
+class BenchmarkRunRead(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    suite: str
+    model_id: int | None
+    model_checksum: str
+    runtime_version: str
+    config: dict[str, Any]
+    hardware_fingerprint: str
+    hardware: dict[str, Any]
+    metrics: dict[str, float]
+    is_baseline: bool
+    notes: str | None
+    created_at: datetime
+
+
+class BenchmarkRunList(BaseModel):
+    items: list[BenchmarkRunRead]
+
+
+class BenchmarkJobStatus(str, Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class BenchmarkJobRead(BaseModel):
+    id: str
+    model_id: int
+    status: BenchmarkJobStatus
+    run: BenchmarkRunRead | None = None
+    error: str | None = None
+    created_at: datetime
+    finished_at: datetime | None = None
+
+
+class MetricDelta(BaseModel):
+    name: str
+    baseline: float
+    candidate: float
+    change_pct: float
+    higher_is_better: bool
+    regression: bool
+
+
+class BenchmarkComparison(BaseModel):
+    baseline_id: int
+    candidate_id: int
+    threshold_pct: float
+    comparable: bool = Field(description="False when model file or hardware differ.")
+    regressed: bool
+    deltas: list[MetricDelta]
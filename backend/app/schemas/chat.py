@@ -1,6 +1,9 @@
 """Chat schema definitions shared between API routes and mock fixtures."""
 
-from pydantic import BaseModel, Field
+from enum import Enum
+from typing import Any, Literal
+
+from pydantic import BaseModel, Field, model_validator
 
 
 class ChatConfig(BaseModel):
@@ -11,6 +14,22 @@ class ChatConfig(BaseModel):
     max_tokens: int = Field(default=256, gt=0, le=4096)
     presence_penalty: float = Field(default=0.0, ge=-2.0, le=2.0)
     frequency_penalty: float = Field(default=0.0, ge=-2.0, le=2.0)
+    grammar: str | None = Field(
+        default=None,
+        min_length=1,
+        max_length=100_000,
+        description="GBNF grammar the reply must match.",
+    )
+    json_schema: dict[str, Any] | None = Field(
+        default=None,
+        description="JSON schema the reply must satisfy; converted to a grammar.",
+    )
+
+    @model_validator(mode="after")
+    def _one_constraint(self) -> "ChatConfig":
+        if self.grammar is not None and self.json_schema is not None:
+            raise ValueError("Pass either `grammar` or `json_schema`, not both.")
+        return self
 
 
 class ChatRequest(BaseModel):
@@ -22,6 +41,61 @@ class ChatRequest(BaseModel):
     config: ChatConfig = Field(default_factory=ChatConfig)
 
 
+class FramePolicy(str, Enum):
+    """How streamed tokens are grouped into SSE frames."""
+
+    TOKEN = "token"
+    ADAPTIVE = "adaptive"
+    BATCH = "batch"
+
+
+class ChatStreamRequest(ChatRequest):
+    """Request contract for `POST /chat/stream` against the loaded runtime."""
+
+    conversation_id: int | None = Field(
+        default=None,
+        description="Persist the prompt and streamed reply into this conversation.",
+    )
+    adapter_id: str | None = Field(
+        default=None,
+        description="Slug of a LoRA adapter to apply on the loaded base model for this request.",
+    )
+    frame_policy: FramePolicy = Field(
+        default=FramePolicy.ADAPTIVE,
+        description=(
+            "`token` sends every token on its own, `adaptive` groups tokens that arrive within "
+            "a few milliseconds, `batch` sends the largest frames for non-interactive clients."
+        ),
+    )
+
+
+class ChatSocketMessage(BaseModel):
+    """Client message on `/chat/ws`: start a generation under `id`, or cancel one."""
+
+    type: Literal["start", "cancel"]
+    id: int = Field(ge=0, le=2**32 - 1, description="Client-chosen stream id.")
+    request: ChatStreamRequest | None = None
+
+
+class TokenizeRequest(BaseModel):
+    """Batch of texts to count against one model's tokenizer."""
+
+    model_id: str = Field(description="Identifier matching a registered GGUF model.")
+    texts: list[str] = Field(min_length=1, max_length=1024)
+
+
+class TokenizeResponse(BaseModel):
+    """Token count per input text, in request order."""
+
+    model_id: str
+    counts: list[int]
+    total: int
+    cached: int = Field(description="Texts answered from the count cache.")
+    source: Literal["vocab", "estimate"] = Field(
+        description="`vocab` for the model's own tokenizer, `estimate` when none is available."
+    )
+
+
 class ChatChunk(BaseModel):
     """A mock streamed token chunk."""
 
@@ -35,3 +109,31 @@ class ChatResponse(BaseModel):
 
     model_id: str
     stream: list[ChatChunk]
+
+
+class MockStreamOptions(BaseModel):
+    """Pacing and fault injection for `POST /mock/chat/stream`."""
+
+    tokens_per_second: float = Field(default=0.0, ge=0.0, description="0 streams unthrottled.")
+    first_token_delay_ms: float = Field(default=0.0, ge=0.0, le=600_000)
+    coalesce: int = Field(default=1, ge=1, le=4096, description="Tokens per SSE frame.")
+    synthetic_tokens: int | None = Field(
+        default=None,
+        ge=1,
+        le=10_000_000,
+        description="Stream this many filler tokens instead of the fixture (soak tests).",
+    )
+    fail_after: int | None = Field(
+        default=None, ge=0, description="Emit an `error` event after this many tokens."
+    )
+    disconnect_after: int | None = Field(
+        default=None,
+        ge=0,
+        description="End the stream after this many tokens without a final chunk.",
+    )
+
+
+class MockChatStreamRequest(ChatRequest):
+    """Request contract for the streaming mock chat route."""
+
+    stream: MockStreamOptions = Field(default_factory=MockStreamOptions)
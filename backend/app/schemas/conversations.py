@@ -0,0 +1,97 @@
+"""Schemas for conversation + message persistence APIs."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from enum import Enum
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class MessageRole(str, Enum):
+    """Author of a chat message."""
+
+    SYSTEM = "system"
+    USER = "user"
+    ASSISTANT = "assistant"
+
+
+class MessageStatus(str, Enum):
+    """Persistence state of a message; assistant replies start as `streaming`."""
+
+    COMPLETE = "complete"
+    STREAMING = "streaming"
+    CANCELLED = "cancelled"
+    FAILED = "failed"
+    INTERRUPTED = "interrupted"
+
+
+class ConversationCreate(BaseModel):
+    title: str = Field(default="New chat", min_length=1, max_length=200)
+    system_prompt: str | None = None
+
+
+class ConversationUpdate(BaseModel):
+    title: str | None = Field(default=None, min_length=1, max_length=200)
+    system_prompt: str | None = None
+
+
+class ConversationRead(BaseModel):
+    """Serialized Conversation row."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    title: str
+    system_prompt: str | None
+    message_count: int
+    token_count: int
+    created_at: datetime
+    updated_at: datetime
+
+
+class ConversationPage(BaseModel):
+    conversations: list[ConversationRead]
+    next_cursor: str | None = Field(
+        default=None,
+        description="Opaque keyset cursor for the next (older) page; None on the last page.",
+    )
+
+
+class MessageCreate(BaseModel):
+    role: MessageRole = MessageRole.USER
+    content: str = Field(min_length=1)
+
+
+class MessageRead(BaseModel):
+    """Serialized Message row."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    conversation_id: int
+    role: MessageRole
+    content: str
+    token_count: int
+    status: MessageStatus
+    created_at: datetime
+
+
+class MessagePage(BaseModel):
+    messages: list[MessageRead] = Field(description="Chronological order.")
+    next_cursor: int | None = Field(
+        default=None,
+        description="Pass as `before_id` to load older messages; None when history is exhausted.",
+    )
+
+
+class MessageSearchResult(BaseModel):
+    message_id: int
+    conversation_id: int
+    conversation_title: str
+    role: MessageRole
+    snippet: str
+
+
+class MessageSearchResponse(BaseModel):
+    results: list[MessageSearchResult]
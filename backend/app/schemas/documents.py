@@ -0,0 +1,48 @@
+"""Schemas for document ingestion APIs."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from enum import Enum
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class DocumentStatus(str, Enum):
+    """Lifecycle of a document moving through the ingestion pipeline."""
+
+    PENDING = "pending"
+    PROCESSING = "processing"
+    READY = "ready"
+    FAILED = "failed"
+
+
+class DocumentRead(BaseModel):
+    """Serialized Document row."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    filename: str
+    content_hash: str
+    media_type: str
+    size_bytes: int
+    status: DocumentStatus
+    chunk_count: int
+    token_count: int
+    error: str | None
+    created_at: datetime
+    updated_at: datetime
+    completed_at: datetime | None
+
+
+class DocumentListResponse(BaseModel):
+    documents: list[DocumentRead]
+
+
+class DocumentUploadResponse(BaseModel):
+    document: DocumentRead
+    deduplicated: bool = Field(
+        default=False,
+        description="True when identical content was already ingested.",
+    )
@@ -0,0 +1,130 @@
+"""OpenAI wire-format schemas for the `/v1` compatibility routes.
+
+Only the fields this backend honours are modelled; anything else a client sends is ignored.
+"""
+
+from typing import Any, Literal
+
+from pydantic import BaseModel, Field, model_validator
+
+from backend.app.schemas.chat import ChatConfig
+
+
+class ResponseFormat(BaseModel):
+    type: Literal["text", "json_object", "json_schema"] = "text"
+    json_schema: dict[str, Any] | None = Field(
+        default=None, description="OpenAI's `{name, schema, strict}` wrapper."
+    )
+
+    def schema_constraint(self) -> dict[str, Any] | None:
+        if self.type == "json_object":
+            return {"type": "object"}
+        if self.type == "json_schema":
+            return (self.json_schema or {}).get("schema") or {"type": "object"}
+        return None
+
+
+class _SamplingRequest(BaseModel):
+    model: str = Field(description="Installed model slug.")
+    max_tokens: int | None = Field(default=None, gt=0, le=4096)
+    temperature: float = Field(default=1.0, ge=0.0, le=2.0)
+    top_p: float = Field(default=1.0, ge=0.0, le=1.0)
+    presence_penalty: float = Field(default=0.0, ge=-2.0, le=2.0)
+    frequency_penalty: float = Field(default=0.0, ge=-2.0, le=2.0)
+    n: int = Field(default=1, ge=1, le=16, description="Choices sampled from one prefill.")
+    stream: bool = False
+    stop: str | list[str] | None = None
+    seed: int | None = None
+    response_format: ResponseFormat | None = None
+    grammar: str | None = Field(
+        default=None, min_length=1, description="GBNF grammar (llama.cpp extension)."
+    )
+
+    @model_validator(mode="after")
+    def _one_constraint(self) -> "_SamplingRequest":
+        if (
+            self.grammar is not None
+            and self.response_format
+            and self.response_format.type != "text"
+        ):
+            raise ValueError("Pass either `grammar` or a JSON `response_format`, not both.")
+        return self
+
+    def chat_config(self) -> ChatConfig:
+        defaults = ChatConfig()
+        return ChatConfig(
+            temperature=self.temperature,
+            top_p=self.top_p,
+            max_tokens=self.max_tokens or defaults.max_tokens,
+            presence_penalty=self.presence_penalty,
+            frequency_penalty=self.frequency_penalty,
+            grammar=self.grammar,
+            json_schema=self.response_format.schema_constraint() if self.response_format else None,
+        )
+
+    def stop_sequences(self) -> list[str] | None:
+        if self.stop is None:
+            return None
+        return [self.stop] if isinstance(self.stop, str) else self.stop
+
+
+class ChatCompletionMessage(BaseModel):
+    role: Literal["system", "user", "assistant"]
+    content: str
+
+
+class ChatCompletionRequest(_SamplingRequest):
+    messages: list[ChatCompletionMessage] = Field(min_length=1)
+
+
+class CompletionRequest(_SamplingRequest):
+    prompt: str
+
+
+class Usage(BaseModel):
+    prompt_tokens: int
+    completion_tokens: int
+    total_tokens: int
+
+
+class ChatCompletionChoice(BaseModel):
+    index: int
+    message: ChatCompletionMessage
+    finish_reason: str | None
+
+
+class ChatCompletion(BaseModel):
+    id: str
+    object: Literal["chat.completion"] = "chat.completion"
+    created: int
+    model: str
+    choices: list[ChatCompletionChoice]
+    usage: Usage
+
+
+class CompletionChoice(BaseModel):
+    index: int
+    text: str
+    finish_reason: str | None
+    logprobs: None = None
+
+
+class Completion(BaseModel):
+    id: str
+    object: Literal["text_completion"] = "text_completion"
+    created: int
+    model: str
+    choices: list[CompletionChoice]
+    usage: Usage
+
+
+class ModelObject(BaseModel):
+    id: str
+    object: Literal["model"] = "model"
+    created: int
+    owned_by: str = "local"
+
+
+class ModelList(BaseModel):
+    object: Literal["list"] = "list"
+    data: list[ModelObject]
@@ -4,8 +4,9 @@ from __future__ import annotations
 
 from datetime import datetime
 from enum import Enum
+from typing import Annotated
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 
 
 class KVCachePlacement(str, Enum):
@@ -17,6 +18,33 @@ class KVCachePlacement(str, Enum):
     HYBRID = "hybrid"
 
 
+class RuntimeInstanceSchema(BaseModel):
+    """Placement of one llama.cpp instance when the model is sharded across CPU sets."""
+
+    cpus: list[Annotated[int, Field(ge=0)]] | None = Field(
+        default=None, min_length=1, description="CPU ids the instance's threads are pinned to."
+    )
+    numa_node: int | None = Field(default=None, ge=0, description="Pin to every CPU of a node.")
+    cpu_threads: int | None = Field(
+        default=None,
+        ge=1,
+        le=128,
+        description="Decode threads; defaults from the instance's physical cores.",
+    )
+    prefill_threads: int | None = Field(
+        default=None,
+        ge=1,
+        le=128,
+        description="Prompt-processing threads; defaults from the instance's physical cores.",
+    )
+
+    @model_validator(mode="after")
+    def _one_placement(self) -> RuntimeInstanceSchema:
+        if self.cpus is not None and self.numa_node is not None:
+            raise ValueError("Pass either `cpus` or `numa_node`, not both.")
+        return self
+
+
 class RuntimeConfigSchema(BaseModel):
     """Inference configuration shared across models."""
 
@@ -26,11 +54,27 @@ class RuntimeConfigSchema(BaseModel):
         ge=0,
         description="Number of transformer layers to place on the GPU.",
     )
-    cpu_threads: int = Field(8, ge=1, le=128)
+    cpu_threads: int | None = Field(
+        default=None,
+        ge=1,
+        le=128,
+        description="Decode threads; None picks one per physical performance core.",
+    )
+    prefill_threads: int | None = Field(
+        default=None,
+        ge=1,
+        le=128,
+        description="Prompt-processing threads; None picks one per physical core.",
+    )
     eval_batch_size: int = Field(128, ge=1, le=4096)
     kv_cache_placement: KVCachePlacement = KVCachePlacement.AUTO
     use_mmap: bool = True
     keep_in_memory: bool = True
+    instances: list[RuntimeInstanceSchema] = Field(
+        default_factory=list,
+        max_length=16,
+        description="One llama.cpp instance per entry; empty runs a single instance.",
+    )
 
 
 class InstalledModelRead(BaseModel):
@@ -51,12 +95,40 @@ class InstalledModelRead(BaseModel):
     created_at: datetime
     updated_at: datetime
     last_loaded_at: datetime | None
+    page_cache_resident_bytes: int | None = Field(
+        default=None, description="Bytes of the GGUF currently in the OS page cache."
+    )
+    page_cache_fraction: float | None = None
 
 
 class ModelListResponse(BaseModel):
     models: list[InstalledModelRead]
 
 
+class LoraAdapterRead(BaseModel):
+    """Serialized LoraAdapter row."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    slug: str
+    display_name: str
+    base_model_id: int
+    file_path: str
+    scale: float
+    size_bytes: int | None
+    created_at: datetime
+    updated_at: datetime
+
+
+class LoraAdapterListResponse(BaseModel):
+    adapters: list[LoraAdapterRead]
+
+
+class LoraAdapterUploadResponse(BaseModel):
+    adapter: LoraAdapterRead
+
+
 class ModelSelectionRequest(BaseModel):
     model_id: int
 
@@ -65,12 +137,22 @@ class RuntimeLoadRequest(ModelSelectionRequest):
     config_override: RuntimeConfigSchema | None = None
 
 
+class RuntimeInstanceState(BaseModel):
+    index: int
+    cpus: list[int] | None = None
+    cpu_threads: int
+    prefill_threads: int
+    physical_cores: int
+    efficiency_cores: int = 0
+
+
 class RuntimeState(BaseModel):
     loaded: bool = False
     model: InstalledModelRead | None = None
     config: RuntimeConfigSchema | None = None
     runtime_path: str | None = None
     loaded_at: datetime | None = None
+    instances: list[RuntimeInstanceState] = Field(default_factory=list)
 
 
 class MemoryStats(BaseModel):
@@ -88,3 +170,59 @@ class RuntimeConfigResponse(BaseModel):
 
 class ModelUploadResponse(BaseModel):
     model: InstalledModelRead
+
+
+class TuningJobStatus(str, Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class TuningRequest(BaseModel):
+    """Search space for an auto-tuning run; omitted axes use hardware-derived defaults."""
+
+    cpu_threads: list[Annotated[int, Field(ge=1, le=128)]] | None = Field(
+        default=None, min_length=1
+    )
+    eval_batch_size: list[Annotated[int, Field(ge=1, le=4096)]] | None = Field(
+        default=None, min_length=1
+    )
+    gpu_layers: list[Annotated[int, Field(ge=0)] | None] | None = Field(default=None, min_length=1)
+    kv_cache_placement: list[KVCachePlacement] | None = Field(default=None, min_length=1)
+    max_tokens: int = Field(default=64, ge=2, le=1024)
+
+
+class TuningTrialRead(BaseModel):
+    config: RuntimeConfigSchema
+    seconds: float | None = None
+    prefill_tokens_per_second: float | None = None
+    decode_tokens_per_second: float | None = None
+    error: str | None = None
+
+
+class TuningJobRead(BaseModel):
+    id: str
+    model_id: int
+    status: TuningJobStatus
+    trials: list[TuningTrialRead] = Field(default_factory=list)
+    best: TuningTrialRead | None = None
+    error: str | None = None
+    created_at: datetime
+    finished_at: datetime | None = None
+
+
+class TunedConfigRead(BaseModel):
+    """Persisted auto-tuning result for one model."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    model_id: int
+    gpu_layers: int | None
+    cpu_threads: int
+    eval_batch_size: int
+    kv_cache_placement: KVCachePlacement
+    prefill_tokens_per_second: float
+    decode_tokens_per_second: float
+    trial_count: int
+    updated_at: datetime
@@ -1,6 +1,7 @@
 """System level Pydantic schemas."""
 
 from datetime import UTC, datetime
+from typing import Any
 
 from pydantic import BaseModel, Field
 
@@ -13,3 +14,29 @@ class HealthResponse(BaseModel):
     status: str = Field(default="ok")
     version: str = Field(default=__version__)
     timestamp: datetime = Field(default_factory=lambda: datetime.now(tz=UTC))
+
+
+class TraceSpan(BaseModel):
+    """One timed stage inside a sampled trace."""
+
+    name: str
+    span_id: str
+    parent_id: str | None = None
+    start_unix_ns: int
+    duration_ms: float
+    attributes: dict[str, Any] = Field(default_factory=dict)
+
+
+class TraceRead(BaseModel):
+    """A request trace kept by the tail sampler."""
+
+    trace_id: str
+    name: str
+    duration_ms: float
+    start_unix_ns: int
+    spans: list[TraceSpan]
+
+
+class TraceListResponse(BaseModel):
+    threshold_ms: float
+    items: list[TraceRead]
@@ -0,0 +1,212 @@
+"""Deferred application startup and a cold-start profiler.
+
+`run_startup` is called from the app lifespan: it overlaps database preparation, fixture
+loading and runtime probing on worker threads and records each step's duration on
+`app.state.startup_timings`. `python -m backend.app.startup` profiles a cold start in a fresh
+interpreter and reports import time per module alongside the init steps.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import subprocess
+import sys
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import TYPE_CHECKING
+
+import anyio
+from anyio import to_thread
+
+from backend.app.config import settings
+
+if TYPE_CHECKING:
+    from fastapi import FastAPI
+
+logger = logging.getLogger(__name__)
+
+
+def prepare_database() -> None:
+    from backend.app.db.session import init_db
+    from backend.app.db.write_behind import recover_interrupted_messages
+
+    settings.ensure_directories()
+    init_db()
+    recover_interrupted_messages()
+
+
+def load_fixtures() -> int:
+    """Prime the static-asset cache behind the mock and spec routes."""
+    from backend.app.api.routes import mock, spec
+
+    return mock.prime_fixtures() + int(spec.prime_schema())
+
+
+def probe_runtime() -> bool:
+    from backend.app.runtime import get_runtime_manager
+
+    available = get_runtime_manager().probe()
+    if not available:
+        logger.warning("llama-cpp-python is not importable; model loads will fail.")
+    return available
+
+
+STARTUP_STEPS: tuple[tuple[str, Callable[[], object]], ...] = (
+    ("database", prepare_database),
+    ("fixtures", load_fixtures),
+    ("runtime_probe", probe_runtime),
+)
+
+
+async def run_startup(app: FastAPI) -> dict[str, float]:
+    """Run the startup steps concurrently; returns (and stores) per-step wall time in ms."""
+    timings: dict[str, float] = {}
+
+    async def timed(name: str, step: Callable[[], object]) -> None:
+        started = perf_counter()
+        await to_thread.run_sync(step)
+        timings[name] = (perf_counter() - started) * 1000
+
+    started = perf_counter()
+    async with anyio.create_task_group() as group:
+        for name, step in STARTUP_STEPS:
+            group.start_soon(timed, name, step)
+    timings["total"] = (perf_counter() - started) * 1000
+    app.state.startup_timings = timings
+    return timings
+
+
+@dataclass(frozen=True)
+class ImportTiming:
+    module: str
+    self_ms: float
+    cumulative_ms: float
+    depth: int
+
+
+@dataclass
+class StartupProfile:
+    imports: list[ImportTiming] = field(default_factory=list)
+    create_app_ms: float = 0.0
+    steps: dict[str, float] = field(default_factory=dict)
+    heavy_modules_loaded: list[str] = field(default_factory=list)
+
+    @property
+    def import_ms(self) -> float:
+        return sum(item.cumulative_ms for item in self.imports if item.depth == 0)
+
+    @property
+    def total_ms(self) -> float:
+        return self.import_ms + self.create_app_ms + self.steps.get("total", 0.0)
+
+
+HEAVY_MODULES = ("llama_cpp", "psutil")
+
+
+def parse_importtime(stderr: str) -> list[ImportTiming]:
+    """Parse `python -X importtime` output into one entry per imported module."""
+    timings = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|", 2)
+        if not self_us.strip().isdigit():
+            continue
+        stripped = name.rstrip()
+        timings.append(
+            ImportTiming(
+                module=stripped.strip(),
+                self_ms=int(self_us) / 1000,
+                cumulative_ms=int(cumulative_us) / 1000,
+                depth=(len(stripped) - len(stripped.lstrip()) - 1) // 2,
+            )
+        )
+    return timings
+
+
+def _profile_child() -> None:
+    from backend.app.main import create_app
+
+    started = perf_counter()
+    app = create_app()
+    created = perf_counter()
+    # Checked before the runtime probe, which imports the bindings on purpose.
+    heavy = [name for name in HEAVY_MODULES if name in sys.modules]
+    steps = anyio.run(run_startup, app)
+    payload = {
+        "create_app_ms": (created - started) * 1000,
+        "steps": steps,
+        "heavy_modules_loaded": heavy,
+    }
+    print(json.dumps(payload))
+
+
+def profile_startup(env: dict[str, str] | None = None) -> StartupProfile:
+    """Cold-start the app in a fresh interpreter and collect import + init timings."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "backend.app.startup", "--child"],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={**os.environ, **(env or {})},
+    )
+    payload = json.loads(result.stdout.strip().splitlines()[-1])
+    return StartupProfile(
+        imports=parse_importtime(result.stderr),
+        create_app_ms=payload["create_app_ms"],
+        steps=payload["steps"],
+        heavy_modules_loaded=payload["heavy_modules_loaded"],
+    )
+
+
+def format_profile(profile: StartupProfile, top: int = 20) -> str:
+    lines = [f"{'self ms':>9} {'cum ms':>9}  module"]
+    slowest = sorted(profile.imports, key=lambda item: item.cumulative_ms, reverse=True)
+    for item in slowest[:top]:
+        lines.append(f"{item.self_ms:9.1f} {item.cumulative_ms:9.1f}  {item.module}")
+    lines.append("")
+    lines.append(f"imports:        {profile.import_ms:9.1f} ms ({len(profile.imports)} modules)")
+    lines.append(f"create_app:     {profile.create_app_ms:9.1f} ms")
+    for name, elapsed in profile.steps.items():
+        lines.append(f"{name + ':':<12} {elapsed:9.1f} ms")
+    lines.append(f"cold start:     {profile.total_ms:9.1f} ms")
+    if profile.heavy_modules_loaded:
+        lines.append(f"eagerly imported: {', '.join(profile.heavy_modules_loaded)}")
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Profile backend cold-start time.")
+    parser.add_argument("--top", type=int, default=20, help="Modules to list")
+    parser.add_argument("--json", action="store_true", help="Emit the profile as JSON")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    if args.child:
+        _profile_child()
+        return 0
+
+    profile = profile_startup()
+    if args.json:
+        print(
+            json.dumps(
+                {
+                    "imports": [item.__dict__ for item in profile.imports],
+                    "import_ms": profile.import_ms,
+                    "create_app_ms": profile.create_app_ms,
+                    "steps": profile.steps,
+                    "total_ms": profile.total_ms,
+                    "heavy_modules_loaded": profile.heavy_modules_loaded,
+                }
+            )
+        )
+    else:
+        print(format_profile(profile, top=args.top))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
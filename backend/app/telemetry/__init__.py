@@ -0,0 +1 @@
+"""In-process telemetry: metrics today, tracing alongside."""
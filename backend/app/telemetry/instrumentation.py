@@ -0,0 +1,111 @@
+"""Hooks that feed metrics and traces from the HTTP layer and the token loop."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+from contextvars import ContextVar
+from time import perf_counter, perf_counter_ns
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from backend.app.telemetry.metrics import (
+    CHAT_DECODE_TOKENS_PER_SECOND,
+    CHAT_ESTIMATED_PREFILL_TOKENS_PER_SECOND,
+    CHAT_INTER_TOKEN_LATENCY,
+    CHAT_TIME_TO_FIRST_TOKEN,
+    CHAT_TOKENS,
+    HTTP_REQUEST_DURATION,
+)
+from backend.app.telemetry.tracing import tracer
+
+_generation_started: ContextVar[int | None] = ContextVar("generation_started", default=None)
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware timing each request, labelled by route template."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        start = perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            route = getattr(scope.get("route"), "path", "unmatched")
+            HTTP_REQUEST_DURATION.labels(scope["method"], route).observe(perf_counter() - start)
+
+
+class TracingMiddleware:
+    """Pure ASGI middleware opening the root span for each request."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        status_code = 0
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        with tracer.start_trace(f"{scope['method']} {scope['path']}") as root:
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                route = getattr(scope.get("route"), "path", None)
+                if route:
+                    root.name = f"{scope['method']} {route}"
+                root.set("http.target", scope["path"])
+                root.set("http.status_code", status_code)
+
+
+def mark_generation_start(started_ns: int) -> None:
+    """Record when the runtime gave this generation its slot, ending any queue wait."""
+    _generation_started.set(started_ns)
+
+
+def instrument_token_stream(tokens: Iterable[str], *, prompt_tokens: int) -> Iterator[str]:
+    """Record TTFT, inter-token gaps and prefill/decode throughput while passing tokens on.
+
+    TTFT and prefill run from `mark_generation_start`, so time queued behind other
+    generations is not counted; without a mark they fall back to the first pull. The prefill
+    rate uses the caller's `prompt_tokens` estimate. Prefill and decode are also recorded
+    as spans on the active trace.
+    """
+    _generation_started.set(None)
+    start = perf_counter_ns()
+    first = last = 0
+    count = 0
+    try:
+        for token in tokens:
+            now = perf_counter_ns()
+            if count == 0:
+                first = now
+                start = _generation_started.get() or start
+                CHAT_TIME_TO_FIRST_TOKEN.observe((now - start) / 1e9)
+                if prompt_tokens and now > start:
+                    CHAT_ESTIMATED_PREFILL_TOKENS_PER_SECOND.observe(
+                        prompt_tokens * 1e9 / (now - start)
+                    )
+            else:
+                CHAT_INTER_TOKEN_LATENCY.observe((now - last) / 1e9)
+            last = now
+            count += 1
+            yield token
+    finally:
+        CHAT_TOKENS.labels("prefill").inc(prompt_tokens)
+        CHAT_TOKENS.labels("decode").inc(count)
+        if count > 1 and last > first:
+            CHAT_DECODE_TOKENS_PER_SECOND.observe((count - 1) * 1e9 / (last - first))
+        if count:
+            tracer.record_span("chat.prefill", start, first, estimated_prompt_tokens=prompt_tokens)
+            tracer.record_span("chat.decode", first, last, tokens=count)
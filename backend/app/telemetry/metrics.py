@@ -0,0 +1,317 @@
+"""Low-overhead Prometheus-style metrics.
+
+Counters and histograms accumulate into per-thread shards: the hot path only touches a list
+owned by the current thread, so there is no lock and no cross-thread contention. Shards are
+summed when `/metrics` is scraped.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+from bisect import bisect_left
+from collections.abc import Iterable
+
+LATENCY_BUCKETS: tuple[float, ...] = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+THROUGHPUT_BUCKETS: tuple[float, ...] = (1, 5, 10, 20, 40, 80, 160, 320, 640, 1280, 2560, 5120)
+
+
+class _Shards:
+    """Per-thread float accumulators; writers never contend, readers sum every shard."""
+
+    def __init__(self, size: int) -> None:
+        self._size = size
+        self._local = threading.local()
+        self._all: list[list[float]] = []
+        self._lock = threading.Lock()
+
+    def mine(self) -> list[float]:
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = [0.0] * self._size
+            with self._lock:
+                self._all.append(shard)
+            self._local.shard = shard
+            return shard
+
+    def totals(self) -> list[float]:
+        with self._lock:
+            shards = list(self._all)
+        return [math.fsum(column) for column in zip(*shards, strict=True)] or [0.0] * self._size
+
+
+class _CounterChild:
+    def __init__(self) -> None:
+        self._shards = _Shards(1)
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._shards.mine()[0] += amount
+
+    def value(self) -> float:
+        return self._shards.totals()[0]
+
+
+class _GaugeChild:
+    def __init__(self) -> None:
+        self._value = 0.0
+
+    def set(self, value: float) -> None:
+        self._value = float(value)
+
+    def value(self) -> float:
+        return self._value
+
+
+class _HistogramChild:
+    def __init__(self, bounds: tuple[float, ...]) -> None:
+        self._bounds = bounds
+        # One slot per bucket (the last is +Inf), then sum, then count.
+        self._shards = _Shards(len(bounds) + 2)
+
+    def observe(self, value: float) -> None:
+        shard = self._shards.mine()
+        shard[bisect_left(self._bounds, value)] += 1
+        shard[-2] += value
+        shard[-1] += 1
+
+    def totals(self) -> list[float]:
+        return self._shards.totals()
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        *,
+        registry: Registry | None = None,
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: dict[tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+        (registry or REGISTRY).register(self)
+
+    def _new_child(self) -> object:
+        raise NotImplementedError
+
+    def _child(self, values: tuple[str, ...]) -> object:
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}.")
+            with self._lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+
+    def _samples(self) -> Iterable[tuple[str, dict[str, str], float]]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for suffix, labels, value in self._samples():
+            lines.append(f"{self.name}{suffix}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines)
+
+    def _labelled(self) -> list[tuple[dict[str, str], object]]:
+        with self._lock:
+            items = list(self._children.items())
+        return [(dict(zip(self.labelnames, values, strict=True)), child) for values, child in items]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self) -> _CounterChild:
+        return _CounterChild()
+
+    def labels(self, *values: str) -> _CounterChild:
+        return self._child(values)  # type: ignore[return-value]
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+    def _samples(self) -> Iterable[tuple[str, dict[str, str], float]]:
+        for labels, child in self._labelled():
+            yield "_total", labels, child.value()  # type: ignore[attr-defined]
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def _new_child(self) -> _GaugeChild:
+        return _GaugeChild()
+
+    def labels(self, *values: str) -> _GaugeChild:
+        return self._child(values)  # type: ignore[return-value]
+
+    def set(self, value: float) -> None:
+        self.labels().set(value)
+
+    def _samples(self) -> Iterable[tuple[str, dict[str, str], float]]:
+        for labels, child in self._labelled():
+            yield "", labels, child.value()  # type: ignore[attr-defined]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        *,
+        buckets: Iterable[float] = LATENCY_BUCKETS,
+        registry: Registry | None = None,
+    ) -> None:
+        self.bounds = (*sorted(buckets), math.inf)
+        super().__init__(name, documentation, labelnames, registry=registry)
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.bounds)
+
+    def labels(self, *values: str) -> _HistogramChild:
+        return self._child(values)  # type: ignore[return-value]
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+    def _samples(self) -> Iterable[tuple[str, dict[str, str], float]]:
+        for labels, child in self._labelled():
+            totals = child.totals()  # type: ignore[attr-defined]
+            cumulative = 0.0
+            for bound, count in zip(self.bounds, totals, strict=False):
+                cumulative += count
+                yield "_bucket", {**labels, "le": _format_value(bound)}, cumulative
+            yield "_sum", labels, totals[-2]
+            yield "_count", labels, totals[-1]
+
+
+class Registry:
+    """Ordered collection of metrics rendered in the Prometheus text format."""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> None:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} already registered.")
+            self._metrics[metric.name] = metric
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "\n".join(metric.render() for metric in metrics) + "\n"
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    pairs = (f'{key}="{_escape_label(value)}"' for key, value in labels.items())
+    return "{" + ",".join(pairs) + "}"
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+REGISTRY = Registry()
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "API request latency by route template.",
+    ("method", "route"),
+)
+CHAT_TIME_TO_FIRST_TOKEN = Histogram(
+    "chat_time_to_first_token_seconds",
+    "Time from acquiring a generation slot to the first streamed token.",
+)
+CHAT_INTER_TOKEN_LATENCY = Histogram(
+    "chat_inter_token_latency_seconds",
+    "Gap between consecutive streamed tokens.",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.02, 0.04, 0.08, 0.16, 0.32, 0.64, 1.28),
+)
+CHAT_ESTIMATED_PREFILL_TOKENS_PER_SECOND = Histogram(
+    "chat_estimated_prefill_tokens_per_second",
+    "Estimated prompt tokens processed per second between slot acquisition and first token.",
+    buckets=THROUGHPUT_BUCKETS,
+)
+CHAT_DECODE_TOKENS_PER_SECOND = Histogram(
+    "chat_decode_tokens_per_second",
+    "Generated tokens per second after the first token.",
+    buckets=THROUGHPUT_BUCKETS,
+)
+CHAT_TOKENS = Counter("chat_tokens", "Tokens processed by phase.", ("phase",))
+CHAT_TOKENS_PER_FRAME = Histogram(
+    "chat_tokens_per_frame",
+    "Tokens coalesced into each streamed SSE frame, by frame policy.",
+    ("policy",),
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256, 512),
+)
+RUNTIME_QUEUE_WAIT = Histogram(
+    "runtime_queue_wait_seconds",
+    "Time a generation waited for the runtime to become free.",
+)
+RUNTIME_MODEL_LOAD_DURATION = Histogram(
+    "runtime_model_load_seconds",
+    "Wall time spent loading a model into memory.",
+    buckets=(0.5, 1, 2.5, 5, 10, 20, 40, 80, 160),
+)
+RUNTIME_GRAMMAR_COMPILE = Histogram(
+    "runtime_grammar_compile_seconds",
+    "Time spent compiling a GBNF grammar or JSON schema on a cache miss.",
+)
+RUNTIME_CONSTRAINED_SAMPLING = Histogram(
+    "runtime_constrained_sampling_seconds",
+    "Wall time of generations sampled under a grammar, by constraint kind.",
+    ("kind",),
+)
+RUNTIME_ADAPTER_SWAP = Histogram(
+    "runtime_adapter_swap_seconds",
+    "Time to switch the active LoRA adapter on the resident base model.",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+CONVERSATION_SUMMARIES = Counter(
+    "conversation_summaries",
+    "Background conversation summarization attempts by outcome.",
+    ("outcome",),
+)
+RUNTIME_RESIDENT_BYTES = Gauge("runtime_resident_bytes", "Backend process resident set size.")
+RUNTIME_VRAM_BYTES = Gauge("runtime_vram_bytes", "GPU memory in use as reported by rocm-smi.")
+CACHE_REQUESTS = Counter(
+    "cache_requests", "Cache lookups by cache and outcome.", ("cache", "result")
+)
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    """Count a cache lookup; hit rate is hits / (hits + misses) per `cache` label."""
+    CACHE_REQUESTS.labels(cache, "hit" if hit else "miss").inc()
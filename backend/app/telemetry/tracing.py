@@ -0,0 +1,263 @@
+"""Lightweight request tracing with an in-process tail sampler.
+
+Every HTTP request opens a root span and stages record child spans into it. The active trace
+lives in a context variable, so it follows the request into threadpool workers (Starlette and
+anyio copy the context for sync handlers and sync streaming iterators). When the root span
+ends, the trace is kept only if it exceeded `trace_slow_threshold_ms`; kept traces stay in a
+small ring buffer for `/api/debug/traces` and are exported off the request path.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import secrets
+import time
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from threading import Lock
+from typing import Any, Protocol
+
+from backend.app.config import settings
+
+logger = logging.getLogger(__name__)
+
+_WALL_OFFSET_NS = time.time_ns() - time.perf_counter_ns()
+
+
+@dataclass
+class Span:
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: str | None
+    start_ns: int
+    end_ns: int = 0
+    attributes: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.end_ns - self.start_ns) / 1_000_000
+
+    def set(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_unix_ns": self.start_ns + _WALL_OFFSET_NS,
+            "duration_ms": round(self.duration_ms, 3),
+            "attributes": self.attributes,
+        }
+
+
+@dataclass
+class _Trace:
+    root: Span
+    spans: list[Span] = field(default_factory=list)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "trace_id": self.root.trace_id,
+            "name": self.root.name,
+            "duration_ms": round(self.root.duration_ms, 3),
+            "start_unix_ns": self.root.start_ns + _WALL_OFFSET_NS,
+            "spans": [self.root.to_dict(), *(item.to_dict() for item in self.spans)],
+        }
+
+
+_active: ContextVar[tuple[_Trace, Span] | None] = ContextVar("active_trace", default=None)
+
+
+class TraceExporter(Protocol):
+    def export(self, trace: dict[str, Any]) -> None: ...
+
+
+class JsonlTraceExporter:
+    """Append each sampled trace as one JSON line."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+
+    def export(self, trace: dict[str, Any]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("a", encoding="utf-8") as handle:
+            handle.write(json.dumps(trace) + "\n")
+
+
+class OtlpHttpTraceExporter:
+    """POST traces in OTLP/JSON shape to a collector (or any stand-in that accepts it)."""
+
+    def __init__(self, endpoint: str, *, timeout: float = 2.0) -> None:
+        self.url = endpoint.rstrip("/") + "/v1/traces"
+        self.timeout = timeout
+
+    def export(self, trace: dict[str, Any]) -> None:
+        import httpx
+
+        spans = [
+            {
+                "traceId": trace["trace_id"],
+                "spanId": item["span_id"],
+                "parentSpanId": item["parent_id"] or "",
+                "name": item["name"],
+                "startTimeUnixNano": str(item["start_unix_ns"]),
+                "endTimeUnixNano": str(
+                    item["start_unix_ns"] + int(item["duration_ms"] * 1_000_000)
+                ),
+                "attributes": [
+                    {"key": key, "value": {"stringValue": str(value)}}
+                    for key, value in item["attributes"].items()
+                ],
+            }
+            for item in trace["spans"]
+        ]
+        payload = {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": [
+                            {"key": "service.name", "value": {"stringValue": "chatbot-webui"}}
+                        ]
+                    },
+                    "scopeSpans": [{"scope": {"name": "backend.app"}, "spans": spans}],
+                }
+            ]
+        }
+        httpx.post(self.url, json=payload, timeout=self.timeout).raise_for_status()
+
+
+def _default_exporters() -> list[TraceExporter]:
+    exporters: list[TraceExporter] = []
+    if settings.trace_export_path is not None:
+        exporters.append(JsonlTraceExporter(settings.trace_export_path))
+    if settings.trace_otlp_endpoint:
+        exporters.append(OtlpHttpTraceExporter(settings.trace_otlp_endpoint))
+    return exporters
+
+
+class Tracer:
+    """Creates spans for the active request and tail-samples finished traces."""
+
+    def __init__(self, *, exporters: list[TraceExporter] | None = None) -> None:
+        self._exporters = exporters
+        self._lock = Lock()
+        self._recent: deque[dict[str, Any]] = deque(maxlen=settings.trace_buffer_size)
+        self._executor: ThreadPoolExecutor | None = None
+
+    @contextmanager
+    def start_trace(self, name: str, **attributes: Any) -> Iterator[Span]:
+        """Open a root span; the trace is sampled when the block exits."""
+        root = Span(
+            name=name,
+            trace_id=secrets.token_hex(16),
+            span_id=secrets.token_hex(8),
+            parent_id=None,
+            start_ns=time.perf_counter_ns(),
+            attributes=attributes,
+        )
+        trace = _Trace(root)
+        token = _active.set((trace, root))
+        try:
+            yield root
+        finally:
+            root.end_ns = time.perf_counter_ns()
+            _active.reset(token)
+            self._finish(trace)
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Span | None]:
+        """Time a block as a child of the current span (no-op outside a trace).
+
+        Do not hold this across a `yield`; generators should use `record_span` instead.
+        """
+        active = _active.get()
+        if active is None:
+            yield None
+            return
+        trace, parent = active
+        child = Span(
+            name=name,
+            trace_id=parent.trace_id,
+            span_id=secrets.token_hex(8),
+            parent_id=parent.span_id,
+            start_ns=time.perf_counter_ns(),
+            attributes=attributes,
+        )
+        token = _active.set((trace, child))
+        try:
+            yield child
+        finally:
+            child.end_ns = time.perf_counter_ns()
+            _active.reset(token)
+            trace.spans.append(child)
+
+    def record_span(self, name: str, start_ns: int, end_ns: int, **attributes: Any) -> None:
+        """Attach an already-measured interval (perf_counter_ns clock) to the current span."""
+        active = _active.get()
+        if active is None:
+            return
+        trace, parent = active
+        trace.spans.append(
+            Span(
+                name=name,
+                trace_id=parent.trace_id,
+                span_id=secrets.token_hex(8),
+                parent_id=parent.span_id,
+                start_ns=start_ns,
+                end_ns=end_ns,
+                attributes=attributes,
+            )
+        )
+
+    def slowest(self, limit: int) -> list[dict[str, Any]]:
+        """Return up to `limit` recently sampled traces, slowest first."""
+        with self._lock:
+            traces = list(self._recent)
+        return sorted(traces, key=lambda item: item["duration_ms"], reverse=True)[:limit]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._recent.clear()
+
+    def _finish(self, trace: _Trace) -> None:
+        if not settings.trace_enabled:
+            return
+        if trace.root.duration_ms < settings.trace_slow_threshold_ms:
+            return
+        record = trace.to_dict()
+        with self._lock:
+            self._recent.append(record)
+            exporters = self._exporters if self._exporters is not None else _default_exporters()
+            if exporters and self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="trace-export"
+                )
+            executor = self._executor
+        if exporters and executor is not None:
+            executor.submit(self._export, exporters, record)
+
+    @staticmethod
+    def _export(exporters: list[TraceExporter], record: dict[str, Any]) -> None:
+        for exporter in exporters:
+            try:
+                exporter.export(record)
+            except Exception:
+                logger.warning(
+                    "Trace export via %s failed.", type(exporter).__name__, exc_info=True
+                )
+
+
+tracer = Tracer()
+
+
+def get_tracer() -> Tracer:
+    """Return the process-wide tracer."""
+    return tracer
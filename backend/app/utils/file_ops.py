@@ -3,14 +3,23 @@
 from __future__ import annotations
 
 import re
+from collections.abc import Callable
 from hashlib import sha256
 from pathlib import Path
 
 from fastapi import UploadFile
 
 
-async def save_upload(upload: UploadFile, destination: Path, chunk_size: int = 1024 * 1024) -> int:
-    """Persist an UploadFile to disk and return the number of bytes written."""
+async def save_upload(
+    upload: UploadFile,
+    destination: Path,
+    chunk_size: int = 1024 * 1024,
+    on_chunk: Callable[[bytes], None] | None = None,
+) -> int:
+    """Persist an UploadFile to disk and return the number of bytes written.
+
+    `on_chunk` sees every block as it is written, e.g. to hash the upload in the same pass.
+    """
     destination.parent.mkdir(parents=True, exist_ok=True)
     written = 0
     with destination.open("wb") as handle:
@@ -19,6 +28,8 @@ async def save_upload(upload: UploadFile, destination: Path, chunk_size: int = 1
             if not chunk:
                 break
             handle.write(chunk)
+            if on_chunk is not None:
+                on_chunk(chunk)
             written += len(chunk)
     await upload.close()
     return written
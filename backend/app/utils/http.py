@@ -0,0 +1,79 @@
+"""HTTP response helpers."""
+
+from __future__ import annotations
+
+from fastapi import Request, Response, status
+
+from backend.app.telemetry.metrics import record_cache
+from backend.app.utils.static_assets import StaticAsset
+
+
+def sse_event(data: str, event: str | None = None) -> str:
+    """Format one server-sent event frame."""
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {data}\n\n"
+
+
+def etag_matches(request: Request, *etags: str) -> bool:
+    """Return True when the request's If-None-Match already names one of `etags`."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = {item.strip().removeprefix("W/") for item in header.split(",")}
+    return "*" in candidates or not candidates.isdisjoint(etags)
+
+
+def accepts_gzip(request: Request) -> bool:
+    """Return True when Accept-Encoding lists gzip with a non-zero quality."""
+    for item in request.headers.get("accept-encoding", "").split(","):
+        coding, *params = (part.strip() for part in item.split(";"))
+        if coding.lower() != "gzip":
+            continue
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    return float(value) > 0
+                except ValueError:
+                    return False
+        return True
+    return False
+
+
+def cached_response(
+    request: Request,
+    body: bytes,
+    etag: str,
+    *,
+    media_type: str = "application/json",
+    gzip_body: bytes | None = None,
+) -> Response:
+    """Serve a pre-serialized body, answering 304 when the client's copy is current.
+
+    With `gzip_body`, clients that accept gzip get the precompressed bytes under their own
+    ETag (a variant suffix), so caches never confuse the two representations.
+    """
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    tags = [etag]
+    if gzip_body is not None:
+        gzip_etag = f'{etag[:-1]}-gzip"'
+        tags.append(gzip_etag)
+        headers["Vary"] = "Accept-Encoding"
+        if accepts_gzip(request):
+            body = gzip_body
+            headers["ETag"] = gzip_etag
+            headers["Content-Encoding"] = "gzip"
+    matched = etag_matches(request, *tags)
+    if "if-none-match" in request.headers:
+        record_cache("http_etag", hit=matched)
+    if matched:
+        headers.pop("Content-Encoding", None)
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type=media_type, headers=headers)
+
+
+def asset_response(request: Request, asset: StaticAsset) -> Response:
+    """`cached_response` for a `StaticAsset`, including its gzip variant."""
+    return cached_response(
+        request, asset.body, asset.etag, media_type=asset.media_type, gzip_body=asset.gzip_body
+    )
@@ -0,0 +1,87 @@
+"""In-memory cache for files served as-is (mock fixtures, the hand-written OpenAPI schema).
+
+Each file is read and rendered into a response body once, then gzipped and tagged. Later
+lookups only stat the file and render it again when its mtime or size has changed.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from threading import Lock
+from typing import Any
+
+from backend.app.telemetry.metrics import record_cache
+
+Render = Callable[[bytes], tuple[Any, bytes]]
+
+
+def raw_body(content: bytes) -> tuple[bytes, bytes]:
+    """Default render: serve the file bytes unchanged."""
+    return content, content
+
+
+@dataclass(frozen=True)
+class StaticAsset:
+    value: Any
+    body: bytes
+    gzip_body: bytes
+    etag: str
+    media_type: str
+    mtime_ns: int
+    size: int
+
+
+class StaticAssetCache:
+    """Rendered, precompressed file bodies keyed by path and render function."""
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._assets: dict[tuple[Path, Render], StaticAsset] = {}
+
+    def get(
+        self,
+        path: Path,
+        render: Render = raw_body,
+        *,
+        media_type: str = "application/json",
+    ) -> StaticAsset:
+        """Return the asset for `path`, reloading it if the file changed.
+
+        Raises FileNotFoundError when the file is missing and whatever `render` raises when
+        the content is invalid.
+        """
+        stat = path.stat()
+        key = (path, render)
+        asset = self._assets.get(key)
+        fresh = (
+            asset is not None and asset.mtime_ns == stat.st_mtime_ns and asset.size == stat.st_size
+        )
+        record_cache("static_asset", hit=fresh)
+        if fresh:
+            return asset  # type: ignore[return-value]
+
+        # A write racing this read leaves a newer mtime behind, so the next lookup reloads.
+        value, body = render(path.read_bytes())
+        asset = StaticAsset(
+            value=value,
+            body=body,
+            gzip_body=gzip.compress(body, compresslevel=9, mtime=0),
+            etag=f'"{hashlib.sha256(body).hexdigest()[:20]}"',
+            media_type=media_type,
+            mtime_ns=stat.st_mtime_ns,
+            size=stat.st_size,
+        )
+        with self._lock:
+            self._assets[key] = asset
+        return asset
+
+    def clear(self) -> None:
+        with self._lock:
+            self._assets.clear()
+
+
+static_assets = StaticAssetCache()
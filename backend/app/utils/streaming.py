@@ -0,0 +1,240 @@
+"""Token-frame coalescing and template serialization for the chat streaming transports."""
+
+from __future__ import annotations
+
+import json
+import struct
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import closing
+from contextvars import copy_context
+from dataclasses import dataclass
+from enum import IntEnum
+from queue import Empty, Queue
+from threading import Event, Thread
+from time import perf_counter
+from typing import Protocol, TypeVar
+
+from backend.app.schemas.chat import FramePolicy
+from backend.app.telemetry.metrics import CHAT_TOKENS_PER_FRAME
+from backend.app.utils.http import sse_event
+
+FrameT = TypeVar("FrameT", covariant=True)
+
+
+@dataclass(frozen=True)
+class FrameWindow:
+    max_delay: float
+    max_tokens: int
+
+
+FRAME_WINDOWS: dict[FramePolicy, FrameWindow] = {
+    FramePolicy.TOKEN: FrameWindow(max_delay=0.0, max_tokens=1),
+    FramePolicy.ADAPTIVE: FrameWindow(max_delay=0.02, max_tokens=32),
+    FramePolicy.BATCH: FrameWindow(max_delay=0.25, max_tokens=512),
+}
+
+_GAP_SMOOTHING = 0.3
+_TOKEN_FRAME = 'data: {"token":%s,"index":%d,"is_final":false}\n\n'
+_FINAL_FRAME = 'data: {"token":"","index":%d,"is_final":true}\n\n'
+_encode_string = json.JSONEncoder(ensure_ascii=False).encode
+
+
+class FrameBuilder:
+    """Groups timestamped tokens into `(first_index, pieces)` frames under one window.
+
+    The first token is always sent alone so time-to-first-token is unaffected. After that a
+    frame is flushed once it is full, once `deadline` passes, or as soon as the smoothed
+    inter-token gap says the next token would land outside the window, so a slow stream
+    degrades to one frame per token instead of holding tokens back.
+    """
+
+    def __init__(self, policy: FramePolicy) -> None:
+        self.window = FRAME_WINDOWS[policy]
+        self._observe = CHAT_TOKENS_PER_FRAME.labels(policy.value).observe
+        self._pieces: list[str] = []
+        self._index = self._first_index = 0
+        self._opened = self._last = 0.0
+        self._gap: float | None = None
+
+    @property
+    def deadline(self) -> float | None:
+        """When the open frame must be flushed even if no further token arrives."""
+        return self._opened + self.window.max_delay if self._pieces else None
+
+    def add(self, token: str, now: float) -> tuple[int, list[str]] | None:
+        """Append a token that arrived at `now`; returns the frame it completes, if any."""
+        if self._index:
+            sample = now - self._last
+            self._gap = (
+                sample if self._gap is None else self._gap + _GAP_SMOOTHING * (sample - self._gap)
+            )
+        self._last = now
+        if not self._pieces:
+            self._opened, self._first_index = now, self._index
+        self._pieces.append(token)
+        self._index += 1
+        window, gap = self.window, self._gap
+        if (
+            gap is None
+            or len(self._pieces) >= window.max_tokens
+            or now + gap - self._opened > window.max_delay
+        ):
+            return self.flush()
+        return None
+
+    def flush(self) -> tuple[int, list[str]] | None:
+        """Close the open frame; None when it is empty."""
+        if not self._pieces:
+            return None
+        frame, self._pieces = (self._first_index, self._pieces), []
+        self._observe(len(frame[1]))
+        return frame
+
+
+def coalesce_tokens(
+    tokens: Iterable[str],
+    policy: FramePolicy,
+    *,
+    clock: Callable[[], float] = perf_counter,
+) -> Iterator[tuple[int, list[str]]]:
+    """Group `tokens` into frames with a `FrameBuilder`, enforcing its deadline in real time.
+
+    Tokens are pulled on a helper thread so a held frame is flushed when its window closes
+    even while decode stalls. Closing the result stops and waits for that thread, which
+    closes `tokens` on its way out.
+    """
+    frames = FrameBuilder(policy)
+    if frames.window.max_tokens <= 1:
+        for token in tokens:
+            if (frame := frames.add(token, clock())) is not None:
+                yield frame
+        return
+
+    arrivals: Queue[tuple[str | None, BaseException | None]] = Queue()
+    stop = Event()
+
+    def pump() -> None:
+        try:
+            with closing(iter(tokens)) as produced:
+                for token in produced:
+                    arrivals.put((token, None))
+                    if stop.is_set():
+                        break
+        except BaseException as exc:
+            arrivals.put((None, exc))
+        else:
+            arrivals.put((None, None))
+
+    # The pump runs the caller's instrumentation, so it joins the caller's trace context.
+    context = copy_context()
+    Thread(target=context.run, args=(pump,), name="token-coalescer", daemon=True).start()
+    ended = False
+    try:
+        while True:
+            deadline = frames.deadline
+            try:
+                token, error = arrivals.get(
+                    timeout=None if deadline is None else max(0.0, deadline - clock())
+                )
+            except Empty:
+                frame = frames.flush()
+            else:
+                if token is None:
+                    ended = True
+                    if error is not None:
+                        raise error
+                    break
+                frame = frames.add(token, clock())
+            if frame is not None:
+                yield frame
+        if (frame := frames.flush()) is not None:
+            yield frame
+    finally:
+        stop.set()
+        while not ended:  # Wait for the pump so `tokens` is closed before the caller goes on.
+            ended = arrivals.get()[0] is None
+
+
+def token_frame(text: str, index: int) -> str:
+    """SSE frame for a `ChatChunk` built from a fixed template rather than the model."""
+    return _TOKEN_FRAME % (_encode_string(text), index)
+
+
+def final_frame(index: int) -> str:
+    return _FINAL_FRAME % index
+
+
+class FrameEncoder(Protocol[FrameT]):
+    """Renders one generation's events for a transport."""
+
+    def token(self, text: str, index: int) -> FrameT: ...
+
+    def final(self, index: int) -> FrameT: ...
+
+    def error(self, detail: str, status_code: int = 500) -> FrameT: ...
+
+
+class SseFrames:
+    """Server-sent event frames for `/chat/stream`."""
+
+    def token(self, text: str, index: int) -> str:
+        return token_frame(text, index)
+
+    def final(self, index: int) -> str:
+        return final_frame(index)
+
+    def error(self, detail: str, status_code: int = 500) -> str:
+        return sse_event(json.dumps({"detail": detail}), event="error")
+
+
+SSE_FRAMES = SseFrames()
+
+
+class SocketFrameKind(IntEnum):
+    TOKEN = 1
+    FINAL = 2
+    ERROR = 3
+    CANCELLED = 4
+
+
+_SOCKET_HEADER = struct.Struct("!BII")
+_SOCKET_TOKEN = '{"type":"token","id":%d,"index":%d,"token":%s}'
+_SOCKET_FINAL = '{"type":"final","id":%d,"index":%d}'
+
+
+class SocketFrames:
+    """Frames for one multiplexed stream on `/chat/ws`.
+
+    Text frames are JSON objects tagged with `type` and the stream `id`. Binary frames are a
+    9-byte big-endian header (kind: u8, stream id: u32, index: u32) followed by the UTF-8 token
+    text; errors put the status code in the index slot and the detail in the payload.
+    """
+
+    def __init__(self, stream_id: int, *, binary: bool = False) -> None:
+        self.stream_id = stream_id
+        self.binary = binary
+
+    def _pack(self, kind: SocketFrameKind, index: int, text: str = "") -> bytes:
+        return _SOCKET_HEADER.pack(kind, self.stream_id, index) + text.encode("utf-8")
+
+    def token(self, text: str, index: int) -> str | bytes:
+        if self.binary:
+            return self._pack(SocketFrameKind.TOKEN, index, text)
+        return _SOCKET_TOKEN % (self.stream_id, index, _encode_string(text))
+
+    def final(self, index: int) -> str | bytes:
+        if self.binary:
+            return self._pack(SocketFrameKind.FINAL, index)
+        return _SOCKET_FINAL % (self.stream_id, index)
+
+    def error(self, detail: str, status_code: int = 500) -> str | bytes:
+        if self.binary:
+            return self._pack(SocketFrameKind.ERROR, status_code, detail)
+        return json.dumps(
+            {"type": "error", "id": self.stream_id, "status": status_code, "detail": detail}
+        )
+
+    def cancelled(self) -> str | bytes:
+        if self.binary:
+            return self._pack(SocketFrameKind.CANCELLED, 0)
+        return json.dumps({"type": "cancelled", "id": self.stream_id})
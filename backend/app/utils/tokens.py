@@ -0,0 +1,10 @@
+"""Token counting helpers that work without a resident model."""
+
+import re
+
+_TOKEN_PATTERN = re.compile(r"\w{1,4}|[^\w\s]")
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap BPE-like estimate (~4 characters per token) used when no tokenizer is resident."""
+    return len(_TOKEN_PATTERN.findall(text))
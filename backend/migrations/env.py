@@ -16,6 +16,7 @@ config = context.config
 if config.config_file_name:
     fileConfig(config.config_file_name)
 
+settings.ensure_directories()
 config.set_main_option("sqlalchemy.url", settings.database_url)
 
 target_metadata = SQLModel.metadata
@@ -0,0 +1,61 @@
+"""Document ingestion tables."""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "2026_10_19_0002"
+down_revision = "2025_08_11_0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "documents",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("filename", sa.String(), nullable=False),
+        sa.Column("content_hash", sa.String(), nullable=False),
+        sa.Column("media_type", sa.String(), nullable=False),
+        sa.Column("file_path", sa.String(), nullable=False),
+        sa.Column("size_bytes", sa.BigInteger(), nullable=False),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("chunk_count", sa.Integer(), nullable=False),
+        sa.Column("token_count", sa.Integer(), nullable=False),
+        sa.Column("error", sa.String(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.Column("completed_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_documents_content_hash", "documents", ["content_hash"], unique=True)
+    op.create_index("ix_documents_status", "documents", ["status"], unique=False)
+
+    op.create_table(
+        "document_chunks",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column(
+            "document_id",
+            sa.Integer(),
+            sa.ForeignKey("documents.id"),
+            nullable=False,
+        ),
+        sa.Column("ordinal", sa.Integer(), nullable=False),
+        sa.Column("text", sa.String(), nullable=False),
+        sa.Column("token_count", sa.Integer(), nullable=False),
+        sa.Column("embedding", sa.LargeBinary(), nullable=False),
+    )
+    op.create_index(
+        "ix_document_chunks_document_id",
+        "document_chunks",
+        ["document_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_document_chunks_document_id", table_name="document_chunks")
+    op.drop_table("document_chunks")
+    op.drop_index("ix_documents_status", table_name="documents")
+    op.drop_index("ix_documents_content_hash", table_name="documents")
+    op.drop_table("documents")
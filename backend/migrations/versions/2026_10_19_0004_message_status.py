@@ -0,0 +1,23 @@
+"""Track streaming state on messages."""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "2026_10_19_0004"
+down_revision = "2026_10_19_0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("messages") as batch_op:
+        batch_op.add_column(
+            sa.Column("status", sa.String(), nullable=False, server_default="complete"),
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("messages") as batch_op:
+        batch_op.drop_column("status")
@@ -0,0 +1,44 @@
+"""Per-model auto-tuned runtime configs."""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "2026_10_19_0005"
+down_revision = "2026_10_19_0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "tuned_runtime_configs",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column(
+            "model_id",
+            sa.Integer(),
+            sa.ForeignKey("installed_models.id"),
+            nullable=False,
+        ),
+        sa.Column("gpu_layers", sa.Integer(), nullable=True),
+        sa.Column("cpu_threads", sa.Integer(), nullable=False),
+        sa.Column("eval_batch_size", sa.Integer(), nullable=False),
+        sa.Column("kv_cache_placement", sa.String(), nullable=False),
+        sa.Column("prefill_tokens_per_second", sa.Float(), nullable=False),
+        sa.Column("decode_tokens_per_second", sa.Float(), nullable=False),
+        sa.Column("trial_count", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index(
+        "ix_tuned_runtime_configs_model_id",
+        "tuned_runtime_configs",
+        ["model_id"],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_tuned_runtime_configs_model_id", table_name="tuned_runtime_configs")
+    op.drop_table("tuned_runtime_configs")
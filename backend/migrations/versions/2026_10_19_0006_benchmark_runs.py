@@ -0,0 +1,42 @@
+"""Benchmark run history."""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "2026_10_19_0006"
+down_revision = "2026_10_19_0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "benchmark_runs",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("suite", sa.String(), nullable=False),
+        sa.Column(
+            "model_id",
+            sa.Integer(),
+            sa.ForeignKey("installed_models.id"),
+            nullable=True,
+        ),
+        sa.Column("model_checksum", sa.String(), nullable=False),
+        sa.Column("runtime_version", sa.String(), nullable=False),
+        sa.Column("config", sa.JSON(), nullable=False),
+        sa.Column("hardware_fingerprint", sa.String(), nullable=False),
+        sa.Column("hardware", sa.JSON(), nullable=False),
+        sa.Column("metrics", sa.JSON(), nullable=False),
+        sa.Column("is_baseline", sa.Boolean(), nullable=False),
+        sa.Column("notes", sa.String(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+    )
+    for column in ("suite", "model_checksum", "hardware_fingerprint", "is_baseline"):
+        op.create_index(f"ix_benchmark_runs_{column}", "benchmark_runs", [column], unique=False)
+
+
+def downgrade() -> None:
+    for column in ("suite", "model_checksum", "hardware_fingerprint", "is_baseline"):
+        op.drop_index(f"ix_benchmark_runs_{column}", table_name="benchmark_runs")
+    op.drop_table("benchmark_runs")
@@ -0,0 +1,42 @@
+"""LoRA adapters linked to a base model."""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "2026_10_19_0007"
+down_revision = "2026_10_19_0006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "lora_adapters",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("slug", sa.String(), nullable=False),
+        sa.Column("display_name", sa.String(), nullable=False),
+        sa.Column(
+            "base_model_id",
+            sa.Integer(),
+            sa.ForeignKey("installed_models.id"),
+            nullable=False,
+        ),
+        sa.Column("file_path", sa.String(), nullable=False),
+        sa.Column("scale", sa.Float(), nullable=False),
+        sa.Column("size_bytes", sa.Integer(), nullable=True),
+        sa.Column("checksum_sha256", sa.String(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_lora_adapters_slug", "lora_adapters", ["slug"], unique=True)
+    for column in ("base_model_id", "checksum_sha256"):
+        op.create_index(f"ix_lora_adapters_{column}", "lora_adapters", [column], unique=False)
+
+
+def downgrade() -> None:
+    for column in ("base_model_id", "checksum_sha256"):
+        op.drop_index(f"ix_lora_adapters_{column}", table_name="lora_adapters")
+    op.drop_index("ix_lora_adapters_slug", table_name="lora_adapters")
+    op.drop_table("lora_adapters")
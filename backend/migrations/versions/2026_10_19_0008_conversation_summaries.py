@@ -0,0 +1,43 @@
+"""Background summaries that stand in for older conversation turns."""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "2026_10_19_0008"
+down_revision = "2026_10_19_0007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "conversation_summaries",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column(
+            "conversation_id",
+            sa.Integer(),
+            sa.ForeignKey("conversations.id"),
+            nullable=False,
+        ),
+        sa.Column("first_message_id", sa.Integer(), nullable=False),
+        sa.Column("last_message_id", sa.Integer(), nullable=False),
+        sa.Column("content", sa.String(), nullable=False),
+        sa.Column("token_count", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index(
+        "ix_conversation_summaries_conversation_id_last_message_id",
+        "conversation_summaries",
+        ["conversation_id", "last_message_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_conversation_summaries_conversation_id_last_message_id",
+        table_name="conversation_summaries",
+    )
+    op.drop_table("conversation_summaries")
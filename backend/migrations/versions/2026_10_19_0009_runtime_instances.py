@@ -0,0 +1,23 @@
+"""Per-instance CPU placement for sharded runtimes."""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "2026_10_19_0009"
+down_revision = "2026_10_19_0008"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("runtime_config") as batch_op:
+        batch_op.add_column(
+            sa.Column("instances", sa.JSON(), nullable=False, server_default="[]"),
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("runtime_config") as batch_op:
+        batch_op.drop_column("instances")
@@ -0,0 +1,24 @@
+"""Topology-derived thread counts: nullable decode threads and separate prefill threads."""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "2026_10_19_0010"
+down_revision = "2026_10_19_0009"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("runtime_config") as batch_op:
+        batch_op.alter_column("cpu_threads", existing_type=sa.Integer(), nullable=True)
+        batch_op.add_column(sa.Column("prefill_threads", sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    op.execute("UPDATE runtime_config SET cpu_threads = 8 WHERE cpu_threads IS NULL")
+    with op.batch_alter_table("runtime_config") as batch_op:
+        batch_op.drop_column("prefill_threads")
+        batch_op.alter_column("cpu_threads", existing_type=sa.Integer(), nullable=False)
@@ -0,0 +1,71 @@
+"""Shared fixtures for backend tests."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Generator, Iterator
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.app.config import settings
+from backend.app.db.session import configure_engine, init_db
+from backend.app.runtime.synthetic import SyntheticRuntime
+
+
+class StreamingFakeRuntime(SyntheticRuntime):
+    """Runtime that streams a fixed reply and records every prompt it was given."""
+
+    def __init__(self, tokens: list[str]) -> None:
+        super().__init__(prefill_delay=0, tokens_per_second=0, jitter=0)
+        self.tokens = tokens
+        self.prompts: list[list[dict[str, str]]] = []
+
+    def generate(self, messages, config, *, cache_key=None, adapter=None) -> Iterator[str]:
+        self.prompts.append(messages)
+        yield from self.tokens
+
+
+def _load_model(client: TestClient) -> str:
+    upload = client.post(
+        "/api/runtime/models/upload",
+        files={"file": ("tiny.gguf", b"GGUF", "application/octet-stream")},
+    ).json()["model"]
+    client.post("/api/runtime/load", json={"model_id": upload["id"]})
+    return upload["slug"]
+
+
+@pytest.fixture
+def isolated_state(tmp_path, monkeypatch) -> Generator[Path, None, None]:
+    """Point settings + the engine at a throwaway data directory and database."""
+    original_db_url = settings.database_url
+    data_dir = tmp_path / "state"
+    db_path = data_dir / "chatbot.db"
+
+    monkeypatch.setattr(settings, "data_dir", data_dir, raising=False)
+    monkeypatch.setattr(settings, "models_dir", data_dir / "models", raising=False)
+    monkeypatch.setattr(settings, "documents_dir", data_dir / "documents", raising=False)
+    monkeypatch.setattr(settings, "runtime_root", tmp_path / "runtime", raising=False)
+    monkeypatch.setattr(settings, "trace_export_path", data_dir / "traces.jsonl", raising=False)
+    monkeypatch.setattr(settings, "database_path", db_path, raising=False)
+    monkeypatch.setattr(settings, "database_url", f"sqlite:///{db_path}", raising=False)
+    settings.ensure_directories()
+
+    configure_engine(settings.database_url)
+    init_db()
+    try:
+        yield data_dir
+    finally:
+        configure_engine(original_db_url)
+
+
+@pytest.fixture
+def streaming_runtime() -> Callable[[list[str]], StreamingFakeRuntime]:
+    """Factory for runtimes that stream the given tokens as every reply."""
+    return StreamingFakeRuntime
+
+
+@pytest.fixture
+def load_model() -> Callable[[TestClient], str]:
+    """Upload a stub GGUF through the API and load it; returns the model slug."""
+    return _load_model
@@ -0,0 +1,125 @@
+"""Tests covering the LoRA adapter registry and hot-swapping on the resident base model."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from backend.app.config import settings
+from backend.app.main import create_app
+from backend.app.runtime import get_runtime_manager
+from backend.app.runtime.manager import AdapterSpec
+from backend.app.runtime.synthetic import SyntheticRuntime
+from backend.app.schemas.chat import ChatConfig
+from backend.app.schemas.runtime import RuntimeConfigSchema
+
+
+class SwapRecordingRuntime(SyntheticRuntime):
+    def __init__(self) -> None:
+        super().__init__(prefill_delay=0, tokens_per_second=0, jitter=0)
+        self.loaded: list[Path] = []
+        self.applied: list[Path | None] = []
+        self.freed: list[Path] = []
+
+    def _load_adapter(self, llama: None, path: Path) -> Path:
+        self.loaded.append(path)
+        return path
+
+    def _set_adapter(self, llama: None, handle: Path | None, scale: float) -> None:
+        if handle is not None:
+            self.applied.append(handle)
+
+    def _free_adapter(self, handle: Path) -> None:
+        self.freed.append(handle)
+
+
+def _upload(client: TestClient, url: str, name: str) -> dict:
+    response = client.post(url, files={"file": (name, b"GGUF", "application/octet-stream")})
+    assert response.status_code == 201
+    return response.json()
+
+
+def test_adapters_are_swapped_from_an_lru(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(settings, "lora_max_loaded", 2, raising=False)
+    runtime = SwapRecordingRuntime()
+    model_path = tmp_path / "base.gguf"
+    model_path.write_bytes(b"GGUF")
+    runtime.load_model(model_id=1, model_path=model_path, config=RuntimeConfigSchema())
+    specs = {}
+    for name in "abc":
+        (tmp_path / f"{name}.gguf").write_bytes(b"GGUF")
+        specs[name] = AdapterSpec(adapter_id=ord(name), path=tmp_path / f"{name}.gguf")
+
+    config = ChatConfig(max_tokens=1)
+    for name in "aabac":
+        list(runtime.generate([], config, adapter=specs[name]))
+    list(runtime.generate([], config))
+
+    paths = {name: spec.path for name, spec in specs.items()}
+    assert runtime.loaded == [paths["a"], paths["b"], paths["c"]]
+    assert runtime.applied == [paths["a"], paths["b"], paths["a"], paths["c"]]
+    assert runtime.freed == [paths["b"]]
+
+    runtime.unload_model()
+    runtime.load_model(model_id=1, model_path=model_path, config=RuntimeConfigSchema())
+    list(runtime.generate([], config, adapter=specs["a"]))
+    assert runtime.loaded[-1] == paths["a"]
+
+
+def test_background_generations_keep_the_active_adapter(tmp_path) -> None:
+    runtime = SwapRecordingRuntime()
+    model_path = tmp_path / "base.gguf"
+    model_path.write_bytes(b"GGUF")
+    runtime.load_model(model_id=1, model_path=model_path, config=RuntimeConfigSchema())
+    (tmp_path / "a.gguf").write_bytes(b"GGUF")
+    spec = AdapterSpec(adapter_id=1, path=tmp_path / "a.gguf")
+
+    config = ChatConfig(max_tokens=1)
+    list(runtime.generate([], config, adapter=spec))
+    list(runtime.generate_choices(config, messages=[], background=True))
+    list(runtime.generate([], config, adapter=spec))
+
+    assert runtime.applied == [spec.path]
+    assert runtime._instances[0].active_adapter == (1, spec.scale)
+
+
+def test_adapter_registry_and_per_request_selection(isolated_state) -> None:
+    app = create_app()
+    runtime = SwapRecordingRuntime()
+    app.dependency_overrides[get_runtime_manager] = lambda: runtime
+
+    with TestClient(app) as client:
+        base = _upload(client, "/api/runtime/models/upload", "base.gguf")["model"]
+        other = _upload(client, "/api/runtime/models/upload", "other.gguf")["model"]
+        adapter = _upload(client, f"/api/runtime/models/{base['id']}/adapters/upload", "base.gguf")[
+            "adapter"
+        ]
+        stranger = _upload(
+            client, f"/api/runtime/models/{other['id']}/adapters/upload", "tone.gguf"
+        )["adapter"]
+        assert adapter["slug"] == "base-2"  # shares the slug namespace with models
+        listed = client.get("/api/runtime/adapters", params={"base_model_id": base["id"]}).json()
+        assert [item["slug"] for item in listed["adapters"]] == ["base-2"]
+
+        client.post("/api/runtime/load", json={"model_id": base["id"]})
+        request = {"model_id": base["slug"], "prompt": "Hi", "config": {"max_tokens": 2}}
+        ok = client.post("/api/chat/stream", json={**request, "adapter_id": adapter["slug"]})
+        assert ok.status_code == 200
+        assert runtime.applied == [Path(adapter["file_path"])]
+        missing = client.post("/api/chat/stream", json={**request, "adapter_id": "nope"})
+        wrong_base = client.post(
+            "/api/chat/stream", json={**request, "adapter_id": stranger["slug"]}
+        )
+        assert (missing.status_code, wrong_base.status_code) == (404, 409)
+
+        assert adapter["slug"] in {model["id"] for model in client.get("/v1/models").json()["data"]}
+        completion = client.post(
+            "/v1/completions", json={"model": adapter["slug"], "prompt": "Hi", "max_tokens": 2}
+        )
+        assert completion.status_code == 200
+
+        assert client.delete(f"/api/runtime/adapters/{adapter['id']}").status_code == 204
+        assert runtime.freed == [Path(adapter["file_path"])]
+        assert not Path(adapter["file_path"]).exists()
+        assert client.delete(f"/api/runtime/adapters/{adapter['id']}").status_code == 404
@@ -0,0 +1,103 @@
+"""Tests covering benchmark history and regression comparison."""
+
+from __future__ import annotations
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from backend.app.config import settings
+from backend.app.db.models import BenchmarkRun, InstalledModel
+from backend.app.db.session import get_engine
+from backend.app.main import create_app
+from backend.app.runtime import get_benchmark_runner, get_runtime_manager
+from backend.app.runtime.benchmark import BenchmarkRunner, compare_runs, main
+from backend.app.runtime.synthetic import SyntheticRuntime
+
+
+def _run(run_id: int, **metrics: float) -> BenchmarkRun:
+    return BenchmarkRun(
+        id=run_id,
+        suite="standard-v1",
+        model_checksum="abc",
+        runtime_version="test",
+        hardware_fingerprint="host",
+        metrics=metrics,
+    )
+
+
+def test_compare_flags_regressions_by_direction() -> None:
+    baseline = _run(1, decode_tokens_per_second=100.0, ttft_ms_p50=50.0, total_seconds=10.0)
+    candidate = _run(2, decode_tokens_per_second=90.0, ttft_ms_p50=40.0, total_seconds=10.3)
+
+    comparison = compare_runs(baseline, candidate, threshold_pct=5.0)
+
+    flags = {delta.name: delta.regression for delta in comparison.deltas}
+    assert flags == {
+        "ttft_ms_p50": False,
+        "decode_tokens_per_second": True,
+        "total_seconds": False,
+    }
+    assert comparison.regressed is True
+    assert comparison.comparable is True
+
+
+def _benchmark(client: TestClient, runner: BenchmarkRunner, **request) -> dict:
+    response = client.post("/api/benchmarks", json=request)
+    assert response.status_code == 202
+    runner.wait(timeout=30)
+    job = client.get(f"/api/benchmarks/jobs/{response.json()['id']}").json()
+    assert job["status"] == "completed"
+    return job["run"]
+
+
+def test_benchmark_api_records_and_compares_runs(isolated_state) -> None:
+    app = create_app()
+    runtime = SyntheticRuntime(prefill_delay=0.0, tokens_per_second=2000.0, jitter=0.0)
+    runner = BenchmarkRunner()
+    app.dependency_overrides[get_runtime_manager] = lambda: runtime
+    app.dependency_overrides[get_benchmark_runner] = lambda: runner
+
+    with TestClient(app) as client:
+        assert client.post("/api/benchmarks", json={}).status_code == 409
+        assert client.get("/api/benchmarks/jobs/missing").status_code == 404
+        model_id = client.post(
+            "/api/runtime/models/upload",
+            files={"file": ("tiny.gguf", b"GGUF", "application/octet-stream")},
+        ).json()["model"]["id"]
+        client.post("/api/runtime/load", json={"model_id": model_id})
+
+        baseline = _benchmark(client, runner, max_tokens=6, mark_baseline=True)
+        assert baseline["is_baseline"] is True
+        assert baseline["metrics"]["decode_tokens_per_second"] > 0
+
+        runtime.tokens_per_second = 100.0
+        candidate = _benchmark(client, runner, max_tokens=6)
+        comparison = client.get("/api/benchmarks/compare").json()
+        listing = client.get("/api/benchmarks", params={"model_id": model_id}).json()
+
+    assert comparison["baseline_id"] == baseline["id"]
+    assert comparison["candidate_id"] == candidate["id"]
+    assert comparison["regressed"] is True
+    assert [item["id"] for item in listing["items"]] == [candidate["id"], baseline["id"]]
+
+
+def test_cli_runs_suite_with_synthetic_backend(isolated_state, monkeypatch, capsys) -> None:
+    # A real prefill delay keeps TTFT well above scheduler noise so the two runs compare.
+    monkeypatch.setattr(settings, "synthetic_prefill_delay", 0.01)
+    monkeypatch.setattr(settings, "synthetic_tokens_per_second", 2000.0)
+    monkeypatch.setattr(settings, "synthetic_jitter", 0.0)
+    model_path = settings.models_dir / "tiny.gguf"
+    model_path.write_bytes(b"GGUF")
+    with Session(get_engine()) as session:
+        session.add(
+            InstalledModel(
+                slug="tiny", display_name="Tiny", file_path=str(model_path), checksum_sha256="x"
+            )
+        )
+        session.commit()
+
+    args = ["run", "--model", "tiny", "--backend", "synthetic", "--max-tokens", "4"]
+    assert main([*args, "--baseline"]) == 0
+    assert "recorded run #1" in capsys.readouterr().out
+    assert main([*args, "--threshold", "1000"]) == 0
+    assert "baseline #1 -> candidate #2" in capsys.readouterr().out
@@ -0,0 +1,194 @@
+"""Tests covering chat streaming and write-behind persistence of replies."""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Generator
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from backend.app.api.routes import chat
+from backend.app.db.models import Conversation, Message
+from backend.app.db.session import get_engine
+from backend.app.db.write_behind import (
+    MessageWriteBehind,
+    get_message_writer,
+    process_owner,
+    recover_interrupted_messages,
+)
+from backend.app.main import create_app
+from backend.app.runtime import build_runtime, get_runtime_manager
+from backend.app.runtime.synthetic import SyntheticRuntime
+from backend.app.runtime.tokenizer import TokenCounter
+from backend.app.schemas.conversations import MessageStatus
+
+
+@pytest.fixture
+def chat_client(
+    isolated_state, streaming_runtime
+) -> Generator[tuple[TestClient, SyntheticRuntime, MessageWriteBehind], None, None]:
+    app = create_app()
+    runtime = streaming_runtime(["Hel", "lo", "!"])
+    writer = MessageWriteBehind(flush_interval=60, max_buffered_chars=1_000_000)
+    app.dependency_overrides[get_runtime_manager] = lambda: runtime
+    app.dependency_overrides[get_message_writer] = lambda: writer
+    try:
+        with TestClient(app) as client:
+            yield client, runtime, writer
+    finally:
+        writer.close()
+
+
+def _events(body: str) -> list[dict]:
+    return [
+        json.loads(line[len("data: ") :]) for line in body.splitlines() if line.startswith("data: ")
+    ]
+
+
+def test_stream_requires_loaded_model(chat_client) -> None:
+    client, _, _ = chat_client
+    response = client.post("/api/chat/stream", json={"model_id": "missing", "prompt": "Hi"})
+    assert response.status_code == 409
+
+
+def test_stream_persists_reply_through_write_behind(chat_client, load_model) -> None:
+    client, runtime, writer = chat_client
+    slug = load_model(client)
+    conversation_id = client.post("/api/conversations", json={"title": "Greeting"}).json()["id"]
+    client.post(
+        f"/api/conversations/{conversation_id}/messages",
+        json={"role": "user", "content": "Earlier question"},
+    )
+
+    response = client.post(
+        "/api/chat/stream",
+        json={"model_id": slug, "prompt": "Say hello", "conversation_id": conversation_id},
+    )
+    events = _events(response.text)
+    assert response.status_code == 200
+    assert "".join(event["token"] for event in events) == "Hello!"
+    assert events[-1]["is_final"] is True
+    assert [turn["content"] for turn in runtime.prompts[0][1:]] == [
+        "Earlier question",
+        "Say hello",
+    ]
+
+    writer.flush()
+    messages = client.get(f"/api/conversations/{conversation_id}/messages").json()["messages"]
+    assert messages[-1]["role"] == "assistant"
+    assert messages[-1]["content"] == "Hello!"
+    assert messages[-1]["status"] == "complete"
+    assert messages[-1]["token_count"] == 3
+
+
+def test_budgeting_counts_with_the_model_vocabulary(chat_client, monkeypatch, load_model) -> None:
+    client, runtime, _ = chat_client
+    runtime.load_vocab = lambda model_path: len  # One token per character.
+    monkeypatch.setattr(chat, "get_token_counter", lambda: TokenCounter())
+    slug = load_model(client)
+    conversation_id = client.post("/api/conversations", json={}).json()["id"]
+
+    response = client.post(
+        "/api/chat/stream",
+        json={"model_id": slug, "prompt": "Say hello", "conversation_id": conversation_id},
+    )
+
+    assert response.status_code == 200
+    messages = client.get(f"/api/conversations/{conversation_id}/messages").json()["messages"]
+    assert messages[0]["token_count"] == len("Say hello")
+
+
+def test_write_behind_batches_until_flush_and_recovers(isolated_state) -> None:
+    with Session(get_engine()) as session:
+        conversation = Conversation(title="Buffered")
+        session.add(conversation)
+        session.commit()
+        message = Message(
+            conversation_id=conversation.id,
+            role="assistant",
+            content="",
+            status=MessageStatus.STREAMING.value,
+        )
+        # Another worker's live stream must survive recovery; a dead process's must not.
+        live, dead = (
+            Message(
+                conversation_id=conversation.id,
+                role="assistant",
+                content="",
+                status=MessageStatus.STREAMING.value,
+                owner=owner,
+            )
+            for owner in (process_owner(), "999999999:0.00")
+        )
+        session.add_all([message, live, dead])
+        session.commit()
+        message_id, conversation_id = message.id, conversation.id
+        live_id, dead_id = live.id, dead.id
+
+    writer = MessageWriteBehind(flush_interval=60, max_buffered_chars=1_000_000)
+    for token in ("par", "tial", " reply"):
+        writer.append(message_id, conversation_id, token)
+
+    with Session(get_engine()) as session:
+        assert session.get(Message, message_id).content == ""
+
+    writer.flush()
+    with Session(get_engine()) as session:
+        assert session.get(Message, message_id).content == "partial reply"
+
+    assert recover_interrupted_messages() == 2
+    with Session(get_engine()) as session:
+        recovered = session.get(Message, message_id)
+        assert recovered.status == MessageStatus.INTERRUPTED.value
+        assert session.get(Message, dead_id).status == MessageStatus.INTERRUPTED.value
+        assert session.get(Message, live_id).status == MessageStatus.STREAMING.value
+        assert session.get(Conversation, conversation_id).token_count == recovered.token_count
+    writer.close()
+
+
+def test_synthetic_runtime_streams_requested_tokens(isolated_state, load_model) -> None:
+    app = create_app()
+    runtime = build_runtime("synthetic")
+    runtime.prefill_delay = 0.0
+    runtime.tokens_per_second = 0.0
+    app.dependency_overrides[get_runtime_manager] = lambda: runtime
+
+    with TestClient(app) as client:
+        slug = load_model(client)
+        response = client.post(
+            "/api/chat/stream",
+            json={
+                "model_id": slug,
+                "prompt": "Hi",
+                "config": {"max_tokens": 5},
+                "frame_policy": "token",
+            },
+        )
+
+    events = _events(response.text)
+    assert [event["index"] for event in events] == [0, 1, 2, 3, 4, 5]
+    assert "".join(event["token"] for event in events) == "The quick brown fox jumps"
+    assert events[-1]["is_final"] is True
+
+
+def test_adaptive_frames_coalesce_fast_tokens(isolated_state, load_model) -> None:
+    app = create_app()
+    runtime = build_runtime("synthetic")
+    runtime.prefill_delay = 0.0
+    runtime.tokens_per_second = 0.0
+    app.dependency_overrides[get_runtime_manager] = lambda: runtime
+
+    with TestClient(app) as client:
+        slug = load_model(client)
+        response = client.post(
+            "/api/chat/stream",
+            json={"model_id": slug, "prompt": "Hi", "config": {"max_tokens": 200}},
+        )
+
+    events = _events(response.text)
+    assert events[0] == {"token": "The", "index": 0, "is_final": False}
+    assert len(events) < 50
+    assert events[-1] == {"token": "", "index": 200, "is_final": True}
+    assert "".join(event["token"] for event in events).count(" ") == 199
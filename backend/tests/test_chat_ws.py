@@ -0,0 +1,90 @@
+"""Tests covering the multiplexed WebSocket chat transport."""
+
+from __future__ import annotations
+
+import time
+
+from fastapi.testclient import TestClient
+
+from backend.app.db.write_behind import MessageWriteBehind, get_message_writer
+from backend.app.main import create_app
+from backend.app.runtime import build_runtime, get_runtime_manager
+from backend.app.utils.streaming import SocketFrameKind
+
+
+def _start(stream_id: int, **request) -> dict:
+    return {"type": "start", "id": stream_id, "request": {"prompt": "Hi", **request}}
+
+
+def test_streams_are_multiplexed_over_one_socket(
+    isolated_state, streaming_runtime, load_model
+) -> None:
+    app = create_app()
+    runtime = streaming_runtime(["Hel", "lo", "!"])
+    app.dependency_overrides[get_runtime_manager] = lambda: runtime
+
+    with TestClient(app) as client, client.websocket_connect("/api/chat/ws") as websocket:
+        slug = load_model(client)
+        for stream_id in (1, 2):
+            websocket.send_json(_start(stream_id, model_id=slug, frame_policy="token"))
+        frames: list[dict] = []
+        while sum(frame["type"] == "final" for frame in frames) < 2:
+            frames.append(websocket.receive_json())
+
+        for stream_id in (1, 2):
+            own = [frame for frame in frames if frame["id"] == stream_id]
+            assert "".join(frame.get("token", "") for frame in own) == "Hello!"
+            assert own[-1] == {"type": "final", "id": stream_id, "index": 3}
+
+        websocket.send_json(_start(3, model_id="missing"))
+        error = websocket.receive_json()
+        assert (error["type"], error["id"], error["status"]) == ("error", 3, 409)
+
+        websocket.send_json({"type": "start", "id": 4})
+        assert websocket.receive_json()["status"] == 422
+
+
+def test_binary_stream_is_cancelled_in_band(isolated_state, load_model) -> None:
+    app = create_app()
+    runtime = build_runtime("synthetic")
+    runtime.prefill_delay = 0.0
+    runtime.tokens_per_second = 50.0
+    writer = MessageWriteBehind(flush_interval=60, max_buffered_chars=1_000_000)
+    app.dependency_overrides[get_runtime_manager] = lambda: runtime
+    app.dependency_overrides[get_message_writer] = lambda: writer
+
+    with TestClient(app) as client:
+        slug = load_model(client)
+        conversation_id = client.post("/api/conversations", json={"title": "Cancel"}).json()["id"]
+        with client.websocket_connect("/api/chat/ws?encoding=binary") as websocket:
+            websocket.send_json(
+                _start(
+                    7,
+                    model_id=slug,
+                    conversation_id=conversation_id,
+                    config={"max_tokens": 1000},
+                )
+            )
+            first = websocket.receive_bytes()
+            assert first[:9] == bytes([SocketFrameKind.TOKEN, 0, 0, 0, 7, 0, 0, 0, 0])
+            assert first[9:] == b"The"
+
+            websocket.send_json({"type": "cancel", "id": 7})
+            kinds = []
+            while not kinds or kinds[-1] != SocketFrameKind.CANCELLED:
+                kinds.append(websocket.receive_bytes()[0])
+            assert SocketFrameKind.FINAL not in kinds
+
+        # The ack is sent straight away; the reply is finalized once the generator unwinds.
+        deadline = time.monotonic() + 5
+        while True:
+            writer.flush()
+            messages = client.get(f"/api/conversations/{conversation_id}/messages").json()
+            reply = messages["messages"][-1]
+            if reply["status"] != "streaming" or time.monotonic() > deadline:
+                break
+            time.sleep(0.02)
+    writer.close()
+
+    assert reply["status"] == "cancelled"
+    assert 0 < reply["token_count"] < 1000
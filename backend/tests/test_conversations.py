@@ -0,0 +1,108 @@
+"""Tests covering conversation persistence, keyset pagination and search."""
+
+from __future__ import annotations
+
+from collections.abc import Generator
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.app.main import create_app
+
+
+@pytest.fixture
+def client(isolated_state) -> Generator[TestClient, None, None]:
+    with TestClient(create_app()) as test_client:
+        yield test_client
+
+
+def _create_conversation(client: TestClient, title: str) -> int:
+    response = client.post("/api/conversations", json={"title": title})
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+def test_conversation_crud_and_token_cache(client) -> None:
+    conversation_id = _create_conversation(client, "Draft")
+
+    message = client.post(
+        f"/api/conversations/{conversation_id}/messages",
+        json={"role": "user", "content": "How do I offload layers to the GPU?"},
+    )
+    assert message.status_code == 201
+    assert message.json()["token_count"] > 0
+
+    renamed = client.patch(f"/api/conversations/{conversation_id}", json={"title": "GPU offload"})
+    assert renamed.json()["title"] == "GPU offload"
+    assert renamed.json()["message_count"] == 1
+    assert renamed.json()["token_count"] == message.json()["token_count"]
+
+    assert client.delete(f"/api/conversations/{conversation_id}").status_code == 204
+    assert client.get(f"/api/conversations/{conversation_id}").status_code == 404
+
+
+def test_conversations_keyset_pagination(client) -> None:
+    created = [_create_conversation(client, f"Chat {index}") for index in range(5)]
+
+    first = client.get("/api/conversations", params={"limit": 2}).json()
+    assert [item["id"] for item in first["conversations"]] == created[::-1][:2]
+    assert first["next_cursor"]
+
+    seen = [item["id"] for item in first["conversations"]]
+    cursor = first["next_cursor"]
+    while cursor:
+        page = client.get("/api/conversations", params={"limit": 2, "cursor": cursor}).json()
+        seen.extend(item["id"] for item in page["conversations"])
+        cursor = page["next_cursor"]
+    assert seen == created[::-1]
+
+    assert client.get("/api/conversations", params={"cursor": "%%%"}).status_code == 400
+
+
+def test_message_history_pages_backwards(client) -> None:
+    conversation_id = _create_conversation(client, "Long chat")
+    for index in range(7):
+        client.post(
+            f"/api/conversations/{conversation_id}/messages",
+            json={"role": "user", "content": f"message {index}"},
+        )
+
+    latest = client.get(f"/api/conversations/{conversation_id}/messages", params={"limit": 3})
+    payload = latest.json()
+    assert [item["content"] for item in payload["messages"]] == [
+        "message 4",
+        "message 5",
+        "message 6",
+    ]
+
+    older = client.get(
+        f"/api/conversations/{conversation_id}/messages",
+        params={"limit": 10, "before_id": payload["next_cursor"]},
+    ).json()
+    assert [item["content"] for item in older["messages"]][-1] == "message 3"
+    assert older["next_cursor"] is None
+
+
+def test_full_text_search_across_conversations(client) -> None:
+    rocm = _create_conversation(client, "ROCm setup")
+    other = _create_conversation(client, "Cooking")
+    client.post(
+        f"/api/conversations/{rocm}/messages",
+        json={
+            "role": "assistant",
+            "content": "Install the ROCm drivers before building llama.cpp.",
+        },
+    )
+    client.post(
+        f"/api/conversations/{other}/messages",
+        json={"role": "user", "content": "How long should pasta boil?"},
+    )
+
+    response = client.get("/api/conversations/search", params={"q": "drive"})
+    results = response.json()["results"]
+    assert response.status_code == 200
+    assert [item["conversation_id"] for item in results] == [rocm]
+    assert "[drivers]" in results[0]["snippet"]
+
+    client.delete(f"/api/conversations/{rocm}")
+    assert client.get("/api/conversations/search", params={"q": "drivers"}).json()["results"] == []
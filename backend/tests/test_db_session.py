@@ -0,0 +1,38 @@
+"""Tests covering SQLite engine tuning."""
+
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from backend.app.config import settings
+from backend.app.db.session import get_engine, get_read_engine
+
+
+def _pragma(engine, name: str):
+    with engine.connect() as connection:
+        return connection.execute(text(f"PRAGMA {name}")).scalar()
+
+
+def test_engine_applies_sqlite_pragmas(isolated_state) -> None:
+    engine = get_engine()
+
+    assert _pragma(engine, "journal_mode") == "wal"
+    assert _pragma(engine, "synchronous") == 1
+    assert _pragma(engine, "busy_timeout") == settings.database_busy_timeout_ms
+    assert _pragma(engine, "cache_size") == -settings.database_cache_size_kib
+    assert engine.pool.size() == settings.threadpool_size
+
+
+def test_read_only_pool_rejects_writes(isolated_state, monkeypatch) -> None:
+    monkeypatch.setattr(settings, "database_read_only_pool", False)
+    assert get_read_engine() is get_engine()
+
+    monkeypatch.setattr(settings, "database_read_only_pool", True)
+    read_engine = get_read_engine()
+    assert read_engine is not get_engine()
+    with read_engine.connect() as connection:
+        assert connection.execute(text("SELECT count(*) FROM conversations")).scalar() == 0
+        with pytest.raises(OperationalError):
+            connection.execute(text("INSERT INTO conversations (title) VALUES ('nope')"))
@@ -0,0 +1,235 @@
+"""Tests covering the document ingestion pipeline and endpoints."""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Generator
+from threading import Event
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+
+from backend.app.config import settings
+from backend.app.db.models import Document, DocumentChunk
+from backend.app.db.session import get_engine
+from backend.app.documents import get_document_ingestor
+from backend.app.documents.embeddings import HashingEmbedder, RuntimeEmbedder, unpack_vector
+from backend.app.documents.ingest import DocumentIngestor
+from backend.app.documents.pipeline import chunk_paragraphs, parse_document
+from backend.app.main import create_app
+from backend.app.runtime.manager import LlamaRuntime
+from backend.app.schemas.runtime import RuntimeConfigSchema
+
+MARKDOWN = b"""# Title
+
+First paragraph with a handful of words about local inference.
+
+## Section
+
+Second paragraph mentions ROCm and llama.cpp several times over.
+"""
+
+
+@pytest.fixture
+def documents_client(isolated_state) -> Generator[tuple[TestClient, DocumentIngestor], None, None]:
+    app = create_app()
+    ingestor = DocumentIngestor(embedder=HashingEmbedder(16), max_workers=1)
+    app.dependency_overrides[get_document_ingestor] = lambda: ingestor
+    try:
+        with TestClient(app) as client:
+            yield client, ingestor
+    finally:
+        ingestor.shutdown()
+
+
+def test_parse_document_splits_paragraphs_and_headings(tmp_path) -> None:
+    source = tmp_path / "notes.md"
+    source.write_bytes(MARKDOWN)
+
+    paragraphs = list(parse_document(source))
+
+    assert paragraphs[0] == "# Title"
+    assert paragraphs[1].startswith("First paragraph")
+    assert paragraphs[2] == "## Section"
+
+
+def test_chunk_paragraphs_respects_budget_and_overlap() -> None:
+    words = " ".join(f"w{index}" for index in range(50))
+
+    chunks = list(
+        chunk_paragraphs([words], max_tokens=10, overlap_tokens=2, count_tokens=lambda _: 1)
+    )
+
+    assert all(chunk.token_count <= 10 for chunk in chunks)
+    assert [chunk.ordinal for chunk in chunks] == list(range(len(chunks)))
+    assert chunks[1].text.split()[:2] == chunks[0].text.split()[-2:]
+    assert chunks[-1].text.split()[-1] == "w49"
+
+
+def test_chunk_paragraphs_splits_oversized_words() -> None:
+    word = "x" * 1000
+
+    chunks = list(chunk_paragraphs([word], max_tokens=16))
+
+    assert len(chunks) > 1
+    assert all(chunk.token_count <= 16 for chunk in chunks)
+    assert "".join(chunk.text for chunk in chunks) == word
+
+
+def test_upload_ingests_and_deduplicates(documents_client) -> None:
+    client, ingestor = documents_client
+    response = client.post(
+        "/api/documents",
+        files={"file": ("notes.md", MARKDOWN, "text/markdown")},
+    )
+    assert response.status_code == 202
+    document_id = response.json()["document"]["id"]
+
+    ingestor.wait(timeout=10)
+    detail = client.get(f"/api/documents/{document_id}").json()["document"]
+    assert detail["status"] == "ready"
+    assert detail["chunk_count"] >= 1
+
+    with Session(get_engine()) as session:
+        chunk = session.exec(
+            select(DocumentChunk).where(DocumentChunk.document_id == document_id)
+        ).first()
+    assert chunk is not None
+    assert len(unpack_vector(chunk.embedding)) == 16
+
+    duplicate = client.post(
+        "/api/documents",
+        files={"file": ("copy.md", MARKDOWN, "text/markdown")},
+    )
+    assert duplicate.status_code == 200
+    assert duplicate.json()["deduplicated"] is True
+    assert duplicate.json()["document"]["id"] == document_id
+    assert len(client.get("/api/documents").json()["documents"]) == 1
+
+
+def test_upload_rejects_binary_extensions(documents_client) -> None:
+    client, _ = documents_client
+    response = client.post(
+        "/api/documents",
+        files={"file": ("model.gguf", b"GGUF", "application/octet-stream")},
+    )
+    assert response.status_code == 415
+
+
+class FlakyEmbedder(HashingEmbedder):
+    """Embeds one batch, then fails or cancels the job on the next."""
+
+    def __init__(self, cancelled: Event | None = None) -> None:
+        super().__init__(16)
+        self.cancelled = cancelled
+        self.calls = 0
+
+    def embed(self, texts: list[str]) -> list[list[float]]:
+        self.calls += 1
+        if self.calls == 2:
+            if self.cancelled is None:
+                raise RuntimeError("embedder crashed")
+            self.cancelled.set()
+        return super().embed(texts)
+
+
+def _stored_document(source) -> int:
+    source.write_text("\n\n".join(f"Paragraph {index} of the notes." for index in range(8)))
+    with Session(get_engine()) as session:
+        document = Document(
+            filename=source.name,
+            content_hash=source.name,
+            media_type="text/plain",
+            file_path=str(source),
+            size_bytes=source.stat().st_size,
+        )
+        session.add(document)
+        session.commit()
+        return document.id  # type: ignore[return-value]
+
+
+def _chunks(document_id: int) -> list[DocumentChunk]:
+    with Session(get_engine()) as session:
+        return list(
+            session.exec(select(DocumentChunk).where(DocumentChunk.document_id == document_id))
+        )
+
+
+def test_failed_and_cancelled_ingests_leave_no_chunks(isolated_state, monkeypatch) -> None:
+    monkeypatch.setattr(settings, "document_chunk_tokens", 4)
+    monkeypatch.setattr(settings, "document_chunk_overlap_tokens", 0)
+    monkeypatch.setattr(settings, "document_embed_batch_size", 1)
+
+    failing = _stored_document(settings.documents_dir / "failing.txt")
+    DocumentIngestor(embedder=FlakyEmbedder()).ingest(
+        failing, settings.documents_dir / "failing.txt"
+    )
+    with Session(get_engine()) as session:
+        document = session.get(Document, failing)
+        assert (document.status, document.chunk_count) == ("failed", 0)
+        assert document.error == "embedder crashed"
+    assert _chunks(failing) == []
+
+    cancelled = Event()
+    stopped = _stored_document(settings.documents_dir / "stopped.txt")
+    ingestor = DocumentIngestor(embedder=FlakyEmbedder(cancelled))
+    ingestor.ingest(stopped, settings.documents_dir / "stopped.txt", cancelled)
+    assert _chunks(stopped) == []
+
+
+def test_delete_waits_for_a_running_ingest(documents_client) -> None:
+    client, ingestor = documents_client
+    document_id = client.post(
+        "/api/documents", files={"file": ("notes.md", MARKDOWN, "text/markdown")}
+    ).json()["document"]["id"]
+
+    assert client.delete(f"/api/documents/{document_id}").status_code == 204
+    ingestor.wait(timeout=10)
+
+    assert client.get(f"/api/documents/{document_id}").status_code == 404
+    assert _chunks(document_id) == []
+
+
+class EmbeddingLlama:
+    def __init__(self, **llama_args) -> None:
+        self.args = llama_args
+        self.embed_threads: list[str] = []
+
+    def embed(self, texts: list[str]) -> list[list[float]]:
+        if not self.args.get("embedding"):
+            raise RuntimeError(
+                "Llama model must be created with embedding=True to call this method"
+            )
+        self.embed_threads.append(threading.current_thread().name)
+        return [[float(len(text))] for text in texts]
+
+
+class EmbeddingRuntime(LlamaRuntime):
+    requires_bindings = False
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.created: list[EmbeddingLlama] = []
+
+    def _create_llama(self, llama_args):
+        self.created.append(EmbeddingLlama(**llama_args))
+        return self.created[-1]
+
+
+def test_runtime_embedder_uses_an_embedding_context(tmp_path) -> None:
+    (tmp_path / "model.gguf").write_bytes(b"GGUF")
+    runtime = EmbeddingRuntime()
+    runtime.load_model(model_id=1, model_path=tmp_path / "model.gguf", config=RuntimeConfigSchema())
+    embedder = RuntimeEmbedder(runtime)
+
+    assert embedder.embed(["ab", "abcd"]) == [[2.0], [4.0]]
+    assert embedder.embed(["a"]) == [[1.0]]
+
+    generation, embedding = runtime.created
+    assert not generation.args.get("embedding")
+    assert embedding.args["embedding"] is True
+    assert embedding.args["model_path"] == generation.args["model_path"]
+    assert len(set(embedding.embed_threads)) == 1
+    assert embedding.embed_threads[0] != threading.current_thread().name
+    runtime.unload_model()
@@ -0,0 +1,116 @@
+"""Tests covering grammar / JSON-schema constrained decoding and the compiled-grammar LRU."""
+
+from __future__ import annotations
+
+import logging
+
+import pytest
+from pydantic import ValidationError
+
+from backend.app.runtime import manager
+from backend.app.runtime.grammar import Constraint, GrammarCache, constraint_for
+from backend.app.runtime.manager import LlamaRuntime
+from backend.app.schemas.chat import ChatConfig
+from backend.app.schemas.openai import ChatCompletionRequest
+from backend.app.schemas.runtime import RuntimeConfigSchema
+
+SCHEMA = {"type": "object", "properties": {"name": {"type": "string"}}, "required": ["name"]}
+
+
+class RecordingCompiler:
+    def __init__(self) -> None:
+        self.compiled: list[Constraint] = []
+
+    def __call__(self, constraint: Constraint) -> object:
+        self.compiled.append(constraint)
+        return object()
+
+
+def test_constraints_are_keyed_by_canonical_form() -> None:
+    reordered = {"required": ["name"], "properties": SCHEMA["properties"], "type": "object"}
+    first = constraint_for(ChatConfig(json_schema=SCHEMA))
+    assert first is not None and first.kind == "json_schema"
+    assert first == constraint_for(ChatConfig(json_schema=reordered))
+    assert constraint_for(ChatConfig(grammar='root ::= "yes"')).kind == "gbnf"  # type: ignore[union-attr]
+    assert constraint_for(ChatConfig()) is None
+
+    with pytest.raises(ValidationError):
+        ChatConfig(grammar='root ::= "yes"', json_schema=SCHEMA)
+    request = ChatCompletionRequest(
+        model="m",
+        messages=[{"role": "user", "content": "Hi"}],
+        response_format={"type": "json_schema", "json_schema": {"name": "x", "schema": SCHEMA}},
+    )
+    assert request.chat_config().json_schema == SCHEMA
+
+
+def test_compiled_grammars_are_cached_lru() -> None:
+    compiler = RecordingCompiler()
+    cache = GrammarCache(max_entries=2, compiler=compiler)
+    one, two, three = (constraint_for(ChatConfig(grammar=f'root ::= "{n}"')) for n in range(3))
+
+    first = cache.get(one)  # type: ignore[arg-type]
+    again = cache.get(one)  # type: ignore[arg-type]
+    assert (first.cache_hit, again.cache_hit) == (False, True)
+    assert again.grammar is first.grammar and again.compile_ms == 0.0
+
+    cache.get(two)  # type: ignore[arg-type]
+    cache.get(one)  # type: ignore[arg-type]
+    cache.get(three)  # type: ignore[arg-type]
+    assert cache.get(one).cache_hit  # type: ignore[arg-type]
+    assert not cache.get(two).cache_hit  # type: ignore[arg-type]
+    assert len(compiler.compiled) == 4
+
+
+def test_each_instance_gets_its_own_grammar() -> None:
+    cache = GrammarCache(compiler=RecordingCompiler())
+    constraint = constraint_for(ChatConfig(json_schema=SCHEMA))
+
+    first = cache.get(constraint, instance=0)  # type: ignore[arg-type]
+    second = cache.get(constraint, instance=1)  # type: ignore[arg-type]
+
+    assert not second.cache_hit and second.grammar is not first.grammar
+    assert cache.get(constraint, instance=1).grammar is second.grammar  # type: ignore[arg-type]
+
+
+class FakeLlama:
+    def __init__(self) -> None:
+        self.grammars: list[object] = []
+
+    def create_chat_completion(self, messages, **options):
+        self.grammars.append(options["grammar"])
+        yield {"choices": [{"delta": {"content": '{"name":"x"}'}, "finish_reason": "stop"}]}
+
+
+class FakeRuntime(LlamaRuntime):
+    requires_bindings = False
+
+    def _create_llama(self, llama_args):
+        return FakeLlama()
+
+
+def test_runtime_samples_under_cached_grammar(tmp_path, monkeypatch, caplog) -> None:
+    compiler = RecordingCompiler()
+    monkeypatch.setattr(manager, "grammar_cache", GrammarCache(compiler=compiler))
+    (tmp_path / "model.gguf").write_bytes(b"GGUF")
+    runtime = FakeRuntime()
+    runtime.load_model(
+        model_id=1,
+        model_path=tmp_path / "model.gguf",
+        config=RuntimeConfigSchema(use_mmap=False, context_length=512),
+    )
+    messages = [{"role": "user", "content": "Name?"}]
+
+    with caplog.at_level(logging.INFO, logger=manager.__name__):
+        for _ in range(2):
+            reply = "".join(runtime.generate(messages, ChatConfig(json_schema=SCHEMA)))
+            assert reply == '{"name":"x"}'
+        list(runtime.generate(messages, ChatConfig()))
+
+    llama = runtime._llama
+    assert len(compiler.compiled) == 1
+    assert llama.grammars[0] is llama.grammars[1] is not None  # type: ignore[union-attr]
+    assert llama.grammars[2] is None  # type: ignore[union-attr]
+    reports = [r.getMessage() for r in caplog.records if "Constrained sampling" in r.getMessage()]
+    assert len(reports) == 2
+    assert "compiled" in reports[0] and "cached" in reports[1]
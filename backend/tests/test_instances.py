@@ -0,0 +1,217 @@
+"""Tests covering multi-instance runtimes: CPU placement and least-loaded routing."""
+
+from __future__ import annotations
+
+import contextvars
+import os
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.app.config import settings
+from backend.app.main import create_app
+from backend.app.runtime import get_runtime_manager, topology
+from backend.app.runtime.manager import plan_instances
+from backend.app.runtime.synthetic import SyntheticRuntime
+from backend.app.runtime.topology import CpuCore, CpuTopology, parse_cpu_list
+from backend.app.schemas.chat import ChatConfig
+from backend.app.schemas.runtime import RuntimeConfigSchema
+from backend.app.telemetry.tracing import get_tracer
+
+MESSAGES = [{"role": "user", "content": "Hi"}]
+
+
+def _routed_to(runtime: SyntheticRuntime, cache_key: str | None) -> int:
+    before = [instance.routed for instance in runtime._instances]
+    list(runtime.generate(MESSAGES, ChatConfig(max_tokens=2), cache_key=cache_key))
+    after = [instance.routed for instance in runtime._instances]
+    return next(
+        index for index, (old, new) in enumerate(zip(before, after, strict=True)) if new > old
+    )
+
+
+def _write(path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+
+
+def test_topology_groups_smt_siblings_and_efficiency_cores(tmp_path, monkeypatch) -> None:
+    # Hybrid part: P-cores 0-1 with SMT siblings 4-5, E-cores 2-3 without SMT.
+    siblings = {0: "0,4", 1: "1,5", 2: "2", 3: "3", 4: "0,4", 5: "1,5"}
+    for cpu, listed in siblings.items():
+        _write(tmp_path / "cpu" / f"cpu{cpu}" / "topology" / "core_cpus_list", listed)
+    _write(tmp_path / "atom", "2-3\n")
+    monkeypatch.setattr(topology, "SYSFS_CPUS", tmp_path / "cpu")
+    monkeypatch.setattr(topology, "SYSFS_ATOM_CPUS", tmp_path / "atom")
+
+    detected = topology.detect_topology(frozenset(range(6)))
+    assert detected.source == "sysfs"
+    assert [(core.cpus, core.efficiency) for core in detected.cores] == [
+        ((0, 4), False),
+        ((1, 5), False),
+        ((2,), True),
+        ((3,), True),
+    ]
+    assert topology.default_threads(list(detected.cores)) == (4, 2)
+    # A cgroup that only allows one sibling still sees the whole core.
+    assert [core.cpus for core in topology.detect_topology(frozenset({0, 1})).cores] == [
+        (0,),
+        (1,),
+    ]
+
+    monkeypatch.setattr(topology, "SYSFS_CPUS", tmp_path / "missing")
+    cpuinfo = "\n\n".join(
+        f"processor\t: {cpu}\nphysical id\t: 0\ncore id\t\t: {cpu % 2}" for cpu in range(4)
+    )
+    _write(tmp_path / "cpuinfo", cpuinfo)
+    monkeypatch.setattr(topology, "PROC_CPUINFO", tmp_path / "cpuinfo")
+    detected = topology.detect_topology(frozenset(range(4)))
+    assert (detected.source, [core.cpus for core in detected.cores]) == (
+        "cpuinfo",
+        [(0, 2), (1, 3)],
+    )
+
+
+def test_instances_are_placed_on_cpu_sets_and_numa_nodes(tmp_path, monkeypatch) -> None:
+    assert parse_cpu_list("0-3,8,10-11\n") == {0, 1, 2, 3, 8, 10, 11}
+    for node, cpus in enumerate(("0-2,6-8", "3-5,9-11")):
+        _write(tmp_path / f"node{node}" / "cpulist", cpus)
+    monkeypatch.setattr(topology, "SYSFS_NODES", tmp_path)
+    # Six two-way SMT cores on CPUs 0-11, except that this process may not use CPU 11.
+    cores = [CpuCore((cpu, cpu + 6)) for cpu in range(5)] + [CpuCore((5,))]
+    host = CpuTopology(tuple(cores), "test")
+
+    config = RuntimeConfigSchema(
+        cpu_threads=3,
+        instances=[{"numa_node": 1}, {"cpus": [0, 6], "cpu_threads": 1}, {}, {}],
+    )
+    placements = plan_instances(config, host)
+    assert [(p.cpus, p.threads, p.prefill_threads, p.physical_cores) for p in placements] == [
+        ({3, 4, 5}, 3, 3, 3),  # One CPU per physical core of the node.
+        ({0, 6}, 1, 1, 1),  # Explicit CPUs are kept, SMT siblings included.
+        (None, 3, 1, 1),  # The unclaimed cores are split between floating instances,
+        (None, 3, 1, 1),  # which stay unpinned unless `runtime_pin_threads` is set.
+    ]
+    default = plan_instances(RuntimeConfigSchema(prefill_threads=4), host)
+    assert [(p.cpus, p.threads, p.prefill_threads) for p in default] == [(None, 6, 4)]
+
+    # Hybrid host: P-cores 0-1 with siblings 4-5, E-cores 2-3.
+    hybrid = CpuTopology(
+        (
+            CpuCore((0, 4)),
+            CpuCore((1, 5)),
+            CpuCore((2,), efficiency=True),
+            CpuCore((3,), efficiency=True),
+        ),
+        "test",
+    )
+    (unpinned,) = plan_instances(RuntimeConfigSchema(), hybrid)
+    assert (unpinned.cpus, unpinned.threads, unpinned.prefill_threads) == (None, 2, 4)
+    monkeypatch.setattr(settings, "runtime_pin_threads", True)
+    # Decode and prefill share one mask, so a pinned instance stays off the E-cores.
+    (pinned,) = plan_instances(RuntimeConfigSchema(), hybrid)
+    assert (pinned.cpus, pinned.threads, pinned.prefill_threads) == ({0, 1}, 2, 2)
+    for bad in ({"cpus": [12]}, {"numa_node": 2}):
+        with pytest.raises(ValueError):
+            plan_instances(RuntimeConfigSchema(instances=[bad]), host)
+
+
+def test_router_prefers_idle_instances_and_session_affinity(tmp_path) -> None:
+    runtime = SyntheticRuntime(prefill_delay=0, tokens_per_second=0, jitter=0)
+    (tmp_path / "model.gguf").write_bytes(b"GGUF")
+    runtime.load_model(
+        model_id=1,
+        model_path=tmp_path / "model.gguf",
+        config=RuntimeConfigSchema(use_mmap=False, instances=[{"cpus": [0]}, {}]),
+    )
+    first = _routed_to(runtime, "conversation:a")
+    assert _routed_to(runtime, "conversation:b") != first  # Idle ties spread out.
+    assert _routed_to(runtime, "conversation:a") == first  # Back to its warm KV cache.
+
+    # With its instance busy, the conversation moves instead of queueing behind it.
+    held = runtime.generate(MESSAGES, ChatConfig(max_tokens=4), cache_key="conversation:b")
+    next(held)
+    busy = next(index for index, item in enumerate(runtime._instances) if item.lock.locked())
+    routed: list[int] = []
+    worker = threading.Thread(target=lambda: routed.append(_routed_to(runtime, "conversation:a")))
+    worker.start()
+    worker.join(timeout=5)
+    assert routed == [1 - busy]
+    held.close()
+    assert _routed_to(runtime, "conversation:a") == 1 - busy
+
+
+def test_generations_run_on_the_pinned_instance_worker(tmp_path) -> None:
+    seen: list[tuple[str, frozenset[int]]] = []
+    traced: list[bool] = []
+
+    class ThreadRecordingRuntime(SyntheticRuntime):
+        def _sample(self, llama, config, **options):
+            with get_tracer().span("sample") as span:
+                traced.append(span is not None)
+            for item in super()._sample(llama, config, **options):
+                seen.append((threading.current_thread().name, frozenset(os.sched_getaffinity(0))))
+                yield item
+
+    runtime = ThreadRecordingRuntime(prefill_delay=0, tokens_per_second=0, jitter=0)
+    (tmp_path / "model.gguf").write_bytes(b"GGUF")
+    runtime.load_model(
+        model_id=1,
+        model_path=tmp_path / "model.gguf",
+        config=RuntimeConfigSchema(use_mmap=False, instances=[{"cpus": [0]}]),
+    )
+    affinity = os.sched_getaffinity(0)
+    with get_tracer().start_trace("generation"):
+        generation = runtime.generate(MESSAGES, ChatConfig(max_tokens=8))
+        deltas: list[str] = []
+        for _ in range(3):  # Resumed from a different thread each time, like streaming does.
+            step = threading.Thread(
+                target=contextvars.copy_context().run,
+                args=(lambda: deltas.append(next(generation)),),
+            )
+            step.start()
+            step.join(timeout=5)
+        generation.close()
+
+    assert deltas == ["The", " quick", " brown"]
+    assert {name for name, _ in seen} == {"llama-instance-0"}
+    assert {cpus for _, cpus in seen} == {frozenset({0})}
+    assert os.sched_getaffinity(0) == affinity
+    assert traced == [True]  # The worker joined the caller's trace.
+    assert not runtime.is_busy()  # Closing waited for the worker to stop.
+
+
+def test_load_reports_instance_placement(isolated_state) -> None:
+    app = create_app()
+    runtime = SyntheticRuntime(prefill_delay=0, tokens_per_second=0, jitter=0)
+    app.dependency_overrides[get_runtime_manager] = lambda: runtime
+
+    with TestClient(app) as client:
+        model = client.post(
+            "/api/runtime/models/upload",
+            files={"file": ("tiny.gguf", b"GGUF", "application/octet-stream")},
+        ).json()["model"]
+        override = {"cpu_threads": 2, "instances": [{"cpus": [0]}, {"prefill_threads": 3}]}
+        loaded = client.post(
+            "/api/runtime/load", json={"model_id": model["id"], "config_override": override}
+        ).json()
+        assert loaded["config"]["prefill_threads"] is None
+        pinned, floating = loaded["instances"]
+        assert pinned == {
+            "index": 0,
+            "cpus": [0],
+            "cpu_threads": 1,
+            "prefill_threads": 1,
+            "physical_cores": 1,
+            "efficiency_cores": 0,
+        }
+        assert (floating["cpu_threads"], floating["prefill_threads"]) == (2, 3)
+        assert floating["physical_cores"] >= 1
+        assert client.get("/api/runtime/state").json()["instances"] == loaded["instances"]
+
+        unplaceable = {"instances": [{"cpus": [4096]}]}
+        response = client.post(
+            "/api/runtime/load", json={"model_id": model["id"], "config_override": unplaceable}
+        )
+        assert response.status_code == 422
@@ -0,0 +1,89 @@
+"""Tests covering the in-process metrics registry and /metrics endpoint."""
+
+from __future__ import annotations
+
+import threading
+import time
+
+from fastapi.testclient import TestClient
+
+from backend.app.main import create_app
+from backend.app.runtime.synthetic import SyntheticRuntime
+from backend.app.schemas.chat import ChatConfig
+from backend.app.schemas.runtime import RuntimeConfigSchema
+from backend.app.telemetry import instrumentation
+from backend.app.telemetry.instrumentation import instrument_token_stream
+from backend.app.telemetry.metrics import Counter, Histogram, Registry
+
+
+def test_counter_sums_per_thread_shards() -> None:
+    registry = Registry()
+    counter = Counter("work", "Units of work.", ("kind",), registry=registry)
+
+    def worker() -> None:
+        for _ in range(1000):
+            counter.labels("a").inc()
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert counter.labels("a").value() == 4000
+    assert 'work_total{kind="a"} 4000' in registry.render()
+
+
+def test_histogram_renders_cumulative_buckets() -> None:
+    registry = Registry()
+    histogram = Histogram("latency", "Latency.", buckets=(0.1, 1.0), registry=registry)
+    for value in (0.05, 0.5, 5.0):
+        histogram.observe(value)
+
+    rendered = registry.render()
+    assert 'latency_bucket{le="0.1"} 1' in rendered
+    assert 'latency_bucket{le="1"} 2' in rendered
+    assert 'latency_bucket{le="+Inf"} 3' in rendered
+    assert "latency_count 3" in rendered
+
+
+def test_metrics_endpoint_reports_routes_and_tokens(isolated_state) -> None:
+    assert list(instrument_token_stream(iter(["a", "b", "c"]), prompt_tokens=12)) == ["a", "b", "c"]
+
+    with TestClient(create_app()) as client:
+        client.get("/api/health")
+        response = client.get("/metrics")
+
+    body = response.text
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'http_request_duration_seconds_count{method="GET",route="/api/health"}' in body
+    assert "chat_time_to_first_token_seconds_count" in body
+    assert 'chat_tokens_total{phase="decode"}' in body
+    assert "runtime_resident_bytes" in body
+
+
+def test_time_to_first_token_excludes_queue_wait(tmp_path, monkeypatch) -> None:
+    ttft = Histogram("ttft", "TTFT.", registry=Registry())
+    monkeypatch.setattr(instrumentation, "CHAT_TIME_TO_FIRST_TOKEN", ttft)
+    runtime = SyntheticRuntime(prefill_delay=0, tokens_per_second=0, jitter=0)
+    (tmp_path / "model.gguf").write_bytes(b"GGUF")
+    runtime.load_model(model_id=1, model_path=tmp_path / "model.gguf", config=RuntimeConfigSchema())
+    messages = [{"role": "user", "content": "Hi"}]
+
+    holder = runtime.generate(messages, ChatConfig(max_tokens=4))
+    next(holder)
+    queued = threading.Thread(
+        target=lambda: list(
+            instrument_token_stream(
+                runtime.generate(messages, ChatConfig(max_tokens=2)), prompt_tokens=1
+            )
+        )
+    )
+    queued.start()
+    time.sleep(0.3)
+    holder.close()
+    queued.join(timeout=5)
+
+    *_, total, count = ttft.labels().totals()
+    assert count == 1 and total < 0.2
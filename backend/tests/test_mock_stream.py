@@ -0,0 +1,70 @@
+"""Tests covering the paced, fault-injecting mock chat stream."""
+
+from __future__ import annotations
+
+import json
+import time
+
+from fastapi.testclient import TestClient
+
+from backend.app.main import create_app
+
+client = TestClient(create_app())
+
+
+def _events(body: str) -> list[tuple[str | None, dict]]:
+    events = []
+    for frame in body.strip().split("\n\n"):
+        event = None
+        for line in frame.splitlines():
+            if line.startswith("event: "):
+                event = line.removeprefix("event: ")
+            elif line.startswith("data: "):
+                events.append((event, json.loads(line.removeprefix("data: "))))
+    return events
+
+
+def _stream(**options) -> list[tuple[str | None, dict]]:
+    response = client.post(
+        "/api/mock/chat/stream",
+        json={"model_id": "tinyllama-q4", "prompt": "Hi", "stream": options},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    return _events(response.text)
+
+
+def test_fixture_is_streamed_then_finalized() -> None:
+    fixture = client.post("/api/mock/chat", json={"model_id": "tinyllama-q4", "prompt": "Hi"})
+    events = _stream()
+
+    tokens = [data["token"] for _, data in events[:-1]]
+    assert tokens == [chunk["token"] for chunk in fixture.json()["stream"]]
+    assert events[-1][1] == {"token": "", "index": len(tokens), "is_final": True}
+
+
+def test_synthetic_stream_is_coalesced_and_paced() -> None:
+    started = time.perf_counter()
+    events = _stream(
+        synthetic_tokens=50, coalesce=8, tokens_per_second=500, first_token_delay_ms=50
+    )
+    elapsed = time.perf_counter() - started
+
+    frames = [data for _, data in events[:-1]]
+    assert [frame["index"] for frame in frames] == [0, 8, 16, 24, 32, 40, 48]
+    assert "".join(frame["token"] for frame in frames).count(" ") == 49
+    assert events[-1][1]["index"] == 50
+    assert elapsed >= 0.05 + 49 / 500 * 0.9
+
+
+def test_injected_faults() -> None:
+    failed = _stream(synthetic_tokens=20, fail_after=5)
+    assert failed[-1] == ("error", {"detail": "Injected mock failure."})
+    assert sum(1 for event, _ in failed if event is None) == 5
+
+    dropped = _stream(synthetic_tokens=20, disconnect_after=3, fail_after=10)
+    assert [data["index"] for _, data in dropped] == [0, 1, 2]
+    assert not any(data.get("is_final") for _, data in dropped)
+
+    unknown = client.post("/api/mock/chat/stream", json={"model_id": "nope", "prompt": "Hi"})
+    assert unknown.status_code == 404
@@ -0,0 +1,104 @@
+"""Tests covering the OpenAI-compatible `/v1` completion endpoints."""
+
+from __future__ import annotations
+
+import json
+import time
+
+from fastapi.testclient import TestClient
+
+from backend.app.main import create_app
+from backend.app.runtime import get_runtime_manager
+from backend.app.runtime.synthetic import SyntheticRuntime
+
+PREFILL = 0.2
+
+
+def _client(runtime: SyntheticRuntime) -> TestClient:
+    app = create_app()
+    app.dependency_overrides[get_runtime_manager] = lambda: runtime
+    return TestClient(app)
+
+
+def test_n_choices_share_one_prefill(isolated_state, load_model) -> None:
+    runtime = SyntheticRuntime(prefill_delay=PREFILL, tokens_per_second=0, jitter=0)
+    with _client(runtime) as client:
+        slug = load_model(client)
+        assert [model["id"] for model in client.get("/v1/models").json()["data"]] == [slug]
+
+        started = time.perf_counter()
+        response = client.post(
+            "/v1/chat/completions",
+            json={
+                "model": slug,
+                "messages": [{"role": "user", "content": "Hi there"}],
+                "n": 3,
+                "max_tokens": 4,
+                "logit_bias": {},
+            },
+        )
+        elapsed = time.perf_counter() - started
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["object"] == "chat.completion"
+    assert body["id"].startswith("chatcmpl-")
+    assert [choice["index"] for choice in body["choices"]] == [0, 1, 2]
+    assert {choice["finish_reason"] for choice in body["choices"]} == {"length"}
+    assert body["choices"][0]["message"]["content"].count(" ") == 3
+    assert body["usage"]["completion_tokens"] == 12
+    assert elapsed < 2 * PREFILL
+
+
+def test_streamed_completion_ends_with_done(isolated_state, load_model) -> None:
+    runtime = SyntheticRuntime(prefill_delay=0, tokens_per_second=0, jitter=0)
+    with _client(runtime) as client:
+        slug = load_model(client)
+        response = client.post(
+            "/v1/completions",
+            json={"model": slug, "prompt": "Once", "n": 2, "max_tokens": 3, "stream": True},
+        )
+
+    assert response.headers["content-type"].startswith("text/event-stream")
+    data = [line.removeprefix("data: ") for line in response.text.splitlines() if line]
+    assert data[-1] == "[DONE]"
+    chunks = [json.loads(item) for item in data[:-1]]
+    assert {chunk["object"] for chunk in chunks} == {"text_completion"}
+    for index in (0, 1):
+        own = [chunk["choices"][0] for chunk in chunks if chunk["choices"][0]["index"] == index]
+        assert "".join(choice["text"] for choice in own).count(" ") == 2
+        assert own[-1]["finish_reason"] == "length"
+
+
+def test_unloaded_model_is_rejected(isolated_state) -> None:
+    runtime = SyntheticRuntime(prefill_delay=0, tokens_per_second=0, jitter=0)
+    with _client(runtime) as client:
+        response = client.post("/v1/completions", json={"model": "missing", "prompt": "Hi"})
+        invalid = client.post("/v1/completions", json={"model": "x", "prompt": "Hi", "n": 0})
+
+    assert response.status_code == 409
+    assert invalid.status_code == 422
+
+
+class StrictGrammarRuntime(SyntheticRuntime):
+    def _compile_constraint(self, constraint, *, instance=0):
+        if "root" not in constraint.source:
+            raise ValueError("Invalid GBNF grammar: missing root rule")
+        return None
+
+
+def test_invalid_grammar_is_rejected_before_streaming(isolated_state, load_model) -> None:
+    runtime = StrictGrammarRuntime(prefill_delay=0, tokens_per_second=0, jitter=0)
+    with _client(runtime) as client:
+        slug = load_model(client)
+        body = {"model": slug, "prompt": "Hi", "max_tokens": 2}
+        bad = client.post("/v1/completions", json={**body, "grammar": "x ::= y", "stream": True})
+        good = client.post("/v1/completions", json={**body, "grammar": 'root ::= "a"'})
+        chat = client.post(
+            "/api/chat/stream",
+            json={"model_id": slug, "prompt": "Hi", "config": {"grammar": "x ::= y"}},
+        )
+
+    assert bad.status_code == 422 and "missing root rule" in bad.json()["detail"]
+    assert good.status_code == 200
+    assert chat.status_code == 422
@@ -0,0 +1,99 @@
+"""Tests covering page-cache prewarming, residency reporting and startup auto-load."""
+
+from __future__ import annotations
+
+import json
+import sys
+from concurrent.futures import Future
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from backend.app.config import settings
+from backend.app.db.models import InstalledModel
+from backend.app.db.session import get_engine
+from backend.app.main import create_app
+from backend.app.runtime import manager
+from backend.app.runtime.autoload import load_active_model
+from backend.app.runtime.pagecache import (
+    page_cache_residency,
+    page_cache_warmer,
+    prewarm_file,
+    resident_page_count,
+)
+from backend.app.runtime.snapshot import RuntimeStateHub
+from backend.app.runtime.synthetic import SyntheticRuntime
+from backend.app.schemas.runtime import RuntimeConfigSchema
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="mincore is Linux-only here")
+def test_prewarm_and_residency(tmp_path) -> None:
+    path = tmp_path / "weights.gguf"
+    path.write_bytes(b"G" * (3 * 1024 * 1024 + 17))
+
+    assert prewarm_file(path) == path.stat().st_size
+    assert page_cache_warmer.submit(path).result() == path.stat().st_size
+    residency = page_cache_residency(path)
+
+    assert residency is not None
+    assert residency.total_bytes == path.stat().st_size
+    assert 0 < residency.resident_bytes <= residency.total_bytes
+
+
+def test_resident_pages_count_only_the_low_bit() -> None:
+    assert resident_page_count(bytes([1, 0, 3, 2, 0x81, 0xFE])) == 3
+    assert resident_page_count(b"") == 0
+
+
+def test_load_does_not_wait_for_prewarm(tmp_path, monkeypatch) -> None:
+    class StalledWarmer:
+        def submit(self, path):
+            self.path = path
+            return Future()  # Never completes.
+
+    warmer = StalledWarmer()
+    monkeypatch.setattr(manager, "page_cache_warmer", warmer)
+    monkeypatch.setattr(settings, "runtime_prewarm", True)
+    path = tmp_path / "model.gguf"
+    path.write_bytes(b"GGUF")
+
+    runtime = SyntheticRuntime()
+    runtime.load_model(model_id=1, model_path=path, config=RuntimeConfigSchema(use_mmap=True))
+    assert warmer.path == path
+    assert runtime.get_state() is not None
+
+
+def test_model_listing_reports_residency(isolated_state) -> None:
+    with TestClient(create_app()) as client:
+        client.post(
+            "/api/runtime/models/upload",
+            files={"file": ("tiny.gguf", b"GGUF" * 1024, "application/octet-stream")},
+        )
+        model = client.get("/api/runtime/models").json()["models"][0]
+
+    if page_cache_residency(settings.models_dir / "tiny.gguf") is not None:
+        assert model["page_cache_resident_bytes"] == 4096
+        assert model["page_cache_fraction"] == 1.0
+
+
+def test_active_model_is_autoloaded(isolated_state, monkeypatch) -> None:
+    path = settings.models_dir / "tiny.gguf"
+    path.write_bytes(b"GGUF")
+    with Session(get_engine()) as session:
+        session.add(
+            InstalledModel(slug="tiny", display_name="Tiny", file_path=str(path), is_active=True)
+        )
+        session.commit()
+    runtime = SyntheticRuntime()
+    hub = RuntimeStateHub()
+
+    monkeypatch.setattr(settings, "runtime_autoload_active", False)
+    assert load_active_model(runtime, hub) is False
+    assert runtime.get_state() is None
+
+    monkeypatch.setattr(settings, "runtime_autoload_active", True)
+    assert load_active_model(runtime, hub) is True
+    assert runtime.get_state() is not None
+    assert json.loads(hub.state().body)["model"]["slug"] == "tiny"
+    assert load_active_model(runtime, hub) is False
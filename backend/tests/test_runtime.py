@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import asyncio
+import json
 from collections.abc import Generator
 from pathlib import Path
 
@@ -13,6 +15,8 @@ from backend.app.db.session import configure_engine, init_db
 from backend.app.main import create_app
 from backend.app.runtime import get_runtime_manager
 from backend.app.runtime.manager import LoadedModelState, MemorySnapshot
+from backend.app.runtime.snapshot import RuntimeStateHub
+from backend.app.schemas.runtime import RuntimeState
 from backend.app.utils.clock import utcnow
 
 
@@ -38,6 +42,9 @@ class FakeRuntime:
     def get_state(self) -> LoadedModelState | None:
         return self.state
 
+    def ensure_loaded(self, model_id: int) -> bool:
+        return False
+
     def memory_snapshot(self) -> MemorySnapshot:
         return self.snapshot
 
@@ -152,3 +159,42 @@ def test_runtime_config_and_memory(runtime_client) -> None:
         "vram_bytes": runtime.snapshot.vram_bytes,
         "source": runtime.snapshot.source,
     }
+
+
+def test_runtime_state_supports_conditional_polling(runtime_client) -> None:
+    client, _ = runtime_client
+    first = client.get("/api/runtime/state")
+    etag = first.headers["etag"]
+    assert first.json()["loaded"] is False
+
+    cached = client.get("/api/runtime/state", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+
+    model_id = client.post(
+        "/api/runtime/models/upload",
+        files={"file": ("etag.gguf", b"GGUF", "application/octet-stream")},
+    ).json()["model"]["id"]
+    client.post("/api/runtime/load", json={"model_id": model_id})
+
+    refreshed = client.get("/api/runtime/state", headers={"If-None-Match": etag})
+    assert refreshed.status_code == 200
+    assert refreshed.headers["etag"] != etag
+    assert refreshed.json()["model"]["id"] == model_id
+
+
+@pytest.mark.asyncio
+async def test_runtime_hub_pushes_state_to_subscribers() -> None:
+    hub = RuntimeStateHub(memory_max_age=60)
+    runtime = FakeRuntime()
+
+    async with hub.subscribe(runtime) as queue:
+        initial = await asyncio.wait_for(queue.get(), 1)
+        assert initial.event == "state"
+
+        await asyncio.to_thread(hub.publish_state, RuntimeState(loaded=True))
+        events = [await asyncio.wait_for(queue.get(), 1) for _ in range(2)]
+
+    by_kind = {event.event: event for event in events}
+    assert json.loads(by_kind["state"].payload.body)["loaded"] is True
+    assert json.loads(by_kind["memory"].payload.body)["source"] == "fake"
+    assert by_kind["state"].encode().startswith(f"id: {by_kind['state'].payload.version}\n")
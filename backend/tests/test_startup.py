@@ -0,0 +1,88 @@
+"""Tests covering deferred startup and the cold-start budget."""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+
+from fastapi.testclient import TestClient
+
+from backend.app.config import settings
+from backend.app.main import create_app
+from backend.app.startup import parse_importtime, profile_startup
+
+# Generous enough for a loaded CI box; a regression back to eager llama.cpp/psutil imports or
+# import-time DB work shows up in `heavy_modules_loaded` long before it trips this.
+COLD_START_BUDGET_MS = 5000.0
+
+
+def test_lifespan_runs_startup_steps(isolated_state) -> None:
+    app = create_app()
+    assert not hasattr(app.state, "startup_timings")
+
+    with TestClient(app) as client:
+        assert client.get("/api/health").status_code == 200
+        timings = app.state.startup_timings
+
+    assert {"database", "fixtures", "runtime_probe", "total"} <= timings.keys()
+    assert settings.database_path.exists()
+
+
+def test_importing_the_app_touches_no_directories(tmp_path) -> None:
+    data_dir = tmp_path / "state"
+    env = {
+        "CHATBOT_DATA_DIR": str(data_dir),
+        "CHATBOT_MODELS_DIR": str(data_dir / "models"),
+        "CHATBOT_DOCUMENTS_DIR": str(data_dir / "documents"),
+    }
+    subprocess.run(
+        [sys.executable, "-c", "import backend.app.main"], check=True, env={**os.environ, **env}
+    )
+    assert not data_dir.exists()
+
+
+def test_dev_command_discovers_the_app() -> None:
+    # Mirrors `fastapi dev backend/app/main.py` from the README.
+    script = (
+        "from pathlib import Path; from fastapi_cli.discover import get_import_data; "
+        "print(get_import_data(path=Path('backend/app/main.py')).import_string)"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script], check=True, capture_output=True, text=True
+    )
+    assert result.stdout.strip() == "backend.app.main:app"
+
+
+def test_parse_importtime() -> None:
+    stderr = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       120 |        120 |   backend.app.config\n"
+        "import time:      1500 |       1620 | backend.app\n"
+    )
+    timings = parse_importtime(stderr)
+
+    assert [(item.module, item.depth) for item in timings] == [
+        ("backend.app.config", 1),
+        ("backend.app", 0),
+    ]
+    assert timings[1].cumulative_ms == 1.62
+
+
+def test_cold_start_stays_within_budget(tmp_path) -> None:
+    data_dir = tmp_path / "state"
+    profile = profile_startup(
+        {
+            "CHATBOT_RUNTIME_BACKEND": "synthetic",
+            "CHATBOT_DATA_DIR": str(data_dir),
+            "CHATBOT_MODELS_DIR": str(data_dir / "models"),
+            "CHATBOT_DOCUMENTS_DIR": str(data_dir / "documents"),
+            "CHATBOT_DATABASE_PATH": str(data_dir / "chatbot.db"),
+            "CHATBOT_DATABASE_URL": f"sqlite:///{(data_dir / 'chatbot.db').as_posix()}",
+            "CHATBOT_TRACE_EXPORT_PATH": str(data_dir / "traces.jsonl"),
+        }
+    )
+
+    assert profile.heavy_modules_loaded == []
+    assert any(item.module == "backend.app.main" for item in profile.imports)
+    assert profile.total_ms < COLD_START_BUDGET_MS
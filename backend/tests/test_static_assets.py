@@ -0,0 +1,68 @@
+"""Tests covering the cached, precompressed mock fixtures and OpenAPI schema."""
+
+from __future__ import annotations
+
+import gzip
+import json
+import os
+import shutil
+
+from fastapi.testclient import TestClient
+
+from backend.app.config import settings
+from backend.app.main import create_app
+from backend.app.utils.static_assets import StaticAssetCache
+
+client = TestClient(create_app())
+
+
+def test_asset_reloads_when_file_changes(tmp_path) -> None:
+    path = tmp_path / "asset.txt"
+    path.write_bytes(b"one")
+    cache = StaticAssetCache()
+
+    first = cache.get(path, media_type="text/plain")
+    assert cache.get(path, media_type="text/plain") is first
+    assert gzip.decompress(first.gzip_body) == b"one"
+
+    path.write_bytes(b"three")
+    os.utime(path, ns=(first.mtime_ns + 1_000_000, first.mtime_ns + 1_000_000))
+    second = cache.get(path, media_type="text/plain")
+    assert second.body == b"three"
+    assert second.etag != first.etag
+
+
+def test_mock_models_served_gzipped_with_etag() -> None:
+    plain = client.get("/api/mock/models", headers={"Accept-Encoding": "identity"})
+    zipped = client.get("/api/mock/models", headers={"Accept-Encoding": "gzip"})
+
+    assert "content-encoding" not in plain.headers
+    assert zipped.headers["content-encoding"] == "gzip"
+    assert zipped.headers["vary"] == "Accept-Encoding"
+    assert zipped.json() == plain.json()
+    assert zipped.headers["etag"] != plain.headers["etag"]
+
+    revalidated = client.get("/api/mock/models", headers={"If-None-Match": zipped.headers["etag"]})
+    assert revalidated.status_code == 304
+
+    spec = client.get("/api/spec")
+    assert spec.headers["content-type"].startswith("application/yaml")
+    cached = client.get("/api/spec", headers={"If-None-Match": spec.headers["etag"]})
+    assert cached.status_code == 304
+
+
+def test_fixture_edits_are_picked_up(tmp_path, monkeypatch) -> None:
+    fixtures = tmp_path / "fixtures"
+    shutil.copytree(settings.fixtures_dir, fixtures)
+    monkeypatch.setattr(settings, "fixtures_dir", fixtures, raising=False)
+    before = client.get("/api/mock/models").json()
+
+    models = json.loads((fixtures / "models.json").read_text(encoding="utf-8"))
+    models.append({**models[0], "id": "added-model"})
+    (fixtures / "models.json").write_text(json.dumps(models), encoding="utf-8")
+
+    after = client.get("/api/mock/models").json()
+    assert len(after) == len(before) + 1
+    chat = client.post("/api/mock/chat", json={"model_id": "added-model", "prompt": "Hi"})
+    assert chat.status_code == 200
+    assert chat.json()["model_id"] == "added-model"
@@ -0,0 +1,83 @@
+"""Tests covering token-frame coalescing and template serialization."""
+
+from __future__ import annotations
+
+import json
+import time
+from collections.abc import Iterator
+
+from backend.app.schemas.chat import ChatChunk, FramePolicy
+from backend.app.utils.streaming import (
+    FrameBuilder,
+    coalesce_tokens,
+    final_frame,
+    token_frame,
+)
+
+
+def _frames(gaps: list[float], policy: FramePolicy) -> list[tuple[int, list[str]]]:
+    """Frames for tokens "t0".."tN" arriving after `gaps`, with no deadline expiring early."""
+    builder = FrameBuilder(policy)
+    frames, now = [], 0.0
+    for index, gap in enumerate([0.0, *gaps]):
+        now += gap
+        if (frame := builder.add(f"t{index}", now)) is not None:
+            frames.append(frame)
+    if (frame := builder.flush()) is not None:
+        frames.append(frame)
+    return [(index, list(pieces)) for index, pieces in frames]
+
+
+def test_fast_tokens_are_grouped_within_the_window() -> None:
+    frames = _frames([0.006] * 9, FramePolicy.ADAPTIVE)
+
+    assert frames[0] == (0, ["t0"])
+    assert frames[1] == (1, ["t1", "t2", "t3", "t4"])
+    assert [index for index, _ in frames] == [0, 1, 5, 9]
+    assert sum(len(pieces) for _, pieces in frames) == 10
+
+
+def test_slow_tokens_and_token_policy_are_not_held() -> None:
+    assert len(_frames([0.05] * 5, FramePolicy.ADAPTIVE)) == 6
+    assert len(_frames([0.001] * 5, FramePolicy.TOKEN)) == 6
+    assert len(_frames([0.001] * 99, FramePolicy.BATCH)) == 2
+
+
+def test_held_tokens_are_flushed_when_decode_stalls() -> None:
+    closed: list[bool] = []
+
+    def stalling() -> Iterator[str]:
+        try:
+            for index in range(6):
+                time.sleep(0.002)
+                yield f"t{index}"
+            time.sleep(1.0)
+            yield "late"
+        finally:
+            closed.append(True)
+
+    started = time.perf_counter()
+    frames = coalesce_tokens(stalling(), FramePolicy.ADAPTIVE)
+    received: list[tuple[float, list[str]]] = []
+    for _, pieces in frames:
+        received.append((time.perf_counter() - started, pieces))
+        if pieces[-1] == "late":
+            break
+    frames.close()
+
+    held = [(at, pieces) for at, pieces in received if pieces[-1] != "late"]
+    assert [token for _, pieces in held for token in pieces] == [f"t{i}" for i in range(6)]
+    assert held[-1][0] < 0.5  # Flushed by the window's deadline, not by the next token.
+    assert received[-1][1] == ["late"]
+    assert closed == [True]  # Closing the frames stopped and closed the token source.
+
+
+def test_templates_match_model_serialization() -> None:
+    for text in ("plain", 'quote " and \\\\ slash', "line\nbreak\ttab", "ünïcödé ✓", "\x00"):
+        frame = token_frame(text, 7)
+        assert frame.startswith("data: ") and frame.endswith("\n\n")
+        assert json.loads(frame[6:]) == ChatChunk(token=text, index=7).model_dump()
+    assert (
+        final_frame(3)
+        == f"data: {ChatChunk(token='', index=3, is_final=True).model_dump_json()}\n\n"
+    )
@@ -0,0 +1,153 @@
+"""Tests covering background conversation summarization and low-priority generations."""
+
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.app.api.routes import chat
+from backend.app.db.write_behind import get_message_writer
+from backend.app.main import create_app
+from backend.app.runtime import get_runtime_manager
+from backend.app.runtime.manager import RuntimeBusyError
+from backend.app.runtime.summarizer import ConversationSummarizer
+from backend.app.runtime.synthetic import SyntheticRuntime
+from backend.app.schemas.chat import ChatConfig
+from backend.app.schemas.runtime import RuntimeConfigSchema
+
+TURN = " ".join(["word"] * 30)
+
+
+class PromptRecordingRuntime(SyntheticRuntime):
+    def __init__(self) -> None:
+        super().__init__(prefill_delay=0, tokens_per_second=0, jitter=0)
+        self.prompts: list[list[dict[str, str]]] = []
+
+    def _sample(self, llama, config, *, messages, **options):
+        self.prompts.append(messages)
+        yield from super()._sample(llama, config, messages=messages, **options)
+
+
+def _loaded(tmp_path) -> PromptRecordingRuntime:
+    runtime = PromptRecordingRuntime()
+    (tmp_path / "model.gguf").write_bytes(b"GGUF")
+    runtime.load_model(
+        model_id=1,
+        model_path=tmp_path / "model.gguf",
+        config=RuntimeConfigSchema(use_mmap=False, context_length=256),
+    )
+    return runtime
+
+
+def test_background_generations_yield_to_foreground(tmp_path) -> None:
+    runtime = _loaded(tmp_path)
+    messages = [{"role": "user", "content": "Hi"}]
+
+    foreground = runtime.generate(messages, ChatConfig(max_tokens=4))
+    next(foreground)
+    with pytest.raises(RuntimeBusyError):
+        next(runtime.generate_choices(ChatConfig(), messages=messages, background=True))
+    foreground.close()
+
+    background = runtime.generate_choices(ChatConfig(), messages=messages, background=True)
+    next(background)
+    replies: list[list[str]] = []
+    waiter = threading.Thread(
+        target=lambda: replies.append(list(runtime.generate(messages, ChatConfig(max_tokens=2))))
+    )
+    waiter.start()
+    while not runtime._instances[0].waiting:
+        time.sleep(0.001)
+    with pytest.raises(RuntimeBusyError):
+        list(background)
+    waiter.join(timeout=5)
+    assert replies == [["The", " quick"]]
+
+
+def test_summaries_replace_older_turns_in_the_prompt(isolated_state, monkeypatch) -> None:
+    app = create_app()
+    runtime = PromptRecordingRuntime()
+    app.dependency_overrides[get_runtime_manager] = lambda: runtime
+    summarizer = ConversationSummarizer(keep_recent=2, max_tokens=8, retry_interval=60)
+    monkeypatch.setattr(chat, "get_summarizer", lambda: summarizer)
+
+    with TestClient(app) as client:
+        model = client.post(
+            "/api/runtime/models/upload",
+            files={"file": ("tiny.gguf", b"GGUF", "application/octet-stream")},
+        ).json()["model"]
+        client.post(
+            "/api/runtime/load",
+            json={"model_id": model["id"], "config_override": {"context_length": 256}},
+        )
+        conversation_id = client.post("/api/conversations", json={}).json()["id"]
+        for index in range(8):
+            client.post(
+                f"/api/conversations/{conversation_id}/messages",
+                json={"role": "user" if index % 2 == 0 else "assistant", "content": TURN},
+            )
+        request = {
+            "model_id": model["slug"],
+            "conversation_id": conversation_id,
+            "prompt": "Next?",
+            "config": {"max_tokens": 8},
+        }
+
+        assert client.post("/api/chat/stream", json=request).status_code == 200
+        assert summarizer.pending() == [conversation_id]
+        summarizer.run_pending()  # The runtime has not been idle long enough yet.
+        assert summarizer.pending() == [conversation_id]
+
+        # Only the turns that fit the summarizer's own context go into one pass.
+        summary = summarizer.summarize(runtime, conversation_id)
+        assert summary is not None and summary.content.startswith("The quick")
+        assert (summary.first_message_id, summary.last_message_id) == (1, 4)
+        assert runtime.prompts[-1][1]["content"].count(TURN) == 4
+        assert summarizer.pending() == [conversation_id]
+
+        assert client.post("/api/chat/stream", json=request).status_code == 200
+        system, *turns = runtime.prompts[-1]
+        assert system["content"].endswith(summary.content)
+        assert [turn["content"] for turn in turns[:5]] == [TURN] * 4 + ["Next?"]
+        assert len(turns) == 7
+
+        get_message_writer().flush()  # Streaming replies are not summarized.
+        folded = summarizer.summarize(runtime, conversation_id)
+        assert folded is not None
+        assert (folded.first_message_id, folded.last_message_id) == (1, 10)
+        assert "Summary so far" in runtime.prompts[-1][1]["content"]
+        assert client.delete(f"/api/conversations/{conversation_id}").status_code == 204
+    summarizer.close()
+
+
+def test_summary_input_is_capped_below_the_context(isolated_state) -> None:
+    app = create_app()
+    runtime = PromptRecordingRuntime()
+    app.dependency_overrides[get_runtime_manager] = lambda: runtime
+    summarizer = ConversationSummarizer(keep_recent=2, max_tokens=8, max_input_tokens=70)
+
+    with TestClient(app) as client:
+        model = client.post(
+            "/api/runtime/models/upload",
+            files={"file": ("tiny.gguf", b"GGUF", "application/octet-stream")},
+        ).json()["model"]
+        client.post(
+            "/api/runtime/load",
+            json={"model_id": model["id"], "config_override": {"context_length": 256}},
+        )
+        conversation_id = client.post("/api/conversations", json={}).json()["id"]
+        for index in range(8):
+            client.post(
+                f"/api/conversations/{conversation_id}/messages",
+                json={"role": "user" if index % 2 == 0 else "assistant", "content": TURN},
+            )
+
+        # The window would fit four turns, but one pass prefills at most 70 tokens of them.
+        summary = summarizer.summarize(runtime, conversation_id)
+        assert summary is not None
+        assert (summary.first_message_id, summary.last_message_id) == (1, 2)
+        assert runtime.prompts[-1][1]["content"].count(TURN) == 2
+    summarizer.close()
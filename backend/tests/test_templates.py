@@ -0,0 +1,235 @@
+"""Tests covering GGUF metadata parsing and incremental chat-template rendering."""
+
+from __future__ import annotations
+
+import os
+import re
+import struct
+from pathlib import Path
+
+from backend.app.runtime.gguf import read_metadata
+from backend.app.runtime.manager import LlamaRuntime
+from backend.app.runtime.templates import ChatTemplate, ChatTemplateEngine
+from backend.app.schemas.chat import ChatConfig
+from backend.app.schemas.runtime import RuntimeConfigSchema
+
+CHATML = (
+    "{% for message in messages %}"
+    "{{ '<|im_start|>' + message['role'] + '\n' + message['content'] + '<|im_end|>\n' }}"
+    "{% endfor %}"
+    "{% if add_generation_prompt %}{{ '<|im_start|>assistant\n' }}{% endif %}"
+)
+LLAMA3 = (
+    "{{ bos_token }}{% for message in messages %}"
+    "{{ '<|start_header_id|>' + message['role'] + '<|end_header_id|>\n\n'"
+    " + message['content'] | trim + '<|eot_id|>' }}"
+    "{% endfor %}"
+    "{% if add_generation_prompt %}{{ '<|start_header_id|>assistant<|end_header_id|>\n\n' }}"
+    "{% endif %}"
+)
+ALTERNATING = (
+    "{{ bos_token }}{% for message in messages %}"
+    "{% if (message['role'] == 'user') != (loop.index0 % 2 == 0) %}"
+    "{{ raise_exception('Conversation roles must alternate') }}{% endif %}"
+    "{% if message['role'] == 'user' %}{{ '[INST] ' + message['content'] + ' [/INST]' }}"
+    "{% else %}{{ message['content'] + eos_token }}{% endif %}{% endfor %}"
+)
+PLAIN = (
+    "{% for message in messages %}{{ message['role'] + ': ' + message['content'] + '\n' }}"
+    "{% endfor %}{% if add_generation_prompt %}{{ 'assistant:' }}{% endif %}"
+)
+SPECIAL_TOKENS = {
+    CHATML: ("<|im_start|>", "<|im_end|>"),
+    LLAMA3: ("<s>", "<|start_header_id|>", "<|end_header_id|>", "<|eot_id|>"),
+}
+LAST_AWARE = (
+    "{% for message in messages %}{% if loop.last %}>>{% endif %}"
+    "{{ message['content'] }}|{% endfor %}"
+)
+
+
+def _string(value: str) -> bytes:
+    data = value.encode("utf-8")
+    return struct.pack("<Q", len(data)) + data
+
+
+def write_gguf(path: Path, metadata: dict[str, object]) -> Path:
+    """Write a header-only GGUF v3 file holding `metadata`."""
+    body = b""
+    for key, value in metadata.items():
+        body += _string(key)
+        if isinstance(value, str):
+            body += struct.pack("<I", 8) + _string(value)
+        elif isinstance(value, int):
+            body += struct.pack("<II", 4, value)
+        elif all(isinstance(item, str) for item in value):  # type: ignore[union-attr]
+            body += struct.pack("<IIQ", 9, 8, len(value))  # type: ignore[arg-type]
+            body += b"".join(_string(item) for item in value)  # type: ignore[union-attr]
+        else:
+            body += struct.pack("<IIQ", 9, 4, len(value))  # type: ignore[arg-type]
+            body += b"".join(struct.pack("<I", item) for item in value)  # type: ignore[union-attr]
+    path.write_bytes(b"GGUF" + struct.pack("<IQQ", 3, 0, len(metadata)) + body)
+    return path
+
+
+def _tokenize(text: str) -> list[int]:
+    return [ord(char) for char in text]
+
+
+_SPECIAL_IDS = {token: -index for index, token in enumerate(SPECIAL_TOKENS[CHATML], 1)}
+_SPECIAL_SPLIT = re.compile("(" + "|".join(map(re.escape, _SPECIAL_IDS)) + ")")
+_PIECES: dict[str, int] = {}
+
+
+def _merging_tokenize(text: str) -> list[int]:
+    """Like llama.cpp with SentencePiece: split at special tokens, then prefix each text
+    fragment with "▁" and merge word runs, so pieces only concatenate at special tokens."""
+    ids: list[int] = []
+    for fragment in _SPECIAL_SPLIT.split(text):
+        if fragment in _SPECIAL_IDS:
+            ids.append(_SPECIAL_IDS[fragment])
+        elif fragment:
+            pieces = re.findall(r"▁?\w+|\W", "▁" + fragment.replace(" ", "▁"))
+            ids.extend(_PIECES.setdefault(piece, len(_PIECES)) for piece in pieces)
+    return ids
+
+
+def _conversation(turns: int) -> list[dict[str, str]]:
+    messages = [{"role": "system", "content": "Be brief."}]
+    for turn in range(turns):
+        messages.append({"role": "user", "content": f"Question {turn}?"})
+        messages.append({"role": "assistant", "content": f"Answer {turn}."})
+    return messages
+
+
+def test_metadata_reader_skips_unwanted_values(tmp_path) -> None:
+    path = write_gguf(
+        tmp_path / "model.gguf",
+        {
+            "general.name": "tiny",
+            "tokenizer.ggml.scores": list(range(1000)),
+            "tokenizer.ggml.tokens": ["<s>", "</s>", "a"],
+            "tokenizer.ggml.bos_token_id": 0,
+        },
+    )
+    metadata = read_metadata(path, lambda key: key.startswith("tokenizer.ggml.t"))
+    assert metadata == {"tokenizer.ggml.tokens": ["<s>", "</s>", "a"]}
+    assert read_metadata(path)["tokenizer.ggml.bos_token_id"] == 0
+
+
+def test_appended_turns_render_only_new_messages() -> None:
+    for source in (CHATML, LLAMA3):
+        template = ChatTemplate(source, bos_token="<s>", special_tokens=SPECIAL_TOKENS[source])
+        assert template.incremental
+        engine = ChatTemplateEngine()
+        messages = _conversation(0) + [{"role": "user", "content": "Hi"}]
+
+        first = engine.render("c1", template, messages, _tokenize)
+        assert first.text == template.render(messages)
+        assert first.rendered_messages == 2
+
+        for turn in range(3):
+            messages = messages + [
+                {"role": "assistant", "content": f"Reply {turn}"},
+                {"role": "user", "content": f"Follow-up {turn}"},
+            ]
+            rendered = engine.render("c1", template, messages, _tokenize)
+            assert rendered.text == template.render(messages)
+            assert rendered.token_ids == _tokenize(rendered.text)
+            assert rendered.rendered_messages == 2
+            assert rendered.reused_tokens > 0
+
+        # An edited history is not a prefix any more and is rendered in full.
+        edited = [messages[0], {"role": "user", "content": "Different"}]
+        rendered = engine.render("c1", template, edited, _tokenize)
+        assert (rendered.text, rendered.rendered_messages) == (template.render(edited), 2)
+
+
+def test_token_ids_match_a_full_tokenization_across_joins() -> None:
+    for source, reuses in ((CHATML, True), (PLAIN, False)):
+        template = ChatTemplate(source, special_tokens=SPECIAL_TOKENS[CHATML])
+        assert template.incremental
+        engine = ChatTemplateEngine()
+        messages = _conversation(1) + [{"role": "user", "content": "Hi"}]
+        engine.render("c1", template, messages, _merging_tokenize)
+
+        messages = messages + [
+            {"role": "assistant", "content": "Hello"},
+            {"role": "user", "content": "More"},
+        ]
+        rendered = engine.render("c1", template, messages, _merging_tokenize)
+        assert rendered.token_ids == _merging_tokenize(template.render(messages))
+        assert rendered.rendered_messages == 2
+        # Plain-text joins would merge or gain a "▁", so they are tokenized in full.
+        assert (rendered.reused_tokens > 0) is reuses
+
+
+def test_whole_list_templates_fall_back_to_full_renders() -> None:
+    alternating = ChatTemplate(ALTERNATING, bos_token="<s>", eos_token="</s>")
+    assert alternating.incremental
+    last_aware = ChatTemplate(LAST_AWARE)
+    assert not last_aware.incremental
+
+    engine = ChatTemplateEngine()
+    messages = _conversation(3)[1:] + [{"role": "user", "content": "Next"}]
+    for template in (alternating, last_aware):
+        for size in (3, 5, 7):
+            rendered = engine.render(f"{id(template)}", template, messages[:size])
+            assert rendered.text == template.render(messages[:size])
+
+
+def test_template_compiled_once_per_file(tmp_path) -> None:
+    path = write_gguf(
+        tmp_path / "model.gguf",
+        {
+            "tokenizer.ggml.tokens": ["<s>", "</s>"],
+            "tokenizer.ggml.bos_token_id": 0,
+            "tokenizer.chat_template": LLAMA3,
+        },
+    )
+    engine = ChatTemplateEngine()
+    template = engine.template_for(path)
+    assert template is not None and template.bos_token == "<s>"
+    assert engine.template_for(path) is template
+
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert engine.template_for(path) is not template
+
+    (tmp_path / "junk.gguf").write_bytes(b"GGUF")
+    assert engine.template_for(tmp_path / "junk.gguf") is None
+
+
+class FakeLlama:
+    def __init__(self) -> None:
+        self.prompts: list[object] = []
+
+    def tokenize(self, text: bytes, add_bos: bool, special: bool) -> list[int]:
+        return _tokenize(text.decode("utf-8"))
+
+    def create_completion(self, prompt, **options):
+        self.prompts.append(prompt)
+        yield {"choices": [{"text": "ok", "finish_reason": "stop"}]}
+
+
+class TemplatedRuntime(LlamaRuntime):
+    requires_bindings = False
+
+    def _create_llama(self, llama_args):
+        return FakeLlama()
+
+
+def test_runtime_feeds_rendered_token_ids(tmp_path) -> None:
+    path = write_gguf(tmp_path / "chat.gguf", {"tokenizer.chat_template": CHATML})
+    runtime = TemplatedRuntime()
+    runtime.load_model(
+        model_id=1,
+        model_path=path,
+        config=RuntimeConfigSchema(use_mmap=False, context_length=512),
+    )
+    messages = [{"role": "user", "content": "Hi"}]
+
+    assert list(runtime.generate(messages, ChatConfig(), cache_key="conversation:1")) == ["ok"]
+    llama = runtime._llama
+    expected = ChatTemplate(CHATML).render(messages)
+    assert llama.prompts == [_tokenize(expected)]  # type: ignore[union-attr]
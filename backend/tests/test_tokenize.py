@@ -0,0 +1,79 @@
+"""Tests covering the batch tokenization endpoint and its count cache."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from backend.app.main import create_app
+from backend.app.runtime import get_runtime_manager, get_token_counter
+from backend.app.runtime.synthetic import SyntheticRuntime
+from backend.app.runtime.tokenizer import TokenCounter
+from backend.app.utils.tokens import estimate_tokens
+
+
+class VocabRuntime(SyntheticRuntime):
+    """Counts characters as tokens and records every text it is asked to tokenize."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.vocab_loads: list[Path] = []
+        self.tokenized: list[str] = []
+
+    def load_vocab(self, model_path: Path):
+        self.vocab_loads.append(model_path)
+
+        def count(text: str) -> int:
+            self.tokenized.append(text)
+            return len(text)
+
+        return count
+
+
+def test_only_uncached_texts_are_tokenized() -> None:
+    runtime = VocabRuntime()
+    counter = TokenCounter(max_entries=2)
+    path = Path("model.gguf")
+
+    first = counter.count(runtime, 1, path, ["ab", "cde", "ab"])
+    assert (first.counts, first.cached, first.source) == ([2, 3, 2], 0, "vocab")
+    assert runtime.tokenized == ["ab", "cde"]
+
+    second = counter.count(runtime, 1, path, ["cde", "ab", "fghi"])
+    assert (second.counts, second.cached) == ([3, 2, 4], 2)
+    assert runtime.tokenized == ["ab", "cde", "fghi"]
+    assert runtime.vocab_loads == [path]
+
+    # "cde" was the least recently used entry once "fghi" pushed the cache past two.
+    counter.count(runtime, 1, path, ["cde"])
+    assert runtime.tokenized[-1] == "cde"
+
+    # Counts are per model: the same text under another model is tokenized again.
+    assert counter.count(runtime, 2, path, ["ab"]).cached == 0
+
+
+def test_tokenize_endpoint(isolated_state) -> None:
+    app = create_app()
+    counter = TokenCounter()
+    app.dependency_overrides[get_runtime_manager] = lambda: SyntheticRuntime()
+    app.dependency_overrides[get_token_counter] = lambda: counter
+    texts = ["Hello there, world!", "A second message."]
+
+    with TestClient(app) as client:
+        slug = client.post(
+            "/api/runtime/models/upload",
+            files={"file": ("tiny.gguf", b"GGUF", "application/octet-stream")},
+        ).json()["model"]["slug"]
+        first = client.post("/api/tokenize", json={"model_id": slug, "texts": texts}).json()
+        second = client.post("/api/tokenize", json={"model_id": slug, "texts": texts}).json()
+        missing = client.post("/api/tokenize", json={"model_id": "nope", "texts": ["x"]})
+        empty = client.post("/api/tokenize", json={"model_id": slug, "texts": []})
+    counter.shutdown()
+
+    assert first["counts"] == [estimate_tokens(text) for text in texts]
+    assert first["total"] == sum(first["counts"])
+    assert (first["cached"], second["cached"]) == (0, 2)
+    assert first["source"] == "estimate"
+    assert missing.status_code == 404
+    assert empty.status_code == 422
@@ -0,0 +1,73 @@
+"""Tests covering request tracing and the slow-request tail sampler."""
+
+from __future__ import annotations
+
+import contextvars
+import json
+import threading
+import time
+
+from fastapi.testclient import TestClient
+
+from backend.app.config import settings
+from backend.app.main import create_app
+from backend.app.runtime import get_runtime_manager
+from backend.app.telemetry.tracing import JsonlTraceExporter, Tracer, get_tracer
+
+
+def test_tail_sampler_keeps_only_slow_traces(isolated_state, monkeypatch) -> None:
+    monkeypatch.setattr(settings, "trace_slow_threshold_ms", 20.0)
+    export_path = isolated_state / "traces.jsonl"
+    tracer = Tracer(exporters=[JsonlTraceExporter(export_path)])
+
+    with tracer.start_trace("fast"):
+        with tracer.span("db"):
+            pass
+    with tracer.start_trace("slow") as root:
+        with tracer.span("db") as db_span:
+            time.sleep(0.03)
+        context = contextvars.copy_context()
+        worker = threading.Thread(
+            target=context.run, args=(tracer.record_span, "worker", 0, 1_000_000)
+        )
+        worker.start()
+        worker.join()
+
+    traces = tracer.slowest(10)
+    assert [trace["name"] for trace in traces] == ["slow"]
+    spans = {span["name"]: span for span in traces[0]["spans"]}
+    assert spans["db"]["span_id"] == db_span.span_id
+    assert spans["db"]["parent_id"] == root.span_id
+    assert spans["worker"]["parent_id"] == root.span_id
+
+    tracer._executor.shutdown(wait=True)  # type: ignore[union-attr]
+    exported = [json.loads(line) for line in export_path.read_text().splitlines()]
+    assert [trace["trace_id"] for trace in exported] == [root.trace_id]
+
+
+def test_debug_traces_cover_chat_stages(isolated_state, monkeypatch, streaming_runtime) -> None:
+    monkeypatch.setattr(settings, "trace_slow_threshold_ms", 0.0)
+    monkeypatch.setattr(settings, "trace_export_path", None)
+    get_tracer().clear()
+    app = create_app()
+    runtime = streaming_runtime(["Hi", "!"])
+    app.dependency_overrides[get_runtime_manager] = lambda: runtime
+
+    with TestClient(app) as client:
+        upload = client.post(
+            "/api/runtime/models/upload",
+            files={"file": ("tiny.gguf", b"GGUF", "application/octet-stream")},
+        ).json()["model"]
+        client.post("/api/runtime/load", json={"model_id": upload["id"]})
+        client.post("/api/chat/stream", json={"model_id": upload["slug"], "prompt": "Hello"})
+        response = client.get("/api/debug/traces", params={"limit": 50})
+
+    assert response.status_code == 200
+    traces = response.json()["items"]
+    durations = [trace["duration_ms"] for trace in traces]
+    assert durations == sorted(durations, reverse=True)
+    chat = next(trace for trace in traces if trace["name"] == "POST /api/chat/stream")
+    names = {span["name"] for span in chat["spans"]}
+    assert {"db.get_model", "chat.tokenize", "chat.prefill", "chat.decode"} <= names
+    assert "chat.serialize" in names
+    get_tracer().clear()
@@ -0,0 +1,90 @@
+"""Tests covering the per-model runtime auto-tuner."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from backend.app.main import create_app
+from backend.app.runtime import get_auto_tuner, get_runtime_manager
+from backend.app.runtime.synthetic import SyntheticRuntime
+from backend.app.runtime.tuning import AutoTuner, default_search_space
+from backend.app.schemas.runtime import KVCachePlacement, TuningRequest
+
+
+class ThreadSensitiveRuntime(SyntheticRuntime):
+    """Decodes fastest with 4 threads and a 256 batch, so the tuner has a clear winner.
+
+    Coordinate descent tunes one axis at a time, so each knob must speed decode up on its
+    own; a winner that only shows when two knobs interact would be invisible to it.
+    """
+
+    def load_model(self, *, model_id: int, model_path: Path, config):
+        if config.eval_batch_size == 512:
+            raise MemoryError("batch does not fit")
+        speedup = (5 if config.cpu_threads == 4 else 1) * (
+            5 if config.eval_batch_size == 256 else 1
+        )
+        self.tokens_per_second = 200.0 * speedup
+        return super().load_model(model_id=model_id, model_path=model_path, config=config)
+
+
+def test_tuner_persists_best_config_used_by_load(isolated_state) -> None:
+    app = create_app()
+    runtime = ThreadSensitiveRuntime(prefill_delay=0.0, jitter=0.0)
+    tuner = AutoTuner(prompts=("Hello there.",))
+    app.dependency_overrides[get_runtime_manager] = lambda: runtime
+    app.dependency_overrides[get_auto_tuner] = lambda: tuner
+
+    with TestClient(app) as client:
+        model_id = client.post(
+            "/api/runtime/models/upload",
+            files={"file": ("tiny.gguf", b"GGUF", "application/octet-stream")},
+        ).json()["model"]["id"]
+        assert client.get(f"/api/runtime/models/{model_id}/tuned-config").status_code == 404
+        before = client.post("/api/runtime/load", json={"model_id": model_id}).json()
+
+        response = client.post(
+            f"/api/runtime/models/{model_id}/tune",
+            json={"cpu_threads": [2, 4], "eval_batch_size": [128, 256, 512], "max_tokens": 6},
+        )
+        assert response.status_code == 202
+        tuner.wait(timeout=30)
+
+        job = client.get(f"/api/runtime/tuning/{response.json()['id']}").json()
+        assert job["status"] == "completed"
+        assert job["best"]["config"]["cpu_threads"] == 4
+        assert job["best"]["config"]["eval_batch_size"] == 256
+        assert any(trial["error"] == "batch does not fit" for trial in job["trials"])
+        # The previous load is restored, and the published snapshot follows it.
+        restored = client.get("/api/runtime/state").json()
+        assert restored["config"] == before["config"]
+        assert restored["loaded_at"] != before["loaded_at"]
+        assert datetime.fromisoformat(restored["loaded_at"]) == runtime.get_state().loaded_at
+
+        tuned = client.get(f"/api/runtime/models/{model_id}/tuned-config").json()
+        assert tuned["trial_count"] == len(job["trials"])
+        assert tuned["decode_tokens_per_second"] > 0
+
+        loaded = client.post("/api/runtime/load", json={"model_id": model_id}).json()
+        assert loaded["config"]["cpu_threads"] == 4
+        assert loaded["config"]["context_length"] == 4096
+
+        client.delete(f"/api/runtime/models/{model_id}/tuned-config")
+        reloaded = client.post("/api/runtime/load", json={"model_id": model_id}).json()
+        assert reloaded["config"]["cpu_threads"] is None
+
+
+def test_search_space_sweeps_offload_only_when_the_build_can() -> None:
+    cpu_only = default_search_space(TuningRequest())
+    assert cpu_only["gpu_layers"] == [None]
+    assert cpu_only["kv_cache_placement"] == [KVCachePlacement.AUTO]
+
+    gpu = default_search_space(TuningRequest(), layers=31, gpu=True)
+    assert gpu["gpu_layers"] == [0, 8, 16, 24, 32]
+    assert gpu["kv_cache_placement"] == ["auto", "cpu", "gpu"]
+    assert default_search_space(TuningRequest(), gpu=True)["gpu_layers"] == [0, 999]
+    pinned = default_search_space(TuningRequest(gpu_layers=[4]), layers=31, gpu=True)
+    assert pinned["gpu_layers"] == [4]
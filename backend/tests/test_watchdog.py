@@ -0,0 +1,87 @@
+"""Tests covering idle unloading, memory-pressure shedding and lazy reloads."""
+
+from __future__ import annotations
+
+import math
+
+from fastapi.testclient import TestClient
+
+from backend.app.main import create_app
+from backend.app.runtime import get_runtime_manager
+from backend.app.runtime.synthetic import SyntheticRuntime
+from backend.app.runtime.watchdog import RuntimeWatchdog, WatchdogAction
+
+
+class CachingRuntime(SyntheticRuntime):
+    """Synthetic runtime that pretends to hold a releasable prompt cache."""
+
+    def __init__(self) -> None:
+        super().__init__(prefill_delay=0.0, tokens_per_second=0.0)
+        self.released = 0
+
+    def release_caches(self) -> bool:
+        self.released += 1
+        return True
+
+
+def _load(client: TestClient) -> str:
+    model = client.post(
+        "/api/runtime/models/upload",
+        files={"file": ("tiny.gguf", b"GGUF", "application/octet-stream")},
+    ).json()["model"]
+    client.post("/api/runtime/load", json={"model_id": model["id"]})
+    return model["slug"]
+
+
+def test_idle_model_is_unloaded_and_lazily_reloaded(isolated_state) -> None:
+    app = create_app()
+    runtime = CachingRuntime()
+    app.dependency_overrides[get_runtime_manager] = lambda: runtime
+    watchdog = RuntimeWatchdog(
+        runtime,
+        app.state.runtime_hub,
+        idle_ttl=0.0001,
+        min_available_bytes=0,
+        swap_rate_bytes=math.inf,
+        interval=0,
+    )
+
+    with TestClient(app) as client:
+        slug = _load(client)
+        assert watchdog.check() is WatchdogAction.UNLOAD_IDLE
+        assert client.get("/api/runtime/state").json()["loaded"] is False
+
+        response = client.post(
+            "/api/chat/stream",
+            json={"model_id": slug, "prompt": "Hi", "config": {"max_tokens": 2}},
+        )
+        assert response.status_code == 200
+        assert '"token":"The"' in response.text
+        assert client.get("/api/runtime/state").json()["loaded"] is True
+
+        client.post("/api/runtime/unload")
+        other = client.post("/api/chat/stream", json={"model_id": slug, "prompt": "Hi"})
+        assert other.status_code == 409
+
+
+def test_pressure_sheds_caches_before_unloading(isolated_state) -> None:
+    app = create_app()
+    runtime = CachingRuntime()
+    app.dependency_overrides[get_runtime_manager] = lambda: runtime
+    watchdog = RuntimeWatchdog(
+        runtime,
+        app.state.runtime_hub,
+        idle_ttl=0,
+        min_available_bytes=2**62,
+        swap_rate_bytes=math.inf,
+        interval=0,
+    )
+
+    with TestClient(app) as client:
+        _load(client)
+        assert watchdog.check() is WatchdogAction.SHED_CACHES
+        assert runtime.get_state() is not None
+        assert watchdog.check() is WatchdogAction.UNLOAD_PRESSURE
+        assert runtime.get_state() is None
+        assert watchdog.check() is None
+    assert runtime.released == 1
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""Drive concurrent streaming chat clients and report latency + throughput."""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+import httpx
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+@dataclass
+class StreamResult:
+    ttft: float | None
+    total: float
+    tokens: int
+    error: str | None = None
+
+
+@dataclass
+class LoadReport:
+    clients: int
+    requests: int
+    errors: int
+    wall_seconds: float
+    ttft_p50: float | None
+    ttft_p99: float | None
+    latency_p50: float | None
+    latency_p99: float | None
+    tokens: int
+    tokens_per_second: float
+
+
+def percentile(values: list[float], pct: float) -> float | None:
+    """Nearest-rank percentile; None for an empty sample."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, min(len(ordered), round(pct / 100 * len(ordered) + 0.5)))
+    return ordered[rank - 1]
+
+
+def summarize(results: list[StreamResult], clients: int, wall_seconds: float) -> LoadReport:
+    ok = [result for result in results if result.error is None]
+    ttfts = [result.ttft for result in ok if result.ttft is not None]
+    totals = [result.total for result in ok]
+    tokens = sum(result.tokens for result in ok)
+    return LoadReport(
+        clients=clients,
+        requests=len(results),
+        errors=len(results) - len(ok),
+        wall_seconds=wall_seconds,
+        ttft_p50=percentile(ttfts, 50),
+        ttft_p99=percentile(ttfts, 99),
+        latency_p50=percentile(totals, 50),
+        latency_p99=percentile(totals, 99),
+        tokens=tokens,
+        tokens_per_second=tokens / wall_seconds if wall_seconds else 0.0,
+    )
+
+
+async def stream_once(client: httpx.AsyncClient, path: str, payload: dict) -> StreamResult:
+    started = time.perf_counter()
+    ttft: float | None = None
+    tokens = 0
+    try:
+        async with client.stream("POST", path, json=payload) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if line.startswith("event: error"):
+                    raise RuntimeError("server reported a generation error")
+                if not line.startswith("data: "):
+                    continue
+                chunk = json.loads(line[len("data: ") :])
+                if chunk.get("token"):
+                    tokens += 1
+                    if ttft is None:
+                        ttft = time.perf_counter() - started
+                if chunk.get("is_final"):
+                    # Frames may carry several tokens; the final chunk's index is the true count.
+                    tokens = max(tokens, chunk["index"])
+    except (httpx.HTTPError, RuntimeError) as exc:
+        return StreamResult(
+            ttft=ttft, total=time.perf_counter() - started, tokens=tokens, error=str(exc)
+        )
+    return StreamResult(ttft=ttft, total=time.perf_counter() - started, tokens=tokens)
+
+
+async def run_load(
+    base_url: str,
+    *,
+    path: str,
+    payload: dict,
+    clients: int,
+    requests_per_client: int,
+) -> LoadReport:
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+    timeout = httpx.Timeout(300.0, connect=10.0)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=timeout) as client:
+
+        async def worker() -> list[StreamResult]:
+            return [await stream_once(client, path, payload) for _ in range(requests_per_client)]
+
+        started = time.perf_counter()
+        batches = await asyncio.gather(*(worker() for _ in range(clients)))
+        wall = time.perf_counter() - started
+    return summarize([result for batch in batches for result in batch], clients, wall)
+
+
+def ensure_model_loaded(base_url: str, model_slug: str | None) -> str:
+    """Load `model_slug`, or upload and load a placeholder GGUF for the synthetic runtime."""
+    with httpx.Client(base_url=base_url, timeout=60.0) as client:
+        if model_slug is None:
+            upload = client.post(
+                "/api/runtime/models/upload",
+                files={"file": ("synthetic.gguf", b"GGUF", "application/octet-stream")},
+            )
+            upload.raise_for_status()
+            model = upload.json()["model"]
+        else:
+            models = client.get("/api/runtime/models").json()["models"]
+            model = next((item for item in models if item["slug"] == model_slug), None)
+            if model is None:
+                raise SystemExit(f"Model '{model_slug}' is not installed.")
+        client.post("/api/runtime/load", json={"model_id": model["id"]}).raise_for_status()
+        return model["slug"]
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def spawn_synthetic_server(
+    data_dir: Path, args: argparse.Namespace
+) -> tuple[subprocess.Popen, str]:
+    """Start uvicorn with the synthetic runtime against a throwaway data directory."""
+    port = _free_port()
+    env = {
+        **os.environ,
+        "CHATBOT_RUNTIME_BACKEND": "synthetic",
+        "CHATBOT_SYNTHETIC_PREFILL_DELAY": str(args.prefill_delay),
+        "CHATBOT_SYNTHETIC_TOKENS_PER_SECOND": str(args.tokens_per_second),
+        "CHATBOT_SYNTHETIC_JITTER": str(args.jitter),
+        "CHATBOT_DATA_DIR": str(data_dir),
+        "CHATBOT_MODELS_DIR": str(data_dir / "models"),
+        "CHATBOT_DOCUMENTS_DIR": str(data_dir / "documents"),
+        "CHATBOT_DATABASE_PATH": str(data_dir / "chatbot.db"),
+        "CHATBOT_DATABASE_URL": f"sqlite:///{(data_dir / 'chatbot.db').as_posix()}",
+        "CHATBOT_TRACE_EXPORT_PATH": str(data_dir / "traces.jsonl"),
+    }
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "--factory",
+            "backend.app.main:create_app",
+            "--port",
+            str(port),
+            "--log-level",
+            "warning",
+        ],
+        cwd=ROOT,
+        env=env,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise SystemExit("Backend exited during startup.")
+        try:
+            if httpx.get(f"{base_url}/api/health", timeout=1.0).status_code == 200:
+                return process, base_url
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    process.terminate()
+    raise SystemExit("Backend did not become healthy within 30s.")
+
+
+def format_report(report: LoadReport) -> str:
+    def ms(value: float | None) -> str:
+        return "n/a" if value is None else f"{value * 1000:.1f} ms"
+
+    return "\n".join(
+        [
+            f"clients:          {report.clients}",
+            f"requests:         {report.requests} ({report.errors} failed)",
+            f"wall time:        {report.wall_seconds:.2f} s",
+            f"TTFT p50 / p99:   {ms(report.ttft_p50)} / {ms(report.ttft_p99)}",
+            f"stream p50 / p99: {ms(report.latency_p50)} / {ms(report.latency_p99)}",
+            f"throughput:       {report.tokens_per_second:.1f} tok/s ({report.tokens} tokens)",
+        ]
+    )
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--base-url", help="Existing backend to target (default: spawn one)")
+    parser.add_argument("--model", help="Installed model slug to load (default: placeholder)")
+    parser.add_argument("--clients", type=int, default=8, help="Concurrent streaming clients")
+    parser.add_argument("--requests", type=int, default=4, help="Requests per client")
+    parser.add_argument("--prompt", default="Write a short poem about load testing.")
+    parser.add_argument("--max-tokens", type=int, default=64)
+    parser.add_argument("--prefill-delay", type=float, default=0.2, help="Synthetic prefill (s)")
+    parser.add_argument("--tokens-per-second", type=float, default=40.0)
+    parser.add_argument("--jitter", type=float, default=0.2)
+    parser.add_argument(
+        "--mock",
+        action="store_true",
+        help="Target /api/mock/chat/stream instead of a model (no runtime involved)",
+    )
+    parser.add_argument("--coalesce", type=int, default=1, help="Mock tokens per SSE frame")
+    parser.add_argument("--json", type=Path, help="Also write the report as JSON here")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    process: subprocess.Popen | None = None
+    with tempfile.TemporaryDirectory(prefix="chatbot-load-") as temp_dir:
+        base_url = args.base_url
+        if base_url is None:
+            process, base_url = spawn_synthetic_server(Path(temp_dir), args)
+        try:
+            if args.mock:
+                path = "/api/mock/chat/stream"
+                payload = {
+                    "model_id": args.model or "tinyllama-q4",
+                    "prompt": args.prompt,
+                    "stream": {
+                        "synthetic_tokens": args.max_tokens,
+                        "tokens_per_second": args.tokens_per_second,
+                        "first_token_delay_ms": args.prefill_delay * 1000,
+                        "coalesce": args.coalesce,
+                    },
+                }
+            else:
+                path = "/api/chat/stream"
+                payload = {
+                    "model_id": ensure_model_loaded(base_url, args.model),
+                    "prompt": args.prompt,
+                    "config": {"max_tokens": args.max_tokens},
+                }
+            report = asyncio.run(
+                run_load(
+                    base_url,
+                    path=path,
+                    payload=payload,
+                    clients=args.clients,
+                    requests_per_client=args.requests,
+                )
+            )
+        finally:
+            if process is not None:
+                process.terminate()
+                process.wait(timeout=10)
+    print(format_report(report))
+    if args.json:
+        args.json.write_text(json.dumps(asdict(report), indent=2) + "\n", encoding="utf-8")
+    return 1 if report.errors else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -82,6 +82,83 @@ def copy_runtime_pack(
     ctx.run(" ".join(cmd), echo=True, pty=True)
 
 
+@task(
+    help={
+        "base_url": "Target an already running backend instead of spawning a synthetic one",
+        "model": "Installed model slug to load (default: upload a placeholder)",
+        "clients": "Concurrent streaming clients",
+        "requests": "Requests per client",
+        "max_tokens": "Tokens requested per stream",
+        "tokens_per_second": "Synthetic runtime decode rate",
+        "prefill_delay": "Synthetic runtime prefill delay in seconds",
+        "json": "Optional path for a JSON copy of the report",
+        "mock": "Stream from the mock chat route instead of a runtime",
+    },
+)
+def load_test(
+    ctx,
+    base_url="",
+    model="",
+    clients=8,
+    requests=4,
+    max_tokens=64,
+    tokens_per_second=40.0,
+    prefill_delay=0.2,
+    mock=False,
+    json="",
+) -> None:
+    """Benchmark chat streaming with N concurrent clients (CPU-only synthetic runtime)."""
+    cmd = [
+        "uv",
+        "run",
+        "python",
+        "infra/bench/stream_load.py",
+        f"--clients {clients}",
+        f"--requests {requests}",
+        f"--max-tokens {max_tokens}",
+        f"--tokens-per-second {tokens_per_second}",
+        f"--prefill-delay {prefill_delay}",
+    ]
+    if base_url:
+        cmd.extend(["--base-url", base_url])
+    if model:
+        cmd.extend(["--model", model])
+    if json:
+        cmd.extend(["--json", f'"{json}"'])
+    if mock:
+        cmd.append("--mock")
+    ctx.run(" ".join(cmd), echo=True, pty=True)
+
+
+@task(
+    help={
+        "model": "Installed model slug to benchmark",
+        "backend": "Runtime backend override (llama or synthetic)",
+        "baseline": "Mark this run as the new baseline",
+        "threshold": "Regression threshold in percent",
+    },
+)
+def benchmark(ctx, model, backend="", baseline=False, threshold="") -> None:
+    """Run the standard benchmark suite, record it and compare against the baseline."""
+    cmd = ["uv", "run", "python", "-m", "backend.app.runtime.benchmark", "run", f"--model {model}"]
+    if backend:
+        cmd.extend(["--backend", backend])
+    if baseline:
+        cmd.append("--baseline")
+    if threshold:
+        cmd.extend(["--threshold", str(threshold)])
+    ctx.run(" ".join(cmd), echo=True, pty=True)
+
+
+@task(help={"top": "Number of slowest imports to list", "json": "Emit JSON instead of a table"})
+def profile_startup(ctx, top=20, json=False) -> None:
+    """Report per-module import time and init-step time for a cold backend start."""
+    cmd = ["uv", "run", "python", "-m", "backend.app.startup", f"--top {top}"]
+    if json:
+        cmd.append("--json")
+    ctx.run(" ".join(cmd), echo=True, pty=True)
+
+
 @task(pre=[lint_backend, lint_frontend, test_backend])
 def ci(ctx) -> None:  # noqa: ARG001
     """Aggregate task mirroring the Phase 1 CI workflow."""